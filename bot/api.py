@@ -1,17 +1,47 @@
 import logging
-from typing import Optional
+import math
+import os
+import time
+from datetime import datetime, timezone
+from decimal import Decimal
+from typing import List, Optional
 
 from dotenv import load_dotenv
-from fastapi import FastAPI, HTTPException
+from fastapi import Depends, FastAPI, Header, HTTPException, Query, Request, WebSocket, WebSocketDisconnect
+from fastapi.concurrency import run_in_threadpool
+from fastapi.encoders import jsonable_encoder
+from fastapi.exceptions import RequestValidationError
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import HTMLResponse
+from fastapi.responses import HTMLResponse, JSONResponse, Response
 from pydantic import BaseModel, Field
 
-from .client import BinanceFuturesClient
-from .db import get_recent_orders, init_db
+from .client import DEFAULT_FUTURES_BASE_URL, AsyncBinanceFuturesClient
+from .db import (
+    InvalidCursor,
+    OrderSummary,
+    get_order,
+    get_orders_page,
+    get_recent_orders,
+    init_db,
+)
+from .events import order_hub
+from .exchange_info import ExchangeInfoCache, http_exchange_info_fetcher
+from .klines import KlineStore
 from .logging_config import setup_logging
-from .orders import build_and_place_order, summarize_order_response
+from .market_data import MarketData, quote_to_dict
+from .metrics import HTTP_REQUEST_SECONDS, render_latest
+from .positions import PositionBook, position_book
+from .rate_limit import RateLimitExceeded, get_rate_limiter
+from .risk import RiskEngine
+from .orders import (
+    build_and_place_batch_async,
+    build_and_place_order_async,
+    summarize_batch_results,
+    summarize_order_response,
+)
+from .user_stream import UserDataStream
 from .validators import ValidationError
+from .writer import get_order_writer, start_order_writer, stop_order_writer
 
 logger = logging.getLogger(__name__)
 
@@ -26,42 +56,187 @@ app.add_middleware(
 )
 
 
+@app.middleware("http")
+async def record_request_time(request: Request, call_next):
+    t0 = time.perf_counter()
+    status = 500
+    try:
+        response = await call_next(request)
+        status = response.status_code
+        return response
+    finally:
+        # Label by route template (/orders/{order_id}), not the raw path.
+        route = request.scope.get("route")
+        HTTP_REQUEST_SECONDS.labels(
+            request.method, getattr(route, "path", "unmatched"), str(status)
+        ).observe(time.perf_counter() - t0)
+
+
+@app.exception_handler(RequestValidationError)
+async def request_validation_error(request: Request, exc: RequestValidationError) -> JSONResponse:
+    # The default 422 body echoes each bad input; a JSON number such as
+    # 1e999999 parses to inf, which cannot be encoded and turned into a 500.
+    errors = [
+        dict(error, input=repr(error["input"]))
+        if isinstance(error.get("input"), float) and not math.isfinite(error["input"])
+        else error
+        for error in exc.errors()
+    ]
+    return JSONResponse(status_code=422, content={"detail": jsonable_encoder(errors)})
+
+
 class OrderRequest(BaseModel):
     symbol: str = Field(..., example="BTCUSDT")
     side: str = Field(..., example="BUY")
     order_type: str = Field(..., alias="type", example="MARKET")
-    quantity: float = Field(..., gt=0)
-    price: Optional[float] = Field(None, gt=0)
+    quantity: Decimal = Field(..., gt=0)
+    price: Optional[Decimal] = Field(None, gt=0)
     time_in_force: Optional[str] = Field(None, alias="timeInForce", example="GTC")
 
     class Config:
         populate_by_name = True
 
 
+class BatchOrderRequest(BaseModel):
+    orders: List[OrderRequest] = Field(..., min_length=1, max_length=50)
+
+
 @app.on_event("startup")
 def on_startup() -> None:
     # Load environment variables for API process
     load_dotenv()
     setup_logging()
     init_db()
+    # Positions: last snapshot plus a replay of orders that changed after it.
+    position_book.restore()
+    position_book.start()
+    # Pre-trade limits from TRADING_BOT_RISK_CONFIG, re-read when the file changes.
+    app.state.risk_engine = RiskEngine.from_env()
+    # Orders are persisted by a background writer so the API never waits on a commit.
+    start_order_writer()
+
+    # One long-lived client (and keep-alive connection pool) for all requests.
+    app.state.binance_client = None
+    app.state.binance_client_error = None
+    try:
+        app.state.binance_client = AsyncBinanceFuturesClient()
+    except Exception as exc:
+        logger.exception("Failed to initialize AsyncBinanceFuturesClient in API.")
+        app.state.binance_client_error = str(exc)
+
+    # Candles downloaded by `klines sync`, served as memory-mapped slices.
+    app.state.kline_store = KlineStore()
+
+    # Latest quotes for TRADING_BOT_MARKET_SYMBOLS; the stream starts in start_streams.
+    app.state.market_data = MarketData.from_env()
+
+    # Symbol filters for local order checks: snapshot first, then background refresh.
+    base_url = os.getenv("BINANCE_FUTURES_TESTNET_URL", DEFAULT_FUTURES_BASE_URL)
+    app.state.exchange_info = ExchangeInfoCache.from_env(http_exchange_info_fetcher(base_url))
+    app.state.exchange_info.start()
     logger.info("API startup complete.")
 
 
+@app.on_event("startup")
+async def start_streams() -> None:
+    # Runs after on_startup; needs the event loop, hence a separate async hook.
+    app.state.market_data.start()
+    app.state.user_stream = None
+    client = getattr(app.state, "binance_client", None)
+    if client is None or os.getenv("TRADING_BOT_USER_STREAM", "1") == "0":
+        return
+    app.state.user_stream = UserDataStream(client)
+    app.state.user_stream.start()
+
+
+@app.on_event("shutdown")
+async def on_shutdown() -> None:
+    user_stream = getattr(app.state, "user_stream", None)
+    if user_stream is not None:
+        await user_stream.stop()
+        app.state.user_stream = None
+    market_data = getattr(app.state, "market_data", None)
+    if market_data is not None:
+        await market_data.stop()
+    client = getattr(app.state, "binance_client", None)
+    if client is not None:
+        await client.aclose()
+        app.state.binance_client = None
+    exchange_info = getattr(app.state, "exchange_info", None)
+    if exchange_info is not None:
+        await run_in_threadpool(exchange_info.stop)
+    await run_in_threadpool(stop_order_writer)
+    await run_in_threadpool(position_book.stop)
+
+
+def get_binance_client(request: Request) -> AsyncBinanceFuturesClient:
+    """
+    Dependency returning the shared client built in the startup hook.
+    """
+    client = getattr(request.app.state, "binance_client", None)
+    if client is None:
+        detail = getattr(request.app.state, "binance_client_error", None)
+        raise HTTPException(
+            status_code=500, detail=detail or "Binance client is not initialized."
+        )
+    return client
+
+
+def get_exchange_info(request: Request) -> Optional[ExchangeInfoCache]:
+    """
+    Dependency returning the shared exchange-info cache, if one was started.
+    """
+    return getattr(request.app.state, "exchange_info", None)
+
+
+def get_market_data(request: Request) -> Optional[MarketData]:
+    """
+    Dependency returning the shared quote cache, if one was started.
+    """
+    return getattr(request.app.state, "market_data", None)
+
+
+def get_risk_engine(request: Request) -> Optional[RiskEngine]:
+    """
+    Dependency returning the shared risk engine, if one was started.
+    """
+    return getattr(request.app.state, "risk_engine", None)
+
+
+def get_kline_store(request: Request) -> KlineStore:
+    """
+    Dependency returning the shared kline store (created on first use).
+    """
+    store = getattr(request.app.state, "kline_store", None)
+    if store is None:
+        store = request.app.state.kline_store = KlineStore()
+    return store
+
+
+def get_position_book() -> PositionBook:
+    """
+    Dependency returning the process-wide position book.
+    """
+    return position_book
+
+
 @app.get("/health")
 def health() -> dict:
     return {"status": "ok"}
 
 
 @app.post("/orders")
-def create_order(payload: OrderRequest):
+async def create_order(
+    payload: OrderRequest,
+    client: AsyncBinanceFuturesClient = Depends(get_binance_client),
+    exchange_info: Optional[ExchangeInfoCache] = Depends(get_exchange_info),
+    market_data: Optional[MarketData] = Depends(get_market_data),
+    risk: Optional[RiskEngine] = Depends(get_risk_engine),
+    # Retries carrying the same key map to the same clientOrderId.
+    idempotency_key: Optional[str] = Header(None, alias="Idempotency-Key", max_length=128),
+):
     try:
-        client = BinanceFuturesClient()
-    except Exception as exc:
-        logger.exception("Failed to initialize BinanceFuturesClient in API.")
-        raise HTTPException(status_code=500, detail=str(exc))
-
-    try:
-        response = build_and_place_order(
+        response = await build_and_place_order_async(
             client=client,
             symbol=payload.symbol,
             side=payload.side,
@@ -69,9 +244,19 @@ def create_order(payload: OrderRequest):
             quantity=payload.quantity,
             price=payload.price,
             time_in_force=payload.time_in_force,
+            exchange_info=exchange_info,
+            market_data=market_data,
+            risk=risk,
+            idempotency_key=idempotency_key,
         )
     except ValidationError as exc:
         raise HTTPException(status_code=400, detail=str(exc))
+    except RateLimitExceeded as exc:
+        raise HTTPException(
+            status_code=429,
+            detail=str(exc),
+            headers={"Retry-After": str(max(1, round(exc.retry_after)))},
+        )
     except Exception as exc:
         logger.exception("Failed to place order via API.")
         raise HTTPException(status_code=502, detail=str(exc))
@@ -79,21 +264,217 @@ def create_order(payload: OrderRequest):
     return summarize_order_response(response)
 
 
+@app.post("/orders/batch")
+async def create_batch_orders(
+    payload: BatchOrderRequest,
+    client: AsyncBinanceFuturesClient = Depends(get_binance_client),
+    exchange_info: Optional[ExchangeInfoCache] = Depends(get_exchange_info),
+    market_data: Optional[MarketData] = Depends(get_market_data),
+    risk: Optional[RiskEngine] = Depends(get_risk_engine),
+):
+    orders = [order.model_dump(by_alias=True) for order in payload.orders]
+    try:
+        results = await build_and_place_batch_async(
+            client=client, orders=orders, exchange_info=exchange_info, market_data=market_data, risk=risk
+        )
+    except ValidationError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+
+    return summarize_batch_results(results)
+
+
+def _order_row(r: OrderSummary) -> dict:
+    return {
+        "id": r.id,
+        "created_at": r.created_at,
+        "symbol": r.symbol,
+        "side": r.side,
+        "type": r.type,
+        "status": r.status,
+        "order_id": r.order_id,
+    }
+
+
+def _naive_utc(value: Optional[datetime]) -> Optional[datetime]:
+    # Timestamps are stored as naive UTC.
+    if value is not None and value.tzinfo is not None:
+        value = value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value
+
+
 @app.get("/orders/recent")
-def recent_orders(limit: int = 20):
-    records = get_recent_orders(limit=limit)
-    return [
-        {
-            "id": r.id,
-            "created_at": r.created_at,
-            "symbol": r.symbol,
-            "side": r.side,
-            "type": r.type,
-            "status": r.status,
-            "order_id": r.order_id,
-        }
-        for r in records
-    ]
+async def recent_orders(limit: int = Query(20, ge=1, le=500)):
+    records = await run_in_threadpool(get_recent_orders, limit)
+    return [_order_row(r) for r in records]
+
+
+@app.get("/orders")
+async def list_orders(
+    limit: int = Query(50, ge=1, le=500),
+    cursor: Optional[str] = None,
+    symbol: Optional[str] = None,
+    side: Optional[str] = None,
+    status: Optional[str] = None,
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+):
+    """
+    Order history, newest first, with keyset pagination via ``next_cursor``.
+    """
+    try:
+        records, next_cursor = await run_in_threadpool(
+            get_orders_page,
+            limit=limit,
+            cursor=cursor,
+            symbol=symbol.upper() if symbol else None,
+            side=side.upper() if side else None,
+            status=status.upper() if status else None,
+            start=_naive_utc(start),
+            end=_naive_utc(end),
+        )
+    except InvalidCursor as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+    return {"items": [_order_row(r) for r in records], "next_cursor": next_cursor}
+
+
+@app.get("/orders/{order_id}")
+async def order_detail(order_id: str, symbol: Optional[str] = Query(None)):
+    """
+    One order including the raw exchange response. Order ids are unique per
+    symbol only; pass ``symbol`` to pick the order on that symbol.
+    """
+    record = await run_in_threadpool(get_order, order_id, symbol)
+    if record is None:
+        raise HTTPException(status_code=404, detail=f"Order {order_id} not found.")
+    return {
+        "id": record.id,
+        "created_at": record.created_at,
+        "symbol": record.symbol,
+        "side": record.side,
+        "type": record.type,
+        "status": record.status,
+        "order_id": record.order_id,
+        "raw_response": record.raw_response,
+    }
+
+
+@app.get("/marketdata/{symbol}")
+async def market_data_quote(
+    symbol: str, market_data: Optional[MarketData] = Depends(get_market_data)
+):
+    """
+    Latest cached book ticker and mark price; served from memory.
+    """
+    quote = market_data.get(symbol.upper()) if market_data is not None else None
+    if quote is None:
+        raise HTTPException(status_code=404, detail=f"No market data for {symbol.upper()}.")
+    return quote_to_dict(quote)
+
+
+@app.get("/klines/{symbol}")
+def klines(
+    symbol: str,
+    interval: str = "1m",
+    start: Optional[int] = Query(None, description="First open time, epoch ms."),
+    end: Optional[int] = Query(None, description="Open times before this, epoch ms."),
+    limit: int = Query(1000, ge=1, le=100_000),
+    store: KlineStore = Depends(get_kline_store),
+):
+    """
+    Cached candles in columns (time, open, high, low, close, volume): the
+    latest ``limit`` opening in [start, end).
+    """
+    try:
+        bars = store.load(symbol, interval, start, end)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+    bars = bars.slice(max(bars.size - limit, 0))
+    return {"symbol": symbol.upper(), "interval": interval, **{name: column.tolist() for name, column in bars._asdict().items()}}
+
+
+@app.get("/positions")
+def positions(
+    book: PositionBook = Depends(get_position_book),
+    market_data: Optional[MarketData] = Depends(get_market_data),
+):
+    """
+    Net position, entry price and realized/unrealized PnL per symbol, from
+    memory; unrealized PnL uses the cached mark price (mid as a fallback).
+    """
+
+    def mark_price(symbol: str) -> Optional[float]:
+        quote = market_data.get(symbol) if market_data is not None else None
+        return (quote.mark_price or quote.mid or None) if quote is not None else None
+
+    return book.positions(mark_price)
+
+
+@app.websocket("/ws/orders")
+async def order_stream(websocket: WebSocket) -> None:
+    """
+    Push new and updated orders to the dashboard as they happen.
+    """
+    await websocket.accept()
+    subscription = order_hub.subscribe()
+    try:
+        while True:
+            event = await subscription.get()
+            if event is None:
+                # Fell too far behind; the client reconnects and reloads.
+                await websocket.close(code=1013, reason="Subscriber too slow")
+                return
+            await websocket.send_json(event)
+    except WebSocketDisconnect:
+        pass
+    finally:
+        order_hub.unsubscribe(subscription)
+
+
+@app.get("/metrics")
+def prometheus_metrics() -> Response:
+    """
+    Prometheus exposition: order, validation, exchange, DB and HTTP latency
+    histograms and Binance error counters.
+    """
+    content, content_type = render_latest()
+    return Response(content=content, media_type=content_type)
+
+
+@app.get("/metrics/persistence")
+def persistence_metrics() -> dict:
+    writer = get_order_writer()
+    if writer is None:
+        return {"mode": "sync"}
+    return {"mode": "write-behind", **writer.metrics()}
+
+
+@app.get("/metrics/endpoints")
+def endpoint_metrics(request: Request) -> dict:
+    """
+    Per-base-URL latency percentiles, health and hedging counts.
+    """
+    client = getattr(request.app.state, "binance_client", None)
+    if client is None:
+        return {}
+    return client.endpoints.metrics()
+
+
+@app.get("/metrics/risk")
+def risk_metrics(risk: Optional[RiskEngine] = Depends(get_risk_engine)) -> dict:
+    """
+    Risk engine state: whether limits are loaded, checks and orders in window.
+    """
+    if risk is None:
+        return {"enabled": False}
+    return risk.status()
+
+
+@app.get("/metrics/rate-limit")
+def rate_limit_metrics() -> dict:
+    """
+    Remaining request-weight / order-count budget of the client governor.
+    """
+    return get_rate_limiter().metrics()
 
 
 @app.get("/", response_class=HTMLResponse)
@@ -187,26 +568,58 @@ def dashboard() -> str:
     </div>
 
     <script>
+      const MAX_ROWS = 25;
+
+      function renderRow(tr, row) {
+        const sideBadgeClass = row.side === 'BUY' ? 'badge badge-buy' : 'badge badge-sell';
+        tr.dataset.orderId = row.order_id;
+        tr.innerHTML = `
+          <td>${new Date(row.created_at + (row.created_at.endsWith('Z') ? '' : 'Z')).toLocaleTimeString()}</td>
+          <td>${row.symbol}</td>
+          <td><span class="${sideBadgeClass}">${row.side}</span></td>
+          <td>${row.type}</td>
+          <td>${row.status}</td>
+          <td>${row.order_id}</td>
+        `;
+      }
+
+      function upsertOrder(row) {
+        const tbody = document.querySelector('#orders-table tbody');
+        let tr = tbody.querySelector(`tr[data-order-id="${row.order_id}"]`);
+        if (tr) {
+          // Status update for a row we already show: keep its original time.
+          row = Object.assign({}, row, { created_at: tr.dataset.createdAt });
+        } else {
+          tr = document.createElement('tr');
+          tr.dataset.createdAt = row.created_at;
+          tbody.prepend(tr);
+          while (tbody.children.length > MAX_ROWS) tbody.lastElementChild.remove();
+        }
+        renderRow(tr, row);
+      }
+
       async function loadOrders() {
-        const res = await fetch('/orders/recent?limit=25');
+        const res = await fetch('/orders/recent?limit=' + MAX_ROWS);
         const data = await res.json();
         const tbody = document.querySelector('#orders-table tbody');
         tbody.innerHTML = '';
-        for (const row of data) {
-          const tr = document.createElement('tr');
-          const sideBadgeClass = row.side === 'BUY' ? 'badge badge-buy' : 'badge badge-sell';
-          tr.innerHTML = `
-            <td>${new Date(row.created_at).toLocaleTimeString()}</td>
-            <td>${row.symbol}</td>
-            <td><span class="${sideBadgeClass}">${row.side}</span></td>
-            <td>${row.type}</td>
-            <td>${row.status}</td>
-            <td>${row.order_id}</td>
-          `;
-          tbody.appendChild(tr);
+        for (const row of data.reverse()) {
+          upsertOrder(row);
         }
       }
 
+      let retryDelay = 1000;
+      function connectOrderStream() {
+        const proto = location.protocol === 'https:' ? 'wss://' : 'ws://';
+        const ws = new WebSocket(proto + location.host + '/ws/orders');
+        ws.onopen = () => { retryDelay = 1000; loadOrders(); };
+        ws.onmessage = (msg) => upsertOrder(JSON.parse(msg.data));
+        ws.onclose = () => {
+          setTimeout(connectOrderStream, retryDelay);
+          retryDelay = Math.min(retryDelay * 2, 30000);
+        };
+      }
+
       document.getElementById('order-form').addEventListener('submit', async (e) => {
         e.preventDefault();
         const btn = document.getElementById('submit-btn');
@@ -234,7 +647,6 @@ def dashboard() -> str:
             document.getElementById('order-result').textContent = 'Error: ' + (data.detail || JSON.stringify(data));
           } else {
             document.getElementById('order-result').textContent = JSON.stringify(data, null, 2);
-            await loadOrders();
           }
         } catch (err) {
           document.getElementById('order-result').textContent = 'Request failed: ' + err;
@@ -243,8 +655,7 @@ def dashboard() -> str:
         }
       });
 
-      loadOrders();
-      setInterval(loadOrders, 15000);
+      connectOrderStream();
     </script>
   </body>
 </html>
@@ -0,0 +1,569 @@
+import importlib
+import itertools
+import json
+import logging
+import os
+import tempfile
+import time
+from abc import ABC, abstractmethod
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Iterator, List, NamedTuple, Optional, Sequence, Tuple, Union
+
+import numpy as np
+import typer
+from rich.console import Console
+from rich.table import Table
+
+from .exchange_info import ExchangeInfoCache
+from .validators import ValidationError, validate_order
+
+logger = logging.getLogger(__name__)
+
+console = Console()
+
+DEFAULT_CHUNK_SIZE = 100_000
+
+# Columns (time, open, high, low, close, volume) or (time, price, qty) in
+# Binance's public CSV dumps, used when a file has no header row.
+_CSV_COLUMNS = {
+    "klines": (0, 1, 2, 3, 4, 5),
+    "trades": (4, 1, 2),
+    "aggTrades": (5, 1, 2),
+}
+_HEADER_NAMES = {
+    "klines": ("open_time", "open", "high", "low", "close", "volume"),
+    "trades": ("time", "price", "qty"),
+    "aggTrades": ("transact_time", "price", "quantity"),
+}
+
+
+class Bars(NamedTuple):
+    """
+    OHLCV columns as parallel arrays; ``time`` is the bar open in epoch ms.
+    """
+
+    time: np.ndarray
+    open: np.ndarray
+    high: np.ndarray
+    low: np.ndarray
+    close: np.ndarray
+    volume: np.ndarray
+
+    @property
+    def size(self) -> int:
+        return len(self.time)
+
+    def slice(self, start: Optional[int] = None, stop: Optional[int] = None) -> "Bars":
+        return Bars(*(column[start:stop] for column in self))
+
+    @classmethod
+    def concat(cls, parts: Sequence["Bars"]) -> "Bars":
+        return cls(*(np.concatenate(columns) for columns in zip(*parts)))
+
+
+def _bars_from_columns(kind: str, columns: Sequence[np.ndarray]) -> Bars:
+    if kind == "klines":
+        t, o, h, l, c, v = columns
+        return Bars(t.astype(np.int64), o, h, l, c, v)
+    # One bar per trade: open, high, low and close are the trade price.
+    t, price, qty = columns
+    return Bars(t.astype(np.int64), price, price, price, price, qty)
+
+
+def _csv_usecols(header: List[str], kind: str) -> Tuple[int, ...]:
+    names = _HEADER_NAMES[kind]
+    try:
+        return tuple(header.index(name) for name in names)
+    except ValueError:
+        raise ValueError(f"CSV header must contain {', '.join(names)} for {kind} data.") from None
+
+
+def _iter_csv(path: Path, kind: str, chunk_size: int) -> Iterator[Bars]:
+    with path.open(encoding="utf-8") as fh:
+        first = fh.readline()
+        if not first:
+            return
+        fields = [f.strip() for f in first.split(",")]
+        try:
+            float(fields[0])
+        except ValueError:
+            usecols = _csv_usecols(fields, kind)
+            pending: List[str] = []
+        else:
+            usecols = _CSV_COLUMNS[kind]
+            pending = [first]
+        while True:
+            lines = pending + list(itertools.islice(fh, chunk_size - len(pending)))
+            pending = []
+            if not lines:
+                return
+            data = np.loadtxt(lines, delimiter=",", usecols=usecols, dtype=np.float64, ndmin=2)
+            yield _bars_from_columns(kind, data.T)
+
+
+def _iter_parquet(path: Path, kind: str, chunk_size: int) -> Iterator[Bars]:
+    try:
+        import pyarrow.parquet as pq
+    except ImportError as exc:
+        raise RuntimeError("Reading Parquet files needs pyarrow: pip install pyarrow.") from exc
+
+    names = list(_HEADER_NAMES[kind])
+    for batch in pq.ParquetFile(path).iter_batches(batch_size=chunk_size, columns=names):
+        columns = [batch.column(name).to_numpy(zero_copy_only=False).astype(np.float64) for name in names]
+        yield _bars_from_columns(kind, columns)
+
+
+def iter_bars(path: Union[str, Path], kind: str = "klines", chunk_size: int = DEFAULT_CHUNK_SIZE) -> Iterator[Bars]:
+    """
+    Stream ``path`` (CSV or Parquet) as chunks of at most ``chunk_size`` bars.
+
+    ``kind`` is ``klines``, ``trades`` or ``aggTrades`` (Binance's column
+    layouts; CSV header rows are optional). Trades become one bar each.
+    """
+    if kind not in _CSV_COLUMNS:
+        raise ValueError(f"kind must be one of {', '.join(_CSV_COLUMNS)}.")
+    path = Path(path)
+    if path.suffix.lower() in (".parquet", ".pq"):
+        return _iter_parquet(path, kind, chunk_size)
+    return _iter_csv(path, kind, chunk_size)
+
+
+class Orders(NamedTuple):
+    """
+    Orders a strategy places at the close of each bar: signed quantity (0 for
+    none; negative sells) and limit price (NaN for MARKET).
+    """
+
+    qty: np.ndarray
+    limit: Optional[np.ndarray] = None
+
+
+class BacktestStrategy(ABC):
+    """
+    Vectorized strategy: ``orders`` maps a block of bars to one Orders row
+    per bar, computed with array operations rather than a per-bar loop.
+
+    Chunks are passed with the previous ``warmup`` bars prepended, so
+    rolling indicators see the same history they would on a single array;
+    rows for the warmup bars are discarded. Constructor keyword arguments
+    are the strategy's parameters (what ``sweep`` varies).
+    """
+
+    warmup = 0
+
+    @abstractmethod
+    def orders(self, bars: Bars) -> Orders:
+        """
+        Orders for every bar of ``bars``, one row each.
+        """
+
+
+def _sma(values: np.ndarray, window: int) -> np.ndarray:
+    # Window sums rather than a running cumsum: each value depends only on
+    # its window, so results do not change with where chunks start.
+    out = np.full(values.size, np.nan)
+    if values.size >= window:
+        out[window - 1 :] = np.lib.stride_tricks.sliding_window_view(values, window).mean(axis=1)
+    return out
+
+
+class MovingAverageCross(BacktestStrategy):
+    """
+    Long ``size`` while the fast SMA is above the slow one, short below.
+    With ``offset`` > 0, entries are LIMIT orders that far (a fraction)
+    from the close, rounded to ``tick``, valid for one bar.
+    """
+
+    def __init__(
+        self, fast: int = 20, slow: int = 100, size: float = 0.01, offset: float = 0.0, tick: float = 0.1
+    ) -> None:
+        if not 0 < fast < slow:
+            raise ValueError("Need 0 < fast < slow.")
+        self.fast, self.slow, self.size, self.offset, self.tick = fast, slow, size, offset, tick
+        self.warmup = slow
+
+    def orders(self, bars: Bars) -> Orders:
+        fast, slow = _sma(bars.close, self.fast), _sma(bars.close, self.slow)
+        # The target position, and the orders that move to it.
+        target = np.where(np.isnan(slow), 0.0, np.sign(fast - slow)) * self.size
+        qty = np.diff(target, prepend=target[:1])
+        limit = None
+        if self.offset:
+            prices = np.round(np.round(bars.close * (1 - np.sign(qty) * self.offset) / self.tick) * self.tick, 8)
+            limit = np.where(qty != 0, prices, np.nan)
+        return Orders(qty, limit)
+
+
+@dataclass
+class BacktestResult:
+    symbol: str
+    params: Dict[str, Any] = field(default_factory=dict)
+    bars: int = 0
+    orders: int = 0
+    fills: int = 0
+    expired: int = 0
+    rejected: int = 0
+    volume: float = 0.0
+    notional: float = 0.0
+    fees: float = 0.0
+    pnl: float = 0.0
+    max_drawdown: float = 0.0
+    position: float = 0.0
+    seconds: float = 0.0
+    # Most common rejection reasons and their counts.
+    rejections: Dict[str, int] = field(default_factory=dict)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+
+class _OrderRules:
+    """
+    validators.validate_order plus the exchange-info filters (stepSize,
+    tickSize, minNotional; rounding in "round" mode), memoized per distinct
+    (side, type, quantity, price): a strategy repeats the same order shape
+    many times, and each shape only needs checking once. MARKET orders carry
+    no price, so they share one entry per side and size.
+    """
+
+    def __init__(self, symbol: str, exchange_info: Optional[ExchangeInfoCache], max_cached: int = 100_000) -> None:
+        self.symbol = symbol
+        self.exchange_info = exchange_info
+        self.max_cached = max_cached
+        self._cache: Dict[Tuple[str, str, float, Optional[float]], Union[Tuple[float, float], str]] = {}
+
+    def check(
+        self, side: str, order_type: str, qty: float, price: Optional[float]
+    ) -> Union[Tuple[float, float], str]:
+        """
+        (quantity, price) as the exchange would accept them, or the rejection message.
+        """
+        key = (side, order_type, qty, price)
+        result = self._cache.get(key)
+        if result is None:
+            if len(self._cache) >= self.max_cached:
+                # LIMIT prices can make most orders distinct.
+                self._cache.clear()
+            result = self._cache[key] = self._check(side, order_type, qty, price)
+        return result
+
+    def _check(
+        self, side: str, order_type: str, qty: float, price: Optional[float]
+    ) -> Union[Tuple[float, float], str]:
+        try:
+            order = validate_order(self.symbol, side, order_type, qty, price)
+            v_qty, v_price = order.quantity, order.price
+            if self.exchange_info is not None:
+                v_qty, v_price = self.exchange_info.check_order(order.symbol, order.order_type, v_qty, v_price)
+        except ValidationError as exc:
+            return str(exc)
+        return float(v_qty), float(v_price) if v_price is not None else np.nan
+
+
+class Backtester:
+    """
+    Replays bars chunk by chunk against a BacktestStrategy.
+
+    Orders placed at a bar's close execute on the next bar: MARKET at its
+    open (plus ``slippage``), LIMIT at the limit price (or a better open)
+    if the bar trades through it, otherwise they expire. Every order first
+    goes through the same validation and exchange filters as a live order.
+    Matching, position, cash and drawdown are computed with array
+    operations over the chunk; only the carried state (position, cash,
+    equity peak, the last order and the warmup bars) crosses chunks.
+    """
+
+    def __init__(
+        self,
+        strategy: BacktestStrategy,
+        symbol: str = "BTCUSDT",
+        exchange_info: Optional[ExchangeInfoCache] = None,
+        taker_fee: float = 0.0004,
+        maker_fee: float = 0.0002,
+        slippage: float = 0.0,
+    ) -> None:
+        self.strategy = strategy
+        self.symbol = symbol.upper()
+        self.rules = _OrderRules(self.symbol, exchange_info)
+        self.taker_fee = taker_fee
+        self.maker_fee = maker_fee
+        self.slippage = slippage
+
+    def run(self, chunks: Iterable[Bars], params: Optional[Dict[str, Any]] = None) -> BacktestResult:
+        t0 = time.perf_counter()
+        result = BacktestResult(self.symbol, dict(params or {}))
+        rejections: Counter = Counter()
+        warmup = int(getattr(self.strategy, "warmup", 0))
+        history: Optional[Bars] = None
+        carried = (0.0, np.nan)  # order from the last bar of the previous chunk
+        position = cash = 0.0
+        peak = 0.0
+        last_close = np.nan
+
+        for chunk in chunks:
+            n = chunk.size
+            if not n:
+                continue
+            context = Bars.concat([history, chunk]) if history is not None else chunk
+            signals = self.strategy.orders(context)
+            skip = context.size - n
+            order_qty = np.asarray(signals.qty, dtype=np.float64)[skip:]
+            order_limit = (
+                np.asarray(signals.limit, dtype=np.float64)[skip:]
+                if signals.limit is not None
+                else np.full(n, np.nan)
+            )
+
+            # Orders execute one bar later.
+            exec_qty = np.concatenate(([carried[0]], order_qty[:-1]))
+            exec_limit = np.concatenate(([carried[1]], order_limit[:-1]))
+            carried = (float(order_qty[-1]), float(order_limit[-1]))
+
+            idx = np.flatnonzero(exec_qty)
+            result.orders += len(idx)
+            qty, limit, fee_rate = self._validate(exec_qty[idx], exec_limit[idx], rejections)
+            accepted = ~np.isnan(qty)
+            idx, qty, limit, fee_rate = idx[accepted], qty[accepted], limit[accepted], fee_rate[accepted]
+
+            price, filled = self._match(chunk, idx, qty, limit)
+            result.expired += int((~filled).sum())
+            idx, qty, price, fee_rate = idx[filled], qty[filled], price[filled], fee_rate[filled]
+
+            notional = np.abs(qty) * price
+            fees = notional * fee_rate
+            d_qty = np.zeros(n)
+            d_cash = np.zeros(n)
+            # At most one order per bar, so plain fancy assignment is enough.
+            d_qty[idx] = qty
+            d_cash[idx] = -qty * price - fees
+            positions = position + np.cumsum(d_qty)
+            cashes = cash + np.cumsum(d_cash)
+            equity = cashes + positions * chunk.close
+            peaks = np.maximum.accumulate(np.maximum(equity, peak))
+            result.max_drawdown = max(result.max_drawdown, float((peaks - equity).max()))
+
+            position, cash, peak = float(positions[-1]), float(cashes[-1]), float(peaks[-1])
+            last_close = float(chunk.close[-1])
+            result.bars += n
+            result.fills += len(idx)
+            result.volume += float(np.abs(qty).sum())
+            result.notional += float(notional.sum())
+            result.fees += float(fees.sum())
+            history = context.slice(context.size - warmup) if warmup else None
+
+        if carried[0]:
+            # Placed on the last bar; there is no next bar to fill it.
+            result.orders += 1
+            result.expired += 1
+        result.position = round(position, 12)
+        result.pnl = cash + position * last_close if result.bars else 0.0
+        result.rejected = sum(rejections.values())
+        result.rejections = dict(rejections.most_common(5))
+        result.seconds = time.perf_counter() - t0
+        return result
+
+    def _validate(
+        self, qty: np.ndarray, limit: np.ndarray, rejections: Counter
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        # Validation is per order (the rules are plain Python) but only runs
+        # for bars that have one, and each distinct order once.
+        out_qty = np.full(len(qty), np.nan)
+        out_limit = limit.copy()
+        fee_rate = np.where(np.isnan(limit), self.taker_fee, self.maker_fee)
+        # Float noise from the strategy's arithmetic (0.0019999999999999996)
+        # would fail stepSize checks a live order would pass.
+        sizes = np.round(np.abs(qty), 12)
+        for i, (signed, size, price) in enumerate(zip(qty.tolist(), sizes.tolist(), limit.tolist())):
+            side = "BUY" if signed > 0 else "SELL"
+            # NaN never equals itself, so it would miss the cache every time.
+            if price != price:
+                order_type, price = "MARKET", None
+            else:
+                order_type = "LIMIT"
+            checked = self.rules.check(side, order_type, size, price)
+            if isinstance(checked, str):
+                rejections[checked] += 1
+                continue
+            v_qty, v_price = checked
+            out_qty[i] = v_qty if side == "BUY" else -v_qty
+            out_limit[i] = v_price
+        return out_qty, out_limit, fee_rate
+
+    def _match(
+        self, bars: Bars, idx: np.ndarray, qty: np.ndarray, limit: np.ndarray
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        opens, highs, lows = bars.open[idx], bars.high[idx], bars.low[idx]
+        buy = qty > 0
+        market = np.isnan(limit)
+        market_price = opens * np.where(buy, 1 + self.slippage, 1 - self.slippage)
+        # A LIMIT fills if the bar trades through it, at the open if that is better.
+        limit_fills = np.where(buy, lows <= limit, highs >= limit)
+        limit_price = np.where(buy, np.minimum(limit, opens), np.maximum(limit, opens))
+        price = np.where(market, market_price, limit_price)
+        return price, market | limit_fills
+
+
+def run_backtest(
+    source: Union[str, Path, Bars, Iterable[Bars]],
+    strategy: BacktestStrategy,
+    symbol: str = "BTCUSDT",
+    kind: str = "klines",
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    exchange_info: Optional[ExchangeInfoCache] = None,
+    params: Optional[Dict[str, Any]] = None,
+    **costs: float,
+) -> BacktestResult:
+    """
+    Backtest ``strategy`` over a file path, a Bars block or an iterable of chunks.
+    """
+    if isinstance(source, (str, Path)):
+        chunks: Iterable[Bars] = iter_bars(source, kind, chunk_size)
+    elif isinstance(source, Bars):
+        chunks = (source.slice(i, i + chunk_size) for i in range(0, source.size, chunk_size))
+    else:
+        chunks = source
+    return Backtester(strategy, symbol, exchange_info, **costs).run(chunks, params)
+
+
+def load_strategy_class(path: str) -> Callable[..., BacktestStrategy]:
+    module_name, _, attr = path.partition(":")
+    if not attr:
+        raise ValueError(f"Strategy class must be given as module:Class, got {path!r}.")
+    return getattr(importlib.import_module(module_name), attr)
+
+
+def parameter_grid(grid: Dict[str, Sequence[Any]]) -> List[Dict[str, Any]]:
+    names = list(grid)
+    return [dict(zip(names, values)) for values in itertools.product(*(grid[name] for name in names))]
+
+
+# Per worker process: the bars (memory-mapped) and the fixed run settings.
+_worker: Dict[str, Any] = {}
+
+
+def _init_worker(columns_dir: str, settings: Dict[str, Any]) -> None:
+    _worker["bars"] = Bars(*(np.load(os.path.join(columns_dir, f"{name}.npy"), mmap_mode="r") for name in Bars._fields))
+    _worker["settings"] = settings
+
+
+def _run_one(params: Dict[str, Any]) -> BacktestResult:
+    settings = dict(_worker["settings"])
+    strategy = settings.pop("strategy_class")(**params)
+    try:
+        return run_backtest(_worker["bars"], strategy, params=params, **settings)
+    except Exception as exc:
+        logger.exception("Backtest failed for %s.", params)
+        return BacktestResult(settings["symbol"], params, rejections={f"failed: {exc}": 1})
+
+
+def sweep(
+    source: Union[str, Path, Bars],
+    strategy_class: Callable[..., BacktestStrategy],
+    grid: Dict[str, Sequence[Any]],
+    symbol: str = "BTCUSDT",
+    kind: str = "klines",
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    exchange_info: Optional[ExchangeInfoCache] = None,
+    processes: Optional[int] = None,
+    **costs: float,
+) -> List[BacktestResult]:
+    """
+    Backtest every combination in ``grid`` in a process pool.
+
+    The data is parsed once and written as one .npy file per column, which
+    each worker memory-maps: parameter sets share the page cache instead of
+    re-reading the source or receiving a pickled copy of it.
+    """
+    combos = parameter_grid(grid)
+    if not combos:
+        return []
+    bars = source if isinstance(source, Bars) else Bars.concat(list(iter_bars(source, kind, chunk_size)))
+    settings = dict(
+        strategy_class=strategy_class,
+        symbol=symbol,
+        chunk_size=chunk_size,
+        exchange_info=exchange_info,
+        **costs,
+    )
+    processes = min(processes or os.cpu_count() or 1, len(combos))
+    with tempfile.TemporaryDirectory(prefix="backtest-") as columns_dir:
+        for name, column in zip(Bars._fields, bars):
+            np.save(os.path.join(columns_dir, f"{name}.npy"), column)
+        with ProcessPoolExecutor(processes, initializer=_init_worker, initargs=(columns_dir, settings)) as pool:
+            return list(pool.map(_run_one, combos))
+
+
+def _parse_grid(values: List[str]) -> Dict[str, List[Any]]:
+    grid: Dict[str, List[Any]] = {}
+    for item in values:
+        name, sep, raw = item.partition("=")
+        if not sep:
+            raise typer.BadParameter(f"Expected name=v1,v2,..., got {item!r}.")
+        grid[name.strip()] = [json.loads(v) for v in raw.split(",")]
+    return grid
+
+
+def main(
+    data: Path = typer.Argument(..., exists=True, dir_okay=False, help="Kline or trade file (CSV or Parquet)."),
+    strategy: str = typer.Option(
+        "bot.backtest:MovingAverageCross", help="Strategy class as module:Class."
+    ),
+    param: List[str] = typer.Option(
+        [], "--param", "-p", help="Parameter values, e.g. -p fast=10,20 -p slow=100. Several values sweep."
+    ),
+    symbol: str = typer.Option("BTCUSDT", help="Symbol whose exchange filters apply."),
+    kind: str = typer.Option("klines", help="Data layout: klines, trades or aggTrades."),
+    chunk_size: int = typer.Option(DEFAULT_CHUNK_SIZE, help="Bars per chunk."),
+    processes: Optional[int] = typer.Option(None, help="Worker processes for a sweep (default: CPU count)."),
+    taker_fee: float = typer.Option(0.0004, help="Fee rate for MARKET fills."),
+    maker_fee: float = typer.Option(0.0002, help="Fee rate for LIMIT fills."),
+    slippage: float = typer.Option(0.0, help="MARKET fill slippage as a fraction of the open."),
+    json_out: Optional[Path] = typer.Option(None, "--json", help="Also write the results as JSON to this file."),
+) -> None:
+    """
+    Backtest a strategy over historical bars, or sweep a parameter grid.
+    """
+    # Filters from the exchange-info snapshot, as for CLI orders; none without one.
+    exchange_info = ExchangeInfoCache.from_env()
+    if not exchange_info.load_snapshot():
+        exchange_info = None
+    strategy_class = load_strategy_class(strategy)
+    grid = _parse_grid(param)
+    costs = dict(taker_fee=taker_fee, maker_fee=maker_fee, slippage=slippage)
+
+    t0 = time.perf_counter()
+    combos = parameter_grid(grid)
+    if len(combos) == 1:
+        results = [
+            run_backtest(data, strategy_class(**combos[0]), symbol, kind, chunk_size, exchange_info, combos[0], **costs)
+        ]
+    else:
+        results = sweep(data, strategy_class, grid, symbol, kind, chunk_size, exchange_info, processes, **costs)
+    elapsed = time.perf_counter() - t0
+
+    results.sort(key=lambda r: r.pnl, reverse=True)
+    table = Table(show_header=True, header_style="bold cyan")
+    for column in ("params", "bars", "fills", "expired", "rejected", "fees", "pnl", "max_drawdown"):
+        table.add_column(column)
+    for r in results:
+        table.add_row(
+            " ".join(f"{k}={v}" for k, v in r.params.items()) or "-",
+            str(r.bars),
+            str(r.fills),
+            str(r.expired),
+            str(r.rejected),
+            f"{r.fees:.2f}",
+            f"{r.pnl:.2f}",
+            f"{r.max_drawdown:.2f}",
+        )
+    console.print(table)
+    console.print(f"{len(results)} backtest(s) in {elapsed:.2f}s")
+    if json_out is not None:
+        json_out.write_text(json.dumps([r.to_dict() for r in results], indent=2), encoding="utf-8")
+
+
+if __name__ == "__main__":
+    typer.run(main)
@@ -0,0 +1,268 @@
+import asyncio
+import json
+import logging
+import os
+import random
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from decimal import ROUND_HALF_UP, Decimal
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import typer
+from rich.console import Console
+from rich.table import Table
+
+from .client import AsyncBinanceFuturesClient, BinanceFuturesClient
+from .db import dispose_engine, init_db
+from .exchange_info import ExchangeInfoCache, http_exchange_info_fetcher
+from .mock_exchange import MockExchange, MockExchangeServer
+from .orders import build_and_place_order, build_and_place_order_async
+from .rate_limit import RateLimiter
+from .writer import start_order_writer, stop_order_writer
+
+console = Console()
+
+BENCH_API_KEY = "bench-key"
+BENCH_API_SECRET = "bench-secret"
+
+
+def percentiles(samples: List[float]) -> Dict[str, Optional[float]]:
+    """
+    Mean, p50/p90/p95/p99 and max of latency samples (seconds), in milliseconds.
+    """
+    if not samples:
+        return {"mean": None, "p50": None, "p90": None, "p95": None, "p99": None, "max": None}
+    ordered = sorted(samples)
+
+    def pick(q: float) -> float:
+        return round(ordered[min(len(ordered) - 1, int(q * len(ordered)))] * 1000, 3)
+
+    return {
+        "mean": round(sum(ordered) / len(ordered) * 1000, 3),
+        "p50": pick(0.50),
+        "p90": pick(0.90),
+        "p95": pick(0.95),
+        "p99": pick(0.99),
+        "max": round(ordered[-1] * 1000, 3),
+    }
+
+
+def make_orders(
+    count: int, symbol: str = "BTCUSDT", price: float = 70000.0, limit_ratio: float = 0.5, seed: int = 1
+) -> List[Dict[str, Any]]:
+    """
+    A reproducible order mix: alternating sides; LIMIT orders 0.1-0.5% away
+    from ``price`` on the passive side (they rest), the rest MARKET.
+    """
+    rng = random.Random(seed)
+    orders = []
+    for i in range(count):
+        side = "BUY" if i % 2 == 0 else "SELL"
+        order: Dict[str, Any] = {"symbol": symbol, "side": side, "order_type": "MARKET", "quantity": "0.002"}
+        if rng.random() < limit_ratio:
+            offset = Decimal(str(rng.uniform(0.001, 0.005)))
+            factor = 1 - offset if side == "BUY" else 1 + offset
+            order["order_type"] = "LIMIT"
+            order["price"] = str((Decimal(str(price)) * factor).quantize(Decimal("0.1"), rounding=ROUND_HALF_UP))
+            order["time_in_force"] = "GTC"
+        orders.append(order)
+    return orders
+
+
+async def _drive_async(
+    client: AsyncBinanceFuturesClient,
+    orders: List[Dict[str, Any]],
+    concurrency: int,
+    exchange_info: ExchangeInfoCache,
+) -> List[Any]:
+    # Each result is the order's latency in seconds, or the exception it raised.
+    queue: "asyncio.Queue[Dict[str, Any]]" = asyncio.Queue()
+    for order in orders:
+        queue.put_nowait(order)
+    results: List[Any] = []
+
+    async def worker() -> None:
+        while not queue.empty():
+            order = queue.get_nowait()
+            t0 = time.perf_counter()
+            try:
+                await build_and_place_order_async(client, exchange_info=exchange_info, **order)
+                results.append(time.perf_counter() - t0)
+            except Exception as exc:
+                results.append(exc)
+
+    try:
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+    finally:
+        await client.aclose()
+    return results
+
+
+def _drive_sync(
+    client: BinanceFuturesClient,
+    orders: List[Dict[str, Any]],
+    concurrency: int,
+    exchange_info: ExchangeInfoCache,
+) -> List[Any]:
+    def place(order: Dict[str, Any]) -> Any:
+        t0 = time.perf_counter()
+        try:
+            build_and_place_order(client, exchange_info=exchange_info, **order)
+            return time.perf_counter() - t0
+        except Exception as exc:
+            return exc
+
+    try:
+        with ThreadPoolExecutor(max_workers=concurrency) as pool:
+            return list(pool.map(place, orders))
+    finally:
+        client.close()
+
+
+def run_benchmark(
+    base_url: str,
+    orders: int = 1000,
+    concurrency: int = 50,
+    client: str = "async",
+    limit_ratio: float = 0.5,
+    symbol: str = "BTCUSDT",
+    price: float = 70000.0,
+    rate_limit: bool = False,
+    api_key: str = BENCH_API_KEY,
+    api_secret: str = BENCH_API_SECRET,
+) -> Dict[str, Any]:
+    """
+    Place ``orders`` orders through the full order path (validation with
+    exchange filters, signed HTTP client with retries, write-behind DB
+    persistence) against the exchange at ``base_url`` and return throughput,
+    latency percentiles and error counts.
+
+    The database is whatever TRADING_BOT_DB_URL points at; the CLI uses a
+    temporary SQLite file.
+    """
+    if client not in ("async", "sync"):
+        raise ValueError("client must be async or sync.")
+    init_db()
+    exchange_info = ExchangeInfoCache(http_exchange_info_fetcher(base_url))
+    exchange_info.refresh()
+    limiter = RateLimiter(enabled=rate_limit)
+    batch = make_orders(orders, symbol, price, limit_ratio)
+    writer = start_order_writer()
+
+    started = time.perf_counter()
+    if client == "async":
+        exchange = AsyncBinanceFuturesClient(
+            api_key, api_secret, base_url=base_url, pool_size=concurrency, rate_limiter=limiter
+        )
+        results = asyncio.run(_drive_async(exchange, batch, concurrency, exchange_info))
+    else:
+        exchange = BinanceFuturesClient(
+            api_key, api_secret, base_url=base_url, pool_size=concurrency, ping=False, rate_limiter=limiter
+        )
+        results = _drive_sync(exchange, batch, concurrency, exchange_info)
+    elapsed = time.perf_counter() - started
+    writer.flush(timeout=30)
+    persisted = writer.metrics()["written"]
+    stop_order_writer()
+
+    latencies = [r for r in results if isinstance(r, float)]
+    errors: Dict[str, int] = {}
+    for result in results:
+        if isinstance(result, Exception):
+            name = type(result).__name__
+            errors[name] = errors.get(name, 0) + 1
+    return {
+        "client": client,
+        "orders": orders,
+        "concurrency": concurrency,
+        "ok": len(latencies),
+        "errors": errors,
+        "persisted": persisted,
+        "seconds": round(elapsed, 3),
+        "throughput": round(len(latencies) / elapsed, 1) if elapsed else 0.0,
+        "latency_ms": percentiles(latencies),
+    }
+
+
+def _print_report(report: Dict[str, Any]) -> None:
+    table = Table(show_header=True, header_style="bold magenta")
+    table.add_column("Metric")
+    table.add_column("Value", justify="right")
+    table.add_row("client / concurrency", f"{report['client']} / {report['concurrency']}")
+    table.add_row("orders ok / sent", f"{report['ok']} / {report['orders']}")
+    table.add_row("persisted", str(report["persisted"]))
+    table.add_row("errors", ", ".join(f"{k}={v}" for k, v in report["errors"].items()) or "-")
+    table.add_row("wall time (s)", f"{report['seconds']:.3f}")
+    table.add_row("throughput (orders/s)", f"{report['throughput']:.1f}")
+    for name, value in report["latency_ms"].items():
+        table.add_row(f"latency {name} (ms)", "-" if value is None else f"{value:.2f}")
+    if "exchange" in report:
+        exchange = report["exchange"]
+        table.add_row("exchange fills", str(exchange["fills"]))
+        table.add_row("exchange 429s / injected errors", f"{exchange['rate_limited']} / {exchange['injected_errors']}")
+    console.print(table)
+
+
+def main(
+    orders: int = typer.Option(1000, help="Number of orders to place."),
+    concurrency: int = typer.Option(50, help="Orders in flight at once."),
+    client: str = typer.Option("async", help="Client to drive: async (API path) or sync (CLI path)."),
+    limit_ratio: float = typer.Option(0.5, help="Fraction of LIMIT orders; the rest are MARKET."),
+    symbol: str = typer.Option("BTCUSDT", help="Symbol to trade."),
+    price: float = typer.Option(70000.0, help="Reference price for LIMIT orders."),
+    latency: float = typer.Option(0.0, help="Mock exchange latency per request, seconds."),
+    jitter: float = typer.Option(0.0, help="Mock exchange extra random latency, up to this many seconds."),
+    error_rate: float = typer.Option(0.0, help="Fraction of order submissions the mock fails with a 503."),
+    rate_limit: bool = typer.Option(False, help="Apply Binance's rate limits in the mock and the client."),
+    url: Optional[str] = typer.Option(None, help="Benchmark an already running exchange instead of the bundled mock."),
+    db: Optional[str] = typer.Option(None, help="Database URL (default: a temporary SQLite file)."),
+    json_out: Optional[Path] = typer.Option(None, "--json", help="Also write the report as JSON to this file."),
+    log_level: str = typer.Option("ERROR", help="Log level for the bot's own loggers."),
+) -> None:
+    """
+    Drive the full order path against the bundled mock exchange (or --url)
+    and report throughput and latency percentiles.
+    """
+    logging.getLogger("bot").setLevel(log_level.upper())
+    with tempfile.TemporaryDirectory() as tmp:
+        os.environ["TRADING_BOT_DB_URL"] = db or f"sqlite:///{Path(tmp) / 'bench.db'}"
+        settings = dict(
+            orders=orders,
+            concurrency=concurrency,
+            client=client,
+            limit_ratio=limit_ratio,
+            symbol=symbol,
+            price=price,
+            rate_limit=rate_limit,
+        )
+        try:
+            if url:
+                report = run_benchmark(
+                    url, api_key=os.getenv("BINANCE_API_KEY", ""), api_secret=os.getenv("BINANCE_API_SECRET", ""), **settings
+                )
+            else:
+                limits = {} if rate_limit else {"weight_limit": 0, "order_limit_10s": 0, "order_limit_1m": 0}
+                exchange = MockExchange(
+                    latency=latency,
+                    jitter=jitter,
+                    error_rate=error_rate,
+                    api_key=BENCH_API_KEY,
+                    api_secret=BENCH_API_SECRET,
+                    seed=1,
+                    **limits,
+                )
+                with MockExchangeServer(exchange) as server:
+                    report = run_benchmark(server.url, **settings)
+                report["exchange"] = exchange.stats()
+        finally:
+            dispose_engine()
+
+    _print_report(report)
+    if json_out is not None:
+        json_out.write_text(json.dumps(report, indent=2), encoding="utf-8")
+
+
+if __name__ == "__main__":
+    typer.run(main)
@@ -1,22 +1,67 @@
+import csv
 import logging
 import sys
-from typing import Optional
+from pathlib import Path
+from typing import Any, Dict, List, Optional
 
+import click
 import typer
 from dotenv import load_dotenv
 from rich import print
 from rich.console import Console
 from rich.table import Table
+from typer.core import TyperGroup
 
-from .client import BinanceFuturesClient
+from . import daemon as order_daemon
 from .logging_config import setup_logging
-from .orders import build_and_place_order, summarize_order_response
-from .validators import ValidationError
 
-app = typer.Typer(add_completion=False)
+# The client, order and DB modules (binance, aiohttp, SQLAlchemy) are imported
+# inside the commands: they dominate startup and orders sent to a running
+# daemon never need them.
+
+
+class _DefaultCommandGroup(TyperGroup):
+    """
+    Runs ``main`` when no command is named, so the single-order form from
+    before the subcommands (``python -m bot.cli --symbol ...``) still works.
+    """
+
+    default_command = "main"
+
+    def parse_args(self, ctx: click.Context, args: List[str]) -> List[str]:
+        if args and args[0] not in self.commands and args[0] not in ctx.help_option_names:
+            args = [self.default_command, *args]
+        return super().parse_args(ctx, args)
+
+
+app = typer.Typer(add_completion=False, cls=_DefaultCommandGroup)
+klines_app = typer.Typer(add_completion=False, help="Download and inspect cached historical candles.")
+app.add_typer(klines_app, name="klines")
 console = Console()
 
 
+def _load_exchange_info() -> Any:
+    from .exchange_info import ExchangeInfoCache
+
+    # Snapshot only: a one-shot CLI run should not wait on exchangeInfo.
+    # Without a snapshot (written by the API) the filter checks are skipped.
+    exchange_info = ExchangeInfoCache.from_env()
+    exchange_info.load_snapshot()
+    return exchange_info
+
+
+def _load_risk_engine() -> Any:
+    from .positions import position_book
+    from .risk import RiskEngine
+
+    # Order-rate windows need a long-lived process (the daemon); a one-shot
+    # run only enforces the other limits.
+    risk = RiskEngine.from_env()
+    if risk.enabled:
+        position_book.restore()
+    return risk
+
+
 @app.command()
 def main(
     symbol: str = typer.Option(..., help="Trading symbol, e.g. BTCUSDT"),
@@ -33,6 +78,14 @@ def main(
         "-tif",
         help="Time in force for LIMIT orders: GTC, IOC, FOK (default: GTC).",
     ),
+    idempotency_key: Optional[str] = typer.Option(
+        None,
+        "--idempotency-key",
+        help="Fixes the clientOrderId, so a re-run with the same key is rejected as a duplicate.",
+    ),
+    use_daemon: bool = typer.Option(
+        True, "--daemon/--no-daemon", help="Send the order to a running `daemon` if there is one."
+    ),
 ) -> None:
     """
     Simple CLI to place MARKET and LIMIT orders on Binance Futures Testnet (USDT-M).
@@ -41,7 +94,6 @@ def main(
     load_dotenv()
 
     setup_logging()
-    logger = logging.getLogger(__name__)
 
     console.rule("[bold green]Binance Futures Testnet Trading Bot")
 
@@ -57,32 +109,24 @@ def main(
     table.add_row("Time in Force", time_in_force or "GTC (default for LIMIT)")
     console.print(table)
 
-    try:
-        client = BinanceFuturesClient()
-    except Exception as exc:
-        logger.exception("Failed to initialize BinanceFuturesClient.")
-        print(f"[bold red]Error:[/bold red] {exc}")
-        raise typer.Exit(code=1)
-
-    try:
-        response = build_and_place_order(
-            client=client,
-            symbol=symbol,
-            side=side,
-            order_type=order_type,
-            quantity=quantity,
-            price=price,
-            time_in_force=time_in_force,
-        )
-    except ValidationError as exc:
-        print(f"[bold red]Validation error:[/bold red] {exc}")
-        raise typer.Exit(code=1)
-    except Exception as exc:  # API / network errors
-        logger.exception("Failed to place order.")
-        print(f"[bold red]Failed to place order:[/bold red] {exc}")
-        raise typer.Exit(code=1)
-
-    summary = summarize_order_response(response)
+    order = dict(
+        symbol=symbol,
+        side=side,
+        order_type=order_type,
+        quantity=quantity,
+        price=price,
+        time_in_force=time_in_force,
+        idempotency_key=idempotency_key,
+    )
+    reply = _call_daemon("order", {"order": order}) if use_daemon else None
+    if reply is not None:
+        if not reply["ok"]:
+            label = "Validation error" if reply["kind"] == "validation" else "Failed to place order"
+            print(f"[bold red]{label}:[/bold red] {reply['error']}")
+            raise typer.Exit(code=1)
+        summary = reply["summary"]
+    else:
+        summary = _place_order_directly(order)
 
     print("\n[bold]Order response details:[/bold]")
     resp_table = Table(show_header=True, header_style="bold cyan")
@@ -106,6 +150,310 @@ def main(
     print("\n[bold green]Order placed successfully (or accepted by Binance).[/bold green]")
 
 
+def _call_daemon(op: str, payload: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    # None means no daemon is running. Once the request has been sent, a
+    # failure is an error rather than a cue to retry directly, since the
+    # daemon may already have placed the order.
+    try:
+        return order_daemon.call(op, payload)
+    except (OSError, ValueError) as exc:
+        logging.getLogger(__name__).exception("Order daemon request failed.")
+        print(f"[bold red]Order daemon request failed:[/bold red] {exc}")
+        raise typer.Exit(code=1)
+
+
+def _connect_client() -> Any:
+    from .client import BinanceFuturesClient
+
+    try:
+        # No startup ping: the order request itself surfaces bad keys or URLs.
+        return BinanceFuturesClient(ping=False)
+    except Exception as exc:
+        logging.getLogger(__name__).exception("Failed to initialize BinanceFuturesClient.")
+        print(f"[bold red]Error:[/bold red] {exc}")
+        raise typer.Exit(code=1)
+
+
+def _place_order_directly(order: Dict[str, Any]) -> Dict[str, Any]:
+    from .orders import build_and_place_order, summarize_order_response
+    from .validators import ValidationError
+
+    client = _connect_client()
+    try:
+        response = build_and_place_order(
+            client=client, exchange_info=_load_exchange_info(), risk=_load_risk_engine(), **order
+        )
+    except ValidationError as exc:
+        print(f"[bold red]Validation error:[/bold red] {exc}")
+        raise typer.Exit(code=1)
+    except Exception as exc:  # API / network errors
+        logging.getLogger(__name__).exception("Failed to place order.")
+        print(f"[bold red]Failed to place order:[/bold red] {exc}")
+        raise typer.Exit(code=1)
+    return summarize_order_response(response)
+
+
+def read_orders_csv(path: Path) -> List[Dict[str, Any]]:
+    """
+    Read orders from a CSV with a header row.
+
+    Columns: symbol, side, type, quantity, price, timeInForce (price and
+    timeInForce may be empty for MARKET orders).
+    """
+    with path.open(newline="", encoding="utf-8") as fh:
+        rows = list(csv.DictReader(fh))
+    orders = []
+    for row in rows:
+        orders.append(
+            {
+                "symbol": (row.get("symbol") or "").strip(),
+                "side": (row.get("side") or "").strip(),
+                "type": (row.get("type") or "").strip(),
+                "quantity": (row.get("quantity") or "").strip() or None,
+                "price": (row.get("price") or "").strip() or None,
+                "timeInForce": (row.get("timeInForce") or "").strip() or None,
+            }
+        )
+    return orders
+
+
+@app.command()
+def batch(
+    file: Path = typer.Option(
+        ..., "--file", exists=True, dir_okay=False, help="CSV file with one order per row"
+    ),
+    use_daemon: bool = typer.Option(
+        True, "--daemon/--no-daemon", help="Send the orders to a running `daemon` if there is one."
+    ),
+) -> None:
+    """
+    Place a ladder of orders from a CSV file using Binance batchOrders.
+    """
+    load_dotenv()
+
+    setup_logging()
+
+    console.rule("[bold green]Binance Futures Testnet Trading Bot - Batch")
+
+    orders = read_orders_csv(file)
+    print(f"[bold]Loaded {len(orders)} orders from {file}[/bold]")
+
+    reply = _call_daemon("batch", {"orders": orders}) if use_daemon else None
+    if reply is not None:
+        if not reply["ok"]:
+            print(f"[bold red]Validation error:[/bold red] {reply['error']}")
+            raise typer.Exit(code=1)
+        summaries = reply["results"]
+    else:
+        from .orders import build_and_place_batch, summarize_batch_results
+        from .validators import ValidationError
+
+        client = _connect_client()
+        try:
+            results = build_and_place_batch(
+                client=client, orders=orders, exchange_info=_load_exchange_info(), risk=_load_risk_engine()
+            )
+        except ValidationError as exc:
+            print(f"[bold red]Validation error:[/bold red] {exc}")
+            raise typer.Exit(code=1)
+        summaries = summarize_batch_results(results)
+
+    resp_table = Table(show_header=True, header_style="bold cyan")
+    for column in ("#", "symbol", "side", "type", "orderId", "status", "origQty", "error"):
+        resp_table.add_column(column)
+    failed = 0
+    for index, (order, result) in enumerate(zip(orders, summaries), start=1):
+        error = "" if "orderId" in result else f"{result.get('code')}: {result.get('msg')}"
+        failed += bool(error)
+        resp_table.add_row(
+            str(index),
+            str(order["symbol"]).upper(),
+            str(order["side"]).upper(),
+            str(order["type"]).upper(),
+            str(result.get("orderId", "-")),
+            str(result.get("status", "-")),
+            str(result.get("origQty", "-")),
+            error,
+        )
+    console.print(resp_table)
+
+    if failed:
+        print(f"\n[bold red]{failed} of {len(orders)} orders failed.[/bold red]")
+        raise typer.Exit(code=1)
+    print(f"\n[bold green]All {len(orders)} orders placed (or accepted by Binance).[/bold green]")
+
+
+@app.command()
+def daemon(
+    socket_path: Optional[str] = typer.Option(
+        None, "--socket", help="Unix socket path (default: TRADING_BOT_DAEMON_SOCKET or a per-user temp file)."
+    ),
+    stop: bool = typer.Option(False, "--stop", help="Stop the daemon listening on the socket."),
+) -> None:
+    """
+    Keep a warm client, DB connection and exchange-info cache running so
+    `main` and `batch` can skip startup and just send their orders here.
+    """
+    load_dotenv()
+    path = socket_path or order_daemon.default_socket_path()
+
+    if stop:
+        if order_daemon.call("stop", socket_path=path, timeout=10) is None:
+            print(f"[yellow]No daemon is listening on {path}.[/yellow]")
+            raise typer.Exit(code=1)
+        print(f"[bold green]Stopped the daemon on {path}.[/bold green]")
+        return
+
+    setup_logging()
+    server = order_daemon.OrderDaemon(path)
+    try:
+        server.start()
+    except Exception as exc:
+        logging.getLogger(__name__).exception("Failed to start the order daemon.")
+        print(f"[bold red]Error:[/bold red] {exc}")
+        raise typer.Exit(code=1)
+    print(f"[bold green]Order daemon listening on {path}[/bold green] (Ctrl+C or `daemon --stop` to exit)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+@app.command()
+def strategies(
+    config: Path = typer.Option(
+        Path("strategies.json"), "--config", exists=True, dir_okay=False, help="JSON list of strategies to run"
+    ),
+) -> None:
+    """
+    Run automated strategies in one process, sharing a client, market data
+    and DB writer, until Ctrl+C.
+    """
+    load_dotenv()
+
+    setup_logging()
+
+    import asyncio
+
+    from .strategy import StrategyRunner, load_strategies
+
+    try:
+        runner = StrategyRunner(load_strategies(config))
+    except Exception as exc:
+        logging.getLogger(__name__).exception("Failed to load strategies.")
+        print(f"[bold red]Error:[/bold red] {exc}")
+        raise typer.Exit(code=1)
+    print(f"[bold green]Running {len(runner.stats())} strategies[/bold green] (Ctrl+C to stop)")
+    try:
+        asyncio.run(runner.run_forever())
+    except KeyboardInterrupt:
+        pass
+
+    table = Table(show_header=True, header_style="bold cyan")
+    columns = ("name", "state", "ticks", "orders", "fills", "errors", "cpu_seconds", "cpu_share", "max_step", "overruns")
+    for column in columns:
+        table.add_column(column)
+    for row in runner.stats():
+        table.add_row(*(f"{row[c]:.4f}" if isinstance(row[c], float) else str(row[c]) for c in columns))
+    console.print(table)
+
+
+def _parse_time(value: str) -> int:
+    from datetime import datetime, timezone
+
+    try:
+        moment = datetime.fromisoformat(value)
+    except ValueError:
+        raise typer.BadParameter(f"Expected an ISO date or datetime, got {value!r}.")
+    if moment.tzinfo is None:
+        moment = moment.replace(tzinfo=timezone.utc)
+    return int(moment.timestamp() * 1000)
+
+
+@klines_app.command("sync")
+def klines_sync(
+    symbol: List[str] = typer.Option(..., "--symbol", "-s", help="Symbol to download; repeat for several."),
+    interval: str = typer.Option("1m", "--interval", "-i", help="Kline interval, e.g. 1m, 15m, 1h, 1d."),
+    start: Optional[str] = typer.Option(None, help="First candle, ISO date/datetime in UTC (default: --days ago)."),
+    end: Optional[str] = typer.Option(None, help="Stop before this time (default: the last closed candle)."),
+    days: int = typer.Option(30, help="History to keep when --start is not given."),
+    concurrency: Optional[int] = typer.Option(
+        None, help="Requests in flight per symbol (default: TRADING_BOT_KLINES_CONCURRENCY or 4)."
+    ),
+    root: Optional[Path] = typer.Option(None, "--dir", help="Store directory (default: TRADING_BOT_KLINES_DIR)."),
+) -> None:
+    """
+    Download the candles missing from the local store, a page per request,
+    several at once within the client's rate limits.
+    """
+    load_dotenv()
+
+    setup_logging()
+
+    import asyncio
+    import time
+
+    from .client import AsyncBinanceFuturesClient
+    from .klines import KlineStore, KlineSync, interval_ms
+
+    try:
+        interval_ms(interval)
+    except ValueError as exc:
+        raise typer.BadParameter(str(exc), param_hint="--interval")
+    start_ms = _parse_time(start) if start else int((time.time() - days * 86400) * 1000)
+    end_ms = _parse_time(end) if end else None
+
+    async def run() -> List[Any]:
+        client = AsyncBinanceFuturesClient()
+        syncer = KlineSync(client, KlineStore(root), concurrency)
+        try:
+            return [await syncer.sync(s, interval, start_ms, end_ms) for s in symbol]
+        finally:
+            await client.aclose()
+
+    try:
+        results = asyncio.run(run())
+    except Exception as exc:
+        logging.getLogger(__name__).exception("Kline sync failed.")
+        print(f"[bold red]Error:[/bold red] {exc}")
+        raise typer.Exit(code=1)
+
+    table = Table(show_header=True, header_style="bold cyan")
+    for column in ("symbol", "interval", "requests", "failed", "fetched", "rows", "seconds"):
+        table.add_column(column)
+    for r in results:
+        table.add_row(r.symbol, r.interval, str(r.requests), str(r.failed), str(r.fetched), str(r.rows), f"{r.seconds:.2f}")
+    console.print(table)
+    if any(r.failed for r in results):
+        print("[bold red]Some pages failed; run sync again to fetch them.[/bold red]")
+        raise typer.Exit(code=1)
+
+
+@klines_app.command("info")
+def klines_info(
+    root: Optional[Path] = typer.Option(None, "--dir", help="Store directory (default: TRADING_BOT_KLINES_DIR)."),
+) -> None:
+    """
+    List the cached symbols and intervals with their row counts and spans.
+    """
+    from datetime import datetime, timezone
+
+    from .klines import KlineStore
+
+    def fmt(ms: Optional[int]) -> str:
+        return "-" if ms is None else datetime.fromtimestamp(ms / 1000, timezone.utc).strftime("%Y-%m-%d %H:%M")
+
+    table = Table(show_header=True, header_style="bold cyan")
+    for column in ("symbol", "interval", "rows", "first", "last", "gaps"):
+        table.add_column(column)
+    for row in KlineStore(root).datasets():
+        table.add_row(
+            row["symbol"], row["interval"], str(row["rows"]), fmt(row["first"]), fmt(row["last"]),
+            str(max(len(row["coverage"]) - 1, 0)),
+        )
+    console.print(table)
+
+
 if __name__ == "__main__":
     # Allow running as `python -m bot.cli`
     app()
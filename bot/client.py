@@ -1,13 +1,128 @@
+import asyncio
+import hashlib
+import hmac
+import json
 import logging
 import os
-from typing import Any, Dict, Optional
+import threading
+import time
+from decimal import Decimal
+from typing import Any, Dict, List, Optional
+from urllib.parse import urlencode
 
+import aiohttp
 from binance.client import Client
 from binance.exceptions import BinanceAPIException, BinanceRequestException
+from requests.adapters import HTTPAdapter
+from yarl import URL
+
+from .endpoints import EndpointSet
+from .logging_config import log_response
+from .metrics import EXCHANGE_SECONDS, order_outcome, record_binance_error
+from .rate_limit import Priority, RateLimiter, get_rate_limiter
+from .retry import RetryPolicy, is_ambiguous, is_duplicate, is_missing, make_client_order_id
 
 logger = logging.getLogger(__name__)
 
 
+DEFAULT_FUTURES_BASE_URL = "https://testnet.binancefuture.com"
+
+# Binance caps /fapi/v1/batchOrders at 5 orders per request.
+MAX_BATCH_ORDERS = 5
+
+# Fixed-length kline intervals, in milliseconds (1M is calendar-based and omitted).
+KLINE_INTERVALS = {
+    "1m": 60_000,
+    "3m": 180_000,
+    "5m": 300_000,
+    "15m": 900_000,
+    "30m": 1_800_000,
+    "1h": 3_600_000,
+    "2h": 7_200_000,
+    "4h": 14_400_000,
+    "6h": 21_600_000,
+    "8h": 28_800_000,
+    "12h": 43_200_000,
+    "1d": 86_400_000,
+    "3d": 259_200_000,
+    "1w": 604_800_000,
+}
+MAX_KLINES = 1500
+
+
+def build_order_params(
+    symbol: str,
+    side: str,
+    order_type: str,
+    quantity: Any,
+    price: Optional[Any] = None,
+    time_in_force: Optional[str] = None,
+    client_order_id: Optional[str] = None,
+) -> Dict[str, Any]:
+    """
+    Build the /fapi/v1/order parameter dict shared by the sync and async clients.
+
+    Decimal quantities/prices are sent in plain (never scientific) notation.
+    """
+    params: Dict[str, Any] = {
+        "symbol": symbol,
+        "side": side,
+        "type": order_type,
+        "quantity": format_number(quantity),
+    }
+    if order_type == "LIMIT":
+        params["price"] = format_number(price)
+        params["timeInForce"] = time_in_force or "GTC"
+    if client_order_id:
+        params["newClientOrderId"] = client_order_id
+    return params
+
+
+def format_number(value: Any) -> Any:
+    if isinstance(value, Decimal):
+        return format(value, "f")
+    return value
+
+
+def build_batch_order_params(orders: List[Dict[str, Any]]) -> List[Dict[str, str]]:
+    """
+    Convert order param dicts to the all-string form batchOrders expects.
+    """
+    if len(orders) > MAX_BATCH_ORDERS:
+        raise ValueError(f"batchOrders accepts at most {MAX_BATCH_ORDERS} orders.")
+    return [{k: str(v) for k, v in o.items() if v is not None} for o in orders]
+
+
+class _FuturesClient(Client):
+    """
+    python-binance Client pointed at a futures base URL.
+
+    The stock constructor pings the *spot* API before FUTURES_URL can be
+    overridden. This skips that round trip; BinanceFuturesClient pings the
+    futures host instead, which also leaves a warm connection in the pool.
+    """
+
+    def __init__(self, api_key: str, api_secret: str, futures_url: str) -> None:
+        # Skip Client.__init__ (spot ping) and run BaseClient.__init__ directly.
+        super(Client, self).__init__(api_key, api_secret)
+        self.FUTURES_URL = futures_url
+        self._local = threading.local()
+
+    def _handle_response(self, response: Any) -> Any:
+        # The stock client keeps the last response on ``self.response``, which
+        # concurrent callers overwrite; keep each thread's own copy instead.
+        self._local.response = response
+        return Client._handle_response(response)
+
+    def pop_response(self) -> Any:
+        """
+        Return and forget the HTTP response of this thread's last call.
+        """
+        response = getattr(self._local, "response", None)
+        self._local.response = None
+        return response
+
+
 class BinanceFuturesClient:
     """
     Lightweight wrapper around python-binance for USDT-M Futures Testnet.
@@ -18,6 +133,10 @@ class BinanceFuturesClient:
         api_key: Optional[str] = None,
         api_secret: Optional[str] = None,
         base_url: Optional[str] = None,
+        pool_size: Optional[int] = None,
+        ping: Optional[bool] = None,
+        rate_limiter: Optional[RateLimiter] = None,
+        retry_policy: Optional[RetryPolicy] = None,
     ) -> None:
         api_key = api_key or os.getenv("BINANCE_API_KEY")
         api_secret = api_secret or os.getenv("BINANCE_API_SECRET")
@@ -25,7 +144,7 @@ class BinanceFuturesClient:
             raise ValueError("BINANCE_API_KEY and BINANCE_API_SECRET must be set.")
 
         base_url = base_url or os.getenv(
-            "BINANCE_FUTURES_TESTNET_URL", "https://testnet.binancefuture.com"
+            "BINANCE_FUTURES_TESTNET_URL", DEFAULT_FUTURES_BASE_URL
         )
 
         # python-binance uses FUTURES_URL like "https://fapi.binance.com/fapi".
@@ -33,15 +152,48 @@ class BinanceFuturesClient:
         # will append "/order", etc. So we add the "/fapi" prefix here.
         futures_url = base_url.rstrip("/") + "/fapi"
 
-        self._client = Client(api_key=api_key, api_secret=api_secret)
-        self._client.FUTURES_URL = futures_url  # type: ignore[attr-defined]
+        pool_size = pool_size or int(os.getenv("BINANCE_HTTP_POOL_SIZE", "10"))
+        if ping is None:
+            ping = os.getenv("BINANCE_STARTUP_PING", "1") != "0"
+
+        self.rate_limiter = rate_limiter or get_rate_limiter()
+        self.retry_policy = retry_policy or RetryPolicy.from_env()
+        self._client = _FuturesClient(api_key, api_secret, futures_url)
+        # Keep-alive connection pool shared by all calls made through this client.
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self._client.session.mount("https://", adapter)
+        self._client.session.mount("http://", adapter)
+        self._client.session.headers["Connection"] = "keep-alive"
+        if ping:
+            self._governed("GET", "/fapi/v1/ping", self._client.futures_ping)
 
         logger.info(
-            "Initialized BinanceFuturesClient with base_url=%s futures_url=%s",
+            "Initialized BinanceFuturesClient with base_url=%s futures_url=%s pool_size=%s",
             base_url,
             futures_url,
+            pool_size,
         )
 
+    def close(self) -> None:
+        """
+        Close pooled HTTP connections.
+        """
+        self._client.session.close()
+
+    def _governed(self, method: str, path: str, call: Any, **kwargs: Any) -> Any:
+        # Wait for rate-limit budget, then feed the usage headers back.
+        self.rate_limiter.acquire(method, path, kwargs)
+        self._client.pop_response()
+        try:
+            return call(**kwargs)
+        except Exception as exc:
+            record_binance_error(exc)
+            raise
+        finally:
+            response = self._client.pop_response()
+            if response is not None:
+                self.rate_limiter.update(response.status_code, response.headers)
+
     def place_order(
         self,
         symbol: str,
@@ -50,9 +202,15 @@ class BinanceFuturesClient:
         quantity: float,
         price: Optional[float] = None,
         time_in_force: Optional[str] = None,
+        client_order_id: Optional[str] = None,
     ) -> Dict[str, Any]:
         """
         Place a futures order on Binance Futures Testnet.
+
+        The order carries a newClientOrderId fixed before the first attempt.
+        When an attempt fails ambiguously (timeout, dropped connection, 5xx),
+        the order is looked up by that id before anything is re-sent, so a
+        retry never places it twice.
         """
         logger.info(
             "Placing order: symbol=%s side=%s type=%s qty=%s price=%s tif=%s",
@@ -64,32 +222,491 @@ class BinanceFuturesClient:
             time_in_force,
         )
 
+        params = build_order_params(
+            symbol,
+            side,
+            order_type,
+            quantity,
+            price,
+            time_in_force,
+            client_order_id or make_client_order_id(),
+        )
+        t0 = time.perf_counter()
         try:
-            params: Dict[str, Any] = {
-                "symbol": symbol,
-                "side": side,
-                "type": order_type,
-                "quantity": quantity,
-            }
-            if order_type == "LIMIT":
-                params["price"] = price
-                params["timeInForce"] = time_in_force or "GTC"
-
-            response = self._client.futures_create_order(**params)
-            logger.info("Order placed successfully: %s", response)
-            return response
+            response = self._place_with_retries(symbol, params)
+        except Exception as exc:
+            EXCHANGE_SECONDS.labels(symbol, order_type, order_outcome(exc)).observe(time.perf_counter() - t0)
+            raise
+        EXCHANGE_SECONDS.labels(symbol, order_type, "ok").observe(time.perf_counter() - t0)
+        return response
+
+    def _place_with_retries(self, symbol: str, params: Dict[str, Any]) -> Dict[str, Any]:
+        policy = self.retry_policy
+        started = time.monotonic()
+        attempt = 0
+        while True:
+            timeout = policy.call_timeout(started)
+            try:
+                response = self._governed(
+                    "POST",
+                    "/fapi/v1/order",
+                    self._client.futures_create_order,
+                    requests_params={"timeout": timeout},
+                    **params,
+                )
+                log_response(logger, "Order placed successfully", response)
+                return response
+            except Exception as exc:
+                if not (is_ambiguous(exc) or is_duplicate(exc)):
+                    if isinstance(exc, BinanceAPIException):
+                        logger.error(
+                            "Binance API error when placing order: code=%s msg=%s",
+                            exc.code,
+                            exc.message,
+                        )
+                    else:
+                        logger.exception("Unexpected error when placing order: %s", exc)
+                    raise
+                error = exc
+
+            existing = self._find_order(symbol, params["newClientOrderId"], started)
+            if existing is not None:
+                logger.info("Order %s found after %s; not re-sending.", params["newClientOrderId"], error)
+                return existing
+            attempt += 1
+            delay = policy.backoff(attempt)
+            if attempt >= policy.attempts or policy.call_timeout(started) <= delay:
+                logger.error("Giving up on order %s: %s", params["newClientOrderId"], error)
+                raise error
+            logger.warning(
+                "Order %s failed (%s); retry %d in %.2fs.",
+                params["newClientOrderId"],
+                error,
+                attempt,
+                delay,
+            )
+            time.sleep(delay)
+
+    def _find_order(self, symbol: str, client_order_id: str, started: float) -> Optional[Dict[str, Any]]:
+        """
+        Look an order up by client id; None if it does not exist (or the
+        lookup itself fails).
+        """
+        timeout = self.retry_policy.call_timeout(started)
+        if timeout <= 0:
+            return None
+        try:
+            return self._governed(
+                "GET",
+                "/fapi/v1/order",
+                self._client.futures_get_order,
+                symbol=symbol,
+                origClientOrderId=client_order_id,
+                requests_params={"timeout": timeout},
+            )
+        except Exception as exc:
+            if not is_missing(exc):
+                logger.warning("Lookup of order %s failed: %s", client_order_id, exc)
+            return None
+
+    def get_exchange_info(self) -> Dict[str, Any]:
+        """
+        Fetch /fapi/v1/exchangeInfo (symbols and their trading filters).
+        """
+        return self._governed("GET", "/fapi/v1/exchangeInfo", self._client.futures_exchange_info)
+
+    def place_batch_orders(self, orders: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Place up to MAX_BATCH_ORDERS orders in one /fapi/v1/batchOrders call.
+
+        ``orders`` are dicts from build_order_params. The result holds, in input
+        order, either the order response or a ``{"code", "msg"}`` error.
+        """
+        batch = build_batch_order_params(orders)
+        logger.info("Placing batch of %d orders", len(batch))
+        try:
+            responses = self._governed(
+                "POST",
+                "/fapi/v1/batchOrders",
+                self._client.futures_place_batch_order,
+                batchOrders=batch,
+            )
+            log_response(logger, "Batch placed", responses)
+            return responses
         except BinanceAPIException as exc:
             logger.error(
-                "Binance API error when placing order: code=%s msg=%s",
+                "Binance API error when placing batch: code=%s msg=%s",
                 exc.code,
                 exc.message,
             )
             raise
         except BinanceRequestException as exc:
-            logger.error("Network error when placing order: %s", exc)
+            logger.error("Network error when placing batch: %s", exc)
             raise
-        except Exception as exc:  # pragma: no cover - defensive
-            logger.exception("Unexpected error when placing order: %s", exc)
+
+
+class AsyncBinanceFuturesClient:
+    """
+    Asyncio client for USDT-M Futures on a shared keep-alive aiohttp session.
+
+    Requests are signed locally (HMAC-SHA256), so one event loop can keep many
+    orders in flight over a pooled set of connections. The session is created
+    lazily on first use so it binds to the running event loop.
+    """
+
+    def __init__(
+        self,
+        api_key: Optional[str] = None,
+        api_secret: Optional[str] = None,
+        base_url: Optional[str] = None,
+        pool_size: Optional[int] = None,
+        timeout: Optional[float] = None,
+        recv_window: Optional[int] = None,
+        rate_limiter: Optional[RateLimiter] = None,
+        retry_policy: Optional[RetryPolicy] = None,
+        alt_base_urls: Optional[List[str]] = None,
+        hedge_reads: Optional[bool] = None,
+        endpoints: Optional[EndpointSet] = None,
+    ) -> None:
+        api_key = api_key or os.getenv("BINANCE_API_KEY")
+        api_secret = api_secret or os.getenv("BINANCE_API_SECRET")
+        if not api_key or not api_secret:
+            raise ValueError("BINANCE_API_KEY and BINANCE_API_SECRET must be set.")
+
+        base_url = base_url or os.getenv(
+            "BINANCE_FUTURES_TESTNET_URL", DEFAULT_FUTURES_BASE_URL
+        )
+
+        self.base_url = base_url.rstrip("/")
+        if alt_base_urls is None:
+            alt_base_urls = [u.strip() for u in os.getenv("BINANCE_FUTURES_ALT_URLS", "").split(",") if u.strip()]
+        self.endpoints = endpoints or EndpointSet(
+            [self.base_url] + [u for u in alt_base_urls if u.rstrip("/") != self.base_url],
+            hedge_quantile=float(os.getenv("BINANCE_HEDGE_QUANTILE", "0.95")),
+        )
+        if hedge_reads is None:
+            hedge_reads = os.getenv("BINANCE_HEDGE_READS", "0") == "1"
+        self.hedge_reads = hedge_reads
+        self.pool_size = pool_size or int(os.getenv("BINANCE_ASYNC_HTTP_POOL_SIZE", "100"))
+        self.timeout = timeout or float(os.getenv("BINANCE_HTTP_TIMEOUT", "10"))
+        self._api_key = api_key
+        self._secret = api_secret.encode("utf-8")
+        self._recv_window = recv_window
+        self.rate_limiter = rate_limiter or get_rate_limiter()
+        self.retry_policy = retry_policy or RetryPolicy.from_env()
+        self._session: Optional[aiohttp.ClientSession] = None
+
+        logger.info(
+            "Initialized AsyncBinanceFuturesClient with endpoints=%s pool_size=%s hedge_reads=%s",
+            self.endpoints.urls,
+            self.pool_size,
+            self.hedge_reads,
+        )
+
+    def _get_session(self) -> aiohttp.ClientSession:
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=self.pool_size),
+                headers={"X-MBX-APIKEY": self._api_key, "Accept": "application/json"},
+                timeout=aiohttp.ClientTimeout(total=self.timeout),
+            )
+        return self._session
+
+    def sign(self, params: Dict[str, Any]) -> str:
+        """
+        Return the signed query string for ``params`` (timestamp + signature).
+        """
+        payload = {k: v for k, v in params.items() if v is not None}
+        payload["timestamp"] = int(time.time() * 1000)
+        if self._recv_window:
+            payload["recvWindow"] = self._recv_window
+        query = urlencode(payload)
+        signature = hmac.new(self._secret, query.encode("utf-8"), hashlib.sha256).hexdigest()
+        return f"{query}&signature={signature}"
+
+    async def request(
+        self,
+        method: str,
+        path: str,
+        params: Optional[Dict[str, Any]] = None,
+        signed: bool = False,
+        priority: Optional[Priority] = None,
+        timeout: Optional[float] = None,
+    ) -> Any:
+        """
+        Send a request to ``path`` and return the decoded JSON body.
+
+        Writes go to the healthiest endpoint. With hedge_reads, a GET that
+        has not answered within the endpoint's hedge delay is duplicated to
+        the next-best endpoint and the first answer wins.
+
+        Waits for rate-limit budget first (RateLimitExceeded if it would wait
+        too long). Raises BinanceAPIException for non-2xx replies and
+        BinanceRequestException for transport failures, like python-binance.
+        """
+        if method == "GET" and self.hedge_reads and len(self.endpoints) > 1:
+            return await self._hedged(method, path, params, signed, priority, timeout)
+        return await self._send(self.endpoints.choose(), method, path, params, signed, priority, timeout)
+
+    async def _hedged(
+        self,
+        method: str,
+        path: str,
+        params: Optional[Dict[str, Any]],
+        signed: bool,
+        priority: Optional[Priority],
+        timeout: Optional[float],
+    ) -> Any:
+        primary = self.endpoints.choose()
+        first = asyncio.ensure_future(self._send(primary, method, path, params, signed, priority, timeout))
+        done, _ = await asyncio.wait({first}, timeout=self.endpoints.hedge_delay(primary))
+        if done:
+            return first.result()
+
+        alternate = self.endpoints.choose(exclude=primary)
+        second = asyncio.ensure_future(self._send(alternate, method, path, params, signed, priority, timeout))
+        pending = {first, second}
+        try:
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                # Both may finish in the same wakeup; a failure must not hide a success.
+                winner = next((task for task in done if task.exception() is None), None)
+                if winner is not None:
+                    self.endpoints.record_hedge(alternate, won=winner is second)
+                    return winner.result()
+        finally:
+            for task in pending:
+                task.cancel()
+        # Both requests failed: surface the primary's error.
+        self.endpoints.record_hedge(alternate, won=False)
+        return first.result()
+
+    async def _send(
+        self,
+        base_url: str,
+        method: str,
+        path: str,
+        params: Optional[Dict[str, Any]],
+        signed: bool,
+        priority: Optional[Priority],
+        timeout: Optional[float],
+    ) -> Any:
+        await self.rate_limiter.acquire_async(method, path, params, priority)
+        if signed:
+            query = self.sign(params or {})
+        else:
+            query = urlencode({k: v for k, v in (params or {}).items() if v is not None})
+        url = base_url + path + ("?" + query if query else "")
+        # Per-call timeout; otherwise the session's BINANCE_HTTP_TIMEOUT applies.
+        kwargs = {"timeout": aiohttp.ClientTimeout(total=timeout)} if timeout is not None else {}
+
+        started = time.perf_counter()
+        try:
+            # encoded=True: send the query exactly as it was signed.
+            async with self._get_session().request(method, URL(url, encoded=True), **kwargs) as response:
+                text = await response.text()
+            self.rate_limiter.update(response.status, response.headers)
+        except asyncio.CancelledError:
+            # Lost a hedge race: the elapsed time is a lower bound on this
+            # endpoint's latency and still belongs in its histogram.
+            self.endpoints.record(base_url, time.perf_counter() - started, ok=True)
+            raise
+        except (aiohttp.ClientError, asyncio.TimeoutError) as exc:
+            self.endpoints.record(base_url, time.perf_counter() - started, ok=False)
+            error = BinanceRequestException(f"{type(exc).__name__}: {exc}")
+            record_binance_error(error)
+            raise error from exc
+        self.endpoints.record(base_url, time.perf_counter() - started, ok=response.status < 500)
+
+        if not (200 <= response.status < 300):
+            error = BinanceAPIException(response, response.status, text)
+            record_binance_error(error)
+            raise error
+        try:
+            return json.loads(text)
+        except ValueError:
+            raise BinanceRequestException("Invalid Response: %s" % text)
+
+    async def get_positions(self, symbol: Optional[str] = None) -> List[Dict[str, Any]]:
+        return await self.request("GET", "/fapi/v2/positionRisk", {"symbol": symbol}, signed=True)
+
+    async def ping(self) -> Dict[str, Any]:
+        return await self.request("GET", "/fapi/v1/ping")
+
+    async def get_exchange_info(self) -> Dict[str, Any]:
+        return await self.request("GET", "/fapi/v1/exchangeInfo")
+
+    async def place_order(
+        self,
+        symbol: str,
+        side: str,
+        order_type: str,
+        quantity: float,
+        price: Optional[float] = None,
+        time_in_force: Optional[str] = None,
+        client_order_id: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """
+        Place a futures order without blocking the event loop.
+
+        Retries and idempotency work as in BinanceFuturesClient.place_order.
+        """
+        logger.info(
+            "Placing order: symbol=%s side=%s type=%s qty=%s price=%s tif=%s",
+            symbol,
+            side,
+            order_type,
+            quantity,
+            price,
+            time_in_force,
+        )
+
+        params = build_order_params(
+            symbol,
+            side,
+            order_type,
+            quantity,
+            price,
+            time_in_force,
+            client_order_id or make_client_order_id(),
+        )
+        t0 = time.perf_counter()
+        try:
+            response = await self._place_with_retries(symbol, params)
+        except Exception as exc:
+            EXCHANGE_SECONDS.labels(symbol, order_type, order_outcome(exc)).observe(time.perf_counter() - t0)
             raise
+        EXCHANGE_SECONDS.labels(symbol, order_type, "ok").observe(time.perf_counter() - t0)
+        return response
+
+    async def _place_with_retries(self, symbol: str, params: Dict[str, Any]) -> Dict[str, Any]:
+        policy = self.retry_policy
+        started = time.monotonic()
+        attempt = 0
+        while True:
+            try:
+                response = await self.request(
+                    "POST",
+                    "/fapi/v1/order",
+                    params,
+                    signed=True,
+                    timeout=policy.call_timeout(started),
+                )
+                log_response(logger, "Order placed successfully", response)
+                return response
+            except (BinanceAPIException, BinanceRequestException) as exc:
+                if not (is_ambiguous(exc) or is_duplicate(exc)):
+                    logger.error(
+                        "Binance API error when placing order: code=%s msg=%s",
+                        exc.code,
+                        exc.message,
+                    )
+                    raise
+                error = exc
+
+            existing = await self._find_order(symbol, params["newClientOrderId"], started)
+            if existing is not None:
+                logger.info("Order %s found after %s; not re-sending.", params["newClientOrderId"], error)
+                return existing
+            attempt += 1
+            delay = policy.backoff(attempt)
+            if attempt >= policy.attempts or policy.call_timeout(started) <= delay:
+                logger.error("Giving up on order %s: %s", params["newClientOrderId"], error)
+                raise error
+            logger.warning(
+                "Order %s failed (%s); retry %d in %.2fs.",
+                params["newClientOrderId"],
+                error,
+                attempt,
+                delay,
+            )
+            await asyncio.sleep(delay)
 
+    async def _find_order(
+        self, symbol: str, client_order_id: str, started: float
+    ) -> Optional[Dict[str, Any]]:
+        timeout = self.retry_policy.call_timeout(started)
+        if timeout <= 0:
+            return None
+        try:
+            return await self.request(
+                "GET",
+                "/fapi/v1/order",
+                {"symbol": symbol, "origClientOrderId": client_order_id},
+                signed=True,
+                timeout=timeout,
+            )
+        except (BinanceAPIException, BinanceRequestException) as exc:
+            if not is_missing(exc):
+                logger.warning("Lookup of order %s failed: %s", client_order_id, exc)
+            return None
+
+    async def place_batch_orders(self, orders: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Place up to MAX_BATCH_ORDERS orders in one /fapi/v1/batchOrders call.
 
+        See BinanceFuturesClient.place_batch_orders for the result format.
+        """
+        batch = build_batch_order_params(orders)
+        logger.info("Placing batch of %d orders", len(batch))
+        params = {"batchOrders": json.dumps(batch, separators=(",", ":"))}
+        try:
+            responses = await self.request("POST", "/fapi/v1/batchOrders", params, signed=True)
+            log_response(logger, "Batch placed", responses)
+            return responses
+        except BinanceAPIException as exc:
+            logger.error(
+                "Binance API error when placing batch: code=%s msg=%s",
+                exc.code,
+                exc.message,
+            )
+            raise
+        except BinanceRequestException as exc:
+            logger.error("Network error when placing batch: %s", exc)
+            raise
+
+    async def create_listen_key(self) -> str:
+        """
+        Open a user-data stream and return its listenKey.
+        """
+        response = await self.request("POST", "/fapi/v1/listenKey")
+        return response["listenKey"]
+
+    async def keepalive_listen_key(self) -> None:
+        """
+        Extend the current listenKey by 60 minutes.
+        """
+        await self.request("PUT", "/fapi/v1/listenKey")
+
+    async def close_listen_key(self) -> None:
+        await self.request("DELETE", "/fapi/v1/listenKey")
+
+    async def get_open_orders(self, symbol: Optional[str] = None) -> List[Dict[str, Any]]:
+        return await self.request("GET", "/fapi/v1/openOrders", {"symbol": symbol}, signed=True)
+
+    async def get_klines(
+        self,
+        symbol: str,
+        interval: str,
+        start_time: Optional[int] = None,
+        end_time: Optional[int] = None,
+        limit: int = MAX_KLINES,
+    ) -> List[List[Any]]:
+        """
+        Candles (open time, OHLCV, close time, ...) from the public /fapi/v1/klines.
+        """
+        params = {"symbol": symbol, "interval": interval, "startTime": start_time, "endTime": end_time, "limit": limit}
+        return await self.request("GET", "/fapi/v1/klines", params)
+
+    async def get_order(self, symbol: str, order_id: Any) -> Dict[str, Any]:
+        return await self.request(
+            "GET", "/fapi/v1/order", {"symbol": symbol, "orderId": order_id}, signed=True
+        )
+
+    async def aclose(self) -> None:
+        """
+        Close pooled HTTP connections.
+        """
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
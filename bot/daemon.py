@@ -0,0 +1,225 @@
+import json
+import logging
+import os
+import socket
+import socketserver
+import stat
+import tempfile
+import threading
+from typing import Any, Callable, Dict, Optional
+
+# Only the standard library at module level: the CLI imports this module on
+# every run to reach a running daemon, and must stay fast to start.
+
+logger = logging.getLogger(__name__)
+
+
+def default_socket_path() -> str:
+    """
+    TRADING_BOT_DAEMON_SOCKET, or a per-user socket in the temp directory.
+    """
+    uid = os.getuid() if hasattr(os, "getuid") else 0
+    return os.getenv("TRADING_BOT_DAEMON_SOCKET") or os.path.join(
+        tempfile.gettempdir(), f"trading-bot-{uid}.sock"
+    )
+
+
+def call(
+    op: str,
+    payload: Optional[Dict[str, Any]] = None,
+    socket_path: Optional[str] = None,
+    timeout: float = 60.0,
+) -> Optional[Dict[str, Any]]:
+    """
+    Send one request to a running daemon and return its reply, or None if
+    no daemon is listening on ``socket_path``.
+    """
+    path = socket_path or default_socket_path()
+    if not hasattr(socket, "AF_UNIX") or not os.path.exists(path):
+        return None
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    sock.settimeout(timeout)
+    try:
+        try:
+            sock.connect(path)
+        except (FileNotFoundError, ConnectionRefusedError):
+            return None
+        with sock.makefile("rwb") as stream:
+            stream.write(json.dumps({"op": op, **(payload or {})}).encode("utf-8") + b"\n")
+            stream.flush()
+            line = stream.readline()
+    finally:
+        sock.close()
+    if not line:
+        raise ConnectionError("Daemon closed the connection without replying.")
+    return json.loads(line)
+
+
+class _Handler(socketserver.StreamRequestHandler):
+    server: "_Server"
+
+    def handle(self) -> None:
+        # One JSON request per line; a connection may send several.
+        for line in self.rfile:
+            try:
+                request = json.loads(line)
+                reply = self.server.daemon.dispatch(request)
+            except Exception as exc:
+                logger.exception("Daemon request failed.")
+                reply = {"ok": False, "kind": "error", "error": str(exc)}
+            self.wfile.write(json.dumps(reply, default=str).encode("utf-8") + b"\n")
+            self.wfile.flush()
+
+
+class _Server(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+    def __init__(self, path: str, daemon: "OrderDaemon") -> None:
+        self.daemon = daemon
+        super().__init__(path, _Handler)
+
+
+class OrderDaemon:
+    """
+    Long-lived order service for the CLI.
+
+    Keeps one BinanceFuturesClient (with its warm connection pool), the
+    database engine, the write-behind writer and the exchange-info cache,
+    and places orders for CLI invocations sent over a Unix socket, so those
+    skip imports, client setup and the startup ping.
+    """
+
+    def __init__(
+        self,
+        socket_path: Optional[str] = None,
+        client: Any = None,
+        exchange_info: Any = None,
+        risk: Any = None,
+    ) -> None:
+        self.socket_path = socket_path or default_socket_path()
+        self.client = client
+        self.exchange_info = exchange_info
+        self.risk = risk
+        self._server: Optional[_Server] = None
+        self._handlers: Dict[str, Callable[[Dict[str, Any]], Dict[str, Any]]] = {
+            "ping": self._ping,
+            "order": self._order,
+            "batch": self._batch,
+            "stop": self._stop,
+        }
+
+    def start(self) -> None:
+        """
+        Warm up dependencies and bind the socket (removing a stale one).
+        """
+        from .client import DEFAULT_FUTURES_BASE_URL, BinanceFuturesClient
+        from .db import init_db
+        from .exchange_info import ExchangeInfoCache, http_exchange_info_fetcher
+        from .positions import position_book
+        from .risk import RiskEngine
+        from .writer import start_order_writer
+
+        if os.path.lexists(self.socket_path):
+            if call("ping", socket_path=self.socket_path, timeout=2) is not None:
+                raise RuntimeError(f"A daemon is already listening on {self.socket_path}.")
+            self._check_stale_socket()
+            os.unlink(self.socket_path)
+
+        init_db()
+        start_order_writer()
+        if self.client is None:
+            self.client = BinanceFuturesClient()
+        if self.exchange_info is None:
+            base_url = os.getenv("BINANCE_FUTURES_TESTNET_URL", DEFAULT_FUTURES_BASE_URL)
+            self.exchange_info = ExchangeInfoCache.from_env(http_exchange_info_fetcher(base_url))
+            self.exchange_info.load_snapshot()
+            self.exchange_info.start()
+        if self.risk is None:
+            # Keeps its order-rate windows across CLI invocations.
+            self.risk = RiskEngine.from_env()
+            # Current positions for the max_position check. Snapshots are left
+            # to the API, which also sees fills from the user-data stream.
+            position_book.restore()
+
+        # The socket can place orders with this account's keys, so it is
+        # created owner-only rather than restricted after it is listening.
+        old_umask = os.umask(0o177)
+        try:
+            self._server = _Server(self.socket_path, self)
+        finally:
+            os.umask(old_umask)
+        logger.info("Order daemon listening on %s.", self.socket_path)
+
+    def _check_stale_socket(self) -> None:
+        # Only replace a leftover socket of our own, never another user's file.
+        info = os.lstat(self.socket_path)
+        if not stat.S_ISSOCK(info.st_mode):
+            raise RuntimeError(f"{self.socket_path} exists and is not a socket.")
+        if hasattr(os, "getuid") and info.st_uid != os.getuid():
+            raise RuntimeError(f"{self.socket_path} is owned by another user.")
+
+    def serve_forever(self) -> None:
+        assert self._server is not None, "call start() first"
+        try:
+            self._server.serve_forever()
+        finally:
+            self.close()
+
+    def close(self) -> None:
+        from .writer import stop_order_writer
+
+        if self._server is not None:
+            self._server.server_close()
+            self._server = None
+            if os.path.exists(self.socket_path):
+                os.unlink(self.socket_path)
+        if self.exchange_info is not None and hasattr(self.exchange_info, "stop"):
+            self.exchange_info.stop()
+        close_client = getattr(self.client, "close", None)
+        if close_client is not None:
+            close_client()
+        stop_order_writer()
+        logger.info("Order daemon stopped.")
+
+    def dispatch(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        handler = self._handlers.get(request.get("op", ""))
+        if handler is None:
+            return {"ok": False, "kind": "error", "error": f"Unknown op {request.get('op')!r}."}
+        return handler(request)
+
+    def _ping(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        return {"ok": True, "pid": os.getpid()}
+
+    def _order(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        from .orders import build_and_place_order, summarize_order_response
+        from .validators import ValidationError
+
+        try:
+            response = build_and_place_order(
+                client=self.client, exchange_info=self.exchange_info, risk=self.risk, **request["order"]
+            )
+        except ValidationError as exc:
+            return {"ok": False, "kind": "validation", "error": str(exc)}
+        except Exception as exc:
+            logger.exception("Daemon failed to place order.")
+            return {"ok": False, "kind": "error", "error": str(exc)}
+        return {"ok": True, "summary": summarize_order_response(response)}
+
+    def _batch(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        from .orders import build_and_place_batch, summarize_batch_results
+        from .validators import ValidationError
+
+        try:
+            results = build_and_place_batch(
+                client=self.client, orders=request["orders"], exchange_info=self.exchange_info, risk=self.risk
+            )
+        except ValidationError as exc:
+            return {"ok": False, "kind": "validation", "error": str(exc)}
+        return {"ok": True, "results": summarize_batch_results(results)}
+
+    def _stop(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        server = self._server
+        if server is not None:
+            # shutdown() waits for serve_forever, which is running this handler.
+            threading.Thread(target=server.shutdown, daemon=True).start()
+        return {"ok": True}
@@ -1,12 +1,45 @@
+import base64
 import logging
+import os
+import threading
+import time
 from datetime import datetime
-from typing import Any, Dict, List
+from typing import Any, Dict, Iterator, List, NamedTuple, Optional, Tuple
 
-from sqlalchemy import JSON, Column, DateTime, Integer, String, create_engine
-from sqlalchemy.orm import DeclarativeBase, Mapped, Session, mapped_column
+from sqlalchemy import (
+    JSON,
+    Column,
+    DateTime,
+    Index,
+    Integer,
+    String,
+    create_engine,
+    delete,
+    event,
+    insert,
+    inspect,
+    or_,
+    select,
+    tuple_,
+    update,
+)
+from sqlalchemy.sql.functions import coalesce
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.engine import Engine
+from sqlalchemy.exc import IntegrityError, OperationalError
+from sqlalchemy.orm import DeclarativeBase, Mapped, Session, mapped_column, sessionmaker
+
+from .metrics import DB_PERSIST_SECONDS
 
 logger = logging.getLogger(__name__)
 
+DEFAULT_DB_URL = "sqlite:///trading_bot.db"
+
+_engine: Optional[Engine] = None
+_engine_url: Optional[str] = None
+_session_factory: Optional[sessionmaker] = None
+_engine_lock = threading.Lock()
+
 
 class Base(DeclarativeBase):
     pass
@@ -25,40 +58,456 @@ class OrderRecord(Base):
     status: Mapped[str] = mapped_column(String(32), nullable=False)
     order_id: Mapped[str] = mapped_column(String(64), nullable=False)
     raw_response: Mapped[Dict[str, Any]] = mapped_column(JSON, nullable=False)
+    # Kept current by the user-data stream (bot/user_stream.py).
+    executed_qty: Mapped[Optional[str]] = mapped_column(String(32), nullable=True)
+    avg_price: Mapped[Optional[str]] = mapped_column(String(32), nullable=True)
+    updated_at: Mapped[Optional[datetime]] = mapped_column(DateTime, nullable=True)
+
+    # Secondary indexes implicitly end with the primary key (rowid in SQLite),
+    # so (created_at, id) keyset scans are served straight from the index.
+    __table_args__ = (
+        Index("ix_orders_created_at", "created_at"),
+        Index("ix_orders_symbol_created_at", "symbol", "created_at"),
+        # Order ids are only unique per symbol. order_id leads so lookups by
+        # id alone (get_order without a symbol) use the index too.
+        Index("uq_orders_order_id_symbol", "order_id", "symbol", unique=True),
+        # Position replay after a snapshot (get_order_fills_since).
+        Index("ix_orders_updated_at", "updated_at"),
+    )
+
+
+class PositionSnapshot(Base):
+    __tablename__ = "position_snapshots"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    taken_at: Mapped[datetime] = mapped_column(DateTime, nullable=False)
+    # PositionBook.state(): positions plus per-order fill progress.
+    state: Mapped[Dict[str, Any]] = mapped_column(JSON, nullable=False)
+
+
+class OrderSummary(NamedTuple):
+    """Lightweight row for list views; never carries raw_response."""
+
+    id: int
+    created_at: datetime
+    symbol: str
+    side: str
+    type: str
+    status: str
+    order_id: str
+
+
+_SUMMARY_COLUMNS = (
+    OrderRecord.id,
+    OrderRecord.created_at,
+    OrderRecord.symbol,
+    OrderRecord.side,
+    OrderRecord.type,
+    OrderRecord.status,
+    OrderRecord.order_id,
+)
+
+
+class InvalidCursor(ValueError):
+    """Raised when a pagination cursor cannot be decoded."""
+
+
+def get_db_url() -> str:
+    return os.getenv("TRADING_BOT_DB_URL", DEFAULT_DB_URL)
+
 
+def _set_sqlite_pragmas(dbapi_connection, connection_record) -> None:
+    # WAL lets the dashboard read while the order path writes, and
+    # synchronous=NORMAL is durable across app crashes under WAL.
+    journal_mode = os.getenv("TRADING_BOT_SQLITE_JOURNAL_MODE", "WAL")
+    synchronous = os.getenv("TRADING_BOT_SQLITE_SYNCHRONOUS", "NORMAL")
+    cursor = dbapi_connection.cursor()
+    try:
+        cursor.execute(f"PRAGMA journal_mode={journal_mode}")
+        cursor.execute(f"PRAGMA synchronous={synchronous}")
+    finally:
+        cursor.close()
 
-def get_engine(db_url: str = "sqlite:///trading_bot.db"):
-    return create_engine(db_url, echo=False, future=True)
+
+def create_db_engine(db_url: str) -> Engine:
+    """
+    Build a new engine for ``db_url`` with pool settings taken from the environment.
+    """
+    kwargs: Dict[str, Any] = {"echo": False, "future": True}
+    is_sqlite = db_url.startswith("sqlite")
+    in_memory = is_sqlite and (db_url in ("sqlite://", "sqlite:///:memory:") or "mode=memory" in db_url)
+    if not in_memory:
+        kwargs["pool_size"] = int(os.getenv("TRADING_BOT_DB_POOL_SIZE", "5"))
+        kwargs["max_overflow"] = int(os.getenv("TRADING_BOT_DB_MAX_OVERFLOW", "10"))
+    if is_sqlite:
+        # Sessions are used from FastAPI's threadpool, so connections may move
+        # between threads; the pool guarantees one user at a time.
+        kwargs["connect_args"] = {"check_same_thread": False}
+
+    engine = create_engine(db_url, **kwargs)
+    if is_sqlite and not in_memory:
+        event.listen(engine, "connect", _set_sqlite_pragmas)
+    return engine
+
+
+def get_engine(db_url: Optional[str] = None) -> Engine:
+    """
+    Return the process-wide engine, building it on first use.
+
+    The URL defaults to ``TRADING_BOT_DB_URL``; if it changes (e.g. between
+    tests) the old engine is disposed and a new one is built.
+    """
+    global _engine, _engine_url, _session_factory
+
+    url = db_url or get_db_url()
+    engine = _engine
+    if engine is not None and _engine_url == url:
+        return engine
+
+    with _engine_lock:
+        if _engine is not None and _engine_url == url:
+            return _engine
+        if _engine is not None:
+            _engine.dispose()
+        _engine = create_db_engine(url)
+        _engine_url = url
+        _session_factory = sessionmaker(bind=_engine, expire_on_commit=False)
+        logger.info("Created database engine for %s", url)
+        return _engine
+
+
+def get_session() -> Session:
+    """
+    Open a session bound to the shared engine.
+    """
+    get_engine()
+    assert _session_factory is not None
+    return _session_factory()
+
+
+def dispose_engine() -> None:
+    """
+    Close pooled connections and forget the shared engine.
+    """
+    global _engine, _engine_url, _session_factory
+
+    with _engine_lock:
+        if _engine is not None:
+            _engine.dispose()
+        _engine = None
+        _engine_url = None
+        _session_factory = None
 
 
 def init_db() -> None:
     engine = get_engine()
     Base.metadata.create_all(engine)
+    _ensure_columns(engine)
+    _ensure_indexes(engine)
     logger.info("Database initialized.")
 
 
+def _ensure_columns(engine: Engine) -> None:
+    # Nullable columns added after the first release are appended in place.
+    existing = {c["name"] for c in inspect(engine).get_columns(OrderRecord.__tablename__)}
+    with engine.begin() as conn:
+        for column in OrderRecord.__table__.columns:
+            if column.name in existing:
+                continue
+            column_type = column.type.compile(dialect=engine.dialect)
+            conn.exec_driver_sql(
+                f"ALTER TABLE {OrderRecord.__tablename__} ADD COLUMN {column.name} {column_type}"
+            )
+            logger.info("Added column orders.%s.", column.name)
+
+
+def _ensure_indexes(engine: Engine) -> None:
+    # create_all() only adds indexes together with new tables; databases
+    # created before the indexes existed get them here.
+    for index in OrderRecord.__table__.indexes:
+        try:
+            index.create(engine, checkfirst=True)
+        except (IntegrityError, OperationalError):
+            if not index.unique:
+                raise
+            logger.warning(
+                "Existing rows have duplicate (order_id, symbol) values; creating a non-unique index instead."
+            )
+            Index("ix_orders_order_id", OrderRecord.order_id).create(engine, checkfirst=True)
+    # The first unique index was on order_id alone, which rejects the same id
+    # on two symbols.
+    if "uq_orders_order_id" in {i["name"] for i in inspect(engine).get_indexes(OrderRecord.__tablename__)}:
+        # Raw DDL: an Index() on the mapped column would join the table's indexes.
+        with engine.begin() as conn:
+            conn.exec_driver_sql("DROP INDEX uq_orders_order_id")
+        logger.info("Dropped index uq_orders_order_id.")
+
+
+def _order_row(response: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        "created_at": datetime.utcnow(),
+        "symbol": response.get("symbol", ""),
+        "side": response.get("side", ""),
+        "type": response.get("type", ""),
+        "status": response.get("status", ""),
+        "order_id": str(response.get("orderId", "")),
+        "raw_response": response,
+        "executed_qty": response.get("executedQty"),
+        "avg_price": response.get("avgPrice"),
+        "updated_at": None,
+    }
+
+
+def _insert_ignoring_duplicates(engine: Engine):
+    # (order_id, symbol) is unique: re-saving an order the exchange already
+    # reported is a no-op.
+    if engine.dialect.name == "sqlite":
+        return sqlite.insert(OrderRecord).on_conflict_do_nothing()
+    if engine.dialect.name == "postgresql":
+        return postgresql.insert(OrderRecord).on_conflict_do_nothing()
+    return insert(OrderRecord)
+
+
 def save_order(response: Dict[str, Any]) -> None:
-    engine = get_engine()
-    with Session(engine) as session:
-        record = OrderRecord(
-            symbol=response.get("symbol", ""),
-            side=response.get("side", ""),
-            type=response.get("type", ""),
-            status=response.get("status", ""),
-            order_id=str(response.get("orderId", "")),
-            raw_response=response,
-        )
+    save_orders([response])
+
+
+def save_orders(responses: List[Dict[str, Any]]) -> None:
+    """
+    Insert many order responses with a single executemany INSERT.
+
+    Responses without an orderId (rejections) are not stored: they cannot be
+    deduplicated or updated later.
+    """
+    rows = [_order_row(r) for r in responses]
+    rows = [row for row in rows if row["order_id"]]
+    if len(rows) < len(responses):
+        logger.warning("Skipped %d order responses without an orderId.", len(responses) - len(rows))
+    if not rows:
+        return
+    t0 = time.perf_counter()
+    try:
+        with get_session() as session:
+            stmt = _insert_ignoring_duplicates(session.get_bind())
+            session.execute(stmt, rows)
+            session.commit()
+    except Exception:
+        DB_PERSIST_SECONDS.labels("error").observe(time.perf_counter() - t0)
+        raise
+    DB_PERSIST_SECONDS.labels("ok").observe(time.perf_counter() - t0)
+
+
+def upsert_order_updates(updates: List[Dict[str, Any]]) -> int:
+    """
+    Apply order status updates (e.g. from the user-data stream) in one batch.
+
+    Each update carries order_id, symbol, side, type, status, executed_qty,
+    avg_price, updated_at and raw. Known orders are updated unless the stored
+    row is already newer; unknown orders (placed outside the bot) are
+    inserted, and updates without an order_id are skipped. Orders are keyed
+    by (symbol, order_id). Returns the number of rows written.
+    """
+    # Last update per order wins within the batch.
+    latest: Dict[Tuple[str, str], Dict[str, Any]] = {}
+    for item in updates:
+        if not item["order_id"]:
+            continue
+        key = (item["symbol"], item["order_id"])
+        current = latest.get(key)
+        if current is None or item["updated_at"] >= current["updated_at"]:
+            latest[key] = item
+    if not latest:
+        return 0
+
+    with get_session() as session:
+        existing = session.execute(
+            select(OrderRecord.id, OrderRecord.symbol, OrderRecord.order_id, OrderRecord.updated_at).where(
+                OrderRecord.order_id.in_({order_id for _, order_id in latest})
+            )
+        ).all()
+        to_update = []
+        for record_id, symbol, order_id, updated_at in existing:
+            item = latest.pop((symbol, order_id), None)
+            if item is None:
+                # Same id on another symbol.
+                continue
+            if updated_at is not None and updated_at > item["updated_at"]:
+                continue
+            to_update.append(
+                {
+                    "id": record_id,
+                    "status": item["status"],
+                    "executed_qty": item["executed_qty"],
+                    "avg_price": item["avg_price"],
+                    "updated_at": item["updated_at"],
+                }
+            )
+        to_insert = [
+            {
+                "created_at": u["updated_at"],
+                "symbol": u["symbol"],
+                "side": u["side"],
+                "type": u["type"],
+                "status": u["status"],
+                "order_id": u["order_id"],
+                "raw_response": u["raw"],
+                "executed_qty": u["executed_qty"],
+                "avg_price": u["avg_price"],
+                "updated_at": u["updated_at"],
+            }
+            for u in latest.values()
+        ]
+        if to_update:
+            session.execute(update(OrderRecord), to_update)
+        if to_insert:
+            session.execute(_insert_ignoring_duplicates(session.get_bind()), to_insert)
+        session.commit()
+    return len(to_update) + len(to_insert)
+
+
+class OrderFill(NamedTuple):
+    """Cumulative fill state of one order, as stored in the orders table."""
+
+    order_id: str
+    symbol: str
+    side: str
+    status: str
+    executed_qty: Optional[str]
+    avg_price: Optional[str]
+
+
+def get_order_fills_since(since: Optional[datetime] = None) -> Iterator[OrderFill]:
+    """
+    Orders created or updated at or after ``since`` (all orders if None), in
+    the order they last changed, streamed in chunks.
+    """
+    changed_at = coalesce(OrderRecord.updated_at, OrderRecord.created_at)
+    stmt = select(
+        OrderRecord.order_id,
+        OrderRecord.symbol,
+        OrderRecord.side,
+        OrderRecord.status,
+        OrderRecord.executed_qty,
+        OrderRecord.avg_price,
+    )
+    if since is not None:
+        stmt = stmt.where(or_(OrderRecord.updated_at >= since, OrderRecord.created_at >= since))
+    stmt = stmt.order_by(changed_at, OrderRecord.id).execution_options(yield_per=1000)
+    with get_session() as session:
+        for row in session.execute(stmt):
+            yield OrderFill(*row)
+
+
+def save_position_snapshot(state: Dict[str, Any], taken_at: datetime, keep: int = 10) -> None:
+    """
+    Store a position snapshot and prune all but the newest ``keep``.
+    """
+    with get_session() as session:
+        record = PositionSnapshot(taken_at=taken_at, state=state)
         session.add(record)
+        session.flush()
+        session.execute(delete(PositionSnapshot).where(PositionSnapshot.id <= record.id - keep))
         session.commit()
 
 
-def get_recent_orders(limit: int = 20) -> List[OrderRecord]:
-    engine = get_engine()
-    with Session(engine) as session:
-        stmt = (
-            session.query(OrderRecord)
-            .order_by(OrderRecord.created_at.desc())
-            .limit(limit)
+def get_latest_position_snapshot() -> Optional[PositionSnapshot]:
+    stmt = select(PositionSnapshot).order_by(PositionSnapshot.id.desc()).limit(1)
+    with get_session() as session:
+        return session.scalars(stmt).first()
+
+
+def get_open_orders(limit: Optional[int] = None) -> List[Tuple[str, str]]:
+    """
+    (symbol, order_id) of orders the DB still considers working, newest
+    first; all of them unless ``limit`` is given.
+    """
+    stmt = (
+        select(OrderRecord.symbol, OrderRecord.order_id)
+        .where(OrderRecord.status.in_(("NEW", "PARTIALLY_FILLED")))
+        .order_by(OrderRecord.created_at.desc())
+    )
+    if limit is not None:
+        stmt = stmt.limit(limit)
+    with get_session() as session:
+        return [(symbol, order_id) for symbol, order_id in session.execute(stmt)]
+
+
+def get_recent_orders(limit: int = 20) -> List[OrderSummary]:
+    """
+    Newest orders as plain tuples (only the displayed columns are selected).
+    """
+    stmt = (
+        select(*_SUMMARY_COLUMNS)
+        .order_by(OrderRecord.created_at.desc(), OrderRecord.id.desc())
+        .limit(limit)
+    )
+    with get_session() as session:
+        return [OrderSummary(*row) for row in session.execute(stmt)]
+
+
+def get_order(order_id: str, symbol: Optional[str] = None) -> Optional[OrderRecord]:
+    """
+    Full record for one exchange order id, including raw_response.
+
+    Ids are only unique per symbol; without ``symbol`` the latest order with
+    this id on any symbol is returned.
+    """
+    stmt = select(OrderRecord).where(OrderRecord.order_id == order_id)
+    if symbol is not None:
+        stmt = stmt.where(OrderRecord.symbol == symbol.upper())
+    stmt = stmt.order_by(OrderRecord.id.desc()).limit(1)
+    with get_session() as session:
+        return session.scalars(stmt).first()
+
+
+def encode_cursor(record: OrderSummary) -> str:
+    raw = f"{record.created_at.isoformat()}|{record.id}".encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, int]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+        created_at, record_id = raw.rsplit("|", 1)
+        return datetime.fromisoformat(created_at), int(record_id)
+    except (ValueError, UnicodeDecodeError) as exc:
+        raise InvalidCursor("Invalid pagination cursor.") from exc
+
+
+def get_orders_page(
+    limit: int = 50,
+    cursor: Optional[str] = None,
+    symbol: Optional[str] = None,
+    side: Optional[str] = None,
+    status: Optional[str] = None,
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+) -> Tuple[List[OrderSummary], Optional[str]]:
+    """
+    Return one page of orders, newest first, plus the cursor for the next page.
+
+    Uses keyset pagination on (created_at, id), so the cost of a page does not
+    grow with how deep into the history it is.
+    """
+    stmt = select(*_SUMMARY_COLUMNS)
+    if symbol:
+        stmt = stmt.where(OrderRecord.symbol == symbol)
+    if side:
+        stmt = stmt.where(OrderRecord.side == side)
+    if status:
+        stmt = stmt.where(OrderRecord.status == status)
+    if start:
+        stmt = stmt.where(OrderRecord.created_at >= start)
+    if end:
+        stmt = stmt.where(OrderRecord.created_at < end)
+    if cursor:
+        created_at, record_id = decode_cursor(cursor)
+        stmt = stmt.where(
+            tuple_(OrderRecord.created_at, OrderRecord.id) < tuple_(created_at, record_id)
         )
-        return list(stmt)
+    stmt = stmt.order_by(OrderRecord.created_at.desc(), OrderRecord.id.desc()).limit(limit + 1)
 
+    with get_session() as session:
+        records = [OrderSummary(*row) for row in session.execute(stmt)]
+    next_cursor = encode_cursor(records[limit - 1]) if len(records) > limit else None
+    return records[:limit], next_cursor
@@ -0,0 +1,156 @@
+import bisect
+import math
+import threading
+import time
+from typing import Any, Dict, List, Optional, Sequence
+
+# Log-spaced bucket upper bounds from 0.5 ms to ~30 s (about 12% apart).
+_BOUNDS = [0.0005 * 1.12 ** i for i in range(int(math.log(60000) / math.log(1.12)) + 1)]
+
+
+class LatencyHistogram:
+    """
+    Fixed-bucket latency histogram; quantiles are accurate to a bucket width.
+    """
+
+    def __init__(self) -> None:
+        self.counts = [0] * (len(_BOUNDS) + 1)
+        self.count = 0
+        self.total = 0.0
+
+    def observe(self, seconds: float) -> None:
+        self.counts[bisect.bisect_left(_BOUNDS, seconds)] += 1
+        self.count += 1
+        self.total += seconds
+
+    def quantile(self, q: float) -> Optional[float]:
+        if not self.count:
+            return None
+        rank = q * self.count
+        seen = 0
+        for index, n in enumerate(self.counts):
+            seen += n
+            if seen >= rank and n:
+                return _BOUNDS[min(index, len(_BOUNDS) - 1)]
+        return _BOUNDS[-1]
+
+
+class EndpointStats:
+    def __init__(self, url: str) -> None:
+        self.url = url
+        self.histogram = LatencyHistogram()
+        self.ewma: Optional[float] = None
+        self.errors = 0
+        self.consecutive_failures = 0
+        self.last_failure = 0.0
+        self.hedges = 0
+        self.hedge_wins = 0
+
+
+class EndpointSet:
+    """
+    Latency and health bookkeeping for interchangeable API base URLs.
+
+    ``choose`` returns the healthy endpoint with the lowest smoothed latency.
+    Endpoints without data rank after measured ones (so the first URL is used
+    until something is wrong with it) but before ones whose last request
+    failed. An endpoint with ``max_failures`` consecutive failures is skipped
+    for ``cooldown`` seconds. ``hedge_delay`` is the ``hedge_quantile`` of an
+    endpoint's latency histogram: how long to wait before duplicating a read.
+    """
+
+    def __init__(
+        self,
+        urls: Sequence[str],
+        hedge_quantile: float = 0.95,
+        default_hedge_delay: float = 0.1,
+        min_samples: int = 20,
+        max_failures: int = 3,
+        cooldown: float = 30.0,
+        failure_penalty: float = 1.0,
+        alpha: float = 0.2,
+    ) -> None:
+        if not urls:
+            raise ValueError("At least one endpoint URL is required.")
+        self.urls = [u.rstrip("/") for u in urls]
+        self._stats = {u: EndpointStats(u) for u in self.urls}
+        self.hedge_quantile = hedge_quantile
+        self.default_hedge_delay = default_hedge_delay
+        self.min_samples = min_samples
+        self.max_failures = max_failures
+        self.cooldown = cooldown
+        self.failure_penalty = failure_penalty
+        self.alpha = alpha
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self.urls)
+
+    def healthy(self, url: str) -> bool:
+        stats = self._stats[url]
+        return (
+            stats.consecutive_failures < self.max_failures
+            or time.monotonic() - stats.last_failure >= self.cooldown
+        )
+
+    def ranked(self) -> List[str]:
+        def key(item):
+            index, url = item
+            stats = self._stats[url]
+            ewma = stats.ewma if stats.ewma is not None else math.inf
+            return (not self.healthy(url), stats.consecutive_failures > 0, ewma, index)
+
+        return [url for _, url in sorted(enumerate(self.urls), key=key)]
+
+    def choose(self, exclude: Optional[str] = None) -> str:
+        for url in self.ranked():
+            if url != exclude:
+                return url
+        return self.urls[0]
+
+    def hedge_delay(self, url: str) -> float:
+        stats = self._stats[url]
+        if stats.histogram.count < self.min_samples:
+            return self.default_hedge_delay
+        return stats.histogram.quantile(self.hedge_quantile) or self.default_hedge_delay
+
+    def record(self, url: str, seconds: float, ok: bool) -> None:
+        with self._lock:
+            stats = self._stats[url]
+            sample = seconds if ok else max(seconds, self.failure_penalty)
+            stats.ewma = sample if stats.ewma is None else (1 - self.alpha) * stats.ewma + self.alpha * sample
+            if ok:
+                stats.histogram.observe(seconds)
+                stats.consecutive_failures = 0
+            else:
+                stats.errors += 1
+                stats.consecutive_failures += 1
+                stats.last_failure = time.monotonic()
+
+    def record_hedge(self, url: str, won: bool) -> None:
+        with self._lock:
+            stats = self._stats[url]
+            stats.hedges += 1
+            stats.hedge_wins += int(won)
+
+    def metrics(self) -> Dict[str, Any]:
+        def ms(value: Optional[float]) -> Optional[float]:
+            return round(value * 1000, 3) if value is not None else None
+
+        result = {}
+        for url in self.urls:
+            stats = self._stats[url]
+            hist = stats.histogram
+            result[url] = {
+                "requests": hist.count,
+                "errors": stats.errors,
+                "healthy": self.healthy(url),
+                "ewma_ms": ms(stats.ewma),
+                "p50_ms": ms(hist.quantile(0.5)),
+                "p95_ms": ms(hist.quantile(0.95)),
+                "p99_ms": ms(hist.quantile(0.99)),
+                "hedge_delay_ms": ms(self.hedge_delay(url)),
+                "hedges": stats.hedges,
+                "hedge_wins": stats.hedge_wins,
+            }
+        return result
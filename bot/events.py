@@ -0,0 +1,106 @@
+import asyncio
+import logging
+import os
+from datetime import datetime
+from typing import Any, Dict, Optional, Set
+
+logger = logging.getLogger(__name__)
+
+
+class Subscription:
+    """
+    One consumer's bounded event buffer.
+
+    If the consumer falls ``buffer_size`` events behind, its backlog is
+    discarded and it receives ``None`` as a signal to disconnect.
+    """
+
+    def __init__(self, buffer_size: int) -> None:
+        self.queue: "asyncio.Queue[Optional[Dict[str, Any]]]" = asyncio.Queue(maxsize=buffer_size + 1)
+        self.buffer_size = buffer_size
+        self.overflowed = False
+
+    async def get(self) -> Optional[Dict[str, Any]]:
+        return await self.queue.get()
+
+
+class OrderHub:
+    """
+    In-process pub/sub for order events.
+
+    ``publish`` may be called from any thread; delivery always happens on the
+    event loop that owns the subscribers, and never blocks the publisher.
+    """
+
+    def __init__(self, buffer_size: Optional[int] = None) -> None:
+        self.buffer_size = buffer_size or int(os.getenv("TRADING_BOT_WS_BUFFER", "100"))
+        self._subscribers: Set[Subscription] = set()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self.published = 0
+        self.dropped_subscribers = 0
+
+    @property
+    def subscriber_count(self) -> int:
+        return len(self._subscribers)
+
+    def subscribe(self) -> Subscription:
+        """
+        Register a consumer; must be called from the event loop.
+        """
+        self._loop = asyncio.get_running_loop()
+        subscription = Subscription(self.buffer_size)
+        self._subscribers.add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        self._subscribers.discard(subscription)
+
+    def publish(self, event: Dict[str, Any]) -> None:
+        loop = self._loop
+        if loop is None or not self._subscribers:
+            return
+        try:
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            running = None
+        if running is loop:
+            self._deliver(event)
+        else:
+            try:
+                loop.call_soon_threadsafe(self._deliver, event)
+            except RuntimeError:
+                # Loop already closed (e.g. API shut down while the CLI runs).
+                pass
+
+    def _deliver(self, event: Dict[str, Any]) -> None:
+        self.published += 1
+        for subscription in list(self._subscribers):
+            if subscription.queue.qsize() >= subscription.buffer_size:
+                # Slow consumer: drop it rather than buffer without bound.
+                self._subscribers.discard(subscription)
+                subscription.overflowed = True
+                self.dropped_subscribers += 1
+                while not subscription.queue.empty():
+                    subscription.queue.get_nowait()
+                subscription.queue.put_nowait(None)
+                logger.warning("Dropped slow order-stream subscriber.")
+                continue
+            subscription.queue.put_nowait(event)
+
+
+def order_event(response: Dict[str, Any], event: str = "order") -> Dict[str, Any]:
+    """
+    Dashboard-friendly event built from an exchange order response.
+    """
+    return {
+        "event": event,
+        "created_at": datetime.utcnow().isoformat(),
+        "symbol": response.get("symbol", ""),
+        "side": response.get("side", ""),
+        "type": response.get("type", ""),
+        "status": response.get("status", ""),
+        "order_id": str(response.get("orderId", "")),
+    }
+
+
+order_hub = OrderHub()
@@ -0,0 +1,300 @@
+import json
+import logging
+import os
+import threading
+import time
+from dataclasses import dataclass
+from decimal import ROUND_DOWN, ROUND_HALF_UP, Decimal, InvalidOperation
+from typing import Any, Callable, Dict, Literal, Optional, Tuple
+
+import requests
+
+from .rate_limit import get_rate_limiter
+from .validators import ValidationError
+
+logger = logging.getLogger(__name__)
+
+# reject - refuse orders that break a filter
+# round  - round quantity down to stepSize and price to tickSize, then re-check
+FilterMode = Literal["reject", "round"]
+
+DEFAULT_SNAPSHOT_PATH = "exchange_info.json"
+
+
+@dataclass(frozen=True)
+class SymbolFilters:
+    symbol: str
+    status: str
+    tick_size: Decimal
+    min_price: Decimal
+    max_price: Decimal
+    step_size: Decimal
+    min_qty: Decimal
+    max_qty: Decimal
+    market_step_size: Decimal
+    market_min_qty: Decimal
+    market_max_qty: Decimal
+    min_notional: Decimal
+
+
+def _dec(value: Any, default: str = "0") -> Decimal:
+    try:
+        return Decimal(str(value)) if value is not None else Decimal(default)
+    except InvalidOperation:
+        return Decimal(default)
+
+
+def parse_symbol_filters(symbol_info: Dict[str, Any]) -> SymbolFilters:
+    filters = {f.get("filterType"): f for f in symbol_info.get("filters", [])}
+    price = filters.get("PRICE_FILTER", {})
+    lot = filters.get("LOT_SIZE", {})
+    market_lot = filters.get("MARKET_LOT_SIZE", lot)
+    notional = filters.get("MIN_NOTIONAL", {})
+    return SymbolFilters(
+        symbol=symbol_info["symbol"],
+        status=symbol_info.get("status", "TRADING"),
+        tick_size=_dec(price.get("tickSize")),
+        min_price=_dec(price.get("minPrice")),
+        max_price=_dec(price.get("maxPrice")),
+        step_size=_dec(lot.get("stepSize")),
+        min_qty=_dec(lot.get("minQty")),
+        max_qty=_dec(lot.get("maxQty")),
+        market_step_size=_dec(market_lot.get("stepSize")),
+        market_min_qty=_dec(market_lot.get("minQty")),
+        market_max_qty=_dec(market_lot.get("maxQty")),
+        # Futures use "notional"; spot-style payloads use "minNotional".
+        min_notional=_dec(notional.get("notional", notional.get("minNotional"))),
+    )
+
+
+def parse_exchange_info(data: Dict[str, Any]) -> Dict[str, SymbolFilters]:
+    return {s["symbol"]: parse_symbol_filters(s) for s in data.get("symbols", [])}
+
+
+def _is_multiple(value: Decimal, step: Decimal) -> bool:
+    return step <= 0 or (value % step) == 0
+
+
+def _round_to_step(value: Decimal, step: Decimal, rounding: str) -> Decimal:
+    if step <= 0:
+        return value
+    return ((value / step).to_integral_value(rounding=rounding) * step).quantize(step)
+
+
+def http_exchange_info_fetcher(base_url: str, timeout: float = 10.0) -> Callable[[], Dict[str, Any]]:
+    """
+    Return a fetch callable for the public /fapi/v1/exchangeInfo endpoint.
+    """
+    url = base_url.rstrip("/") + "/fapi/v1/exchangeInfo"
+    session = requests.Session()
+
+    def fetch() -> Dict[str, Any]:
+        limiter = get_rate_limiter()
+        limiter.acquire("GET", "/fapi/v1/exchangeInfo")
+        response = session.get(url, timeout=timeout)
+        limiter.update(response.status_code, response.headers)
+        response.raise_for_status()
+        return response.json()
+
+    return fetch
+
+
+class ExchangeInfoCache:
+    """
+    In-memory per-symbol trading filters from /fapi/v1/exchangeInfo.
+
+    Lookups are plain dict reads; a background thread refreshes the data
+    every ``ttl`` seconds and writes a JSON snapshot to ``snapshot_path`` so
+    the next cold start can begin validating before the exchange answers.
+    """
+
+    def __init__(
+        self,
+        fetch: Optional[Callable[[], Dict[str, Any]]] = None,
+        ttl: float = 3600.0,
+        snapshot_path: Optional[str] = None,
+        mode: FilterMode = "reject",
+    ) -> None:
+        if mode not in ("reject", "round"):
+            raise ValueError("mode must be reject or round.")
+        self._fetch = fetch
+        self.ttl = ttl
+        self.snapshot_path = snapshot_path
+        self.mode = mode
+        self.loaded_at = 0.0
+        self._symbols: Dict[str, SymbolFilters] = {}
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    @classmethod
+    def from_env(
+        cls, fetch: Optional[Callable[[], Dict[str, Any]]] = None
+    ) -> "ExchangeInfoCache":
+        return cls(
+            fetch=fetch,
+            ttl=float(os.getenv("TRADING_BOT_EXCHANGE_INFO_TTL", "3600")),
+            snapshot_path=os.getenv("TRADING_BOT_EXCHANGE_INFO_PATH", DEFAULT_SNAPSHOT_PATH),
+            mode=os.getenv("TRADING_BOT_FILTER_MODE", "reject"),  # type: ignore[arg-type]
+        )
+
+    def __getstate__(self) -> Dict[str, Any]:
+        # Pickled copies (e.g. for backtest worker processes) carry the
+        # filters only, without the fetch function or refresh thread.
+        state = self.__dict__.copy()
+        state.update(_fetch=None, _stop=None, _thread=None)
+        return state
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        self.__dict__.update(state)
+        self._stop = threading.Event()
+
+    @property
+    def loaded(self) -> bool:
+        return bool(self._symbols)
+
+    @property
+    def stale(self) -> bool:
+        return time.time() - self.loaded_at >= self.ttl
+
+    def get(self, symbol: str) -> Optional[SymbolFilters]:
+        return self._symbols.get(symbol)
+
+    def load_snapshot(self) -> bool:
+        """
+        Populate the cache from the on-disk snapshot, if there is one.
+        """
+        if not self.snapshot_path or not os.path.exists(self.snapshot_path):
+            return False
+        try:
+            with open(self.snapshot_path, encoding="utf-8") as fh:
+                snapshot = json.load(fh)
+            self._symbols = parse_exchange_info(snapshot["exchange_info"])
+            self.loaded_at = float(snapshot.get("fetched_at", 0))
+        except (OSError, ValueError, KeyError):
+            logger.exception("Ignoring unreadable exchange info snapshot %s.", self.snapshot_path)
+            return False
+        logger.info(
+            "Loaded exchange info snapshot with %d symbols from %s.",
+            len(self._symbols),
+            self.snapshot_path,
+        )
+        return True
+
+    def refresh(self) -> None:
+        """
+        Fetch exchangeInfo, swap in the new filters and save a snapshot.
+        """
+        if self._fetch is None:
+            raise RuntimeError("ExchangeInfoCache has no fetch function.")
+        data = self._fetch()
+        symbols = parse_exchange_info(data)
+        fetched_at = time.time()
+        # Single reference swap: readers see either the old or the new dict.
+        self._symbols = symbols
+        self.loaded_at = fetched_at
+        logger.info("Refreshed exchange info: %d symbols.", len(symbols))
+
+        if self.snapshot_path:
+            tmp_path = self.snapshot_path + ".tmp"
+            try:
+                snapshot = {
+                    "fetched_at": fetched_at,
+                    "exchange_info": {"symbols": data.get("symbols", [])},
+                }
+                with open(tmp_path, "w", encoding="utf-8") as fh:
+                    json.dump(snapshot, fh)
+                os.replace(tmp_path, self.snapshot_path)
+            except OSError:
+                logger.exception("Failed to write exchange info snapshot %s.", self.snapshot_path)
+
+    def start(self) -> None:
+        """
+        Load the snapshot and keep the cache fresh from a background thread.
+        """
+        self.load_snapshot()
+        if self._fetch is None or self._thread is not None:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="exchange-info", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+            self._thread = None
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            wait = max(self.loaded_at + self.ttl - time.time(), 0.0)
+            if wait and self._stop.wait(wait):
+                return
+            try:
+                self.refresh()
+            except Exception:
+                logger.exception("Exchange info refresh failed; retrying in 30s.")
+                if self._stop.wait(min(30.0, self.ttl)):
+                    return
+
+    def check_order(
+        self,
+        symbol: str,
+        order_type: str,
+        quantity: Any,
+        price: Optional[Any] = None,
+    ) -> Tuple[Decimal, Optional[Decimal]]:
+        """
+        Apply LOT_SIZE / MARKET_LOT_SIZE, PRICE_FILTER and MIN_NOTIONAL locally.
+
+        Returns the (possibly rounded) quantity and price as Decimals, or
+        raises ValidationError. Does nothing beyond the Decimal conversion
+        while the cache is empty.
+        """
+        qty = _dec(quantity)
+        px = _dec(price) if price is not None else None
+        if not self._symbols:
+            return qty, px
+
+        filters = self._symbols.get(symbol)
+        if filters is None:
+            raise ValidationError(f"Unknown symbol {symbol}.")
+        if filters.status != "TRADING":
+            raise ValidationError(f"Symbol {symbol} is not trading (status={filters.status}).")
+
+        if order_type == "MARKET":
+            step, min_qty, max_qty = filters.market_step_size, filters.market_min_qty, filters.market_max_qty
+        else:
+            step, min_qty, max_qty = filters.step_size, filters.min_qty, filters.max_qty
+
+        if self.mode == "round":
+            qty = _round_to_step(qty, step, ROUND_DOWN)
+            if px is not None:
+                px = _round_to_step(px, filters.tick_size, ROUND_HALF_UP)
+
+        if not _is_multiple(qty, step):
+            raise ValidationError(f"Quantity {qty} is not a multiple of stepSize {step} for {symbol}.")
+        if qty < min_qty:
+            raise ValidationError(f"Quantity {qty} is below minQty {min_qty} for {symbol}.")
+        if max_qty > 0 and qty > max_qty:
+            raise ValidationError(f"Quantity {qty} is above maxQty {max_qty} for {symbol}.")
+
+        if px is not None:
+            if not _is_multiple(px, filters.tick_size):
+                raise ValidationError(
+                    f"Price {px} is not a multiple of tickSize {filters.tick_size} for {symbol}."
+                )
+            if px < filters.min_price:
+                raise ValidationError(f"Price {px} is below minPrice {filters.min_price} for {symbol}.")
+            if filters.max_price > 0 and px > filters.max_price:
+                raise ValidationError(f"Price {px} is above maxPrice {filters.max_price} for {symbol}.")
+            if filters.min_notional > 0 and px * qty < filters.min_notional:
+                raise ValidationError(
+                    f"Order notional {px * qty} is below minimum {filters.min_notional} for {symbol}."
+                )
+
+        # Canonical precision: 0.0020 -> 0.002 at stepSize 0.001.
+        if step > 0:
+            qty = qty.quantize(step)
+        if px is not None and filters.tick_size > 0:
+            px = px.quantize(filters.tick_size)
+        return qty, px
@@ -0,0 +1,306 @@
+import asyncio
+import json
+import logging
+import os
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple, Union
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+import numpy as np
+
+from .backtest import Bars
+from .client import KLINE_INTERVALS, MAX_KLINES
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_KLINES_DIR = "data/klines"
+
+# Half-open [start, end) ranges of candle open times, in epoch ms.
+Range = Tuple[int, int]
+
+_DTYPES = {"time": np.int64}
+
+
+def interval_ms(interval: str) -> int:
+    try:
+        return KLINE_INTERVALS[interval]
+    except KeyError:
+        raise ValueError(f"Unsupported kline interval {interval!r}; use one of {', '.join(KLINE_INTERVALS)}.") from None
+
+
+def merge_ranges(ranges: Sequence[Range]) -> List[Range]:
+    """
+    Sort ranges and join the ones that overlap or touch.
+    """
+    merged: List[List[int]] = []
+    for start, end in sorted(ranges):
+        if start >= end:
+            continue
+        if merged and start <= merged[-1][1]:
+            merged[-1][1] = max(merged[-1][1], end)
+        else:
+            merged.append([start, end])
+    return [(start, end) for start, end in merged]
+
+
+def missing_ranges(coverage: Sequence[Range], start: int, end: int) -> List[Range]:
+    """
+    The parts of [start, end) not covered by ``coverage``.
+    """
+    gaps = []
+    cursor = start
+    for lo, hi in merge_ranges(coverage):
+        if hi <= cursor:
+            continue
+        if lo >= end:
+            break
+        if lo > cursor:
+            gaps.append((cursor, lo))
+        cursor = max(cursor, hi)
+    if cursor < end:
+        gaps.append((cursor, end))
+    return gaps
+
+
+@contextmanager
+def _write_lock(directory: Path) -> Iterator[None]:
+    # Serializes read-merge-publish between processes sharing the directory.
+    with open(directory / "write.lock", "a+b") as handle:
+        if fcntl is not None:
+            fcntl.flock(handle, fcntl.LOCK_EX)
+        else:
+            handle.seek(0)
+            msvcrt.locking(handle.fileno(), msvcrt.LK_LOCK, 1)
+        try:
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(handle, fcntl.LOCK_UN)
+            else:
+                handle.seek(0)
+                msvcrt.locking(handle.fileno(), msvcrt.LK_UNLCK, 1)
+
+
+def rows_to_bars(rows: Sequence[Sequence[Any]]) -> Bars:
+    """
+    Columns from /fapi/v1/klines rows (open time, open, high, low, close, volume, ...).
+    """
+    if not rows:
+        return Bars(np.empty(0, np.int64), *(np.empty(0) for _ in range(5)))
+    return Bars(
+        np.fromiter((row[0] for row in rows), np.int64, len(rows)),
+        *(np.fromiter((float(row[i]) for row in rows), np.float64, len(rows)) for i in range(1, 6)),
+    )
+
+
+class KlineStore:
+    """
+    Candles on disk, one directory per ``SYMBOL/interval`` holding a
+    ``.npy`` file per column plus ``meta.json`` (rows, covered ranges and
+    the current file version). Writers take a per-directory file lock,
+    publish a new version and then swap ``meta.json``, so concurrent writers
+    never lose each other's rows and readers in other processes always see
+    a complete set; ``load`` returns read-only memory-mapped slices.
+    """
+
+    def __init__(self, root: Union[str, Path, None] = None) -> None:
+        self.root = Path(root or os.getenv("TRADING_BOT_KLINES_DIR", DEFAULT_KLINES_DIR))
+        # (symbol, interval) -> (version, memory-mapped columns)
+        self._maps: Dict[Tuple[str, str], Tuple[int, Bars]] = {}
+
+    def path(self, symbol: str, interval: str) -> Path:
+        interval_ms(interval)
+        return self.root / symbol.upper() / interval
+
+    def meta(self, symbol: str, interval: str) -> Dict[str, Any]:
+        try:
+            text = (self.path(symbol, interval) / "meta.json").read_text(encoding="utf-8")
+        except FileNotFoundError:
+            return {"version": 0, "rows": 0, "coverage": []}
+        return json.loads(text)
+
+    def coverage(self, symbol: str, interval: str) -> List[Range]:
+        return [(start, end) for start, end in self.meta(symbol, interval)["coverage"]]
+
+    def datasets(self) -> List[Dict[str, Any]]:
+        """
+        Every stored symbol/interval with its row count and time span.
+        """
+        found = []
+        for meta_path in sorted(self.root.glob("*/*/meta.json")):
+            symbol, interval = meta_path.parent.parent.name, meta_path.parent.name
+            if interval not in KLINE_INTERVALS:
+                continue
+            bars = self.load(symbol, interval)
+            found.append(
+                {
+                    "symbol": symbol,
+                    "interval": interval,
+                    "rows": bars.size,
+                    "first": int(bars.time[0]) if bars.size else None,
+                    "last": int(bars.time[-1]) if bars.size else None,
+                    "coverage": self.coverage(symbol, interval),
+                }
+            )
+        return found
+
+    def _open(self, symbol: str, interval: str) -> Bars:
+        key = (symbol.upper(), interval)
+        directory = self.path(symbol, interval)
+        # A writer may replace the files between reading meta.json and
+        # mapping them; the next meta.json names the new set.
+        for _ in range(3):
+            meta = self.meta(symbol, interval)
+            version = meta["version"]
+            if version == 0:
+                return rows_to_bars([])
+            cached = self._maps.get(key)
+            if cached is not None and cached[0] == version:
+                return cached[1]
+            try:
+                bars = Bars(*(np.load(directory / f"{name}.{version}.npy", mmap_mode="r") for name in Bars._fields))
+            except FileNotFoundError:
+                continue
+            self._maps[key] = (version, bars)
+            return bars
+        raise RuntimeError(f"Kline files for {key[0]} {interval} kept changing while loading.")
+
+    def load(self, symbol: str, interval: str, start: Optional[int] = None, end: Optional[int] = None) -> Bars:
+        """
+        Candles with open time in [start, end), as zero-copy views of the files.
+        """
+        bars = self._open(symbol, interval)
+        lo = 0 if start is None else int(np.searchsorted(bars.time, start, "left"))
+        hi = bars.size if end is None else int(np.searchsorted(bars.time, end, "left"))
+        return bars.slice(lo, hi)
+
+    def write(self, symbol: str, interval: str, bars: Bars, covered: Sequence[Range] = ()) -> int:
+        """
+        Merge ``bars`` into the stored candles (new rows win on equal open
+        times), record ``covered`` as downloaded and return the row count.
+        """
+        directory = self.path(symbol, interval)
+        directory.mkdir(parents=True, exist_ok=True)
+        with _write_lock(directory):
+            meta = self.meta(symbol, interval)
+            old = self._open(symbol, interval)
+            if bars.size:
+                merged = Bars.concat([bars, old]) if old.size else bars
+                # np.unique keeps the first occurrence, i.e. the new row.
+                _, index = np.unique(merged.time, return_index=True)
+                merged = Bars(*(np.asarray(column)[index] for column in merged))
+            else:
+                merged = old
+            version = meta["version"] + 1
+            for name, column in zip(Bars._fields, merged):
+                # Write aside and rename rather than truncate in place: a
+                # file of this name must never change under a reader's map.
+                tmp = directory / f"{name}.{version}.npy.tmp"
+                with open(tmp, "wb") as handle:
+                    np.save(handle, np.ascontiguousarray(column, dtype=_DTYPES.get(name, np.float64)))
+                os.replace(tmp, directory / f"{name}.{version}.npy")
+            new_meta = {
+                "version": version,
+                "rows": int(merged.size),
+                "coverage": [list(r) for r in merge_ranges([*map(tuple, meta["coverage"]), *covered])],
+            }
+            tmp = directory / "meta.json.tmp"
+            tmp.write_text(json.dumps(new_meta), encoding="utf-8")
+            os.replace(tmp, directory / "meta.json")
+            # Mapped readers keep the unlinked files alive until they let go.
+            self._maps.pop((symbol.upper(), interval), None)
+            for name in Bars._fields:
+                (directory / f"{name}.{meta['version']}.npy").unlink(missing_ok=True)
+        return int(merged.size)
+
+
+@dataclass
+class SyncResult:
+    symbol: str
+    interval: str
+    requests: int = 0
+    failed: int = 0
+    fetched: int = 0
+    rows: int = 0
+    missing: List[Range] = field(default_factory=list)
+    seconds: float = 0.0
+
+
+class KlineSync:
+    """
+    Fills the gaps in a KlineStore from /fapi/v1/klines. Each gap is split
+    into pages of ``limit`` candles that run concurrently (at most
+    ``concurrency`` at a time) through the client's rate limiter; pages are
+    written in batches so an interrupted sync keeps what it fetched.
+    """
+
+    def __init__(
+        self,
+        client: Any,
+        store: Optional[KlineStore] = None,
+        concurrency: Optional[int] = None,
+        limit: int = MAX_KLINES,
+        batch_pages: int = 50,
+    ) -> None:
+        self.client = client
+        self.store = store or KlineStore()
+        self.concurrency = concurrency or int(os.getenv("TRADING_BOT_KLINES_CONCURRENCY", "4"))
+        self.limit = min(limit, MAX_KLINES)
+        self.batch_pages = batch_pages
+
+    def plan(self, symbol: str, interval: str, start: int, end: Optional[int] = None) -> List[Range]:
+        """
+        Pages still to download for candles opening in [start, end), up to the last closed candle.
+        """
+        step = interval_ms(interval)
+        # The candle opening at ``current`` is still forming.
+        current = (int(time.time() * 1000) // step) * step
+        start = -(-start // step) * step
+        end = current if end is None else min(current, -(-end // step) * step)
+        pages = []
+        for lo, hi in missing_ranges(self.store.coverage(symbol, interval), start, end):
+            pages.extend((t, min(hi, t + self.limit * step)) for t in range(lo, hi, self.limit * step))
+        return pages
+
+    async def _fetch(self, symbol: str, interval: str, page: Range, gate: asyncio.Semaphore) -> Optional[Bars]:
+        start, end = page
+        async with gate:
+            try:
+                rows = await self.client.get_klines(symbol, interval, start, end - 1, self.limit)
+            except Exception as exc:
+                logger.warning("Kline page %s %s [%s, %s) failed: %s", symbol, interval, start, end, exc)
+                return None
+        bars = rows_to_bars(rows)
+        keep = (bars.time >= start) & (bars.time < end)
+        return Bars(*(column[keep] for column in bars)) if not keep.all() else bars
+
+    async def sync(self, symbol: str, interval: str, start: int, end: Optional[int] = None) -> SyncResult:
+        symbol = symbol.upper()
+        t0 = time.perf_counter()
+        pages = self.plan(symbol, interval, start, end)
+        result = SyncResult(symbol, interval, requests=len(pages))
+        gate = asyncio.Semaphore(self.concurrency)
+        for i in range(0, len(pages), self.batch_pages):
+            batch = pages[i : i + self.batch_pages]
+            fetched = await asyncio.gather(*(self._fetch(symbol, interval, page, gate) for page in batch))
+            done = [(page, bars) for page, bars in zip(batch, fetched) if bars is not None]
+            result.failed += len(batch) - len(done)
+            if not done:
+                continue
+            bars = Bars.concat([bars for _, bars in done])
+            result.fetched += bars.size
+            # Empty pages count as covered too: before a listing there is nothing to fetch.
+            await asyncio.to_thread(self.store.write, symbol, interval, bars, [page for page, _ in done])
+        result.rows = self.store.meta(symbol, interval)["rows"]
+        if pages:
+            result.missing = missing_ranges(self.store.coverage(symbol, interval), pages[0][0], pages[-1][1])
+        result.seconds = time.perf_counter() - t0
+        return result
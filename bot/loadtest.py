@@ -0,0 +1,378 @@
+import asyncio
+import itertools
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, Iterator, List, Optional, Sequence
+
+import httpx
+import typer
+from rich.console import Console
+from rich.table import Table
+
+from .api import app as api_app
+from .api import get_binance_client
+from .bench import BENCH_API_KEY, BENCH_API_SECRET, make_orders, percentiles
+from .client import build_order_params
+from .daemon import call as daemon_call
+from .db import dispose_engine, init_db, save_orders
+from .exchange_info import ExchangeInfoCache
+from .mock_exchange import MatchingEngine, MockExchange, MockExchangeServer
+from .writer import start_order_writer, stop_order_writer
+
+console = Console()
+cli = typer.Typer(add_completion=False)
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+DEFAULT_BASELINE = PROJECT_ROOT / "benchmarks" / "baseline.json"
+
+# Scenario name -> concurrency levels. Requests per level are scaled by --scale.
+API_LEVELS = (1, 8, 32)
+CLI_LEVELS = (1, 4)
+API_REQUESTS = 400
+CLI_RUNS = 8
+SEED_ORDERS = 20_000
+
+
+class StubClient:
+    """
+    In-process stand-in for AsyncBinanceFuturesClient: orders go straight to
+    a MatchingEngine, so API benchmarks measure the bot, not the network.
+    """
+
+    def __init__(self) -> None:
+        self.engine = MatchingEngine()
+
+    async def place_order(self, symbol, side, order_type, quantity, price=None, time_in_force=None):
+        params = build_order_params(symbol, side, order_type, quantity, price, time_in_force)
+        return self.engine.place({k: str(v) for k, v in params.items()}).to_dict()
+
+
+def seed_db(count: int = SEED_ORDERS) -> None:
+    """
+    Fill the current database with ``count`` deterministic order records.
+    """
+    statuses = ("NEW", "FILLED", "CANCELED", "PARTIALLY_FILLED")
+    rows = [
+        {
+            "orderId": 10_000_000 + i,
+            "symbol": ("BTCUSDT", "ETHUSDT", "SOLUSDT")[i % 3],
+            "side": "BUY" if i % 2 else "SELL",
+            "type": "LIMIT" if i % 4 else "MARKET",
+            "status": statuses[i % len(statuses)],
+            "origQty": "0.002",
+            "price": "70000",
+        }
+        for i in range(count)
+    ]
+    for start in range(0, count, 1000):
+        save_orders(rows[start:start + 1000])
+
+
+async def _measure(
+    call: Callable[[int], Awaitable[bool]], requests: int, concurrency: int
+) -> Dict[str, Any]:
+    counter = itertools.count()
+    latencies: List[float] = []
+    errors = 0
+
+    async def worker() -> None:
+        nonlocal errors
+        while True:
+            i = next(counter)
+            if i >= requests:
+                return
+            t0 = time.perf_counter()
+            ok = await call(i)
+            if ok:
+                latencies.append(time.perf_counter() - t0)
+            else:
+                errors += 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+    return _result(latencies, errors, elapsed)
+
+
+def _result(latencies: List[float], errors: int, elapsed: float) -> Dict[str, Any]:
+    stats = percentiles(latencies)
+    return {
+        "requests": len(latencies) + errors,
+        "errors": errors,
+        "throughput": round(len(latencies) / elapsed, 1) if elapsed else 0.0,
+        "p50_ms": stats["p50"],
+        "p95_ms": stats["p95"],
+        "p99_ms": stats["p99"],
+    }
+
+
+async def _api_scenarios(levels: Sequence[int], requests: int) -> Dict[str, Dict[str, Any]]:
+    orders = make_orders(requests * max(len(levels), 1), limit_ratio=0.5)
+    transport = httpx.ASGITransport(app=api_app)
+    results = {}
+    async with httpx.AsyncClient(transport=transport, base_url="http://loadtest") as http:
+
+        async def place(i: int) -> bool:
+            order = orders[i % len(orders)]
+            payload = {
+                "symbol": order["symbol"],
+                "side": order["side"],
+                "type": order["order_type"],
+                "quantity": order["quantity"],
+                "price": order.get("price"),
+                "timeInForce": order.get("time_in_force"),
+            }
+            response = await http.post("/orders", json=payload)
+            return response.status_code == 200
+
+        async def recent(i: int) -> bool:
+            response = await http.get("/orders/recent", params={"limit": 50})
+            return response.status_code == 200
+
+        # Warm up routes, validation and the connection pool.
+        for i in range(20):
+            await place(i)
+            await recent(i)
+        for concurrency in levels:
+            results[f"api_orders@{concurrency}"] = await _measure(place, requests, concurrency)
+        for concurrency in levels:
+            results[f"api_orders_recent@{concurrency}"] = await _measure(recent, requests, concurrency)
+    return results
+
+
+def run_api_scenarios(levels: Sequence[int] = API_LEVELS, requests: int = API_REQUESTS) -> Dict[str, Dict[str, Any]]:
+    """
+    POST /orders and GET /orders/recent through the ASGI app with a stub
+    exchange client, exchange filters and the write-behind writer, against
+    the current (seeded) database.
+    """
+    exchange_info = ExchangeInfoCache(fetch=MatchingEngine().exchange_info)
+    exchange_info.refresh()
+    state = api_app.state
+    saved = {name: getattr(state, name, None) for name in ("exchange_info", "market_data")}
+    state.exchange_info, state.market_data = exchange_info, None
+    client = StubClient()
+    api_app.dependency_overrides[get_binance_client] = lambda: client
+    start_order_writer()
+    try:
+        return asyncio.run(_api_scenarios(levels, requests))
+    finally:
+        stop_order_writer()
+        api_app.dependency_overrides.pop(get_binance_client, None)
+        for name, value in saved.items():
+            setattr(state, name, value)
+
+
+def run_cli_scenarios(levels: Sequence[int] = CLI_LEVELS, runs: int = CLI_RUNS) -> Dict[str, Dict[str, Any]]:
+    """
+    ``python -m bot.cli main`` as separate processes against the mock
+    exchange, ``concurrency`` at a time; latency is process start to exit.
+    ``cli_order`` places orders directly, ``cli_order_daemon`` through a
+    warm ``bot.cli daemon``.
+    """
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp, MockExchangeServer(
+        MockExchange(api_key=BENCH_API_KEY, api_secret=BENCH_API_SECRET)
+    ) as server:
+        socket_path = str(Path(tmp) / "daemon.sock")
+        env = dict(
+            os.environ,
+            BINANCE_API_KEY=BENCH_API_KEY,
+            BINANCE_API_SECRET=BENCH_API_SECRET,
+            BINANCE_FUTURES_TESTNET_URL=server.url,
+            TRADING_BOT_DB_URL=os.environ["TRADING_BOT_DB_URL"],
+            TRADING_BOT_EXCHANGE_INFO_PATH=str(Path(tmp) / "exchange_info.json"),
+            TRADING_BOT_DAEMON_SOCKET=socket_path,
+            PYTHONPATH=os.pathsep.join(filter(None, [str(PROJECT_ROOT), os.environ.get("PYTHONPATH")])),
+        )
+        command = [
+            sys.executable, "-m", "bot.cli", "main",
+            "--symbol", "BTCUSDT", "--side", "BUY", "--order-type", "MARKET", "--quantity", "0.002",
+        ]
+
+        def invoker(*extra: str) -> Callable[[int], Awaitable[bool]]:
+            async def invoke(i: int) -> bool:
+                process = await asyncio.create_subprocess_exec(
+                    *command, *extra, cwd=tmp, env=env,
+                    stdout=asyncio.subprocess.DEVNULL, stderr=asyncio.subprocess.DEVNULL,
+                )
+                return await process.wait() == 0
+
+            return invoke
+
+        for concurrency in levels:
+            results[f"cli_order@{concurrency}"] = asyncio.run(_measure(invoker("--no-daemon"), runs, concurrency))
+
+        with cli_daemon(env, cwd=tmp):
+            for concurrency in levels:
+                results[f"cli_order_daemon@{concurrency}"] = asyncio.run(_measure(invoker(), runs, concurrency))
+    return results
+
+
+@contextmanager
+def cli_daemon(env: Dict[str, str], cwd: str, timeout: float = 30.0) -> Iterator[subprocess.Popen]:
+    """
+    Run ``python -m bot.cli daemon`` on env's TRADING_BOT_DAEMON_SOCKET until
+    the block exits.
+    """
+    socket_path = env["TRADING_BOT_DAEMON_SOCKET"]
+    process = subprocess.Popen(
+        [sys.executable, "-m", "bot.cli", "daemon"],
+        cwd=cwd, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    try:
+        deadline = time.monotonic() + timeout
+        while daemon_call("ping", socket_path=socket_path, timeout=1) is None:
+            if process.poll() is not None or time.monotonic() > deadline:
+                raise RuntimeError("bot.cli daemon did not start.")
+            time.sleep(0.05)
+        yield process
+    finally:
+        if process.poll() is None:
+            daemon_call("stop", socket_path=socket_path, timeout=5)
+            try:
+                process.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                process.kill()
+                process.wait()
+
+
+def run_suite(scale: float = 1.0, include_cli: bool = True, db_url: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Run every scenario on a freshly seeded database (a temporary SQLite file
+    unless ``db_url`` is given) and return a baseline-shaped report.
+    """
+    requests = max(20, int(API_REQUESTS * scale))
+    with tempfile.TemporaryDirectory() as tmp:
+        previous = os.environ.get("TRADING_BOT_DB_URL")
+        os.environ["TRADING_BOT_DB_URL"] = db_url or f"sqlite:///{Path(tmp) / 'loadtest.db'}"
+        try:
+            init_db()
+            seed_db(max(1000, int(SEED_ORDERS * scale)))
+            results = run_api_scenarios(API_LEVELS, requests)
+            if include_cli:
+                results.update(run_cli_scenarios(CLI_LEVELS, max(2, int(CLI_RUNS * scale))))
+        finally:
+            dispose_engine()
+            if previous is None:
+                os.environ.pop("TRADING_BOT_DB_URL", None)
+            else:
+                os.environ["TRADING_BOT_DB_URL"] = previous
+    return {
+        "meta": {
+            "created": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "machine": platform.machine(),
+            "scale": scale,
+        },
+        "results": results,
+    }
+
+
+def compare(current: Dict[str, Any], baseline: Dict[str, Any], max_regression: float) -> List[str]:
+    """
+    Regressions of ``current`` against ``baseline``: p95 latency up or
+    throughput down by more than ``max_regression`` percent. Scenarios
+    missing from either side are ignored.
+    """
+    limit = max_regression / 100.0
+    failures = []
+    for name, base in baseline.get("results", {}).items():
+        result = current.get("results", {}).get(name)
+        if result is None:
+            continue
+        if base.get("p95_ms") and result.get("p95_ms") is not None and result["p95_ms"] > base["p95_ms"] * (1 + limit):
+            failures.append(f"{name}: p95 {result['p95_ms']:.2f} ms vs baseline {base['p95_ms']:.2f} ms")
+        if base.get("throughput") and result["throughput"] < base["throughput"] * (1 - limit):
+            failures.append(f"{name}: {result['throughput']:.1f} req/s vs baseline {base['throughput']:.1f} req/s")
+        if result.get("errors"):
+            failures.append(f"{name}: {result['errors']} failed requests")
+    return failures
+
+
+def _print_results(report: Dict[str, Any], baseline: Optional[Dict[str, Any]]) -> None:
+    table = Table(show_header=True, header_style="bold magenta")
+    for column in ("Scenario", "req/s", "p50 ms", "p95 ms", "p99 ms", "errors", "baseline p95 / req/s"):
+        table.add_column(column, justify="left" if column == "Scenario" else "right", no_wrap=column == "Scenario")
+    base_results = (baseline or {}).get("results", {})
+    for name, r in report["results"].items():
+        base = base_results.get(name)
+        table.add_row(
+            name,
+            f"{r['throughput']:.1f}",
+            f"{r['p50_ms']:.2f}",
+            f"{r['p95_ms']:.2f}",
+            f"{r['p99_ms']:.2f}",
+            str(r["errors"]),
+            f"{base['p95_ms']:.2f} / {base['throughput']:.1f}" if base else "-",
+        )
+    console.print(table)
+
+
+@cli.command()
+def run(
+    baseline: Path = typer.Option(DEFAULT_BASELINE, help="Baseline JSON to compare against / update."),
+    max_regression: float = typer.Option(
+        float(os.getenv("TRADING_BOT_BENCH_MAX_REGRESSION", "20")),
+        help="Allowed p95 increase / throughput drop, percent.",
+    ),
+    update: bool = typer.Option(False, "--update", help="Write the results as the new baseline."),
+    output: Optional[Path] = typer.Option(None, help="Also write the results JSON here."),
+    scale: float = typer.Option(1.0, help="Multiply request counts (and the seeded DB size) by this."),
+    cli_scenarios: bool = typer.Option(True, "--cli/--no-cli", help="Include the CLI process scenarios."),
+) -> None:
+    """
+    Run the load-test suite and fail on regressions against the baseline.
+    """
+    report = run_suite(scale=scale, include_cli=cli_scenarios)
+    previous = json.loads(baseline.read_text(encoding="utf-8")) if baseline.exists() else None
+    _print_results(report, previous)
+    if output is not None:
+        output.write_text(json.dumps(report, indent=2) + "\n", encoding="utf-8")
+    if update or previous is None:
+        baseline.parent.mkdir(parents=True, exist_ok=True)
+        baseline.write_text(json.dumps(report, indent=2) + "\n", encoding="utf-8")
+        console.print(f"Baseline written to {baseline}.")
+        return
+    failures = compare(report, previous, max_regression)
+    if failures:
+        console.print(f"[bold red]Regressions beyond {max_regression:g}%:[/bold red]")
+        for failure in failures:
+            console.print(f"  {failure}")
+        raise typer.Exit(code=1)
+    console.print(f"[bold green]No regressions beyond {max_regression:g}%.[/bold green]")
+
+
+@cli.command(name="compare")
+def compare_files(
+    current: Path = typer.Argument(..., exists=True, help="Results JSON from `run --output`."),
+    baseline: Path = typer.Option(DEFAULT_BASELINE, exists=True, help="Baseline JSON."),
+    max_regression: float = typer.Option(
+        float(os.getenv("TRADING_BOT_BENCH_MAX_REGRESSION", "20")),
+        help="Allowed p95 increase / throughput drop, percent.",
+    ),
+) -> None:
+    """
+    Compare two saved result files; exits 1 on regressions.
+    """
+    failures = compare(
+        json.loads(current.read_text(encoding="utf-8")),
+        json.loads(baseline.read_text(encoding="utf-8")),
+        max_regression,
+    )
+    for failure in failures:
+        console.print(f"  {failure}")
+    if failures:
+        raise typer.Exit(code=1)
+
+
+if __name__ == "__main__":
+    cli()
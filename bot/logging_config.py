@@ -1,14 +1,78 @@
+import atexit
+import json
 import logging
 import os
-from logging.handlers import RotatingFileHandler
+import queue
+import random
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+from typing import Any, List, Optional
 
+_listener: Optional[QueueListener] = None
+_queue_handler: Optional[QueueHandler] = None
+_response_sample = 1.0
 
-def setup_logging(log_dir: str = "logs", log_filename: str = "trading_bot.log") -> None:
+
+class TextFormatter(logging.Formatter):
+    """
+    Plain-text formatter that appends a record's ``payload`` (see log_response).
+    """
+
+    def formatMessage(self, record: logging.LogRecord) -> str:
+        message = super().formatMessage(record)
+        payload = getattr(record, "payload", None)
+        if payload is not None:
+            message = f"{message}: {payload}"
+        return message
+
+
+class JsonFormatter(logging.Formatter):
+    """
+    One compact JSON object per line: ts, level, logger, msg, plus a nested
+    ``payload`` and ``exc`` when present.
+    """
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "ts": datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "msg": record.getMessage(),
+        }
+        payload = getattr(record, "payload", None)
+        if payload is not None:
+            entry["payload"] = payload
+        if record.exc_info:
+            entry["exc"] = self.formatException(record.exc_info)
+        return json.dumps(entry, default=str, separators=(",", ":"))
+
+
+class _DeferredQueueHandler(QueueHandler):
+    # The stock prepare() renders the message on the caller's thread; here the
+    # record is queued as-is and formatted by the listener thread instead.
+    # Args (e.g. response dicts) must not be mutated after logging them.
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        return record
+
+
+def setup_logging(
+    log_dir: str = "logs",
+    log_filename: str = "trading_bot.log",
+    log_format: Optional[str] = None,
+    use_queue: Optional[bool] = None,
+    response_sample: Optional[float] = None,
+) -> None:
     """
     Configure application-wide logging.
 
-    Creates a rotating file handler and a simple console handler.
+    Creates a rotating file handler and a simple console handler. By default
+    both sit behind a QueueHandler/QueueListener pair, so logging calls only
+    enqueue the record and formatting and file I/O happen on a background
+    thread. Unset arguments come from TRADING_BOT_LOG_FORMAT (text or json),
+    TRADING_BOT_LOG_QUEUE and TRADING_BOT_LOG_RESPONSE_SAMPLE.
     """
+    global _listener, _queue_handler, _response_sample
+
     os.makedirs(log_dir, exist_ok=True)
     log_path = os.path.join(log_dir, log_filename)
 
@@ -17,21 +81,86 @@ def setup_logging(log_dir: str = "logs", log_filename: str = "trading_bot.log")
         # Already configured
         return
 
+    if log_format is None:
+        log_format = os.getenv("TRADING_BOT_LOG_FORMAT", "text")
+    if use_queue is None:
+        use_queue = os.getenv("TRADING_BOT_LOG_QUEUE", "1") != "0"
+    if response_sample is None:
+        response_sample = float(os.getenv("TRADING_BOT_LOG_RESPONSE_SAMPLE", "1"))
+    if log_format not in ("text", "json"):
+        raise ValueError("log_format must be text or json.")
+    _response_sample = min(max(response_sample, 0.0), 1.0)
+
     logger.setLevel(logging.INFO)
 
     file_handler = RotatingFileHandler(
         log_path, maxBytes=5 * 1024 * 1024, backupCount=2, encoding="utf-8"
     )
-    file_formatter = logging.Formatter(
-        "%(asctime)s [%(levelname)s] %(name)s - %(message)s"
-    )
-    file_handler.setFormatter(file_formatter)
-
     console_handler = logging.StreamHandler()
-    console_formatter = logging.Formatter("%(levelname)s - %(message)s")
-    console_handler.setFormatter(console_formatter)
+    if log_format == "json":
+        file_handler.setFormatter(JsonFormatter())
+        console_handler.setFormatter(JsonFormatter())
+    else:
+        file_handler.setFormatter(TextFormatter("%(asctime)s [%(levelname)s] %(name)s - %(message)s"))
+        console_handler.setFormatter(TextFormatter("%(levelname)s - %(message)s"))
+    handlers: List[logging.Handler] = [file_handler, console_handler]
 
-    logger.addHandler(file_handler)
-    logger.addHandler(console_handler)
+    if not use_queue:
+        for handler in handlers:
+            logger.addHandler(handler)
+        return
+
+    log_queue: "queue.SimpleQueue[Any]" = queue.SimpleQueue()
+    _queue_handler = _DeferredQueueHandler(log_queue)
+    _listener = QueueListener(log_queue, *handlers, respect_handler_level=True)
+    _listener.start()
+    logger.addHandler(_queue_handler)
+
+
+def stop_logging() -> None:
+    """
+    Drain the log queue, stop the listener thread and detach all handlers
+    installed by setup_logging. Registered with atexit.
+    """
+    global _listener, _queue_handler
+
+    logger = logging.getLogger()
+    if _listener is not None:
+        _listener.stop()
+        handlers = list(_listener.handlers)
+        logger.removeHandler(_queue_handler)
+        _listener = None
+        _queue_handler = None
+    else:
+        handlers = [h for h in logger.handlers if isinstance(h.formatter, (TextFormatter, JsonFormatter))]
+        for handler in handlers:
+            logger.removeHandler(handler)
+    for handler in handlers:
+        handler.close()
 
 
+atexit.register(stop_logging)
+
+
+def log_response(
+    logger: logging.Logger, message: str, response: Any, level: int = logging.INFO
+) -> None:
+    """
+    Log an exchange response.
+
+    A TRADING_BOT_LOG_RESPONSE_SAMPLE fraction of calls log the full response
+    as the record's payload (rendered only when a handler formats it); the
+    rest log a one-line summary of order ids and statuses.
+    """
+    if not logger.isEnabledFor(level):
+        return
+    if _response_sample >= 1.0 or random.random() < _response_sample:
+        logger.log(level, message, extra={"payload": response})
+        return
+    orders = response if isinstance(response, list) else [response]
+    logger.log(
+        level,
+        "%s: %s",
+        message,
+        " ".join(f"{r.get('orderId')}={r.get('status')}" for r in orders if isinstance(r, dict)),
+    )
@@ -0,0 +1,275 @@
+import asyncio
+import json
+import logging
+import os
+import random
+import time
+from array import array
+from decimal import Decimal
+from typing import Any, Callable, Dict, Iterable, List, NamedTuple, Optional
+
+from websockets.asyncio.client import connect
+from websockets.exceptions import WebSocketException
+
+from .risk import check_price_band
+from .user_stream import DEFAULT_FUTURES_WS_URL
+from .validators import ValidationError
+
+logger = logging.getLogger(__name__)
+
+# Slot layout: [bid, bid_qty, ask, ask_qty, book_time, book_received,
+# mark_price, mark_time, mark_received]. A bookTicker update rewrites the
+# first six values and a markPrice update the last three, each with one
+# slice assignment. *_time is the exchange's event time, *_received the
+# local time.monotonic() on arrival.
+_BOOK = slice(0, 6)
+_MARK = slice(6, 9)
+_WIDTH = 9
+
+
+class Quote(NamedTuple):
+    symbol: str
+    bid: float
+    bid_qty: float
+    ask: float
+    ask_qty: float
+    book_time: float
+    book_received: float
+    mark_price: float
+    mark_time: float
+    mark_received: float
+
+    @property
+    def mid(self) -> float:
+        return (self.bid + self.ask) / 2 if self.bid and self.ask else 0.0
+
+    @property
+    def updated_at(self) -> float:
+        # Exchange time, for display; staleness uses received_at.
+        return max(self.book_time, self.mark_time)
+
+    @property
+    def received_at(self) -> float:
+        return max(self.book_received, self.mark_received)
+
+
+class QuoteStore:
+    """
+    Latest book ticker and mark price per symbol, in one flat array of doubles.
+
+    Writers replace a slot's book or mark block with a single slice
+    assignment and readers copy the whole slot with a single slice, both of
+    which are atomic under the GIL, so reads never take a lock and never see
+    a half-written update.
+    """
+
+    def __init__(self, symbols: Iterable[str] = ()) -> None:
+        self._slots: Dict[str, int] = {}
+        self._data = array("d")
+        for symbol in symbols:
+            self._slot(symbol)
+
+    @property
+    def symbols(self) -> List[str]:
+        return list(self._slots)
+
+    def _slot(self, symbol: str) -> int:
+        slot = self._slots.get(symbol)
+        if slot is None:
+            slot = len(self._data)
+            self._data.extend([0.0] * _WIDTH)
+            self._slots[symbol] = slot
+        return slot
+
+    def update_book(
+        self,
+        symbol: str,
+        bid: float,
+        bid_qty: float,
+        ask: float,
+        ask_qty: float,
+        ts: float,
+        received: Optional[float] = None,
+    ) -> None:
+        received = time.monotonic() if received is None else received
+        slot = self._slot(symbol)
+        self._data[slot + _BOOK.start : slot + _BOOK.stop] = array("d", (bid, bid_qty, ask, ask_qty, ts, received))
+
+    def update_mark(self, symbol: str, mark_price: float, ts: float, received: Optional[float] = None) -> None:
+        received = time.monotonic() if received is None else received
+        slot = self._slot(symbol)
+        self._data[slot + _MARK.start : slot + _MARK.stop] = array("d", (mark_price, ts, received))
+
+    def get(self, symbol: str) -> Optional[Quote]:
+        slot = self._slots.get(symbol)
+        if slot is None:
+            return None
+        values = self._data[slot : slot + _WIDTH]
+        if not values[5] and not values[8]:
+            return None
+        return Quote(symbol, *values)
+
+
+class MarketData:
+    """
+    Quote store fed by the combined ``bookTicker`` / ``markPrice`` streams.
+
+    ``check_order`` gives order placement a local reference price: LIMIT
+    prices too far from the mark price are rejected, and MARKET orders get a
+    notional check against the touch. Without a fresh quote the checks are
+    skipped rather than blocking trading. Freshness is judged by when a
+    quote arrived (on ``clock``), so exchange clock skew cannot hide or
+    invent staleness.
+    """
+
+    def __init__(
+        self,
+        symbols: Iterable[str] = (),
+        ws_url: Optional[str] = None,
+        price_band: float = 0.05,
+        max_age: float = 5.0,
+        max_backoff: float = 60.0,
+        min_healthy: float = 30.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.symbols = [s.upper() for s in symbols]
+        self.store = QuoteStore(self.symbols)
+        self.ws_url = (ws_url or os.getenv("BINANCE_FUTURES_WS_URL", DEFAULT_FUTURES_WS_URL)).rstrip("/")
+        self.price_band = price_band
+        self.max_age = max_age
+        self.max_backoff = max_backoff
+        self.min_healthy = min_healthy
+        self.clock = clock
+        self.connects = 0
+        self.messages = 0
+        self._task: Optional[asyncio.Task] = None
+
+    @classmethod
+    def from_env(cls, symbols: Iterable[str] = ()) -> "MarketData":
+        """
+        TRADING_BOT_MARKET_SYMBOLS plus any ``symbols`` the caller needs.
+        """
+        configured = [s.strip() for s in os.getenv("TRADING_BOT_MARKET_SYMBOLS", "").split(",") if s.strip()]
+        return cls(
+            symbols=list(dict.fromkeys(configured + [s.upper() for s in symbols])),
+            price_band=float(os.getenv("TRADING_BOT_PRICE_BAND", "0.05")),
+            max_age=float(os.getenv("TRADING_BOT_QUOTE_MAX_AGE", "5")),
+        )
+
+    @property
+    def stream_url(self) -> str:
+        streams = []
+        for symbol in self.symbols:
+            streams += [f"{symbol.lower()}@bookTicker", f"{symbol.lower()}@markPrice@1s"]
+        return f"{self.ws_url}/stream?streams=" + "/".join(streams)
+
+    def get(self, symbol: str) -> Optional[Quote]:
+        return self.store.get(symbol)
+
+    def fresh(self, symbol: str) -> Optional[Quote]:
+        """
+        The symbol's quote if it arrived within ``max_age`` seconds, else None.
+        """
+        quote = self.store.get(symbol)
+        if quote is None or self.clock() - quote.received_at > self.max_age:
+            return None
+        return quote
+
+    def apply(self, message: Dict[str, Any]) -> None:
+        """
+        Apply one (combined-stream or raw) bookTicker / markPriceUpdate event.
+        """
+        data = message.get("data", message)
+        event = data.get("e")
+        ts = (data.get("T") or data.get("E") or 0) / 1000 or time.time()
+        if event == "bookTicker":
+            self.store.update_book(
+                data["s"], float(data["b"]), float(data["B"]), float(data["a"]), float(data["A"]), ts, self.clock()
+            )
+        elif event == "markPriceUpdate":
+            self.store.update_mark(data["s"], float(data["p"]), ts, self.clock())
+        else:
+            return
+        self.messages += 1
+
+    def start(self) -> None:
+        if self._task is None and self.symbols:
+            self._task = asyncio.get_running_loop().create_task(self.run(), name="market-data")
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def run(self) -> None:
+        attempt = 0
+        while True:
+            connected: Optional[float] = None
+            try:
+                async with connect(self.stream_url) as ws:
+                    connected = self.clock()
+                    self.connects += 1
+                    logger.info("Market data stream connected for %s.", ",".join(self.symbols))
+                    async for raw in ws:
+                        self.apply(json.loads(raw))
+            except asyncio.CancelledError:
+                raise
+            except (OSError, WebSocketException):
+                logger.warning("Market data stream disconnected; reconnecting.")
+            except Exception:
+                logger.exception("Market data stream failed.")
+            # A server that accepts and then drops the connection at once
+            # still backs off; only one that stayed up resets the backoff.
+            if connected is not None and self.clock() - connected >= self.min_healthy:
+                attempt = 0
+            else:
+                attempt += 1
+            delay = min(self.max_backoff, 0.5 * 2 ** attempt)
+            await asyncio.sleep(random.uniform(0, delay))
+
+    def check_order(
+        self,
+        symbol: str,
+        side: str,
+        order_type: str,
+        quantity: Decimal,
+        price: Optional[Decimal] = None,
+        min_notional: Decimal = Decimal("0"),
+    ) -> None:
+        """
+        Reject LIMIT prices outside the band around the mark price and MARKET
+        orders whose notional at the touch is below ``min_notional``.
+        """
+        quote = self.fresh(symbol)
+        if quote is None:
+            return
+
+        if price is not None:
+            # Same check as the risk engine's price_band, with the env-wide band.
+            check_price_band(symbol, price, quote.mark_price or quote.mid, self.price_band)
+        elif min_notional > 0:
+            touch = quote.ask if side == "BUY" else quote.bid
+            if touch and float(quantity) * touch < float(min_notional):
+                raise ValidationError(
+                    f"Order notional {float(quantity) * touch:.2f} at {touch} is below "
+                    f"minimum {min_notional} for {symbol}."
+                )
+
+
+def quote_to_dict(quote: Quote) -> Dict[str, Any]:
+    return {
+        "symbol": quote.symbol,
+        "bid": quote.bid,
+        "bid_qty": quote.bid_qty,
+        "ask": quote.ask,
+        "ask_qty": quote.ask_qty,
+        "mid": quote.mid,
+        "spread": quote.ask - quote.bid if quote.bid and quote.ask else None,
+        "mark_price": quote.mark_price or None,
+        "updated_at": quote.updated_at,
+        "age_ms": round((time.monotonic() - quote.received_at) * 1000, 3),
+    }
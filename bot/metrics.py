@@ -0,0 +1,214 @@
+import bisect
+import threading
+from abc import ABC, abstractmethod
+from typing import Dict, Iterator, List, Sequence, Tuple
+
+from binance.exceptions import BinanceAPIException
+from prometheus_client import CONTENT_TYPE_LATEST, CollectorRegistry, generate_latest
+from prometheus_client.core import CounterMetricFamily, HistogramMetricFamily
+
+from .retry import is_ambiguous
+
+# Seconds; spans in-process work (validation, enqueue) to slow exchange calls.
+LATENCY_BUCKETS = (
+    0.00001, 0.000025, 0.00005, 0.0001, 0.00025, 0.0005,
+    0.001, 0.0025, 0.005, 0.01, 0.025, 0.05,
+    0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0,
+)
+
+
+class _HistogramChild:
+    __slots__ = ("_bounds", "counts", "sum", "_lock")
+
+    def __init__(self, bounds: Sequence[float]) -> None:
+        self._bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)
+        self.sum = 0.0
+        self._lock = threading.Lock()
+
+    def observe(self, value: float) -> None:
+        index = bisect.bisect_left(self._bounds, value)
+        with self._lock:
+            self.counts[index] += 1
+            self.sum += value
+
+
+class _CounterChild:
+    __slots__ = ("value", "_lock")
+
+    def __init__(self) -> None:
+        self.value = 0.0
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1.0) -> None:
+        with self._lock:
+            self.value += amount
+
+
+class _Metric(ABC):
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str]) -> None:
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._children: Dict[Tuple[str, ...], object] = {}
+        self._lock = threading.Lock()
+        _METRICS.append(self)
+
+    @abstractmethod
+    def _new_child(self) -> object:
+        """
+        A fresh child holding one label combination's values.
+        """
+
+    def labels(self, *values: str):
+        """
+        Child for one label combination; cached, so repeat lookups are a dict hit.
+        """
+        child = self._children.get(values)
+        if child is None:
+            if len(values) != len(self.labelnames):
+                raise ValueError(f"{self.name} expects labels {self.labelnames}.")
+            with self._lock:
+                child = self._children.setdefault(values, self._new_child())
+        return child
+
+
+class Histogram(_Metric):
+    """
+    Labelled latency histogram with a prometheus_client-compatible export.
+
+    Recording is a bisect plus two increments under an uncontended per-child
+    lock, several times cheaper than prometheus_client's own Histogram; the
+    hot path records four of these per order.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = LATENCY_BUCKETS,
+    ) -> None:
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(buckets)
+
+    def _new_child(self) -> _HistogramChild:
+        return _HistogramChild(self.buckets)
+
+    def observe(self, value: float) -> None:
+        self.labels().observe(value)
+
+    def collect(self) -> HistogramMetricFamily:
+        family = HistogramMetricFamily(self.name, self.documentation, labels=self.labelnames)
+        for values, child in list(self._children.items()):
+            with child._lock:
+                counts = list(child.counts)
+                total = child.sum
+            cumulative: List[Tuple[str, float]] = []
+            running = 0
+            for bound, n in zip(self.buckets, counts):
+                running += n
+                cumulative.append((repr(float(bound)), running))
+            cumulative.append(("+Inf", running + counts[-1]))
+            family.add_metric(list(values), cumulative, total)
+        return family
+
+
+class Counter(_Metric):
+    def _new_child(self) -> _CounterChild:
+        return _CounterChild()
+
+    def inc(self, amount: float = 1.0) -> None:
+        self.labels().inc(amount)
+
+    def collect(self) -> CounterMetricFamily:
+        family = CounterMetricFamily(self.name, self.documentation, labels=self.labelnames)
+        for values, child in list(self._children.items()):
+            family.add_metric(list(values), child.value)
+        return family
+
+
+_METRICS: List[_Metric] = []
+
+
+class _Collector:
+    def collect(self) -> Iterator:
+        for metric in _METRICS:
+            yield metric.collect()
+
+
+REGISTRY = CollectorRegistry(auto_describe=False)
+REGISTRY.register(_Collector())
+
+
+def render_latest() -> Tuple[bytes, str]:
+    """
+    Prometheus text exposition of every metric, and its content type.
+    """
+    return generate_latest(REGISTRY), CONTENT_TYPE_LATEST
+
+
+ORDER_SECONDS = Histogram(
+    "trading_bot_order_seconds",
+    "Total time to validate, place and hand off one order.",
+    ["symbol", "type", "outcome"],
+)
+VALIDATION_SECONDS = Histogram(
+    "trading_bot_order_validation_seconds",
+    "Local order validation (input, symbol filters, price checks).",
+    ["symbol", "type", "outcome"],
+)
+EXCHANGE_SECONDS = Histogram(
+    "trading_bot_exchange_round_trip_seconds",
+    "Order placement round trip to the exchange, including retries.",
+    ["symbol", "type", "outcome"],
+)
+DB_PERSIST_SECONDS = Histogram(
+    "trading_bot_db_persist_seconds",
+    "Time to write a batch of orders to the database.",
+    ["outcome"],
+)
+HTTP_REQUEST_SECONDS = Histogram(
+    "trading_bot_http_request_seconds",
+    "API request handling time.",
+    ["method", "route", "status"],
+)
+RISK_REJECTIONS = Counter(
+    "trading_bot_risk_rejections_total",
+    "Orders rejected by pre-trade risk checks, by check.",
+    ["check"],
+)
+STRATEGY_CPU_SECONDS = Counter(
+    "trading_bot_strategy_cpu_seconds_total",
+    "Event-loop CPU time spent in strategy callbacks, by strategy.",
+    ["strategy"],
+)
+STRATEGY_OVERRUNS = Counter(
+    "trading_bot_strategy_budget_overruns_total",
+    "Strategy callbacks that used more than their CPU budget, by strategy.",
+    ["strategy"],
+)
+BINANCE_ERRORS = Counter(
+    "trading_bot_binance_errors_total",
+    "Exchange errors by Binance error code (network for transport failures).",
+    ["code"],
+)
+
+
+def order_outcome(exc: BaseException) -> str:
+    """
+    Outcome label for a failed call: rejected (the exchange or our checks
+    said no) or error (we don't know what happened).
+    """
+    return "error" if is_ambiguous(exc) else "rejected"
+
+
+def record_binance_error(exc: BaseException) -> None:
+    """
+    Count an exchange error by its Binance code, or as ``network`` for
+    transport failures. Anything else is not an exchange error and is skipped.
+    """
+    if isinstance(exc, BinanceAPIException):
+        BINANCE_ERRORS.labels(str(exc.code)).inc()
+    elif is_ambiguous(exc):
+        BINANCE_ERRORS.labels("network").inc()
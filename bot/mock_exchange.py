@@ -0,0 +1,695 @@
+import asyncio
+import hashlib
+import heapq
+import hmac
+import itertools
+import json
+import math
+import os
+import random
+import re
+import socket
+import threading
+import time
+from dataclasses import dataclass, field
+from decimal import Decimal, InvalidOperation
+from typing import Any, Dict, List, NamedTuple, Optional, Sequence, Tuple
+from urllib.parse import parse_qsl
+
+import typer
+import uvicorn
+from fastapi import FastAPI, Request, Response
+
+from .client import KLINE_INTERVALS, MAX_BATCH_ORDERS, MAX_KLINES
+from .rate_limit import request_cost
+
+OPEN_STATUSES = ("NEW", "PARTIALLY_FILLED")
+_SIGNATURE = re.compile(r"&?signature=[0-9a-fA-F]*")
+
+
+class MockSymbol(NamedTuple):
+    symbol: str
+    price: Decimal
+    tick_size: Decimal
+    step_size: Decimal
+    min_qty: Decimal
+    max_qty: Decimal
+    min_notional: Decimal
+
+
+DEFAULT_SYMBOLS = (
+    MockSymbol("BTCUSDT", Decimal("70000"), Decimal("0.10"), Decimal("0.001"), Decimal("0.001"), Decimal("1000"), Decimal("100")),
+    MockSymbol("ETHUSDT", Decimal("3500"), Decimal("0.01"), Decimal("0.001"), Decimal("0.001"), Decimal("10000"), Decimal("20")),
+    MockSymbol("SOLUSDT", Decimal("150"), Decimal("0.010"), Decimal("1"), Decimal("1"), Decimal("100000"), Decimal("5")),
+)
+
+
+class MockError(Exception):
+    """
+    A Binance-style error reply: HTTP status, error code and message.
+    """
+
+    def __init__(self, code: int, msg: str, status: int = 400) -> None:
+        super().__init__(msg)
+        self.code = code
+        self.msg = msg
+        self.status = status
+
+    def body(self) -> Dict[str, Any]:
+        return {"code": self.code, "msg": self.msg}
+
+
+def _fmt(value: Decimal) -> str:
+    return format(value.normalize(), "f") if value else "0"
+
+
+def _param_decimal(params: Dict[str, Any], name: str) -> Decimal:
+    try:
+        value = Decimal(str(params[name]))
+    except (KeyError, InvalidOperation):
+        raise MockError(-1102, f"Mandatory parameter '{name}' was not sent, was empty/null, or malformed.")
+    if not value.is_finite():
+        raise MockError(-1102, f"Mandatory parameter '{name}' was not sent, was empty/null, or malformed.")
+    return value
+
+
+@dataclass
+class _Order:
+    order_id: int
+    symbol: str
+    side: str
+    order_type: str
+    quantity: Decimal
+    price: Decimal
+    time_in_force: str
+    client_order_id: str
+    status: str = "NEW"
+    executed: Decimal = Decimal("0")
+    cum_quote: Decimal = Decimal("0")
+    update_time: int = 0
+
+    @property
+    def remaining(self) -> Decimal:
+        return self.quantity - self.executed
+
+    def to_dict(self) -> Dict[str, Any]:
+        avg = self.cum_quote / self.executed if self.executed else Decimal("0")
+        return {
+            "orderId": self.order_id,
+            "symbol": self.symbol,
+            "status": self.status,
+            "clientOrderId": self.client_order_id,
+            "price": _fmt(self.price),
+            "avgPrice": _fmt(avg),
+            "origQty": _fmt(self.quantity),
+            "executedQty": _fmt(self.executed),
+            "cumQuote": _fmt(self.cum_quote),
+            "timeInForce": self.time_in_force,
+            "type": self.order_type,
+            "side": self.side,
+            "reduceOnly": False,
+            "updateTime": self.update_time,
+        }
+
+
+@dataclass
+class _Position:
+    amount: Decimal = Decimal("0")
+    entry_price: Decimal = Decimal("0")
+    realized: Decimal = Decimal("0")
+
+
+@dataclass
+class _Book:
+    spec: MockSymbol
+    mark: Decimal
+    # Heaps of (sort key, sequence, order id); cancelled or filled entries are
+    # skipped when they reach the top.
+    bids: List[Tuple[Decimal, int, int]] = field(default_factory=list)
+    asks: List[Tuple[Decimal, int, int]] = field(default_factory=list)
+    position: _Position = field(default_factory=_Position)
+
+
+class MatchingEngine:
+    """
+    Price-time priority matching for MARKET and LIMIT orders.
+
+    Incoming orders match resting orders first. Whatever is left trades
+    against synthetic liquidity at the touch (mark price +/- ``half_spread``),
+    so MARKET orders always fill. LIMIT orders that do not cross rest on the
+    book (GTC) or expire (IOC/FOK). ``set_mark`` moves the synthetic touch
+    and fills resting orders it trades through. Not thread-safe; MockExchange
+    serialises access.
+    """
+
+    def __init__(self, symbols: Sequence[MockSymbol] = DEFAULT_SYMBOLS, half_spread: Decimal = Decimal("0.0001")) -> None:
+        self.books = {s.symbol: _Book(s, s.price) for s in symbols}
+        self.half_spread = half_spread
+        self.orders: Dict[int, _Order] = {}
+        self._by_client_id: Dict[str, int] = {}
+        self._ids = itertools.count(1)
+        self._seq = itertools.count()
+        self.fills = 0
+
+    def exchange_info(self) -> Dict[str, Any]:
+        return {
+            "timezone": "UTC",
+            "symbols": [
+                {
+                    "symbol": s.symbol,
+                    "status": "TRADING",
+                    "contractType": "PERPETUAL",
+                    "filters": [
+                        {"filterType": "PRICE_FILTER", "minPrice": _fmt(s.tick_size), "maxPrice": "1000000", "tickSize": _fmt(s.tick_size)},
+                        {"filterType": "LOT_SIZE", "minQty": _fmt(s.min_qty), "maxQty": _fmt(s.max_qty), "stepSize": _fmt(s.step_size)},
+                        {"filterType": "MARKET_LOT_SIZE", "minQty": _fmt(s.min_qty), "maxQty": _fmt(s.max_qty), "stepSize": _fmt(s.step_size)},
+                        {"filterType": "MIN_NOTIONAL", "notional": _fmt(s.min_notional)},
+                    ],
+                }
+                for s in (b.spec for b in self.books.values())
+            ],
+        }
+
+    def touch(self, symbol: str) -> Tuple[Decimal, Decimal]:
+        """
+        Synthetic (bid, ask) around the mark price, on the tick grid.
+        """
+        book = self.books[symbol]
+        tick = book.spec.tick_size
+        bid = (book.mark * (1 - self.half_spread) / tick).to_integral_value(rounding="ROUND_FLOOR") * tick
+        ask = (book.mark * (1 + self.half_spread) / tick).to_integral_value(rounding="ROUND_CEILING") * tick
+        return bid, ask
+
+    def place(self, params: Dict[str, Any]) -> _Order:
+        book = self.books.get(params.get("symbol", ""))
+        if book is None:
+            raise MockError(-1121, "Invalid symbol.")
+        side = params.get("side")
+        if side not in ("BUY", "SELL"):
+            raise MockError(-1117, "Invalid side.")
+        order_type = params.get("type")
+        if order_type not in ("MARKET", "LIMIT"):
+            raise MockError(-1116, "Invalid orderType.")
+        spec = book.spec
+        quantity = _param_decimal(params, "quantity")
+        if quantity <= 0:
+            raise MockError(-4003, "Quantity less than or equal to zero.")
+        if quantity % spec.step_size:
+            raise MockError(-1111, "Precision is over the maximum defined for this asset.")
+        if quantity < spec.min_qty or quantity > spec.max_qty:
+            raise MockError(-4005, "Quantity greater than max quantity." if quantity > spec.max_qty else "Quantity less than min quantity.")
+
+        price = Decimal("0")
+        time_in_force = "GTC"
+        if order_type == "LIMIT":
+            price = _param_decimal(params, "price")
+            time_in_force = params.get("timeInForce") or ""
+            if time_in_force not in ("GTC", "IOC", "FOK"):
+                raise MockError(-1102, "Mandatory parameter 'timeInForce' was not sent, was empty/null, or malformed.")
+            if price <= 0 or price % spec.tick_size:
+                raise MockError(-4014, "Price not increased by tick size.")
+        bid, ask = self.touch(spec.symbol)
+        notional = quantity * (price or (ask if side == "BUY" else bid))
+        if notional < spec.min_notional:
+            raise MockError(-4164, f"Order's notional must be no smaller than {_fmt(spec.min_notional)} (unless you choose reduce only).")
+
+        client_order_id = params.get("newClientOrderId") or f"mock{next(self._seq)}"
+        existing = self._by_client_id.get(client_order_id)
+        if existing is not None and self.orders[existing].status in OPEN_STATUSES:
+            raise MockError(-4116, "ClientOrderId is duplicated.")
+
+        order = _Order(
+            order_id=next(self._ids),
+            symbol=spec.symbol,
+            side=side,
+            order_type=order_type,
+            quantity=quantity,
+            price=price,
+            time_in_force=time_in_force,
+            client_order_id=client_order_id,
+            update_time=int(time.time() * 1000),
+        )
+        self.orders[order.order_id] = order
+        self._by_client_id[client_order_id] = order.order_id
+        self._match(book, order)
+        return order
+
+    def cancel(self, params: Dict[str, Any]) -> _Order:
+        order = self.find(params)
+        if order.status not in OPEN_STATUSES:
+            raise MockError(-2011, "Unknown order sent.")
+        order.status = "CANCELED"
+        order.update_time = int(time.time() * 1000)
+        return order
+
+    def find(self, params: Dict[str, Any]) -> _Order:
+        order_id = params.get("orderId")
+        if order_id is None and params.get("origClientOrderId"):
+            order_id = self._by_client_id.get(params["origClientOrderId"])
+        order = self.orders.get(int(order_id)) if order_id is not None else None
+        if order is None or order.symbol != params.get("symbol", order.symbol):
+            raise MockError(-2013, "Order does not exist.")
+        return order
+
+    def open_orders(self, symbol: Optional[str] = None) -> List[_Order]:
+        return [
+            o for o in self.orders.values()
+            if o.status in OPEN_STATUSES and (symbol is None or o.symbol == symbol)
+        ]
+
+    def set_mark(self, symbol: str, price: Decimal) -> List[_Order]:
+        """
+        Move the mark price; resting orders the new touch crosses fill at
+        their limit price. Returns the orders that traded.
+        """
+        book = self.books[symbol]
+        book.mark = Decimal(str(price))
+        bid, ask = self.touch(symbol)
+        traded = []
+        for heap, crosses in ((book.bids, lambda p: p >= ask), (book.asks, lambda p: p <= bid)):
+            while heap:
+                order = self.orders[heap[0][2]]
+                if order.status not in OPEN_STATUSES:
+                    heapq.heappop(heap)
+                    continue
+                if not crosses(order.price):
+                    break
+                heapq.heappop(heap)
+                self._fill(book, order, order.remaining, order.price)
+                traded.append(order)
+        return traded
+
+    def klines(self, params: Dict[str, Any], now_ms: Optional[int] = None) -> List[List[Any]]:
+        """
+        Synthetic candles: a deterministic daily sine wave around the
+        symbol's initial price, so repeated downloads agree. Paged like
+        /fapi/v1/klines (startTime, endTime, limit up to 1500).
+        """
+        book = self.books.get(params.get("symbol", ""))
+        if book is None:
+            raise MockError(-1121, "Invalid symbol.")
+        step = KLINE_INTERVALS.get(params.get("interval", ""))
+        if step is None:
+            raise MockError(-1120, "Invalid interval.")
+        limit = min(int(params.get("limit") or 500), MAX_KLINES)
+        # Candles open on multiples of the interval, up to the current one.
+        last = ((now_ms if now_ms is not None else int(time.time() * 1000)) // step) * step
+        if params.get("endTime"):
+            last = min(last, (int(params["endTime"]) // step) * step)
+        if params.get("startTime"):
+            first = -(-int(params["startTime"]) // step) * step
+        else:
+            first = last - (limit - 1) * step
+        spec = book.spec
+        base = float(spec.price)
+
+        def price(t: int) -> float:
+            return base * (1 + 0.01 * math.sin(2 * math.pi * t / 86_400_000))
+
+        rows = []
+        for open_time in range(first, min(last, first + (limit - 1) * step) + 1, step):
+            o, c = price(open_time), price(open_time + step)
+            h, low = max(o, c) * 1.0002, min(o, c) * 0.9998
+            volume = 1 + (open_time // step) % 7
+            values = [_fmt(Decimal(str(v)).quantize(spec.tick_size)) for v in (o, h, low, c)]
+            rows.append(
+                [open_time, *values, str(volume), open_time + step - 1, str(round(volume * c, 2)), 10, "0", "0", "0"]
+            )
+        return rows
+
+    def positions(self) -> List[Dict[str, Any]]:
+        result = []
+        for symbol, book in self.books.items():
+            pos = book.position
+            result.append(
+                {
+                    "symbol": symbol,
+                    "positionAmt": _fmt(pos.amount),
+                    "entryPrice": _fmt(pos.entry_price),
+                    "markPrice": _fmt(book.mark),
+                    "unRealizedProfit": _fmt(pos.amount * (book.mark - pos.entry_price)),
+                    "positionSide": "BOTH",
+                }
+            )
+        return result
+
+    def _match(self, book: _Book, order: _Order) -> None:
+        buy = order.side == "BUY"
+        limit = order.price if order.order_type == "LIMIT" else None
+        bid, ask = self.touch(order.symbol)
+        crosses_touch = limit is None or (limit >= ask if buy else limit <= bid)
+
+        if order.time_in_force == "FOK" and not crosses_touch:
+            if self._resting_volume(book, order) < order.quantity:
+                order.status = "EXPIRED"
+                return
+
+        opposite = book.asks if buy else book.bids
+        while order.remaining > 0 and opposite:
+            resting = self.orders[opposite[0][2]]
+            if resting.status not in OPEN_STATUSES:
+                heapq.heappop(opposite)
+                continue
+            if limit is not None and (resting.price > limit if buy else resting.price < limit):
+                break
+            qty = min(order.remaining, resting.remaining)
+            self._fill(book, resting, qty, resting.price)
+            self._fill(book, order, qty, resting.price)
+            if resting.remaining == 0:
+                heapq.heappop(opposite)
+
+        if order.remaining > 0 and crosses_touch:
+            self._fill(book, order, order.remaining, ask if buy else bid)
+        if order.remaining > 0:
+            if order.time_in_force == "GTC":
+                key = -order.price if buy else order.price
+                heapq.heappush(book.bids if buy else book.asks, (key, next(self._seq), order.order_id))
+            else:
+                order.status = "EXPIRED"
+
+    def _resting_volume(self, book: _Book, order: _Order) -> Decimal:
+        buy = order.side == "BUY"
+        total = Decimal("0")
+        for _, _, order_id in book.asks if buy else book.bids:
+            resting = self.orders[order_id]
+            if resting.status in OPEN_STATUSES and (resting.price <= order.price if buy else resting.price >= order.price):
+                total += resting.remaining
+        return total
+
+    def _fill(self, book: _Book, order: _Order, qty: Decimal, price: Decimal) -> None:
+        order.executed += qty
+        order.cum_quote += qty * price
+        order.status = "FILLED" if order.remaining == 0 else "PARTIALLY_FILLED"
+        order.update_time = int(time.time() * 1000)
+        self.fills += 1
+
+        pos = book.position
+        signed = qty if order.side == "BUY" else -qty
+        if pos.amount == 0 or (pos.amount > 0) == (signed > 0):
+            total = abs(pos.amount) + qty
+            pos.entry_price = (abs(pos.amount) * pos.entry_price + qty * price) / total
+        else:
+            closed = min(qty, abs(pos.amount))
+            pos.realized += closed * (price - pos.entry_price) * (1 if pos.amount > 0 else -1)
+            if qty > abs(pos.amount):
+                pos.entry_price = price
+        pos.amount += signed
+        if pos.amount == 0:
+            pos.entry_price = Decimal("0")
+
+
+class MockExchange:
+    """
+    In-process stand-in for the Binance USD-M Futures REST API.
+
+    Implements the endpoints the bot uses (order, batchOrders, openOrders,
+    exchangeInfo, klines, listenKey, positionRisk, ping/time) on top of a
+    MatchingEngine. Every request waits ``latency`` plus up to ``jitter``
+    seconds; an ``error_rate`` fraction of order submissions fail with a 503
+    before reaching the engine; request weight and order counts are limited
+    per fixed window like the real exchange (0 disables a limit) and
+    reported in X-MBX-* headers. With ``api_secret`` set, HMAC signatures
+    and timestamps are checked.
+    """
+
+    def __init__(
+        self,
+        latency: float = 0.0,
+        jitter: float = 0.0,
+        error_rate: float = 0.0,
+        weight_limit: int = 2400,
+        order_limit_10s: int = 300,
+        order_limit_1m: int = 1200,
+        api_key: Optional[str] = None,
+        api_secret: Optional[str] = None,
+        symbols: Sequence[MockSymbol] = DEFAULT_SYMBOLS,
+        seed: Optional[int] = None,
+    ) -> None:
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.api_key = api_key
+        self._secret = api_secret.encode("utf-8") if api_secret else None
+        self.engine = MatchingEngine(symbols)
+        # name -> (limit, window seconds, header)
+        self._limits = {
+            "weight": (weight_limit, 60.0, "X-MBX-USED-WEIGHT-1M"),
+            "orders_10s": (order_limit_10s, 10.0, "X-MBX-ORDER-COUNT-10S"),
+            "orders_1m": (order_limit_1m, 60.0, "X-MBX-ORDER-COUNT-1M"),
+        }
+        self._used = {name: [-1, 0] for name in self._limits}
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._listen_keys = itertools.count(1)
+        self.requests = 0
+        self.rate_limited = 0
+        self.injected_errors = 0
+        self.rejected = 0
+
+    @classmethod
+    def from_env(cls) -> "MockExchange":
+        return cls(
+            latency=float(os.getenv("MOCK_EXCHANGE_LATENCY", "0")),
+            jitter=float(os.getenv("MOCK_EXCHANGE_JITTER", "0")),
+            error_rate=float(os.getenv("MOCK_EXCHANGE_ERROR_RATE", "0")),
+            weight_limit=int(os.getenv("MOCK_EXCHANGE_WEIGHT_LIMIT", "2400")),
+            order_limit_10s=int(os.getenv("MOCK_EXCHANGE_ORDER_LIMIT_10S", "300")),
+            order_limit_1m=int(os.getenv("MOCK_EXCHANGE_ORDER_LIMIT_1M", "1200")),
+            api_key=os.getenv("MOCK_EXCHANGE_API_KEY") or None,
+            api_secret=os.getenv("MOCK_EXCHANGE_API_SECRET") or None,
+        )
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            statuses: Dict[str, int] = {}
+            for order in self.engine.orders.values():
+                statuses[order.status] = statuses.get(order.status, 0) + 1
+            return {
+                "requests": self.requests,
+                "orders": len(self.engine.orders),
+                "fills": self.engine.fills,
+                "statuses": statuses,
+                "rejected": self.rejected,
+                "rate_limited": self.rate_limited,
+                "injected_errors": self.injected_errors,
+            }
+
+    def set_mark(self, symbol: str, price: Any) -> List[Dict[str, Any]]:
+        with self._lock:
+            return [o.to_dict() for o in self.engine.set_mark(symbol, Decimal(str(price)))]
+
+    async def handle(
+        self, method: str, path: str, query: str, body: str, api_key: Optional[str]
+    ) -> Tuple[int, Any, Dict[str, str]]:
+        """
+        Serve one request; returns (HTTP status, JSON body, headers).
+        """
+        delay = self.latency + (self._random.uniform(0, self.jitter) if self.jitter else 0.0)
+        if delay:
+            await asyncio.sleep(delay)
+
+        params = dict(parse_qsl(query))
+        params.update(parse_qsl(body))
+        with self._lock:
+            self.requests += 1
+            headers, retry_after = self._charge(method, path, params)
+            if retry_after is not None:
+                self.rate_limited += 1
+                headers["Retry-After"] = str(retry_after)
+                return 429, {"code": -1003, "msg": "Too many requests; please use the websocket for live updates."}, headers
+            try:
+                if path in ("/fapi/v1/order", "/fapi/v1/batchOrders") and method == "POST":
+                    if self.error_rate and self._random.random() < self.error_rate:
+                        self.injected_errors += 1
+                        raise MockError(-1001, "Internal error; unable to process your request. Please try again.", 503)
+                if path not in _PUBLIC_PATHS:
+                    # listenKey calls carry an API key but no signature.
+                    self._authenticate(query, body, params, api_key, signed=path != "/fapi/v1/listenKey")
+                return 200, self._route(method, path, params), headers
+            except MockError as exc:
+                self.rejected += 1
+                return exc.status, exc.body(), headers
+
+    def _charge(self, method: str, path: str, params: Dict[str, Any]) -> Tuple[Dict[str, str], Optional[int]]:
+        cost = request_cost(method, path, params)
+        now = time.time()
+        headers = {}
+        retry_after = None
+        for name, (limit, window, header) in self._limits.items():
+            used = self._used[name]
+            window_id = math.floor(now / window)
+            if used[0] != window_id:
+                used[0], used[1] = window_id, 0
+            used[1] += cost.get(name, 0)
+            headers[header] = str(used[1])
+            if limit and used[1] > limit:
+                wait = math.ceil((window_id + 1) * window - now)
+                retry_after = max(retry_after or 0, wait)
+        return headers, retry_after
+
+    def _authenticate(
+        self, query: str, body: str, params: Dict[str, Any], api_key: Optional[str], signed: bool
+    ) -> None:
+        if self.api_key is not None and api_key != self.api_key:
+            raise MockError(-2015, "Invalid API-key, IP, or permissions for action.", 401)
+        if self._secret is None or not signed:
+            return
+        # Binance signs the query string followed by the request body.
+        payload = _SIGNATURE.sub("", query) + _SIGNATURE.sub("", body)
+        expected = hmac.new(self._secret, payload.encode("utf-8"), hashlib.sha256).hexdigest()
+        if not hmac.compare_digest(expected, params.get("signature", "")):
+            raise MockError(-1022, "Signature for this request is not valid.")
+        try:
+            timestamp = int(params["timestamp"])
+        except (KeyError, ValueError):
+            raise MockError(-1102, "Mandatory parameter 'timestamp' was not sent, was empty/null, or malformed.")
+        recv_window = int(params.get("recvWindow", 5000))
+        if abs(time.time() * 1000 - timestamp) > recv_window:
+            raise MockError(-1021, "Timestamp for this request is outside of the recvWindow.")
+
+    def _route(self, method: str, path: str, params: Dict[str, Any]) -> Any:
+        engine = self.engine
+        if path == "/fapi/v1/ping":
+            return {}
+        if path == "/fapi/v1/time":
+            return {"serverTime": int(time.time() * 1000)}
+        if path == "/fapi/v1/exchangeInfo":
+            return engine.exchange_info()
+        if path == "/fapi/v1/klines":
+            return engine.klines(params)
+        if path == "/fapi/v1/order":
+            if method == "POST":
+                return engine.place(params).to_dict()
+            if method == "GET":
+                return engine.find(params).to_dict()
+            if method == "DELETE":
+                return engine.cancel(params).to_dict()
+        if path == "/fapi/v1/batchOrders" and method == "POST":
+            try:
+                batch = json.loads(params.get("batchOrders", ""))
+            except ValueError:
+                raise MockError(-1102, "Mandatory parameter 'batchOrders' was not sent, was empty/null, or malformed.")
+            if not isinstance(batch, list) or not batch or len(batch) > MAX_BATCH_ORDERS:
+                raise MockError(-4035, f"batchOrders must contain 1 to {MAX_BATCH_ORDERS} orders.")
+            results = []
+            for item in batch:
+                try:
+                    results.append(engine.place({k: str(v) for k, v in item.items()}).to_dict())
+                except MockError as exc:
+                    self.rejected += 1
+                    results.append(exc.body())
+            return results
+        if path == "/fapi/v1/openOrders" and method == "GET":
+            return [o.to_dict() for o in engine.open_orders(params.get("symbol"))]
+        if path == "/fapi/v2/positionRisk" and method == "GET":
+            return [p for p in engine.positions() if params.get("symbol") in (None, p["symbol"])]
+        if path == "/fapi/v1/listenKey":
+            if method == "POST":
+                return {"listenKey": f"mock{next(self._listen_keys):020d}"}
+            return {}
+        raise MockError(-1000, f"Unsupported endpoint {method} {path}.", 404)
+
+
+_PUBLIC_PATHS = ("/fapi/v1/ping", "/fapi/v1/time", "/fapi/v1/exchangeInfo", "/fapi/v1/klines")
+
+
+def create_app(exchange: Optional[MockExchange] = None) -> FastAPI:
+    """
+    ASGI app serving ``exchange`` (default: MockExchange.from_env()).
+    """
+    exchange = exchange or MockExchange.from_env()
+    app = FastAPI(title="Mock Binance Futures Exchange")
+    app.state.exchange = exchange
+
+    @app.api_route("/fapi/{version}/{endpoint}", methods=["GET", "POST", "PUT", "DELETE"])
+    async def dispatch(request: Request, version: str, endpoint: str) -> Response:
+        body = (await request.body()).decode("utf-8")
+        status, payload, headers = await exchange.handle(
+            request.method,
+            request.url.path,
+            request.url.query,
+            body,
+            request.headers.get("X-MBX-APIKEY"),
+        )
+        return Response(json.dumps(payload), status_code=status, headers=headers, media_type="application/json")
+
+    @app.get("/mock/stats")
+    def stats() -> dict:
+        return exchange.stats()
+
+    @app.post("/mock/mark/{symbol}")
+    def set_mark(symbol: str, price: float) -> list:
+        return exchange.set_mark(symbol, price)
+
+    return app
+
+
+class MockExchangeServer:
+    """
+    Run a MockExchange with uvicorn on a background thread (port 0 picks a
+    free port). Use as a context manager; ``url`` is the base URL.
+    """
+
+    def __init__(self, exchange: Optional[MockExchange] = None, host: str = "127.0.0.1", port: int = 0) -> None:
+        self.exchange = exchange or MockExchange()
+        self._socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self._socket.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        self._socket.bind((host, port))
+        config = uvicorn.Config(
+            create_app(self.exchange), log_level="warning", access_log=False, lifespan="off", backlog=2048
+        )
+        self._server = uvicorn.Server(config)
+        self._thread = threading.Thread(
+            target=self._server.run, kwargs={"sockets": [self._socket]}, name="mock-exchange", daemon=True
+        )
+
+    @property
+    def url(self) -> str:
+        host, port = self._socket.getsockname()[:2]
+        return f"http://{host}:{port}"
+
+    def start(self, timeout: float = 10.0) -> None:
+        self._thread.start()
+        deadline = time.monotonic() + timeout
+        while not self._server.started:
+            if not self._thread.is_alive() or time.monotonic() > deadline:
+                raise RuntimeError("Mock exchange failed to start.")
+            time.sleep(0.01)
+
+    def stop(self) -> None:
+        self._server.should_exit = True
+        self._thread.join(10)
+        self._socket.close()
+
+    def __enter__(self) -> "MockExchangeServer":
+        self.start()
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.stop()
+
+
+def main(
+    host: str = typer.Option("127.0.0.1", help="Interface to listen on."),
+    port: int = typer.Option(8100, help="Port to listen on."),
+    latency: Optional[float] = typer.Option(None, help="Added latency per request, seconds."),
+    jitter: Optional[float] = typer.Option(None, help="Extra random latency, up to this many seconds."),
+    error_rate: Optional[float] = typer.Option(None, help="Fraction of order submissions that fail with a 503."),
+) -> None:
+    """
+    Serve a mock Binance Futures REST API (point BINANCE_FUTURES_TESTNET_URL at it).
+
+    Unset options fall back to the MOCK_EXCHANGE_* environment variables.
+    """
+    exchange = MockExchange.from_env()
+    if latency is not None:
+        exchange.latency = latency
+    if jitter is not None:
+        exchange.jitter = jitter
+    if error_rate is not None:
+        exchange.error_rate = error_rate
+    uvicorn.run(create_app(exchange), host=host, port=port, log_level="warning", access_log=False)
+
+
+if __name__ == "__main__":
+    typer.run(main)
@@ -1,23 +1,151 @@
+import asyncio
 import logging
-from typing import Any, Dict, Optional
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from decimal import Decimal
+from typing import TYPE_CHECKING, Any, Dict, List, Mapping, Optional, Sequence, Tuple
 
-from .client import BinanceFuturesClient
-from .db import save_order
+from .client import (
+    MAX_BATCH_ORDERS,
+    AsyncBinanceFuturesClient,
+    BinanceFuturesClient,
+    build_order_params,
+)
+from .events import order_event, order_hub
+from .exchange_info import ExchangeInfoCache
+from .metrics import ORDER_SECONDS, VALIDATION_SECONDS, order_outcome
+from .positions import position_book
+from .retry import make_client_order_id
+from .risk import Reservation, RiskEngine, RiskRejected
+from .writer import get_order_writer, persist_orders
 from .validators import (
-    OrderType,
-    Side,
-    TimeInForce,
-    validate_order_type,
-    validate_price,
-    validate_quantity,
-    validate_side,
-    validate_symbol,
-    validate_time_in_force,
+    ValidatedOrder,
+    validate_order,
+    validate_orders,
     ValidationError,
 )
 
+if TYPE_CHECKING:
+    # Annotations only; importing market_data pulls in websockets.
+    from .market_data import MarketData
+
 logger = logging.getLogger(__name__)
 
+# Shared by every batch call; a fresh pool per call would spawn its threads
+# again each time. Ten workers send an API batch (50 orders) in one round.
+_BATCH_THREADS = 10
+_batch_pool: Optional[ThreadPoolExecutor] = None
+_batch_pool_lock = threading.Lock()
+
+
+def _get_batch_pool() -> ThreadPoolExecutor:
+    global _batch_pool
+
+    with _batch_pool_lock:
+        if _batch_pool is None:
+            _batch_pool = ThreadPoolExecutor(max_workers=_BATCH_THREADS, thread_name_prefix="batch-orders")
+        return _batch_pool
+
+
+def _validate_order(
+    symbol: str,
+    side: str,
+    order_type: str,
+    quantity: Any,
+    price: Optional[Any],
+    time_in_force: Optional[str],
+    exchange_info: Optional[ExchangeInfoCache] = None,
+    market_data: Optional["MarketData"] = None,
+    risk: Optional[RiskEngine] = None,
+) -> Tuple[ValidatedOrder, Reservation]:
+    # The reservation holds the order's risk budget until it is settled
+    # with the exchange's response (or released if it is never sent).
+    t0 = time.perf_counter()
+    reservation = Reservation()
+    try:
+        order = validate_order(symbol, side, order_type, quantity, price, time_in_force)
+        if exchange_info is not None:
+            order = _apply_symbol_filters(order, exchange_info)
+        if market_data is not None:
+            _apply_price_checks(order, market_data, exchange_info)
+        if risk is not None:
+            reservation = risk.check(order, market_data)
+    except ValidationError:
+        # Unvalidated input is not used as a label value (unbounded cardinality).
+        VALIDATION_SECONDS.labels("", "", "invalid").observe(time.perf_counter() - t0)
+        logger.exception("Validation failed for order parameters.")
+        raise
+    VALIDATION_SECONDS.labels(order.symbol, order.order_type, "ok").observe(time.perf_counter() - t0)
+    return order, reservation
+
+
+def _observe_order(t0: float, symbol: str, order_type: str, outcome: str) -> None:
+    ORDER_SECONDS.labels(symbol, order_type, outcome).observe(time.perf_counter() - t0)
+
+
+def _apply_symbol_filters(order: ValidatedOrder, exchange_info: ExchangeInfoCache) -> ValidatedOrder:
+    # Symbol filters (tickSize, stepSize, minNotional) from the local cache;
+    # also quantizes quantity/price to the symbol's precision.
+    qty, price = exchange_info.check_order(
+        order.symbol, order.order_type, order.quantity, order.price
+    )
+    return order._replace(quantity=qty, price=price)
+
+
+def _apply_price_checks(
+    order: ValidatedOrder,
+    market_data: "MarketData",
+    exchange_info: Optional[ExchangeInfoCache] = None,
+) -> None:
+    # Price band / notional against the locally cached quote; no REST call.
+    filters = exchange_info.get(order.symbol) if exchange_info is not None else None
+    market_data.check_order(
+        order.symbol,
+        order.side,
+        order.order_type,
+        order.quantity,
+        order.price,
+        min_notional=filters.min_notional if filters is not None else Decimal("0"),
+    )
+
+
+def _publish(responses: List[Dict[str, Any]]) -> None:
+    for response in responses:
+        order_hub.publish(order_event(response))
+        position_book.apply_response(response)
+
+
+def _persist(responses: List[Dict[str, Any]]) -> None:
+    # Persist orders for metrics / dashboard (best-effort, never fails the trade).
+    # With the write-behind writer running this only enqueues.
+    _publish(responses)
+    try:
+        persist_orders(responses)
+    except Exception:
+        logger.exception("Failed to persist order to database.")
+
+
+async def _persist_async(responses: List[Dict[str, Any]]) -> None:
+    writer = get_order_writer()
+    if writer is None:
+        await asyncio.to_thread(_persist, responses)
+        return
+    _publish(responses)
+    # A full queue falls back to the backpressure policy, which can wait
+    # or commit inline: never on the event loop.
+    rest = writer.offer(responses)
+    if rest:
+        try:
+            await asyncio.to_thread(writer.submit_many, rest)
+        except Exception:
+            logger.exception("Failed to persist order to database.")
+
+
+def _client_order_id(idempotency_key: Optional[str]) -> Dict[str, str]:
+    # Without a key the client draws a fresh id per order.
+    return {"client_order_id": make_client_order_id(idempotency_key)} if idempotency_key else {}
+
 
 def build_and_place_order(
     client: BinanceFuturesClient,
@@ -27,37 +155,223 @@ def build_and_place_order(
     quantity: float,
     price: Optional[float] = None,
     time_in_force: Optional[str] = None,
+    exchange_info: Optional[ExchangeInfoCache] = None,
+    market_data: Optional["MarketData"] = None,
+    risk: Optional[RiskEngine] = None,
+    idempotency_key: Optional[str] = None,
 ) -> Dict[str, Any]:
     """
     Validate input and place an order through the BinanceFuturesClient.
+
+    With ``exchange_info``, symbol filters are enforced locally before any
+    network call (rejecting or rounding, per the cache's mode). With
+    ``market_data``, LIMIT prices are checked against the mark-price band and
+    MARKET orders against min notional at the current touch. With ``risk``,
+    the pre-trade risk checks run last, before the order is sent. The same
+    ``idempotency_key`` always yields the same newClientOrderId, so a caller
+    repeating a request hits the exchange's duplicate check.
     """
+    t0 = time.perf_counter()
     try:
-        v_symbol = validate_symbol(symbol)
-        v_side: Side = validate_side(side)
-        v_type: OrderType = validate_order_type(order_type)
-        v_qty = validate_quantity(quantity)
-        v_price = validate_price(price, v_type)
-        v_tif: Optional[TimeInForce] = validate_time_in_force(time_in_force, v_type)
+        (v_symbol, v_side, v_type, v_qty, v_price, v_tif), reservation = _validate_order(
+            symbol, side, order_type, quantity, price, time_in_force, exchange_info, market_data, risk
+        )
     except ValidationError:
-        logger.exception("Validation failed for order parameters.")
+        _observe_order(t0, "", "", "invalid")
         raise
 
-    response = client.place_order(
-        symbol=v_symbol,
-        side=v_side,
-        order_type=v_type,
-        quantity=v_qty,
-        price=v_price,
-        time_in_force=v_tif,
-    )
-    # Persist order for metrics / dashboard (best-effort, non-blocking for trading)
     try:
-        save_order(response)
-    except Exception:
-        logger.exception("Failed to persist order to database.")
+        response = client.place_order(
+            symbol=v_symbol,
+            side=v_side,
+            order_type=v_type,
+            quantity=v_qty,
+            price=v_price,
+            time_in_force=v_tif,
+            **_client_order_id(idempotency_key),
+        )
+    except Exception as exc:
+        reservation.release()
+        _observe_order(t0, v_symbol, v_type, order_outcome(exc))
+        raise
+    _persist([response])
+    reservation.settle([response])
+    _observe_order(t0, v_symbol, v_type, "ok")
+    return response
+
+
+async def build_and_place_order_async(
+    client: AsyncBinanceFuturesClient,
+    symbol: str,
+    side: str,
+    order_type: str,
+    quantity: float,
+    price: Optional[float] = None,
+    time_in_force: Optional[str] = None,
+    exchange_info: Optional[ExchangeInfoCache] = None,
+    market_data: Optional["MarketData"] = None,
+    risk: Optional[RiskEngine] = None,
+    idempotency_key: Optional[str] = None,
+) -> Dict[str, Any]:
+    """
+    Async counterpart of build_and_place_order for the event-loop API.
+
+    Without the write-behind writer, the DB write runs in a worker thread so
+    the loop stays free.
+    """
+    t0 = time.perf_counter()
+    try:
+        (v_symbol, v_side, v_type, v_qty, v_price, v_tif), reservation = _validate_order(
+            symbol, side, order_type, quantity, price, time_in_force, exchange_info, market_data, risk
+        )
+    except ValidationError:
+        _observe_order(t0, "", "", "invalid")
+        raise
+
+    try:
+        response = await client.place_order(
+            symbol=v_symbol,
+            side=v_side,
+            order_type=v_type,
+            quantity=v_qty,
+            price=v_price,
+            time_in_force=v_tif,
+            **_client_order_id(idempotency_key),
+        )
+    except Exception as exc:
+        reservation.release()
+        _observe_order(t0, v_symbol, v_type, order_outcome(exc))
+        raise
+    except asyncio.CancelledError:
+        reservation.release()
+        raise
+    await _persist_async([response])
+    reservation.settle([response])
+    _observe_order(t0, v_symbol, v_type, "ok")
     return response
 
 
+def _validate_batch(
+    orders: Sequence[Mapping[str, Any]],
+    exchange_info: Optional[ExchangeInfoCache] = None,
+    market_data: Optional["MarketData"] = None,
+    risk: Optional[RiskEngine] = None,
+) -> Tuple[List[Dict[str, Any]], Reservation]:
+    """
+    Validate every order before anything is sent; return /order param dicts
+    and the risk reservation to settle with the results.
+
+    Accepts both API-style (``type``, ``timeInForce``) and Python-style
+    (``order_type``, ``time_in_force``) keys.
+    """
+    if not orders:
+        raise ValidationError("Batch must contain at least one order.")
+
+    try:
+        validated = validate_orders(orders)
+    except ValidationError:
+        logger.exception("Validation failed for batch order parameters.")
+        raise
+    if exchange_info is not None or market_data is not None:
+        for index, order in enumerate(validated):
+            try:
+                if exchange_info is not None:
+                    order = validated[index] = _apply_symbol_filters(order, exchange_info)
+                if market_data is not None:
+                    _apply_price_checks(order, market_data, exchange_info)
+            except ValidationError as exc:
+                raise ValidationError(f"Order #{index + 1}: {exc}") from exc
+    reservation = Reservation()
+    if risk is not None:
+        # One call so each order counts the earlier ones and nothing is
+        # committed unless the whole batch passes.
+        try:
+            reservation = risk.check_batch(validated, market_data)
+        except RiskRejected as exc:
+            raise ValidationError(f"Order #{(exc.index or 0) + 1}: {exc}") from exc
+    return [build_order_params(*order) for order in validated], reservation
+
+
+def _chunk(params: List[Dict[str, Any]]) -> List[List[Dict[str, Any]]]:
+    return [params[i : i + MAX_BATCH_ORDERS] for i in range(0, len(params), MAX_BATCH_ORDERS)]
+
+
+def _group_error(exc: Exception) -> Dict[str, Any]:
+    return {"code": getattr(exc, "code", None), "msg": getattr(exc, "message", None) or str(exc)}
+
+
+def build_and_place_batch(
+    client: BinanceFuturesClient,
+    orders: Sequence[Mapping[str, Any]],
+    exchange_info: Optional[ExchangeInfoCache] = None,
+    market_data: Optional["MarketData"] = None,
+    risk: Optional[RiskEngine] = None,
+) -> List[Dict[str, Any]]:
+    """
+    Validate all orders, then send them as concurrent batchOrders calls.
+
+    Returns one entry per input order, in input order: the exchange response,
+    or a ``{"code", "msg"}`` error for orders that were rejected (including
+    every order in a group whose request failed).
+    """
+    params, reservation = _validate_batch(orders, exchange_info, market_data, risk)
+    groups = _chunk(params)
+
+    def place(group: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        try:
+            return client.place_batch_orders(group)
+        except Exception as exc:
+            logger.exception("Batch group of %d orders failed.", len(group))
+            return [_group_error(exc)] * len(group)
+
+    group_results = [place(groups[0])] if len(groups) == 1 else _get_batch_pool().map(place, groups)
+    results = [r for chunk in group_results for r in chunk]
+
+    _persist([r for r in results if "orderId" in r])
+    reservation.settle(results)
+    return results
+
+
+async def build_and_place_batch_async(
+    client: AsyncBinanceFuturesClient,
+    orders: Sequence[Mapping[str, Any]],
+    exchange_info: Optional[ExchangeInfoCache] = None,
+    market_data: Optional["MarketData"] = None,
+    risk: Optional[RiskEngine] = None,
+) -> List[Dict[str, Any]]:
+    """
+    Async counterpart of build_and_place_batch.
+    """
+    params, reservation = _validate_batch(orders, exchange_info, market_data, risk)
+    groups = _chunk(params)
+
+    try:
+        group_results = await asyncio.gather(
+            *(client.place_batch_orders(group) for group in groups), return_exceptions=True
+        )
+    except asyncio.CancelledError:
+        reservation.release()
+        raise
+    results: List[Dict[str, Any]] = []
+    for group, outcome in zip(groups, group_results):
+        if isinstance(outcome, BaseException):
+            logger.error("Batch group of %d orders failed: %s", len(group), outcome)
+            results.extend([_group_error(outcome)] * len(group))
+        else:
+            results.extend(outcome)
+
+    await _persist_async([r for r in results if "orderId" in r])
+    reservation.settle(results)
+    return results
+
+
+def summarize_batch_results(results: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    Summarize successful responses; pass error entries through unchanged.
+    """
+    return [summarize_order_response(r) if "orderId" in r else r for r in results]
+
+
 def summarize_order_response(response: Dict[str, Any]) -> Dict[str, Any]:
     """
     Extract a concise summary from Binance order response.
@@ -0,0 +1,390 @@
+import itertools
+import logging
+import os
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from decimal import Decimal, InvalidOperation
+from typing import Any, Callable, Dict, Iterable, List, Mapping, Optional, Tuple
+
+from .db import get_latest_position_snapshot, get_order_fills_since, save_position_snapshot
+
+logger = logging.getLogger(__name__)
+
+TERMINAL_STATUSES = frozenset({"FILLED", "CANCELED", "EXPIRED", "EXPIRED_IN_MATCH", "REJECTED"})
+
+_ZERO = Decimal("0")
+_DISPLAY = Decimal("1e-8")
+
+# Bumped when the snapshot layout changes; older snapshots are not loaded.
+STATE_VERSION = 2
+
+# Order ids are only unique per symbol.
+OrderKey = Tuple[str, str]
+
+
+def _dec(value: Any) -> Optional[Decimal]:
+    try:
+        return Decimal(str(value)) if value not in (None, "") else None
+    except InvalidOperation:
+        return None
+
+
+def _fmt(value: Decimal) -> str:
+    return format(value.quantize(_DISPLAY).normalize(), "f")
+
+
+@dataclass
+class Position:
+    """
+    Net one-way position in one symbol; ``qty`` is negative when short.
+    """
+
+    symbol: str
+    qty: Decimal = _ZERO
+    entry_price: Decimal = _ZERO
+    realized_pnl: Decimal = _ZERO
+
+    def apply_fill(self, side: str, qty: Decimal, price: Decimal) -> None:
+        signed = qty if side == "BUY" else -qty
+        if self.qty == 0 or (self.qty > 0) == (signed > 0):
+            total = abs(self.qty) + qty
+            self.entry_price = (abs(self.qty) * self.entry_price + qty * price) / total
+            self.qty += signed
+            return
+        # Reduces, closes or flips the position.
+        closed = min(qty, abs(self.qty))
+        direction = 1 if self.qty > 0 else -1
+        self.realized_pnl += closed * (price - self.entry_price) * direction
+        self.qty += signed
+        if self.qty == 0:
+            self.entry_price = _ZERO
+        elif qty > closed:
+            self.entry_price = price
+
+
+class PositionBook:
+    """
+    In-memory positions and PnL per symbol, updated incrementally from fills.
+
+    Fills are derived from each order's cumulative executed quantity and
+    average price, so the same order update (from the placement response,
+    the user-data stream or a REST resync) can arrive any number of times
+    and in any order without double counting. It also tracks pending
+    exposure per symbol and side: quantity reserved for orders on their way
+    to the exchange, then the unfilled rest of accepted orders until they
+    reach a terminal status. The book is snapshotted to the
+    position_snapshots table periodically and rebuilt at startup from the
+    latest snapshot plus the orders that changed after it.
+    """
+
+    def __init__(
+        self,
+        snapshot_interval: Optional[float] = None,
+        replay_margin: Optional[float] = None,
+        max_closed_orders: int = 10_000,
+    ) -> None:
+        self.snapshot_interval = snapshot_interval or float(
+            os.getenv("TRADING_BOT_POSITION_SNAPSHOT_INTERVAL", "60")
+        )
+        # Replay reaches this far before the snapshot, to cover exchange/local
+        # clock skew and updates still queued in the writer when it was taken.
+        self.replay_margin = replay_margin if replay_margin is not None else float(
+            os.getenv("TRADING_BOT_POSITION_REPLAY_MARGIN", "300")
+        )
+        self.max_closed_orders = max_closed_orders
+        self.fills = 0
+        self.snapshots = 0
+        self._positions: Dict[str, Position] = {}
+        # (symbol, order_id) -> (filled qty, filled quote) seen so far.
+        # Finished orders are kept (bounded) so late duplicates of their
+        # updates are ignored.
+        self._open: Dict[OrderKey, Tuple[Decimal, Decimal]] = {}
+        self._closed: "OrderedDict[OrderKey, Tuple[Decimal, Decimal]]" = OrderedDict()
+        # token -> (symbol, side, qty) for orders not yet answered;
+        # (symbol, order_id) -> (side, orig qty, unfilled qty) for working orders.
+        self._reserved: Dict[int, Tuple[str, str, Decimal]] = {}
+        self._working: Dict[OrderKey, Tuple[str, Decimal, Decimal]] = {}
+        self._pending: Dict[Tuple[str, str], Decimal] = {}
+        self._tokens = itertools.count(1)
+        self._lock = threading.Lock()
+        self._dirty = False
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def clear(self) -> None:
+        with self._lock:
+            self._positions.clear()
+            self._open.clear()
+            self._closed.clear()
+            self._reserved.clear()
+            self._working.clear()
+            self._pending.clear()
+            self.fills = 0
+            self._dirty = False
+
+    def net_qty(self, symbol: str) -> Decimal:
+        # Lock-free: a Position's qty is replaced, never mutated in place.
+        position = self._positions.get(symbol)
+        return position.qty if position is not None else _ZERO
+
+    def pending_qty(self, symbol: str, side: str) -> Decimal:
+        """
+        Quantity of ``side`` orders in ``symbol`` that may still fill.
+        """
+        return self._pending.get((symbol, side), _ZERO)
+
+    def _add_pending(self, symbol: str, side: str, delta: Decimal) -> None:
+        key = (symbol, side)
+        total = self._pending.get(key, _ZERO) + delta
+        if total > 0:
+            self._pending[key] = total
+        else:
+            self._pending.pop(key, None)
+
+    def reserve(self, symbol: str, side: str, qty: Decimal) -> int:
+        """
+        Count ``qty`` as pending until ``release`` is called with the returned token.
+        """
+        with self._lock:
+            token = next(self._tokens)
+            self._reserved[token] = (symbol, side, qty)
+            self._add_pending(symbol, side, qty)
+        return token
+
+    def release(self, token: int, response: Optional[Mapping[str, Any]] = None) -> None:
+        """
+        Drop a reservation. Given the exchange's response, the order's
+        unfilled quantity stays pending until an update with a terminal
+        status arrives; without one (not placed) nothing stays pending.
+        """
+        with self._lock:
+            reserved = self._reserved.pop(token, None)
+            if reserved is None:
+                return
+            symbol, side, qty = reserved
+            self._add_pending(symbol, side, -qty)
+            if response is None:
+                return
+            order_id = str(response.get("orderId", ""))
+            if not order_id or response.get("status") in TERMINAL_STATUSES:
+                return
+            key = (symbol, order_id)
+            # The user stream may have reported the order before its response arrived.
+            if key in self._closed or key in self._working:
+                return
+            orig = _dec(response.get("origQty")) or qty
+            seen = self._open.get(key, (_ZERO, _ZERO))[0]
+            executed = max(_dec(response.get("executedQty")) or _ZERO, seen)
+            if orig > executed:
+                self._working[key] = (side, orig, orig - executed)
+                self._add_pending(symbol, side, orig - executed)
+
+    def _update_working(self, key: OrderKey, status: str, executed: Decimal) -> None:
+        side, orig, unfilled = self._working[key]
+        remaining = _ZERO if status in TERMINAL_STATUSES else max(orig - executed, _ZERO)
+        if remaining == unfilled:
+            return
+        self._add_pending(key[0], side, remaining - unfilled)
+        if remaining:
+            self._working[key] = (side, orig, remaining)
+        else:
+            del self._working[key]
+
+    def apply_order(
+        self,
+        order_id: str,
+        symbol: str,
+        side: str,
+        status: str,
+        executed_qty: Any,
+        avg_price: Any,
+    ) -> bool:
+        """
+        Apply an order's cumulative fill state; returns True if it added a fill.
+        """
+        if not order_id:
+            return False
+        qty, avg = _dec(executed_qty), _dec(avg_price)
+        key = (symbol, order_id)
+        with self._lock:
+            seen = self._open.get(key) or self._closed.get(key)
+            prev_qty, prev_quote = seen or (_ZERO, _ZERO)
+            filled = qty is not None and qty > prev_qty and avg is not None and avg > 0
+            if filled:
+                quote = qty * avg
+                position = self._positions.get(symbol)
+                if position is None:
+                    position = self._positions[symbol] = Position(symbol)
+                position.apply_fill(side, qty - prev_qty, (quote - prev_quote) / (qty - prev_qty))
+                prev_qty, prev_quote = qty, quote
+                self.fills += 1
+                self._dirty = True
+            if status in TERMINAL_STATUSES and key not in self._closed:
+                self._open.pop(key, None)
+                self._closed[key] = (prev_qty, prev_quote)
+                if len(self._closed) > self.max_closed_orders:
+                    self._closed.popitem(last=False)
+                self._dirty = True
+            elif filled:
+                if key in self._closed:
+                    self._closed[key] = (prev_qty, prev_quote)
+                else:
+                    self._open[key] = (prev_qty, prev_quote)
+            if key in self._working:
+                self._update_working(key, status, prev_qty)
+        return filled
+
+    def apply_response(self, response: Dict[str, Any]) -> bool:
+        """
+        Apply an order response in exchange shape (placement or REST query).
+        """
+        return self.apply_order(
+            str(response.get("orderId", "")),
+            response.get("symbol", ""),
+            response.get("side", ""),
+            response.get("status", ""),
+            response.get("executedQty"),
+            response.get("avgPrice"),
+        )
+
+    def apply_updates(self, updates: Iterable[Dict[str, Any]]) -> int:
+        """
+        Apply user-data-stream updates (upsert_order_updates shape).
+        """
+        return sum(
+            self.apply_order(
+                u["order_id"], u["symbol"], u["side"], u["status"], u.get("executed_qty"), u.get("avg_price")
+            )
+            for u in updates
+        )
+
+    def positions(self, mark_price: Optional[Callable[[str], Optional[float]]] = None) -> List[Dict[str, Any]]:
+        """
+        One row per symbol traded; unrealized PnL uses ``mark_price(symbol)``
+        when it returns a price. Cost is O(symbols).
+        """
+        with self._lock:
+            rows = [(p.symbol, p.qty, p.entry_price, p.realized_pnl) for p in self._positions.values()]
+        result = []
+        for symbol, qty, entry, realized in sorted(rows):
+            mark = mark_price(symbol) if mark_price is not None else None
+            mark_dec = Decimal(str(mark)) if mark else None
+            result.append(
+                {
+                    "symbol": symbol,
+                    "position_amt": _fmt(qty),
+                    "entry_price": _fmt(entry),
+                    "mark_price": mark or None,
+                    "notional": _fmt(qty * mark_dec) if mark_dec else None,
+                    "realized_pnl": _fmt(realized),
+                    "unrealized_pnl": _fmt(qty * (mark_dec - entry)) if mark_dec else None,
+                }
+            )
+        return result
+
+    def state(self) -> Dict[str, Any]:
+        """
+        JSON-serializable copy of the book, as stored in snapshots.
+        """
+        with self._lock:
+            return {
+                "version": STATE_VERSION,
+                "positions": {
+                    p.symbol: [str(p.qty), str(p.entry_price), str(p.realized_pnl)]
+                    for p in self._positions.values()
+                },
+                "open": [[sym, oid, str(q), str(c)] for (sym, oid), (q, c) in self._open.items()],
+                "closed": [[sym, oid, str(q), str(c)] for (sym, oid), (q, c) in self._closed.items()],
+                "working": [
+                    [sym, oid, side, str(o), str(u)] for (sym, oid), (side, o, u) in self._working.items()
+                ],
+            }
+
+    def load_state(self, state: Dict[str, Any]) -> None:
+        with self._lock:
+            self._positions = {
+                symbol: Position(symbol, Decimal(qty), Decimal(entry), Decimal(realized))
+                for symbol, (qty, entry, realized) in state.get("positions", {}).items()
+            }
+            self._open = {(sym, oid): (Decimal(q), Decimal(c)) for sym, oid, q, c in state.get("open", [])}
+            self._closed = OrderedDict(
+                ((sym, oid), (Decimal(q), Decimal(c))) for sym, oid, q, c in state.get("closed", [])
+            )
+            self._working = {
+                (sym, oid): (side, Decimal(orig), Decimal(unfilled))
+                for sym, oid, side, orig, unfilled in state.get("working", [])
+            }
+            self._pending = {}
+            for symbol, side, qty in self._reserved.values():
+                self._add_pending(symbol, side, qty)
+            for (symbol, _), (side, _, unfilled) in self._working.items():
+                self._add_pending(symbol, side, unfilled)
+            self._dirty = False
+
+    def save_snapshot(self) -> None:
+        with self._lock:
+            self._dirty = False
+        save_position_snapshot(self.state(), datetime.utcnow())
+        self.snapshots += 1
+
+    def restore(self) -> int:
+        """
+        Rebuild from the latest snapshot plus the orders that changed after
+        it (all orders if there is no snapshot). Returns the fills replayed.
+        """
+        self.clear()
+        since = None
+        snapshot = get_latest_position_snapshot()
+        if snapshot is not None and snapshot.state.get("version") != STATE_VERSION:
+            logger.warning("Ignoring position snapshot in an older format; replaying all orders.")
+            snapshot = None
+        if snapshot is not None:
+            self.load_state(snapshot.state)
+            since = snapshot.taken_at - timedelta(seconds=self.replay_margin)
+        replayed = sum(self.apply_order(*fill) for fill in get_order_fills_since(since))
+        logger.info(
+            "Positions restored for %d symbols (%d fills replayed since %s).",
+            len(self._positions),
+            replayed,
+            since or "the first order",
+        )
+        return replayed
+
+    def start(self) -> None:
+        """
+        Snapshot every ``snapshot_interval`` seconds (when changed) from a
+        background thread.
+        """
+        if self._thread is not None:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="position-snapshots", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """
+        Stop the snapshot thread and take a final snapshot.
+        """
+        self._stop.set()
+        if self._thread is None:
+            return
+        self._thread.join(timeout=5)
+        self._thread = None
+        self._snapshot_if_dirty()
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.snapshot_interval):
+            self._snapshot_if_dirty()
+
+    def _snapshot_if_dirty(self) -> None:
+        if not self._dirty:
+            return
+        try:
+            self.save_snapshot()
+        except Exception:
+            logger.exception("Failed to save position snapshot.")
+
+
+position_book = PositionBook()
@@ -0,0 +1,270 @@
+import asyncio
+import logging
+import math
+import os
+import threading
+import time
+from typing import Any, Dict, List, Literal, Mapping, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# high   - order placement / cancels: may spend the whole budget and queue
+# normal - other account calls: keeps a little headroom for orders
+# low    - background reads (exchangeInfo, resyncs): never waits, rejected instead
+Priority = Literal["high", "normal", "low"]
+
+_HEADROOM: Dict[str, float] = {"high": 0.0, "normal": 0.05, "low": 0.2}
+
+# Cost of each endpoint against each limit; anything unlisted costs 1 weight.
+# Values follow the USDT-M futures API docs.
+ENDPOINT_COSTS: Dict[Tuple[str, str], Dict[str, int]] = {
+    ("POST", "/fapi/v1/order"): {"weight": 0, "orders_10s": 1, "orders_1m": 1},
+    ("POST", "/fapi/v1/batchOrders"): {"weight": 5, "orders_10s": 5, "orders_1m": 1},
+    ("GET", "/fapi/v1/openOrders"): {"weight": 1},
+    ("GET", "/fapi/v1/exchangeInfo"): {"weight": 1},
+}
+
+ENDPOINT_PRIORITY: Dict[Tuple[str, str], Priority] = {
+    ("POST", "/fapi/v1/order"): "high",
+    ("POST", "/fapi/v1/batchOrders"): "high",
+    ("DELETE", "/fapi/v1/order"): "high",
+    ("GET", "/fapi/v1/exchangeInfo"): "low",
+}
+
+
+class RateLimitExceeded(Exception):
+    """
+    Raised when a request would have to wait longer than its priority allows.
+    """
+
+    def __init__(self, message: str, retry_after: float) -> None:
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+def request_cost(method: str, path: str, params: Optional[Mapping[str, Any]] = None) -> Dict[str, int]:
+    if method == "GET" and path == "/fapi/v1/openOrders" and not (params or {}).get("symbol"):
+        return {"weight": 40}
+    if method == "GET" and path == "/fapi/v1/klines":
+        # Weight grows with the page size: [1,100) 1, [100,500) 2, [500,1000] 5, above 10.
+        limit = int((params or {}).get("limit") or 500)
+        return {"weight": 1 if limit < 100 else 2 if limit < 500 else 5 if limit <= 1000 else 10}
+    return ENDPOINT_COSTS.get((method, path), {"weight": 1})
+
+
+class _Budget:
+    """
+    One exchange limit: a token bucket for smoothing plus a fixed-window
+    counter aligned like the exchange's, corrected from response headers.
+    """
+
+    def __init__(self, name: str, capacity: int, interval: float, header: str) -> None:
+        self.name = name
+        self.capacity = capacity
+        self.interval = interval
+        self.header = header.lower()
+        self.rate = capacity / interval
+        self.tokens = float(capacity)
+        self.updated = time.time()
+        self.window = -1
+        self.used = 0
+
+    def _advance(self, now: float) -> None:
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        window = math.floor(now / self.interval)
+        if window != self.window:
+            self.window = window
+            self.used = 0
+
+    def wait_time(self, cost: int, floor: float, now: float) -> float:
+        self._advance(now)
+        if cost <= 0:
+            return 0.0
+        bucket_wait = max(0.0, (cost + floor - self.tokens) / self.rate)
+        window_wait = 0.0
+        if self.used + cost + floor > self.capacity:
+            window_wait = (self.window + 1) * self.interval - now
+        return max(bucket_wait, window_wait)
+
+    def spend(self, cost: int) -> None:
+        self.tokens -= cost
+        self.used += cost
+
+    def observe(self, used: int, now: float) -> None:
+        # The exchange's count is authoritative; it may also include requests
+        # made by other processes on the same IP / account.
+        self._advance(now)
+        if used > self.used:
+            self.used = used
+            self.tokens = min(self.tokens, self.capacity - used)
+
+    @property
+    def available(self) -> int:
+        return max(0, min(int(self.tokens), self.capacity - self.used))
+
+
+class RateLimiter:
+    """
+    Request-weight and order-count governor shared by every client call.
+
+    ``acquire`` (threads) and ``acquire_async`` (event loop) wait until all
+    budgets the request draws on have room, keeping per-priority headroom,
+    or raise RateLimitExceeded when the wait would exceed what the priority
+    allows. ``update`` corrects the budgets from ``X-MBX-USED-WEIGHT-*`` /
+    ``X-MBX-ORDER-COUNT-*`` headers and honours ``Retry-After`` on 429/418.
+    """
+
+    def __init__(
+        self,
+        weight_per_minute: int = 2400,
+        orders_per_10s: int = 300,
+        orders_per_minute: int = 1200,
+        max_wait: float = 10.0,
+        budgets: Optional[List[Tuple[str, int, float, str]]] = None,
+        enabled: bool = True,
+    ) -> None:
+        if budgets is None:
+            budgets = [
+                ("weight", weight_per_minute, 60.0, "X-MBX-USED-WEIGHT-1M"),
+                ("orders_10s", orders_per_10s, 10.0, "X-MBX-ORDER-COUNT-10S"),
+                ("orders_1m", orders_per_minute, 60.0, "X-MBX-ORDER-COUNT-1M"),
+            ]
+        self._budgets = {name: _Budget(name, cap, interval, header) for name, cap, interval, header in budgets}
+        self.max_wait = max_wait
+        self.enabled = enabled
+        self.banned_until = 0.0
+        self._lock = threading.Lock()
+        self.requests = 0
+        self.throttled = 0
+        self.rejected = 0
+        self.bans = 0
+        self.wait_seconds = 0.0
+
+    @classmethod
+    def from_env(cls) -> "RateLimiter":
+        return cls(
+            weight_per_minute=int(os.getenv("BINANCE_WEIGHT_LIMIT_1M", "2400")),
+            orders_per_10s=int(os.getenv("BINANCE_ORDER_LIMIT_10S", "300")),
+            orders_per_minute=int(os.getenv("BINANCE_ORDER_LIMIT_1M", "1200")),
+            max_wait=float(os.getenv("BINANCE_RATE_LIMIT_MAX_WAIT", "10")),
+            enabled=os.getenv("BINANCE_RATE_LIMIT", "1") != "0",
+        )
+
+    def _reserve(self, cost: Mapping[str, int], priority: Priority, waited: float) -> float:
+        """
+        Spend ``cost`` and return 0, or return how long to wait before retrying.
+        """
+        with self._lock:
+            if not self.enabled:
+                self.requests += 1
+                return 0.0
+            now = time.time()
+            wait = max(0.0, self.banned_until - now)
+            for name, amount in cost.items():
+                budget = self._budgets.get(name)
+                if budget is not None:
+                    floor = budget.capacity * _HEADROOM[priority]
+                    wait = max(wait, budget.wait_time(amount, floor, now))
+            if wait <= 0:
+                for name, amount in cost.items():
+                    if name in self._budgets:
+                        self._budgets[name].spend(amount)
+                self.requests += 1
+                return 0.0
+            allowed = 0.0 if priority == "low" else self.max_wait
+            if waited + wait > allowed:
+                self.rejected += 1
+                raise RateLimitExceeded(
+                    f"Rate limit budget exhausted; retry in {wait:.2f}s.", retry_after=wait
+                )
+            if not waited:
+                self.throttled += 1
+            return wait
+
+    def acquire(
+        self, method: str, path: str, params: Optional[Mapping[str, Any]] = None, priority: Optional[Priority] = None
+    ) -> None:
+        cost = request_cost(method, path, params)
+        priority = priority or ENDPOINT_PRIORITY.get((method, path), "normal")
+        waited = 0.0
+        while True:
+            wait = self._reserve(cost, priority, waited)
+            if not wait:
+                break
+            time.sleep(wait)
+            waited += wait
+        self.wait_seconds += waited
+
+    async def acquire_async(
+        self, method: str, path: str, params: Optional[Mapping[str, Any]] = None, priority: Optional[Priority] = None
+    ) -> None:
+        cost = request_cost(method, path, params)
+        priority = priority or ENDPOINT_PRIORITY.get((method, path), "normal")
+        waited = 0.0
+        while True:
+            wait = self._reserve(cost, priority, waited)
+            if not wait:
+                break
+            await asyncio.sleep(wait)
+            waited += wait
+        self.wait_seconds += waited
+
+    def update(self, status: int, headers: Mapping[str, str]) -> None:
+        """
+        Correct the budgets from a response's usage headers.
+        """
+        lowered = {k.lower(): v for k, v in headers.items()}
+        with self._lock:
+            now = time.time()
+            for budget in self._budgets.values():
+                value = lowered.get(budget.header)
+                if value is not None:
+                    try:
+                        budget.observe(int(value), now)
+                    except ValueError:
+                        pass
+            if status in (418, 429):
+                retry_after = float(lowered.get("retry-after") or 60)
+                self.banned_until = max(self.banned_until, now + retry_after)
+                self.bans += 1
+                logger.warning("Exchange rate limit hit (HTTP %s); pausing %.0fs.", status, retry_after)
+
+    def metrics(self) -> Dict[str, Any]:
+        with self._lock:
+            now = time.time()
+            budgets = {}
+            for name, budget in self._budgets.items():
+                budget._advance(now)
+                budgets[name] = {
+                    "capacity": budget.capacity,
+                    "interval_s": budget.interval,
+                    "used": budget.used,
+                    "available": budget.available,
+                }
+            return {
+                "budgets": budgets,
+                "requests": self.requests,
+                "throttled": self.throttled,
+                "rejected": self.rejected,
+                "bans": self.bans,
+                "banned_for_s": round(max(0.0, self.banned_until - now), 3),
+                "wait_seconds": round(self.wait_seconds, 3),
+            }
+
+
+_rate_limiter: Optional[RateLimiter] = None
+_rate_limiter_lock = threading.Lock()
+
+
+def get_rate_limiter() -> RateLimiter:
+    """
+    Process-wide governor: exchange limits are per IP / account, not per client.
+    """
+    global _rate_limiter
+    if _rate_limiter is None:
+        with _rate_limiter_lock:
+            if _rate_limiter is None:
+                _rate_limiter = RateLimiter.from_env()
+    return _rate_limiter
+
@@ -0,0 +1,93 @@
+import asyncio
+import hashlib
+import os
+import random
+import time
+import uuid
+from dataclasses import dataclass
+from typing import Optional
+
+import requests
+from binance.exceptions import BinanceAPIException, BinanceRequestException
+
+CLIENT_ORDER_ID_PREFIX = "tb"
+
+# Exchange codes for "status unknown" and "duplicate clientOrderId".
+_UNKNOWN_STATUS_CODES = {-1006, -1007}
+DUPLICATE_CLIENT_ORDER_ID = -4116
+ORDER_DOES_NOT_EXIST = -2013
+
+
+def make_client_order_id(key: Optional[str] = None) -> str:
+    """
+    newClientOrderId for one logical order.
+
+    The same ``key`` (e.g. an API caller's idempotency key) always maps to
+    the same id; without one a fresh id is drawn. Either way the id is fixed
+    before the first attempt and reused by every retry.
+    """
+    key = key if key is not None else uuid.uuid4().hex
+    digest = hashlib.blake2b(key.encode("utf-8"), digest_size=16).hexdigest()
+    return f"{CLIENT_ORDER_ID_PREFIX}{digest}"
+
+
+def is_ambiguous(exc: BaseException) -> bool:
+    """
+    True if the request may or may not have reached the matching engine.
+    """
+    if isinstance(exc, BinanceAPIException):
+        return exc.status_code >= 500 or exc.code in _UNKNOWN_STATUS_CODES
+    return isinstance(
+        exc,
+        (BinanceRequestException, requests.RequestException, asyncio.TimeoutError, ConnectionError),
+    )
+
+
+def is_duplicate(exc: BaseException) -> bool:
+    return isinstance(exc, BinanceAPIException) and exc.code == DUPLICATE_CLIENT_ORDER_ID
+
+
+def is_missing(exc: BaseException) -> bool:
+    return isinstance(exc, BinanceAPIException) and exc.code == ORDER_DOES_NOT_EXIST
+
+
+@dataclass(frozen=True)
+class RetryPolicy:
+    """
+    Per-call timeout, retry count and jittered exponential backoff for order
+    placement, bounded overall by ``deadline`` seconds.
+    """
+
+    attempts: int = 3
+    timeout: float = 5.0
+    base_delay: float = 0.1
+    max_delay: float = 2.0
+    deadline: float = 15.0
+
+    def __post_init__(self) -> None:
+        # aiohttp reads a zero timeout as "no timeout", not "fail at once".
+        if self.attempts < 1:
+            raise ValueError("attempts must be at least 1.")
+        if self.timeout <= 0 or self.deadline <= 0:
+            raise ValueError("timeout and deadline must be positive.")
+
+    @classmethod
+    def from_env(cls) -> "RetryPolicy":
+        return cls(
+            attempts=int(os.getenv("BINANCE_RETRY_ATTEMPTS", "3")),
+            timeout=float(os.getenv("BINANCE_ORDER_TIMEOUT", "5")),
+            base_delay=float(os.getenv("BINANCE_RETRY_BASE_DELAY", "0.1")),
+            max_delay=float(os.getenv("BINANCE_RETRY_MAX_DELAY", "2")),
+            deadline=float(os.getenv("BINANCE_ORDER_DEADLINE", "15")),
+        )
+
+    def backoff(self, attempt: int) -> float:
+        # Full jitter: uniform in [0, min(max_delay, base * 2^attempt)].
+        return random.uniform(0, min(self.max_delay, self.base_delay * 2 ** attempt))
+
+    def call_timeout(self, started: float) -> float:
+        """
+        Timeout for the next call: the per-call timeout, cut to what is left
+        of the deadline.
+        """
+        return max(0.0, min(self.timeout, started + self.deadline - time.monotonic()))
@@ -0,0 +1,409 @@
+import json
+import logging
+import os
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass, field, fields, replace
+from decimal import Decimal
+from functools import partial
+from typing import TYPE_CHECKING, Any, Callable, Deque, Dict, List, Mapping, NamedTuple, Optional, Sequence, Tuple
+
+from .metrics import RISK_REJECTIONS
+from .positions import PositionBook, position_book
+from .validators import ValidatedOrder, ValidationError
+
+if TYPE_CHECKING:
+    from .market_data import MarketData
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CONFIG_PATH = "risk.json"
+
+
+class RiskRejected(ValidationError):
+    """Raised when an order breaks a pre-trade risk limit."""
+
+    def __init__(self, check: str, message: str) -> None:
+        super().__init__(message)
+        self.check = check
+        # Position of the rejected order within a batch.
+        self.index: Optional[int] = None
+
+
+@dataclass(frozen=True)
+class RiskLimits:
+    """
+    Limits for one symbol; None disables the corresponding check.
+    """
+
+    max_notional: Optional[Decimal] = None
+    max_position: Optional[Decimal] = None
+    max_orders: Optional[int] = None
+    window_seconds: float = 10.0
+    price_band: Optional[float] = None
+
+
+_LIMIT_TYPES: Dict[str, Callable[[Any], Any]] = {
+    "max_notional": lambda v: Decimal(str(v)),
+    "max_position": lambda v: Decimal(str(v)),
+    "max_orders": int,
+    "window_seconds": float,
+    "price_band": float,
+}
+
+
+def _parse_limits(data: Mapping[str, Any], base: RiskLimits) -> RiskLimits:
+    unknown = set(data) - {f.name for f in fields(RiskLimits)}
+    if unknown:
+        raise ValueError(f"Unknown risk limit(s): {', '.join(sorted(unknown))}.")
+    values = {k: (None if v is None else _LIMIT_TYPES[k](v)) for k, v in data.items()}
+    return replace(base, **values)
+
+
+@dataclass(frozen=True)
+class RiskConfig:
+    default: RiskLimits = RiskLimits()
+    symbols: Mapping[str, RiskLimits] = field(default_factory=dict)
+
+    def limits(self, symbol: str) -> RiskLimits:
+        return self.symbols.get(symbol, self.default)
+
+
+def parse_risk_config(data: Mapping[str, Any]) -> RiskConfig:
+    """
+    Build a RiskConfig from ``{"default": {...}, "symbols": {"BTCUSDT": {...}}}``;
+    symbol entries override individual default limits.
+    """
+    default = _parse_limits(data.get("default") or {}, RiskLimits())
+    symbols = {
+        symbol.upper(): _parse_limits(limits or {}, default)
+        for symbol, limits in (data.get("symbols") or {}).items()
+    }
+    return RiskConfig(default, symbols)
+
+
+class RiskContext(NamedTuple):
+    order: ValidatedOrder
+    limits: RiskLimits
+    # Local reference price (fresh mark price, else mid), or None without market data.
+    reference: Optional[float]
+    # Price the order is expected to trade at: its limit price, else the touch.
+    fill_price: Optional[Decimal]
+    # Earlier orders of the same batch: quantity on this symbol and side,
+    # and order count on this symbol.
+    batch_qty: Decimal = Decimal("0")
+    batch_orders: int = 0
+
+
+# Called with the exchange's response, or None if the order was not placed.
+Release = Callable[[Optional[Mapping[str, Any]]], None]
+
+
+class Reservation:
+    """
+    What accepted orders hold until their outcome is known: one list of
+    release callbacks per order, from the checks' ``commit``.
+    """
+
+    def __init__(self, releases: Sequence[Sequence[Release]] = ()) -> None:
+        self._releases = [list(r) for r in releases]
+
+    def settle(self, responses: Sequence[Optional[Mapping[str, Any]]]) -> None:
+        """
+        Hand each order its response (in order; None or an error entry when
+        it was not placed). Later calls do nothing.
+        """
+        releases, self._releases = self._releases, []
+        for callbacks, response in zip(releases, responses):
+            placed = response if response is not None and "orderId" in response else None
+            for release in callbacks:
+                release(placed)
+
+    def release(self) -> None:
+        """
+        Give everything back: none of the orders was placed.
+        """
+        self.settle([None] * len(self._releases))
+
+
+def check_price_band(
+    symbol: str, price: Optional[Decimal], reference: Optional[float], band: Optional[float]
+) -> None:
+    """
+    Fat-finger check: rejects a LIMIT price further than ``band`` (a
+    fraction) from ``reference``. Skipped without a price, reference or band.
+    """
+    if band is None or price is None or not reference:
+        return
+    if abs(float(price) - reference) > reference * band:
+        raise RiskRejected(
+            "price_band", f"Price {price} is more than {band:.1%} away from reference price {reference} for {symbol}."
+        )
+
+
+class PriceBandCheck:
+    """
+    check_price_band with the symbol's ``price_band`` limit.
+    """
+
+    name = "price_band"
+
+    def __call__(self, ctx: RiskContext) -> None:
+        check_price_band(ctx.order.symbol, ctx.order.price, ctx.reference, ctx.limits.price_band)
+
+
+class NotionalCheck:
+    """
+    Rejects orders whose notional (quantity x expected price) exceeds ``max_notional``.
+    """
+
+    name = "max_notional"
+
+    def __call__(self, ctx: RiskContext) -> None:
+        limit = ctx.limits.max_notional
+        if limit is None or ctx.fill_price is None:
+            return
+        notional = ctx.order.quantity * ctx.fill_price
+        if notional > limit:
+            raise RiskRejected(
+                self.name, f"Order notional {notional:.2f} exceeds limit {limit} for {ctx.order.symbol}."
+            )
+
+
+class PositionCheck:
+    """
+    Rejects orders that would take the net position beyond ``max_position``
+    (absolute quantity) if they and every pending order on the same side
+    filled. Orders that reduce that position always pass. Accepted orders
+    are reserved in the book as pending until their outcome is known.
+    """
+
+    name = "max_position"
+
+    def __init__(self, positions: PositionBook) -> None:
+        self.positions = positions
+
+    def __call__(self, ctx: RiskContext) -> None:
+        limit = ctx.limits.max_position
+        if limit is None:
+            return
+        order = ctx.order
+        pending = self.positions.pending_qty(order.symbol, order.side) + ctx.batch_qty
+        if order.side == "BUY":
+            base = self.positions.net_qty(order.symbol) + pending
+            after = base + order.quantity
+        else:
+            base = self.positions.net_qty(order.symbol) - pending
+            after = base - order.quantity
+        if abs(after) > limit and abs(after) > abs(base):
+            raise RiskRejected(
+                self.name,
+                f"Order would take the {order.symbol} position to {after} with pending orders, "
+                f"beyond the limit of {limit}.",
+            )
+
+    def commit(self, ctx: RiskContext) -> Optional[Release]:
+        if ctx.limits.max_position is None:
+            return None
+        token = self.positions.reserve(ctx.order.symbol, ctx.order.side, ctx.order.quantity)
+        return partial(self.positions.release, token)
+
+
+class OrderRateCheck:
+    """
+    At most ``max_orders`` accepted orders per symbol in any ``window_seconds``.
+
+    One deque of accept times per symbol, trimmed from the left as it is
+    checked: O(1) amortized per order. Times are only recorded by
+    ``commit``, once every order of the batch has passed every check.
+    """
+
+    name = "order_rate"
+
+    def __init__(self, clock: Callable[[], float] = time.monotonic) -> None:
+        self.clock = clock
+        self._windows: Dict[str, Deque[float]] = {}
+        self._lock = threading.Lock()
+
+    def __call__(self, ctx: RiskContext) -> None:
+        limit = ctx.limits.max_orders
+        if limit is None:
+            return
+        symbol = ctx.order.symbol
+        now = self.clock()
+        horizon = now - ctx.limits.window_seconds
+        with self._lock:
+            window = self._windows.get(symbol)
+            if window is None:
+                window = self._windows[symbol] = deque()
+            while window and window[0] <= horizon:
+                window.popleft()
+            if len(window) + ctx.batch_orders >= limit:
+                retry_in = window[0] - horizon if window else ctx.limits.window_seconds
+                raise RiskRejected(
+                    self.name,
+                    f"More than {limit} {symbol} orders in {ctx.limits.window_seconds:g}s; "
+                    f"retry in {retry_in:.2f}s.",
+                )
+
+    def commit(self, ctx: RiskContext) -> None:
+        if ctx.limits.max_orders is None:
+            return
+        now = self.clock()
+        with self._lock:
+            self._windows.setdefault(ctx.order.symbol, deque()).append(now)
+
+    def counts(self) -> Dict[str, int]:
+        with self._lock:
+            return {symbol: len(window) for symbol, window in self._windows.items()}
+
+
+RiskCheck = Callable[[RiskContext], None]
+
+
+def default_checks(positions: PositionBook, clock: Callable[[], float] = time.monotonic) -> List[RiskCheck]:
+    return [PriceBandCheck(), NotionalCheck(), PositionCheck(positions), OrderRateCheck(clock)]
+
+
+class RiskEngine:
+    """
+    Pre-trade risk checks run on the order path, after validation and before
+    the order is sent.
+
+    Each check is a callable taking a RiskContext and raising RiskRejected;
+    they run in order and only touch in-memory state (the position book,
+    sliding-window counters, cached quotes). Once every order of a batch
+    has passed, checks with a ``commit`` method record it (rate windows,
+    pending exposure); what they hold comes back as a Reservation that the
+    caller settles with the exchange's responses. Limits come from a JSON file
+    that is re-read when its mtime changes, checked at most every
+    ``reload_interval`` seconds; a missing file disables every check and a
+    broken one keeps the previous limits.
+    """
+
+    def __init__(
+        self,
+        config_path: Optional[str] = None,
+        checks: Optional[Sequence[RiskCheck]] = None,
+        positions: Optional[PositionBook] = None,
+        reload_interval: float = 1.0,
+        config: Optional[RiskConfig] = None,
+    ) -> None:
+        self.config_path = config_path
+        self.reload_interval = reload_interval
+        self.checks: List[RiskCheck] = list(checks) if checks is not None else default_checks(positions or position_book)
+        self.config = config or RiskConfig()
+        self.enabled = config is not None
+        self.reloads = 0
+        self._mtime: Optional[int] = None
+        self._next_reload = 0.0
+        # Checks and commits of one call are atomic with respect to others.
+        self._lock = threading.Lock()
+        if config is None:
+            self.reload()
+
+    @classmethod
+    def from_env(cls) -> "RiskEngine":
+        return cls(
+            config_path=os.getenv("TRADING_BOT_RISK_CONFIG", DEFAULT_CONFIG_PATH),
+            reload_interval=float(os.getenv("TRADING_BOT_RISK_RELOAD_INTERVAL", "1")),
+        )
+
+    def reload(self) -> bool:
+        """
+        Re-read the config file if it changed; returns True if limits were replaced.
+        """
+        path = self.config_path
+        try:
+            mtime = os.stat(path).st_mtime_ns if path else None
+        except FileNotFoundError:
+            mtime = None
+        if mtime == self._mtime:
+            return False
+        self._mtime = mtime
+        if mtime is None:
+            self.config, self.enabled = RiskConfig(), False
+            logger.info("No risk config at %s; risk checks disabled.", path)
+            return True
+        try:
+            with open(path, encoding="utf-8") as fh:
+                config = parse_risk_config(json.load(fh))
+        except (OSError, ValueError, TypeError, AttributeError):
+            logger.exception("Invalid risk config %s; keeping the previous limits.", path)
+            return False
+        self.config, self.enabled = config, True
+        self.reloads += 1
+        logger.info("Loaded risk limits from %s.", path)
+        return True
+
+    def check(self, order: ValidatedOrder, market_data: Optional["MarketData"] = None) -> Reservation:
+        """
+        Run every check against ``order``; raises RiskRejected on the first failure.
+        """
+        return self.check_batch([order], market_data)
+
+    def check_batch(
+        self, orders: Sequence[ValidatedOrder], market_data: Optional["MarketData"] = None
+    ) -> Reservation:
+        """
+        Check orders meant to be sent together, each counting the ones
+        before it; nothing is committed unless all of them pass. A
+        rejection carries the failing order's ``index``.
+        """
+        now = time.monotonic()
+        if now >= self._next_reload:
+            self._next_reload = now + self.reload_interval
+            self.reload()
+        if not self.enabled:
+            return Reservation()
+
+        with self._lock:
+            contexts = []
+            batch_qty: Dict[Tuple[str, str], Decimal] = {}
+            batch_orders: Dict[str, int] = {}
+            for index, order in enumerate(orders):
+                ctx = self._context(order, market_data)._replace(
+                    batch_qty=batch_qty.get((order.symbol, order.side), Decimal("0")),
+                    batch_orders=batch_orders.get(order.symbol, 0),
+                )
+                try:
+                    for check in self.checks:
+                        check(ctx)
+                except RiskRejected as exc:
+                    RISK_REJECTIONS.labels(exc.check).inc()
+                    exc.index = index
+                    raise
+                contexts.append(ctx)
+                batch_qty[(order.symbol, order.side)] = ctx.batch_qty + order.quantity
+                batch_orders[order.symbol] = ctx.batch_orders + 1
+
+            releases = []
+            for ctx in contexts:
+                held = []
+                for check in self.checks:
+                    commit = getattr(check, "commit", None)
+                    release = commit(ctx) if commit is not None else None
+                    if release is not None:
+                        held.append(release)
+                releases.append(held)
+        return Reservation(releases)
+
+    def _context(self, order: ValidatedOrder, market_data: Optional["MarketData"]) -> RiskContext:
+        reference = touch = None
+        quote = market_data.fresh(order.symbol) if market_data is not None else None
+        if quote is not None:
+            reference = quote.mark_price or quote.mid or None
+            touch = (quote.ask if order.side == "BUY" else quote.bid) or reference
+        fill_price = order.price if order.price is not None else (Decimal(str(touch)) if touch else None)
+        return RiskContext(order, self.config.limits(order.symbol), reference, fill_price)
+
+    def status(self) -> Dict[str, Any]:
+        rate = next((c for c in self.checks if isinstance(c, OrderRateCheck)), None)
+        return {
+            "enabled": self.enabled,
+            "config_path": self.config_path,
+            "reloads": self.reloads,
+            "checks": [getattr(c, "name", type(c).__name__) for c in self.checks],
+            "orders_in_window": rate.counts() if rate is not None else {},
+        }
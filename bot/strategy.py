@@ -0,0 +1,504 @@
+import asyncio
+import importlib
+import inspect
+import json
+import logging
+import os
+import time
+import types
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from decimal import Decimal
+from typing import Any, Awaitable, Callable, Dict, Generator, Iterable, List, NamedTuple, Optional, Sequence, Tuple
+
+from .client import DEFAULT_FUTURES_BASE_URL, AsyncBinanceFuturesClient
+from .db import init_db
+from .exchange_info import ExchangeInfoCache, http_exchange_info_fetcher
+from .market_data import MarketData, Quote
+from .metrics import STRATEGY_CPU_SECONDS, STRATEGY_OVERRUNS
+from .orders import build_and_place_order_async
+from .positions import TERMINAL_STATUSES, PositionBook, position_book
+from .risk import RiskEngine
+from .user_stream import UserDataStream, rest_order_update
+from .writer import start_order_writer, stop_order_writer
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CONFIG_PATH = "strategies.json"
+
+
+class Fill(NamedTuple):
+    order_id: str
+    symbol: str
+    side: str
+    status: str
+    # Cumulative for the order, and the part that is new since the last Fill.
+    executed_qty: Decimal
+    last_qty: Decimal
+    avg_price: Decimal
+
+
+class Strategy:
+    """
+    Base class for automated strategies run by a StrategyRunner.
+
+    Override ``on_tick`` (called every ``interval`` seconds) and ``on_fill``
+    (called when an order placed by this strategy fills, fully or in part);
+    ``on_start`` and ``on_stop`` are optional. Callbacks may be plain or
+    ``async`` functions and are never run concurrently for one strategy.
+    They share the runner's event loop, so they must not block: place
+    orders with ``await self.place_order(...)`` and read prices with
+    ``self.quote(symbol)``, both of which stay on the loop.
+    """
+
+    def __init__(
+        self,
+        name: Optional[str] = None,
+        symbols: Iterable[str] = (),
+        interval: float = 1.0,
+        cpu_budget: Optional[float] = None,
+        **params: Any,
+    ) -> None:
+        self.name = name or type(self).__name__
+        self.symbols = [s.upper() for s in symbols]
+        self.interval = interval
+        # CPU seconds per callback; None uses the runner's default.
+        self.cpu_budget = cpu_budget
+        self.params = params
+        self.runner: Optional["StrategyRunner"] = None
+
+    def on_start(self) -> Any:
+        pass
+
+    def on_tick(self) -> Any:
+        pass
+
+    def on_fill(self, fill: Fill) -> Any:
+        pass
+
+    def on_stop(self) -> Any:
+        pass
+
+    def quote(self, symbol: Optional[str] = None) -> Optional[Quote]:
+        """
+        Latest cached quote for ``symbol`` (default: the first of ``symbols``).
+        """
+        return self._runner.quote(symbol or self.symbols[0])
+
+    def position(self, symbol: Optional[str] = None) -> Decimal:
+        """
+        Account net position for ``symbol``, shared by every strategy.
+        """
+        return self._runner.positions.net_qty(symbol or self.symbols[0])
+
+    async def place_order(
+        self,
+        side: str,
+        quantity: Any,
+        order_type: str = "MARKET",
+        price: Any = None,
+        time_in_force: Optional[str] = None,
+        symbol: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        return await self._runner.place_order(
+            self, symbol or self.symbols[0], side, order_type, quantity, price, time_in_force
+        )
+
+    @property
+    def _runner(self) -> "StrategyRunner":
+        if self.runner is None:
+            raise RuntimeError(f"Strategy {self.name} is not attached to a runner.")
+        return self.runner
+
+
+@dataclass
+class StrategyStats:
+    ticks: int = 0
+    fills: int = 0
+    orders: int = 0
+    errors: int = 0
+    cpu_seconds: float = 0.0
+    max_step: float = 0.0
+    overruns: int = 0
+    state: str = "new"
+
+
+@dataclass
+class _Slot:
+    strategy: Strategy
+    budget: float
+    stats: StrategyStats = field(default_factory=StrategyStats)
+    fills: "asyncio.Queue[Fill]" = field(default_factory=asyncio.Queue)
+    consecutive_overruns: int = 0
+    task: Optional[asyncio.Task] = None
+
+
+@types.coroutine
+def _timed(awaitable: Awaitable[Any], account: Callable[[float], None]) -> Generator[Any, Any, Any]:
+    # Drives ``awaitable`` step by step and reports the thread CPU time of
+    # each step, i.e. of each stretch the strategy held the loop, without
+    # counting the time other tasks run while it is suspended.
+    steps = awaitable.__await__()
+    value: Any = None
+    error: Optional[BaseException] = None
+    while True:
+        t0 = time.thread_time()
+        try:
+            yielded = steps.send(value) if error is None else steps.throw(error)
+        except StopIteration as stop:
+            return stop.value
+        finally:
+            account(time.thread_time() - t0)
+        value, error = None, None
+        try:
+            value = yield yielded
+        except GeneratorExit:
+            steps.close()  # type: ignore[attr-defined]
+            raise
+        except BaseException as exc:
+            error = exc
+
+
+class StrategyRunner:
+    """
+    Runs many strategies as tasks on one event loop, sharing one async
+    client, market-data cache, position book, risk engine and DB writer.
+
+    Every callback is timed in thread CPU time, step by step, so a strategy
+    is only charged while it holds the loop. A callback that uses more than
+    its ``cpu_budget`` counts as an overrun, and after ``max_overruns`` in a
+    row the strategy is suspended: scheduling is cooperative, so a callback
+    cannot be interrupted, but a strategy that keeps hogging the loop stops
+    delaying the others. ``stats()`` ranks strategies by CPU use and is
+    logged every ``report_interval`` seconds; single steps longer than
+    ``slow_step`` are logged with the strategy's name as they happen.
+    """
+
+    def __init__(
+        self,
+        strategies: Iterable[Strategy] = (),
+        client: Optional[AsyncBinanceFuturesClient] = None,
+        market_data: Optional[MarketData] = None,
+        exchange_info: Optional[ExchangeInfoCache] = None,
+        risk: Optional[RiskEngine] = None,
+        positions: Optional[PositionBook] = None,
+        cpu_budget: Optional[float] = None,
+        max_overruns: Optional[int] = None,
+        slow_step: Optional[float] = None,
+        report_interval: Optional[float] = None,
+        max_unclaimed: int = 1000,
+    ) -> None:
+        self.client = client
+        self.market_data = market_data
+        self.exchange_info = exchange_info
+        self.risk = risk
+        self.positions = positions or position_book
+        self.cpu_budget = cpu_budget or float(os.getenv("TRADING_BOT_STRATEGY_CPU_BUDGET", "0.01"))
+        self.max_overruns = max_overruns if max_overruns is not None else int(
+            os.getenv("TRADING_BOT_STRATEGY_MAX_OVERRUNS", "5")
+        )
+        self.slow_step = slow_step or float(os.getenv("TRADING_BOT_STRATEGY_SLOW_STEP", "0.1"))
+        self.report_interval = report_interval or float(os.getenv("TRADING_BOT_STRATEGY_REPORT_INTERVAL", "60"))
+        self.max_unclaimed = max_unclaimed
+        self._slots: Dict[str, _Slot] = {}
+        # (symbol, order_id) -> (owning slot, executed qty already reported).
+        self._orders: Dict[Tuple[str, str], Tuple[_Slot, Decimal]] = {}
+        # Stream updates for orders whose placement has not returned yet.
+        self._unclaimed: "OrderedDict[Tuple[str, str], Dict[str, Any]]" = OrderedDict()
+        self._owned: List[str] = []
+        self._user_stream: Optional[UserDataStream] = None
+        self._reporter: Optional[asyncio.Task] = None
+        self._started_cpu = 0.0
+        for strategy in strategies:
+            self.add(strategy)
+
+    def add(self, strategy: Strategy) -> None:
+        if strategy.name in self._slots:
+            raise ValueError(f"Duplicate strategy name {strategy.name!r}.")
+        strategy.runner = self
+        self._slots[strategy.name] = _Slot(strategy, strategy.cpu_budget or self.cpu_budget)
+
+    @property
+    def symbols(self) -> List[str]:
+        symbols: Dict[str, None] = {}
+        for slot in self._slots.values():
+            symbols.update(dict.fromkeys(slot.strategy.symbols))
+        return list(symbols)
+
+    async def start(self) -> None:
+        """
+        Build whatever shared dependencies were not passed in, then start
+        every strategy.
+        """
+        init_db()
+        start_order_writer()
+        if self.client is None:
+            self.client = AsyncBinanceFuturesClient()
+            self._owned.append("client")
+            if os.getenv("TRADING_BOT_USER_STREAM", "1") != "0":
+                self._user_stream = UserDataStream(
+                    self.client, positions=self.positions, listeners=[self.apply_updates]
+                )
+                self._user_stream.start()
+        if self.market_data is None:
+            self.market_data = MarketData.from_env(self.symbols)
+            self.market_data.start()
+            self._owned.append("market_data")
+        if self.exchange_info is None:
+            base_url = os.getenv("BINANCE_FUTURES_TESTNET_URL", DEFAULT_FUTURES_BASE_URL)
+            self.exchange_info = ExchangeInfoCache.from_env(http_exchange_info_fetcher(base_url))
+            await asyncio.to_thread(self.exchange_info.start)
+            self._owned.append("exchange_info")
+        if self.risk is None:
+            self.risk = RiskEngine.from_env()
+        # Snapshots are left to the API, as in the order daemon.
+        await asyncio.to_thread(self.positions.restore)
+
+        self._started_cpu = time.process_time()
+        for slot in self._slots.values():
+            slot.task = asyncio.get_running_loop().create_task(self._run(slot), name=f"strategy-{slot.strategy.name}")
+        self._reporter = asyncio.get_running_loop().create_task(self._report_loop(), name="strategy-report")
+        logger.info("Started %d strategies on %s.", len(self._slots), ",".join(self.symbols) or "no symbols")
+
+    async def stop(self) -> None:
+        tasks = [slot.task for slot in self._slots.values() if slot.task is not None]
+        if self._reporter is not None:
+            tasks.append(self._reporter)
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._reporter = None
+        for slot in self._slots.values():
+            slot.task = None
+            if slot.stats.state in ("running", "suspended"):
+                await self._invoke(slot, slot.strategy.on_stop)
+                slot.stats.state = "stopped"
+
+        if self._user_stream is not None:
+            await self._user_stream.stop()
+            self._user_stream = None
+        if "market_data" in self._owned and self.market_data is not None:
+            await self.market_data.stop()
+        if "exchange_info" in self._owned and self.exchange_info is not None:
+            await asyncio.to_thread(self.exchange_info.stop)
+        if "client" in self._owned and self.client is not None:
+            await self.client.aclose()
+        self._owned.clear()
+        await asyncio.to_thread(stop_order_writer)
+        logger.info("Strategies stopped.")
+
+    async def run_forever(self) -> None:
+        await self.start()
+        try:
+            await asyncio.Event().wait()
+        finally:
+            await self.stop()
+
+    def quote(self, symbol: str) -> Optional[Quote]:
+        return self.market_data.get(symbol) if self.market_data is not None else None
+
+    async def place_order(
+        self,
+        strategy: Strategy,
+        symbol: str,
+        side: str,
+        order_type: str,
+        quantity: Any,
+        price: Any = None,
+        time_in_force: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """
+        Place an order for ``strategy`` through the shared client and checks,
+        and route its fills back to the strategy.
+        """
+        slot = self._slots[strategy.name]
+        response = await build_and_place_order_async(
+            self.client,  # type: ignore[arg-type]
+            symbol,
+            side,
+            order_type,
+            quantity,
+            price,
+            time_in_force,
+            exchange_info=self.exchange_info,
+            market_data=self.market_data,
+            risk=self.risk,
+        )
+        slot.stats.orders += 1
+        # Already applied to the global book; idempotent if this is the same one.
+        self.positions.apply_response(response)
+        update = rest_order_update(response)
+        key = (update["symbol"], update["order_id"])
+        self._orders[key] = (slot, Decimal("0"))
+        self._route(update)
+        # A terminal REST response has already retired the order; _route
+        # then drops the stream's copy.
+        unclaimed = self._unclaimed.pop(key, None)
+        if unclaimed is not None:
+            self._route(unclaimed)
+        return response
+
+    def apply_updates(self, updates: Iterable[Dict[str, Any]]) -> None:
+        """
+        Route user-stream order updates (upsert_order_updates entries) to
+        the strategies that placed the orders; must run on the loop.
+        """
+        for update in updates:
+            key = (update["symbol"], update["order_id"])
+            if key in self._orders:
+                self._route(update)
+            else:
+                self._unclaimed[key] = update
+                if len(self._unclaimed) > self.max_unclaimed:
+                    self._unclaimed.popitem(last=False)
+
+    def _route(self, update: Dict[str, Any]) -> None:
+        # Cumulative quantities make repeated or stale updates harmless.
+        key = (update["symbol"], update["order_id"])
+        routed = self._orders.get(key)
+        if routed is None:
+            return
+        slot, reported = routed
+        executed = Decimal(str(update.get("executed_qty") or 0))
+        if executed > reported:
+            self._orders[key] = (slot, executed)
+            slot.fills.put_nowait(
+                Fill(
+                    update["order_id"],
+                    update["symbol"],
+                    update["side"],
+                    update["status"],
+                    executed,
+                    executed - reported,
+                    Decimal(str(update.get("avg_price") or 0)),
+                )
+            )
+        if update["status"] in TERMINAL_STATUSES:
+            del self._orders[key]
+
+    async def _run(self, slot: _Slot) -> None:
+        strategy = slot.strategy
+        slot.stats.state = "running"
+        await self._invoke(slot, strategy.on_start)
+        loop = asyncio.get_running_loop()
+        next_tick = loop.time()
+        while slot.stats.state == "running":
+            now = loop.time()
+            if not slot.fills.empty():
+                fill = slot.fills.get_nowait()
+            elif now < next_tick:
+                try:
+                    fill = await asyncio.wait_for(slot.fills.get(), next_tick - now)
+                except asyncio.TimeoutError:
+                    continue
+            else:
+                # Ticks missed while the loop was busy are skipped, not queued.
+                next_tick = max(next_tick + strategy.interval, now)
+                slot.stats.ticks += 1
+                await self._invoke(slot, strategy.on_tick)
+                continue
+            slot.stats.fills += 1
+            await self._invoke(slot, strategy.on_fill, fill)
+
+    async def _invoke(self, slot: _Slot, callback: Callable[..., Any], *args: Any) -> None:
+        name = slot.strategy.name
+        used = 0.0
+
+        def account(seconds: float) -> None:
+            nonlocal used
+            used += seconds
+            if seconds > slot.stats.max_step:
+                slot.stats.max_step = seconds
+            if seconds > self.slow_step:
+                logger.warning("Strategy %s held the event loop for %.1f ms.", name, seconds * 1000)
+
+        try:
+            t0 = time.thread_time()
+            try:
+                result = callback(*args)
+            finally:
+                account(time.thread_time() - t0)
+            if inspect.isawaitable(result):
+                await _timed(result, account)
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            slot.stats.errors += 1
+            logger.exception("Strategy %s failed in %s.", name, getattr(callback, "__name__", "callback"))
+        finally:
+            slot.stats.cpu_seconds += used
+            STRATEGY_CPU_SECONDS.labels(name).inc(used)
+
+        if used <= slot.budget:
+            slot.consecutive_overruns = 0
+            return
+        slot.stats.overruns += 1
+        slot.consecutive_overruns += 1
+        STRATEGY_OVERRUNS.labels(name).inc()
+        logger.warning(
+            "Strategy %s used %.1f ms of CPU in %s (budget %.1f ms).",
+            name,
+            used * 1000,
+            getattr(callback, "__name__", "callback"),
+            slot.budget * 1000,
+        )
+        if self.max_overruns and slot.consecutive_overruns >= self.max_overruns and slot.stats.state == "running":
+            slot.stats.state = "suspended"
+            logger.error("Suspended strategy %s after %d budget overruns in a row.", name, slot.consecutive_overruns)
+
+    def stats(self) -> List[Dict[str, Any]]:
+        """
+        Per-strategy counters, heaviest first; ``cpu_share`` is the strategy's
+        share of the process CPU time since start.
+        """
+        process_cpu = max(time.process_time() - self._started_cpu, 1e-9)
+        rows = [
+            {
+                "name": name,
+                **vars(slot.stats),
+                "budget": slot.budget,
+                "cpu_share": round(slot.stats.cpu_seconds / process_cpu, 4),
+            }
+            for name, slot in self._slots.items()
+        ]
+        return sorted(rows, key=lambda row: row["cpu_seconds"], reverse=True)
+
+    async def _report_loop(self) -> None:
+        while True:
+            await asyncio.sleep(self.report_interval)
+            top = ", ".join(
+                f"{row['name']} {row['cpu_share']:.1%} ({row['state']})" for row in self.stats()[:5]
+            )
+            logger.info("Strategy CPU share: %s.", top or "none")
+
+
+def _import_strategy(path: str) -> Callable[..., Strategy]:
+    module_name, _, attr = path.partition(":")
+    if not attr:
+        raise ValueError(f"Strategy class must be given as module:Class, got {path!r}.")
+    return getattr(importlib.import_module(module_name), attr)
+
+
+def load_strategies(source: Any = None) -> List[Strategy]:
+    """
+    Instantiate strategies from a JSON list (a path, or already parsed):
+    ``[{"class": "pkg.module:Class", "name": ..., "symbols": [...],
+    "interval": 1, "cpu_budget": 0.005, "params": {...}}]``.
+    """
+    if source is None or isinstance(source, (str, os.PathLike)):
+        with open(source or os.getenv("TRADING_BOT_STRATEGY_CONFIG", DEFAULT_CONFIG_PATH), encoding="utf-8") as fh:
+            source = json.load(fh)
+    entries: Sequence[Dict[str, Any]] = source
+    strategies = []
+    for entry in entries:
+        cls = _import_strategy(entry["class"])
+        strategies.append(
+            cls(
+                name=entry.get("name"),
+                symbols=entry.get("symbols", ()),
+                interval=float(entry.get("interval", 1.0)),
+                cpu_budget=entry.get("cpu_budget"),
+                **(entry.get("params") or {}),
+            )
+        )
+    return strategies
@@ -0,0 +1,254 @@
+import asyncio
+import json
+import logging
+import os
+import random
+import time
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+from websockets.asyncio.client import connect
+from websockets.exceptions import WebSocketException
+
+from .db import get_open_orders, upsert_order_updates
+from .events import OrderHub, order_event, order_hub
+from .positions import PositionBook, position_book
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_FUTURES_WS_URL = "wss://stream.binancefuture.com"
+
+
+def parse_order_update(message: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """
+    Turn an ORDER_TRADE_UPDATE event into an upsert_order_updates entry.
+    """
+    if message.get("e") != "ORDER_TRADE_UPDATE":
+        return None
+    order = message.get("o") or {}
+    event_ms = order.get("T") or message.get("E") or message.get("T") or 0
+    return {
+        "order_id": str(order.get("i", "")),
+        "symbol": order.get("s", ""),
+        "side": order.get("S", ""),
+        "type": order.get("o", ""),
+        "status": order.get("X", ""),
+        "executed_qty": order.get("z"),
+        "avg_price": order.get("ap"),
+        "updated_at": datetime.utcfromtimestamp(event_ms / 1000),
+        "raw": message,
+    }
+
+
+def rest_order_update(response: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Same shape as parse_order_update, from a REST order query.
+    """
+    event_ms = response.get("updateTime") or response.get("time") or 0
+    return {
+        "order_id": str(response.get("orderId", "")),
+        "symbol": response.get("symbol", ""),
+        "side": response.get("side", ""),
+        "type": response.get("type", ""),
+        "status": response.get("status", ""),
+        "executed_qty": response.get("executedQty"),
+        "avg_price": response.get("avgPrice"),
+        "updated_at": datetime.utcfromtimestamp(event_ms / 1000),
+        "raw": response,
+    }
+
+
+class UserDataStream:
+    """
+    Background consumer of the futures user-data stream.
+
+    Creates a listenKey, keeps it alive, and applies ORDER_TRADE_UPDATE
+    events to the orders table in batches. Every (re)connect is followed by
+    a REST resync of the orders the DB still considers open, so events
+    missed while disconnected are not lost.
+    """
+
+    def __init__(
+        self,
+        client: Any,
+        ws_url: Optional[str] = None,
+        keepalive_interval: float = 30 * 60,
+        flush_interval: float = 0.05,
+        batch_size: int = 200,
+        max_backoff: float = 60.0,
+        min_healthy: float = 30.0,
+        hub: Optional[OrderHub] = None,
+        positions: Optional[PositionBook] = None,
+        listeners: Sequence[Callable[[List[Dict[str, Any]]], None]] = (),
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.client = client
+        self.ws_url = (ws_url or os.getenv("BINANCE_FUTURES_WS_URL", DEFAULT_FUTURES_WS_URL)).rstrip("/")
+        self.keepalive_interval = keepalive_interval
+        self.flush_interval = flush_interval
+        self.batch_size = batch_size
+        self.max_backoff = max_backoff
+        # Connections shorter than this count as failures for the backoff.
+        self.min_healthy = min_healthy
+        self.clock = clock
+        self.hub = hub or order_hub
+        self.positions = positions or position_book
+        # Called on the event loop with each batch of updates (e.g. strategy fills).
+        self.listeners = list(listeners)
+        self.connects = 0
+        self.events = 0
+        self.written = 0
+        self.resyncs = 0
+        self._pending: List[Dict[str, Any]] = []
+        self._task: Optional[asyncio.Task] = None
+        self._connected = asyncio.Event()
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "connects": self.connects,
+            "events": self.events,
+            "written": self.written,
+            "resyncs": self.resyncs,
+        }
+
+    def start(self) -> None:
+        """
+        Run the stream on the current event loop until stop().
+        """
+        if self._task is None:
+            self._task = asyncio.get_running_loop().create_task(self.run(), name="user-data-stream")
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        await self.flush()
+
+    async def wait_connected(self, timeout: float = 5.0) -> None:
+        await asyncio.wait_for(self._connected.wait(), timeout)
+
+    async def run(self) -> None:
+        attempt = 0
+        while True:
+            started = self.clock()
+            try:
+                await self._run_once()
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception("User-data stream failed.")
+            # _run_once also returns after a dropped connection, so only one
+            # that stayed up for a while resets the backoff.
+            if self.clock() - started >= self.min_healthy:
+                attempt = 0
+            else:
+                attempt += 1
+            self._connected.clear()
+            await self.flush()
+            # Full jitter so many bots don't reconnect in lockstep.
+            delay = min(self.max_backoff, 0.5 * 2 ** attempt)
+            await asyncio.sleep(random.uniform(0, delay))
+
+    async def _run_once(self) -> None:
+        listen_key = await self.client.create_listen_key()
+        async with connect(f"{self.ws_url}/ws/{listen_key}") as ws:
+            self.connects += 1
+            logger.info("User-data stream connected.")
+            keepalive = asyncio.create_task(self._keepalive())
+            flusher = asyncio.create_task(self._flush_loop())
+            try:
+                await self.resync()
+                self._connected.set()
+                async for raw in ws:
+                    message = json.loads(raw)
+                    if message.get("e") == "listenKeyExpired":
+                        logger.warning("listenKey expired; reconnecting.")
+                        return
+                    update = parse_order_update(message)
+                    if update is None:
+                        continue
+                    self.events += 1
+                    self._pending.append(update)
+                    if len(self._pending) >= self.batch_size:
+                        await self.flush()
+            except WebSocketException:
+                logger.warning("User-data stream disconnected; reconnecting.")
+            finally:
+                keepalive.cancel()
+                flusher.cancel()
+
+    async def _keepalive(self) -> None:
+        while True:
+            await asyncio.sleep(self.keepalive_interval)
+            try:
+                await self.client.keepalive_listen_key()
+            except Exception:
+                logger.exception("listenKey keepalive failed.")
+
+    async def _flush_loop(self) -> None:
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            await self.flush()
+
+    async def flush(self) -> None:
+        """
+        Write pending updates in one upsert and notify dashboard subscribers.
+        """
+        if not self._pending:
+            return
+        batch, self._pending = self._pending, []
+        # Fills count even if the DB write below fails.
+        self.positions.apply_updates(batch)
+        for listener in self.listeners:
+            try:
+                listener(batch)
+            except Exception:
+                logger.exception("Order update listener failed.")
+        # Shielded: cancelling a write still queued for the executor (as
+        # stop() can) would drop the batch.
+        write = asyncio.get_running_loop().run_in_executor(None, upsert_order_updates, batch)
+        try:
+            self.written += await asyncio.shield(write)
+        except Exception:
+            logger.exception("Failed to apply %d order updates.", len(batch))
+            return
+        for update in batch:
+            self.hub.publish(order_event(_as_response(update), event="update"))
+
+    async def resync(self) -> None:
+        """
+        Reconcile orders the DB still thinks are open against REST.
+
+        One openOrders call covers everything still working; the remaining
+        DB-open orders were filled or cancelled while we weren't listening
+        and are queried individually.
+        """
+        known = await asyncio.to_thread(get_open_orders, None)
+        open_orders = await self.client.get_open_orders()
+        updates = [rest_order_update(o) for o in open_orders]
+        # Order ids are only unique per symbol.
+        still_open = {(u["symbol"], u["order_id"]) for u in updates}
+        for symbol, order_id in known:
+            if (symbol, order_id) in still_open:
+                continue
+            try:
+                updates.append(rest_order_update(await self.client.get_order(symbol, order_id)))
+            except Exception:
+                logger.exception("Resync query failed for order %s.", order_id)
+        self.resyncs += 1
+        self._pending.extend(updates)
+        await self.flush()
+
+
+def _as_response(update: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        "symbol": update["symbol"],
+        "side": update["side"],
+        "type": update["type"],
+        "status": update["status"],
+        "orderId": update["order_id"],
+    }
@@ -1,55 +1,108 @@
-from typing import Literal, Optional
+import re
+from decimal import Decimal, InvalidOperation
+from typing import Any, Iterable, List, Literal, Mapping, NamedTuple, Optional
 
 
 Side = Literal["BUY", "SELL"]
 OrderType = Literal["MARKET", "LIMIT"]
 TimeInForce = Literal["GTC", "IOC", "FOK"]
 
+SIDES = frozenset(("BUY", "SELL"))
+ORDER_TYPES = frozenset(("MARKET", "LIMIT"))
+TIME_IN_FORCE = frozenset(("GTC", "IOC", "FOK"))
+
+# Exact-spelling lookups hit first; anything else falls back to .upper().
+_SIDE_LOOKUP = {s: s for s in SIDES} | {s.lower(): s for s in SIDES}
+_ORDER_TYPE_LOOKUP = {t: t for t in ORDER_TYPES} | {t.lower(): t for t in ORDER_TYPES}
+_TIF_LOOKUP = {t: t for t in TIME_IN_FORCE} | {t.lower(): t for t in TIME_IN_FORCE}
+
+_SYMBOL_RE = re.compile(r"[A-Za-z0-9]{1,32}")
+
+# Far beyond any real price or quantity, but keeps "1e999999" from reaching
+# quantize() and the exchange-filter arithmetic (InvalidOperation).
+MAX_EXPONENT = 20
+MAX_DIGITS = 40
+
 
 class ValidationError(ValueError):
     """Raised when user input is invalid."""
 
 
+class ValidatedOrder(NamedTuple):
+    symbol: str
+    side: Side
+    order_type: OrderType
+    quantity: Decimal
+    price: Optional[Decimal]
+    time_in_force: Optional[TimeInForce]
+
+
+def to_decimal(value: Any) -> Decimal:
+    """
+    Convert user input to an exact Decimal.
+
+    Floats go through their shortest repr, so 0.1 becomes Decimal("0.1")
+    rather than the binary value 0.1000000000000000055511151231257827...
+    """
+    if isinstance(value, Decimal):
+        result = value
+    elif isinstance(value, (int, float, str)) and not isinstance(value, bool):
+        result = Decimal(repr(value) if isinstance(value, float) else value)
+    else:
+        raise TypeError(f"unsupported type {type(value).__name__}")
+    if not result.is_finite():
+        raise ValueError("not a finite number")
+    return result
+
+
+def _in_range(value: Decimal) -> bool:
+    return abs(value.adjusted()) <= MAX_EXPONENT and len(value.as_tuple().digits) <= MAX_DIGITS
+
+
 def validate_symbol(symbol: str) -> str:
-    if not symbol or not symbol.isalnum():
+    if not symbol or not _SYMBOL_RE.fullmatch(symbol):
         raise ValidationError("Symbol must be a non-empty alphanumeric string, e.g. BTCUSDT.")
     return symbol.upper()
 
 
 def validate_side(side: str) -> Side:
-    side_upper = side.upper()
-    if side_upper not in ("BUY", "SELL"):
+    side_upper = _SIDE_LOOKUP.get(side) or side.upper()
+    if side_upper not in SIDES:
         raise ValidationError("Side must be BUY or SELL.")
     return side_upper  # type: ignore[return-value]
 
 
 def validate_order_type(order_type: str) -> OrderType:
-    ot_upper = order_type.upper()
-    if ot_upper not in ("MARKET", "LIMIT"):
+    ot_upper = _ORDER_TYPE_LOOKUP.get(order_type) or order_type.upper()
+    if ot_upper not in ORDER_TYPES:
         raise ValidationError("Order type must be MARKET or LIMIT.")
     return ot_upper  # type: ignore[return-value]
 
 
-def validate_quantity(qty: float) -> float:
+def validate_quantity(qty: Any) -> Decimal:
     try:
-        value = float(qty)
-    except (TypeError, ValueError) as exc:
+        value = to_decimal(qty)
+    except (TypeError, ValueError, InvalidOperation) as exc:
         raise ValidationError("Quantity must be a number.") from exc
     if value <= 0:
         raise ValidationError("Quantity must be greater than 0.")
+    if not _in_range(value):
+        raise ValidationError("Quantity is out of range.")
     return value
 
 
-def validate_price(price: Optional[float], order_type: OrderType) -> Optional[float]:
+def validate_price(price: Optional[Any], order_type: OrderType) -> Optional[Decimal]:
     if order_type == "LIMIT":
         if price is None:
             raise ValidationError("Price is required for LIMIT orders.")
         try:
-            value = float(price)
-        except (TypeError, ValueError) as exc:
+            value = to_decimal(price)
+        except (TypeError, ValueError, InvalidOperation) as exc:
             raise ValidationError("Price must be a number.") from exc
         if value <= 0:
             raise ValidationError("Price must be greater than 0.")
+        if not _in_range(value):
+            raise ValidationError("Price is out of range.")
         return value
     return None
 
@@ -61,9 +114,54 @@ def validate_time_in_force(tif: Optional[str], order_type: OrderType) -> Optiona
     if tif is None:
         return "GTC"
 
-    tif_upper = tif.upper()
-    if tif_upper not in ("GTC", "IOC", "FOK"):
+    tif_upper = _TIF_LOOKUP.get(tif) or tif.upper()
+    if tif_upper not in TIME_IN_FORCE:
         raise ValidationError("time-in-force must be one of GTC, IOC, FOK for LIMIT orders.")
     return tif_upper  # type: ignore[return-value]
 
 
+def validate_order(
+    symbol: str,
+    side: str,
+    order_type: str,
+    quantity: Any,
+    price: Optional[Any] = None,
+    time_in_force: Optional[str] = None,
+) -> ValidatedOrder:
+    v_type = validate_order_type(order_type)
+    return ValidatedOrder(
+        validate_symbol(symbol),
+        validate_side(side),
+        v_type,
+        validate_quantity(quantity),
+        validate_price(price, v_type),
+        validate_time_in_force(time_in_force, v_type),
+    )
+
+
+def validate_orders(orders: Iterable[Mapping[str, Any]]) -> List[ValidatedOrder]:
+    """
+    Validate a list of order mappings in a single pass.
+
+    Accepts API-style (``type``, ``timeInForce``) and Python-style
+    (``order_type``, ``time_in_force``) keys. Raises ValidationError naming
+    the first bad order (1-based).
+    """
+    validated: List[ValidatedOrder] = []
+    append = validated.append
+    for index, order in enumerate(orders, start=1):
+        get = order.get
+        try:
+            append(
+                validate_order(
+                    get("symbol") or "",
+                    get("side") or "",
+                    get("type") or get("order_type") or "",
+                    get("quantity"),
+                    get("price"),
+                    get("timeInForce") or get("time_in_force"),
+                )
+            )
+        except ValidationError as exc:
+            raise ValidationError(f"Order #{index}: {exc}") from exc
+    return validated
@@ -0,0 +1,298 @@
+import atexit
+import logging
+import os
+import queue
+import threading
+import time
+from typing import Any, Dict, List, Literal, Optional
+
+from .db import save_order, save_orders
+
+logger = logging.getLogger(__name__)
+
+# What submit() does when the queue is full:
+#   block - wait up to block_timeout for space, then write synchronously
+#   drop  - discard the record and count it in metrics
+#   sync  - write synchronously on the caller's thread
+BackpressurePolicy = Literal["block", "drop", "sync"]
+
+_STOP = object()
+
+
+class OrderWriter:
+    """
+    Bounded write-behind queue for order records.
+
+    Callers enqueue responses and return immediately; one background thread
+    drains the queue and writes records in batched INSERTs, flushing whenever
+    ``batch_size`` records are pending or ``flush_interval_ms`` has elapsed.
+    """
+
+    def __init__(
+        self,
+        max_queue: int = 10_000,
+        batch_size: int = 200,
+        flush_interval_ms: float = 50.0,
+        policy: BackpressurePolicy = "block",
+        block_timeout: float = 0.5,
+    ) -> None:
+        if policy not in ("block", "drop", "sync"):
+            raise ValueError("policy must be one of block, drop, sync.")
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval_ms / 1000.0
+        self.policy = policy
+        self.block_timeout = block_timeout
+
+        self._queue: "queue.Queue[Any]" = queue.Queue(maxsize=max_queue)
+        self._lock = threading.Lock()
+        self._enqueued = 0
+        self._written = 0
+        self._dropped = 0
+        self._failed = 0
+        self._sync_writes = 0
+        self._flushes = 0
+        self._flush_total = 0.0
+        self._flush_max = 0.0
+        self._flush_last = 0.0
+        self._last_batch_size = 0
+        self._stop_requested = threading.Event()
+
+        self._thread = threading.Thread(target=self._run, name="order-writer", daemon=True)
+        self._thread.start()
+
+    def submit(self, response: Dict[str, Any]) -> bool:
+        """
+        Queue one order response for persistence.
+
+        Returns False if the record was dropped under the ``drop`` policy.
+        """
+        try:
+            self._queue.put_nowait(response)
+        except queue.Full:
+            return self._on_full(response)
+        with self._lock:
+            self._enqueued += 1
+        return True
+
+    def submit_many(self, responses: List[Dict[str, Any]]) -> None:
+        for response in responses:
+            self.submit(response)
+
+    def offer(self, responses: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Queue what fits without waiting and return the rest.
+
+        For event-loop callers: the backpressure policy may block or write
+        to the database, so they hand the rest to ``submit_many`` in a thread.
+        """
+        for i, response in enumerate(responses):
+            try:
+                self._queue.put_nowait(response)
+            except queue.Full:
+                return responses[i:]
+            with self._lock:
+                self._enqueued += 1
+        return []
+
+    def _on_full(self, response: Dict[str, Any]) -> bool:
+        if self.policy == "block":
+            try:
+                self._queue.put(response, timeout=self.block_timeout)
+                with self._lock:
+                    self._enqueued += 1
+                return True
+            except queue.Full:
+                pass
+        elif self.policy == "drop":
+            with self._lock:
+                self._dropped += 1
+            logger.warning("Order writer queue full; dropped order %s.", response.get("orderId"))
+            return False
+
+        with self._lock:
+            self._sync_writes += 1
+        try:
+            save_order(response)
+        except Exception:
+            logger.exception("Failed to persist order to database.")
+            with self._lock:
+                self._failed += 1
+        return True
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """
+        Wait until everything queued so far has been written.
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._queue.all_tasks_done:
+            while self._queue.unfinished_tasks:
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return False
+                self._queue.all_tasks_done.wait(remaining)
+        return True
+
+    def close(self, timeout: float = 10.0) -> None:
+        """
+        Flush pending records and stop the background thread.
+        """
+        if not self._thread.is_alive():
+            return
+        # The thread stops after its current batch and drains the queue; the
+        # marker only wakes it when idle, so a full queue needs no room for it.
+        self._stop_requested.set()
+        try:
+            self._queue.put_nowait(_STOP)
+        except queue.Full:
+            pass
+        self._thread.join(timeout)
+        if self._thread.is_alive():
+            logger.warning("Order writer did not stop within %.1fs; %d records pending.", timeout, self._queue.qsize())
+
+    def metrics(self) -> Dict[str, Any]:
+        with self._lock:
+            flushes = self._flushes
+            return {
+                "queue_depth": self._queue.qsize(),
+                "queue_capacity": self._queue.maxsize,
+                "policy": self.policy,
+                "enqueued": self._enqueued,
+                "written": self._written,
+                "dropped": self._dropped,
+                "failed": self._failed,
+                "sync_writes": self._sync_writes,
+                "flushes": flushes,
+                "last_batch_size": self._last_batch_size,
+                "last_flush_ms": self._flush_last * 1000,
+                "max_flush_ms": self._flush_max * 1000,
+                "avg_flush_ms": (self._flush_total / flushes * 1000) if flushes else 0.0,
+            }
+
+    def _run(self) -> None:
+        stopping = False
+        while not stopping:
+            batch: List[Dict[str, Any]] = []
+            item = self._queue.get()
+            if item is _STOP:
+                self._queue.task_done()
+                break
+            batch.append(item)
+
+            deadline = time.monotonic() + self.flush_interval
+            while len(batch) < self.batch_size:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    item = self._queue.get(timeout=remaining)
+                except queue.Empty:
+                    break
+                if item is _STOP:
+                    self._queue.task_done()
+                    stopping = True
+                    break
+                batch.append(item)
+
+            self._write(batch)
+            for _ in batch:
+                self._queue.task_done()
+            if self._stop_requested.is_set():
+                break
+
+        # Drain anything enqueued after the stop marker.
+        leftovers: List[Dict[str, Any]] = []
+        while True:
+            try:
+                leftovers.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+        if leftovers:
+            self._write([r for r in leftovers if r is not _STOP])
+            for _ in leftovers:
+                self._queue.task_done()
+
+    def _write(self, batch: List[Dict[str, Any]]) -> None:
+        if not batch:
+            return
+        t0 = time.perf_counter()
+        written = failed = 0
+        try:
+            save_orders(batch)
+            written = len(batch)
+        except Exception:
+            logger.exception("Batched insert of %d orders failed; retrying one by one.", len(batch))
+            for response in batch:
+                try:
+                    save_order(response)
+                    written += 1
+                except Exception:
+                    logger.exception("Failed to persist order %s.", response.get("orderId"))
+                    failed += 1
+        elapsed = time.perf_counter() - t0
+
+        with self._lock:
+            self._written += written
+            self._failed += failed
+            self._flushes += 1
+            self._flush_total += elapsed
+            self._flush_last = elapsed
+            self._flush_max = max(self._flush_max, elapsed)
+            self._last_batch_size = len(batch)
+
+
+_writer: Optional[OrderWriter] = None
+_writer_lock = threading.Lock()
+
+
+def start_order_writer(**kwargs: Any) -> OrderWriter:
+    """
+    Start the process-wide writer; settings default to TRADING_BOT_WRITER_* env vars.
+    """
+    global _writer
+
+    with _writer_lock:
+        if _writer is not None:
+            return _writer
+        settings: Dict[str, Any] = {
+            "max_queue": int(os.getenv("TRADING_BOT_WRITER_MAX_QUEUE", "10000")),
+            "batch_size": int(os.getenv("TRADING_BOT_WRITER_BATCH_SIZE", "200")),
+            "flush_interval_ms": float(os.getenv("TRADING_BOT_WRITER_FLUSH_MS", "50")),
+            "policy": os.getenv("TRADING_BOT_WRITER_POLICY", "block"),
+        }
+        settings.update(kwargs)
+        _writer = OrderWriter(**settings)
+        logger.info("Order writer started: %s", settings)
+        return _writer
+
+
+def stop_order_writer() -> None:
+    """
+    Flush and stop the process-wide writer, if one is running.
+    """
+    global _writer
+
+    with _writer_lock:
+        writer, _writer = _writer, None
+    if writer is not None:
+        writer.close()
+        logger.info("Order writer stopped: %s", writer.metrics())
+
+
+def get_order_writer() -> Optional[OrderWriter]:
+    return _writer
+
+
+def persist_orders(responses: List[Dict[str, Any]]) -> None:
+    """
+    Hand responses to the write-behind queue, or write them inline if none runs.
+    """
+    writer = _writer
+    if writer is not None:
+        writer.submit_many(responses)
+    elif len(responses) == 1:
+        save_order(responses[0])
+    else:
+        save_orders(responses)
+
+
+atexit.register(stop_order_writer)
@@ -4,4 +4,9 @@ import sys
 # Add project root to sys.path so "import bot" works in tests
 ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
 if ROOT not in sys.path:
-    sys.path.insert(0, ROOT)
\ No newline at end of file
+    sys.path.insert(0, ROOT)
+
+# Benchmarks hammer local stub servers; the process-wide rate-limit governor
+# would turn them into tests of Binance's limits. test_rate_limit.py builds
+# its own limiters.
+os.environ.setdefault("BINANCE_RATE_LIMIT", "0")
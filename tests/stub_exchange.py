@@ -0,0 +1,254 @@
+"""
+Tiny threaded HTTP server that imitates the Binance Futures REST endpoints
+used by the bot, for offline latency / load tests.
+"""
+
+import collections
+import itertools
+import json
+import math
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qsl, urlsplit
+
+from bot.rate_limit import request_cost
+
+
+EXCHANGE_INFO = {
+    "symbols": [
+        {
+            "symbol": "BTCUSDT",
+            "status": "TRADING",
+            "filters": [
+                {"filterType": "PRICE_FILTER", "minPrice": "261.10", "maxPrice": "809484", "tickSize": "0.10"},
+                {"filterType": "LOT_SIZE", "minQty": "0.001", "maxQty": "1000", "stepSize": "0.001"},
+                {"filterType": "MARKET_LOT_SIZE", "minQty": "0.001", "maxQty": "120", "stepSize": "0.001"},
+                {"filterType": "MIN_NOTIONAL", "notional": "100"},
+            ],
+        }
+    ]
+}
+
+
+class _Server(ThreadingHTTPServer):
+    daemon_threads = True
+    # Large accept backlog so hundreds of concurrent connects are not dropped.
+    request_queue_size = 1024
+
+    def handle_error(self, request, client_address) -> None:
+        # Clients that time out or lose a hedge race hang up mid-reply.
+        pass
+
+
+class StubExchange:
+    def __init__(
+        self,
+        latency: float = 0.0,
+        weight_limit: int = 0,
+        order_limit: int = 0,
+        window: float = 60.0,
+    ) -> None:
+        self.latency = latency
+        # Optional exchange-style limits over fixed, aligned windows (0 = off).
+        self.weight_limit = weight_limit
+        self.order_limit = order_limit
+        self.window = window
+        self.used_weight = 0
+        self.order_count = 0
+        self.rejected = 0
+        self._window_id = -1
+        # Faults applied to the next POST /fapi/v1/order calls, in order:
+        #   "error"       - 503 without placing the order
+        #   "drop_before" - close the connection without placing the order
+        #   "drop"        - place the order, then close without replying
+        #   "slow"        - place the order, reply after fault_delay seconds
+        self.order_faults = collections.deque()
+        self.fault_delay = 1.0
+        # Tail latency: every slow_every-th request takes slow_latency seconds.
+        self.slow_every = 0
+        self.slow_latency = 0.0
+        self.connections = 0
+        self.requests = 0
+        self.batch_sizes = []
+        self.orders = {}
+        self.listen_keys = 0
+        self.keepalives = 0
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+        self._server = _Server(("127.0.0.1", 0), self._make_handler())
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def __enter__(self) -> "StubExchange":
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+    def charge(self, method: str, path: str, params: dict):
+        """
+        Count the request against the limits; return (rejected, usage headers).
+        """
+        cost = request_cost(method, path, params)
+        with self._lock:
+            window_id = math.floor(time.time() / self.window)
+            if window_id != self._window_id:
+                self._window_id = window_id
+                self.used_weight = self.order_count = 0
+            self.used_weight += cost.get("weight", 0)
+            self.order_count += cost.get("orders_10s", 0)
+            headers = {
+                "X-MBX-USED-WEIGHT-1M": str(self.used_weight),
+                "X-MBX-ORDER-COUNT-10S": str(self.order_count),
+            }
+            over = (self.weight_limit and self.used_weight > self.weight_limit) or (
+                self.order_limit and self.order_count > self.order_limit
+            )
+            if over:
+                self.rejected += 1
+                headers["Retry-After"] = str(math.ceil((window_id + 1) * self.window - time.time()))
+            return over, headers
+
+    def handle(self, method: str, path: str, params: dict):
+        if path == "/fapi/v1/ping":
+            return 200, {}
+        if path == "/fapi/v1/exchangeInfo":
+            return 200, EXCHANGE_INFO
+        if path == "/fapi/v1/order" and method == "POST":
+            order = self.new_order(params)
+            return (400 if "code" in order else 200), order
+        if path == "/fapi/v1/batchOrders" and method == "POST":
+            self.batch_sizes.append(len(json.loads(params["batchOrders"])))
+            return 200, [self.new_order(o) for o in json.loads(params["batchOrders"])]
+        if path == "/fapi/v1/order" and method == "GET":
+            if "origClientOrderId" in params:
+                order = self.find_client_order(params["origClientOrderId"])
+            else:
+                order = self.orders.get(int(params.get("orderId", 0)))
+            if order is None:
+                return 400, {"code": -2013, "msg": "Order does not exist."}
+            return 200, order
+        if path == "/fapi/v1/openOrders":
+            return 200, [o for o in self.orders.values() if o["status"] in ("NEW", "PARTIALLY_FILLED")]
+        if path == "/fapi/v1/listenKey":
+            if method == "POST":
+                self.listen_keys += 1
+                return 200, {"listenKey": f"key{self.listen_keys}"}
+            if method == "PUT":
+                self.keepalives += 1
+            return 200, {}
+        return 404, {"code": -1000, "msg": f"Unknown path {path}"}
+
+    def find_client_order(self, client_order_id: str):
+        for order in list(self.orders.values()):
+            if order["clientOrderId"] == client_order_id:
+                return order
+        return None
+
+    def new_order(self, params: dict) -> dict:
+        if params.get("symbol") == "BADUSDT":
+            return {"code": -1121, "msg": "Invalid symbol."}
+        existing = self.find_client_order(params.get("newClientOrderId") or "-")
+        if existing is not None and existing["status"] in ("NEW", "PARTIALLY_FILLED"):
+            return {"code": -4116, "msg": "ClientOrderId is duplicated."}
+        order = {
+            "symbol": params.get("symbol"),
+            "side": params.get("side"),
+            "type": params.get("type"),
+            "status": "NEW",
+            "orderId": next(self._ids),
+            "clientOrderId": params.get("newClientOrderId", ""),
+            "origQty": params.get("quantity"),
+            "price": params.get("price", "0"),
+            "executedQty": "0",
+            "avgPrice": "0.00",
+            "updateTime": int(time.time() * 1000),
+        }
+        self.orders[order["orderId"]] = order
+        return order
+
+    def fill(self, order_id: int, qty: str, price: str, status: str = "FILLED") -> dict:
+        """
+        Mark a stored order (partially) filled, as the matching engine would.
+        """
+        order = self.orders[order_id]
+        order.update(
+            status=status, executedQty=qty, avgPrice=price, updateTime=int(time.time() * 1000)
+        )
+        return order
+
+    def _make_handler(self):
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            disable_nagle_algorithm = True
+
+            def setup(self) -> None:
+                super().setup()
+                with stub._lock:
+                    stub.connections += 1
+
+            def log_message(self, format, *args) -> None:  # noqa: A002
+                pass
+
+            def _dispatch(self, method: str) -> None:
+                parts = urlsplit(self.path)
+                params = dict(parse_qsl(parts.query))
+                length = int(self.headers.get("Content-Length") or 0)
+                if length:
+                    params.update(parse_qsl(self.rfile.read(length).decode()))
+                with stub._lock:
+                    stub.requests += 1
+                    slow = stub.slow_every and stub.requests % stub.slow_every == 0
+                if slow:
+                    time.sleep(stub.slow_latency)
+                elif stub.latency:
+                    time.sleep(stub.latency)
+                fault = None
+                if method == "POST" and parts.path == "/fapi/v1/order" and stub.order_faults:
+                    fault = stub.order_faults.popleft()
+                if fault == "drop_before":
+                    self.close_connection = True
+                    return
+                rejected, headers = stub.charge(method, parts.path, params)
+                if rejected:
+                    status, body = 429, {"code": -1003, "msg": "Too many requests."}
+                elif fault == "error":
+                    status, body = 503, {"code": -1001, "msg": "Internal error; unable to process your request."}
+                else:
+                    status, body = stub.handle(method, parts.path, params)
+                if fault == "drop":
+                    self.close_connection = True
+                    return
+                if fault == "slow":
+                    time.sleep(stub.fault_delay)
+                data = json.dumps(body).encode()
+                self.send_response(status)
+                for name, value in headers.items():
+                    self.send_header(name, value)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def do_GET(self) -> None:
+                self._dispatch("GET")
+
+            def do_POST(self) -> None:
+                self._dispatch("POST")
+
+            def do_PUT(self) -> None:
+                self._dispatch("PUT")
+
+            def do_DELETE(self) -> None:
+                self._dispatch("DELETE")
+
+        return Handler
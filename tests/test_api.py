@@ -1,20 +1,89 @@
+import pytest
 from fastapi.testclient import TestClient
 
-from bot.api import app
+from bot.api import app, get_binance_client
+from bot.retry import make_client_order_id
 
 
 client = TestClient(app)
 
 
+class DummyClient:
+    def __init__(self):
+        self.calls = 0
+        self.client_order_ids = []
+
+    async def place_order(
+        self, symbol, side, order_type, quantity, price=None, time_in_force=None, client_order_id=None
+    ):
+        self.calls += 1
+        self.client_order_ids.append(client_order_id)
+        return {
+            "symbol": symbol,
+            "side": side,
+            "type": order_type,
+            "status": "NEW",
+            "orderId": self.calls,
+            "origQty": str(quantity),
+        }
+
+
+@pytest.fixture
+def dummy_client(tmp_path, monkeypatch):
+    monkeypatch.setenv("TRADING_BOT_DB_URL", f"sqlite:///{tmp_path / 'api.db'}")
+    from bot.db import init_db
+
+    init_db()
+    shared = DummyClient()
+    app.dependency_overrides[get_binance_client] = lambda: shared
+    yield shared
+    app.dependency_overrides.pop(get_binance_client, None)
+
+
 def test_health_endpoint():
     resp = client.get("/health")
     assert resp.status_code == 200
     assert resp.json() == {"status": "ok"}
 
 
-def test_create_order_validation_error():
+def test_create_order_validation_error(dummy_client):
     # Missing quantity should trigger 422 from FastAPI or 400 from our validation
     payload = {"symbol": "BTCUSDT", "side": "BUY", "type": "MARKET"}
     resp = client.post("/orders", json=payload)
     assert resp.status_code in (400, 422)
 
+
+def test_huge_exponents_are_client_errors(dummy_client):
+    body = '{"symbol": "BTCUSDT", "side": "BUY", "type": "MARKET", "quantity": %s}'
+    headers = {"content-type": "application/json"}
+    as_string = client.post("/orders", content=body % '"1e999999"', headers=headers)
+    as_number = client.post("/orders", content=body % "1e999999", headers=headers)
+    assert (as_string.status_code, as_string.json()["detail"]) == (400, "Quantity is out of range.")
+    assert as_number.status_code == 422
+    assert dummy_client.calls == 0
+
+
+def test_create_order_uses_shared_client(dummy_client):
+    payload = {"symbol": "BTCUSDT", "side": "BUY", "type": "MARKET", "quantity": 0.002}
+    for expected_id in (1, 2):
+        resp = client.post("/orders", json=payload)
+        assert resp.status_code == 200
+        assert resp.json()["orderId"] == expected_id
+    assert dummy_client.calls == 2
+
+
+def test_idempotency_key_header_sets_the_client_order_id(dummy_client):
+    payload = {"symbol": "BTCUSDT", "side": "BUY", "type": "MARKET", "quantity": 0.002}
+    for headers in ({"Idempotency-Key": "req-1"}, {"Idempotency-Key": "req-1"}, {}):
+        assert client.post("/orders", json=payload, headers=headers).status_code == 200
+    key_id = make_client_order_id("req-1")
+    assert dummy_client.client_order_ids == [key_id, key_id, None]
+
+
+def test_create_order_without_client_returns_500():
+    app.state.binance_client = None
+    app.state.binance_client_error = "BINANCE_API_KEY and BINANCE_API_SECRET must be set."
+    payload = {"symbol": "BTCUSDT", "side": "BUY", "type": "MARKET", "quantity": 0.002}
+    resp = client.post("/orders", json=payload)
+    assert resp.status_code == 500
+    assert "BINANCE_API_KEY" in resp.json()["detail"]
@@ -0,0 +1,89 @@
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import httpx
+from stub_exchange import StubExchange
+
+from bot.api import app, get_binance_client
+from bot.client import AsyncBinanceFuturesClient, BinanceFuturesClient
+from bot.db import dispose_engine, init_db
+
+N_ORDERS = 200
+EXCHANGE_LATENCY = 0.02
+THREADPOOL_WORKERS = 40  # anyio's default limit for sync FastAPI endpoints
+
+
+def _threadpool_rps(url: str) -> float:
+    client = BinanceFuturesClient("key", "secret", base_url=url, pool_size=THREADPOOL_WORKERS, ping=False)
+
+    def place(_):
+        return client.place_order(symbol="BTCUSDT", side="BUY", order_type="MARKET", quantity=0.002)
+
+    with ThreadPoolExecutor(max_workers=THREADPOOL_WORKERS) as pool:
+        t0 = time.perf_counter()
+        results = list(pool.map(place, range(N_ORDERS)))
+        elapsed = time.perf_counter() - t0
+    client.close()
+    assert len(results) == N_ORDERS
+    return N_ORDERS / elapsed
+
+
+async def _async_rps(url: str) -> float:
+    client = AsyncBinanceFuturesClient("key", "secret", base_url=url, pool_size=N_ORDERS)
+    try:
+        t0 = time.perf_counter()
+        results = await asyncio.gather(
+            *(
+                client.place_order(symbol="BTCUSDT", side="BUY", order_type="MARKET", quantity=0.002)
+                for _ in range(N_ORDERS)
+            )
+        )
+        elapsed = time.perf_counter() - t0
+    finally:
+        await client.aclose()
+    assert len({r["orderId"] for r in results}) == N_ORDERS
+    return N_ORDERS / elapsed
+
+
+def test_async_client_outperforms_threadpool_design():
+    with StubExchange(latency=EXCHANGE_LATENCY) as exchange:
+        threadpool = _threadpool_rps(exchange.url)
+        async_rps = asyncio.run(_async_rps(exchange.url))
+
+    assert async_rps > threadpool
+
+
+def test_async_order_endpoint_handles_concurrent_orders(tmp_path, monkeypatch):
+    monkeypatch.setenv("TRADING_BOT_DB_URL", f"sqlite:///{tmp_path / 'load.db'}")
+    init_db()
+
+    async def run(url: str):
+        exchange_client = AsyncBinanceFuturesClient("key", "secret", base_url=url)
+        app.dependency_overrides[get_binance_client] = lambda: exchange_client
+        transport = httpx.ASGITransport(app=app)
+        payload = {"symbol": "BTCUSDT", "side": "BUY", "type": "MARKET", "quantity": 0.002}
+        try:
+            async with httpx.AsyncClient(transport=transport, base_url="http://api") as api:
+                return await asyncio.gather(*(api.post("/orders", json=payload) for _ in range(100)))
+        finally:
+            app.dependency_overrides.pop(get_binance_client, None)
+            await exchange_client.aclose()
+
+    try:
+        with StubExchange(latency=EXCHANGE_LATENCY) as exchange:
+            responses = asyncio.run(run(exchange.url))
+    finally:
+        dispose_engine()
+
+    assert all(r.status_code == 200 for r in responses)
+    assert len({r.json()["orderId"] for r in responses}) == 100
+
+
+def test_async_client_signs_requests_locally():
+    client = AsyncBinanceFuturesClient("key", "secret", base_url="http://127.0.0.1:1")
+    query = client.sign({"symbol": "BTCUSDT", "price": None})
+    assert query.startswith("symbol=BTCUSDT&timestamp=")
+    assert "price" not in query
+    assert len(query.rsplit("signature=", 1)[1]) == 64
+    asyncio.run(client.aclose())
@@ -0,0 +1,148 @@
+import numpy as np
+import pytest
+
+from bot.backtest import (
+    Backtester,
+    BacktestStrategy,
+    Bars,
+    MovingAverageCross,
+    Orders,
+    iter_bars,
+    parameter_grid,
+    run_backtest,
+    sweep,
+)
+from bot.exchange_info import ExchangeInfoCache
+from bot.mock_exchange import MatchingEngine
+
+
+def _exchange_info():
+    cache = ExchangeInfoCache(fetch=lambda: MatchingEngine().exchange_info())
+    cache.refresh()
+    return cache
+
+
+def _bars(opens, highs, lows, closes):
+    n = len(opens)
+    return Bars(
+        np.arange(n, dtype=np.int64) * 60_000,
+        np.array(opens, dtype=float),
+        np.array(highs, dtype=float),
+        np.array(lows, dtype=float),
+        np.array(closes, dtype=float),
+        np.ones(n),
+    )
+
+
+class Scripted(BacktestStrategy):
+    # Fixed orders by bar index: {index: (qty, limit or None)}.
+
+    def __init__(self, script):
+        self.script = script
+
+    def orders(self, bars):
+        qty = np.zeros(bars.size)
+        limit = np.full(bars.size, np.nan)
+        for index, (q, price) in self.script.items():
+            qty[index] = q
+            limit[index] = np.nan if price is None else price
+        return Orders(qty, limit)
+
+
+def _random_walk(n, seed=1):
+    rng = np.random.default_rng(seed)
+    close = 70000 * np.exp(np.cumsum(rng.normal(0, 0.0005, n)))
+    opens = np.concatenate(([close[0]], close[:-1]))
+    return _bars(opens, np.maximum(opens, close) * 1.0003, np.minimum(opens, close) * 0.9997, close)
+
+
+def test_orders_fill_on_the_next_bar_and_go_through_order_validation():
+    bars = _bars(
+        opens=[70000, 70100, 70300, 70200, 69800, 69900],
+        highs=[70100, 70400, 70350, 70250, 69900, 70000],
+        lows=[69900, 70050, 70150, 69700, 69750, 69850],
+        closes=[70100, 70300, 70200, 69800, 69900, 69950],
+    )
+    script = {
+        0: (0.01, None),  # MARKET buy -> bar 1 open 70100
+        1: (-0.01, 70340.0),  # LIMIT sell -> bar 2 trades through, fills at 70340
+        2: (0.01, 69600.0),  # LIMIT buy below bar 3's low -> expires
+        3: (0.001, 69000.0),  # 69 USDT: below the 100 USDT minimum notional
+        4: (0.0015, None),  # not a multiple of stepSize 0.001
+        5: (0.01, None),  # last bar: nothing left to fill it
+    }
+    result = Backtester(Scripted(script), exchange_info=_exchange_info(), taker_fee=0.001, maker_fee=0.0).run([bars])
+
+    assert (result.orders, result.fills, result.expired, result.rejected) == (6, 2, 2, 2)
+    assert result.position == 0
+    assert result.pnl == pytest.approx((70340 - 70100) * 0.01 - 70100 * 0.01 * 0.001)
+    assert result.fees == pytest.approx(0.701)
+    assert any("step" in reason for reason in result.rejections)
+    assert any("notional" in reason.lower() for reason in result.rejections)
+
+
+def test_repeated_market_orders_hit_the_rules_cache():
+    script = {i: (0.01 if i % 2 else -0.01, None) for i in range(1000)}
+    backtester = Backtester(Scripted(script), exchange_info=_exchange_info())
+    checked = []
+    check = backtester.rules._check
+    backtester.rules._check = lambda *args: checked.append(args) or check(*args)
+    result = backtester.run([_random_walk(1001)])
+
+    assert result.fills == 1000
+    assert sorted(checked) == [("BUY", "MARKET", 0.01, None), ("SELL", "MARKET", 0.01, None)]
+
+
+def test_chunked_run_matches_a_single_pass():
+    bars = _random_walk(20_000)
+    strategy = MovingAverageCross(fast=10, slow=60, size=0.01, offset=0.0005)
+    whole = run_backtest(bars, strategy, chunk_size=bars.size, exchange_info=_exchange_info())
+    chunked = run_backtest(bars, strategy, chunk_size=777, exchange_info=_exchange_info())
+
+    assert whole.fills > 100 and whole.expired > 0
+    for name in ("bars", "orders", "fills", "expired", "rejected", "position"):
+        assert getattr(chunked, name) == getattr(whole, name), name
+    for name in ("volume", "fees", "pnl", "max_drawdown"):
+        assert getattr(chunked, name) == pytest.approx(getattr(whole, name)), name
+
+
+def test_csv_files_stream_in_chunks_with_or_without_header(tmp_path):
+    bars = _random_walk(2_500)
+    rows = [
+        f"{t},{o},{h},{l},{c},{v},{t + 59_999},0,0,0,0,0"
+        for t, o, h, l, c, v in zip(*(column.tolist() for column in bars))
+    ]
+    plain = tmp_path / "klines.csv"
+    plain.write_text("\n".join(rows) + "\n")
+    headed = tmp_path / "klines_header.csv"
+    headed.write_text(
+        "open_time,open,high,low,close,volume,close_time,quote_volume,count,taker_buy_volume,taker_buy_quote_volume,ignore\n"
+        + "\n".join(rows)
+        + "\n"
+    )
+
+    for path in (plain, headed):
+        chunks = list(iter_bars(path, chunk_size=1_000))
+        assert [chunk.size for chunk in chunks] == [1_000, 1_000, 500]
+        assert np.array_equal(Bars.concat(chunks).close, bars.close)
+        assert chunks[0].time.dtype == np.int64
+
+    strategy = MovingAverageCross(fast=5, slow=20, size=0.01)
+    assert run_backtest(plain, strategy, chunk_size=300).pnl == pytest.approx(run_backtest(bars, strategy).pnl)
+
+    trades = tmp_path / "trades.csv"
+    trades.write_text("id,price,qty,quote_qty,time,is_buyer_maker\n1,70000.1,0.5,35000.05,1700000000000,true\n")
+    [chunk] = iter_bars(trades, kind="trades")
+    assert (chunk.time[0], chunk.open[0], chunk.close[0], chunk.volume[0]) == (1700000000000, 70000.1, 70000.1, 0.5)
+
+
+def test_sweep_runs_the_grid_in_worker_processes():
+    bars = _random_walk(10_000, seed=3)
+    grid = {"fast": [5, 10], "slow": [40, 80], "size": [0.01]}
+    results = sweep(bars, MovingAverageCross, grid, exchange_info=_exchange_info(), processes=2)
+
+    assert [r.params for r in results] == parameter_grid(grid)
+    for result in results:
+        serial = run_backtest(bars, MovingAverageCross(**result.params), exchange_info=_exchange_info())
+        assert (result.fills, result.bars) == (serial.fills, bars.size)
+        assert result.pnl == pytest.approx(serial.pnl)
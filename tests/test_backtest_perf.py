@@ -0,0 +1,38 @@
+import time
+
+import numpy as np
+
+from bot.backtest import MovingAverageCross, run_backtest
+from bot.exchange_info import ExchangeInfoCache
+from bot.mock_exchange import MatchingEngine
+
+YEAR_OF_MINUTES = 365 * 24 * 60
+
+
+def _write_klines(path, n):
+    rng = np.random.default_rng(7)
+    close = np.round(70000 * np.exp(np.cumsum(rng.normal(0, 0.0005, n))), 1)
+    opens = np.concatenate(([close[0]], close[:-1]))
+    high = np.round(np.maximum(opens, close) * 1.0003, 1)
+    low = np.round(np.minimum(opens, close) * 0.9997, 1)
+    t = 1704067200000 + np.arange(n, dtype=np.int64) * 60_000
+    columns = (t, opens, high, low, close, rng.uniform(1, 50, n), t + 59_999)
+    rows = (f"{a},{b},{c},{d},{e},{f:.3f},{g},0,0,0,0,0\n" for a, b, c, d, e, f, g in zip(*(x.tolist() for x in columns)))
+    with open(path, "w") as fh:
+        fh.writelines(rows)
+
+
+def test_year_of_minute_bars_in_seconds(tmp_path):
+    path = tmp_path / "BTCUSDT-1m-year.csv"
+    _write_klines(path, YEAR_OF_MINUTES)
+    exchange_info = ExchangeInfoCache(fetch=lambda: MatchingEngine().exchange_info())
+    exchange_info.refresh()
+
+    t0 = time.perf_counter()
+    result = run_backtest(
+        path, MovingAverageCross(fast=20, slow=100, size=0.01, offset=0.0002), exchange_info=exchange_info
+    )
+    elapsed = time.perf_counter() - t0
+    assert result.bars == YEAR_OF_MINUTES
+    assert result.fills > 1000
+    assert elapsed < 5.0
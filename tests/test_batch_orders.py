@@ -0,0 +1,173 @@
+import asyncio
+
+import pytest
+from fastapi.testclient import TestClient
+from stub_exchange import StubExchange
+from typer.testing import CliRunner
+
+from bot import cli
+from bot import client as client_module
+from bot import orders as orders_module
+from bot.api import app, get_binance_client
+from bot.client import AsyncBinanceFuturesClient, BinanceFuturesClient
+from bot.db import dispose_engine, get_recent_orders, init_db
+from bot.orders import build_and_place_batch, build_and_place_batch_async
+from bot.validators import ValidationError
+
+
+def _ladder(n, symbol="BTCUSDT"):
+    return [
+        {
+            "symbol": symbol,
+            "side": "SELL",
+            "type": "LIMIT",
+            "quantity": 0.001,
+            "price": 70000 + 10 * i,
+            "timeInForce": "GTC",
+        }
+        for i in range(n)
+    ]
+
+
+class DummyBatchClient:
+    def __init__(self):
+        self.groups = []
+        self._next_id = 0
+
+    def _respond(self, group):
+        self.groups.append(group)
+        responses = []
+        for params in group:
+            self._next_id += 1
+            responses.append(
+                {
+                    "symbol": params["symbol"],
+                    "side": params["side"],
+                    "type": params["type"],
+                    "status": "NEW",
+                    "orderId": self._next_id,
+                    "price": str(params.get("price")),
+                }
+            )
+        return responses
+
+    def place_batch_orders(self, group):
+        return self._respond(group)
+
+    def place_order(self, symbol, side, order_type, quantity, price=None, time_in_force=None):
+        return self._respond([{"symbol": symbol, "side": side, "type": order_type, "price": price}])[0]
+
+
+class AsyncDummyBatchClient(DummyBatchClient):
+    async def place_batch_orders(self, group):
+        await asyncio.sleep(0)
+        return self._respond(group)
+
+
+@pytest.fixture
+def temp_db(tmp_path, monkeypatch):
+    monkeypatch.setenv("TRADING_BOT_DB_URL", f"sqlite:///{tmp_path / 'batch.db'}")
+    init_db()
+    yield
+    dispose_engine()
+
+
+def test_batch_groups_by_five_and_keeps_input_order(temp_db):
+    client = DummyBatchClient()
+    orders = _ladder(12)
+    results = build_and_place_batch(client, orders)
+
+    assert [len(g) for g in client.groups] == [5, 5, 2]
+    assert [r["price"] for r in results] == [str(o["price"]) for o in orders]
+    assert len(get_recent_orders(limit=50)) == 12
+    # Later batches reuse the same worker threads.
+    pool = orders_module._batch_pool
+    build_and_place_batch(client, _ladder(12))
+    assert orders_module._batch_pool is pool
+
+
+def test_batch_validates_everything_before_sending(temp_db):
+    client = DummyBatchClient()
+    orders = _ladder(6)
+    orders[3]["quantity"] = 0
+    with pytest.raises(ValidationError, match="Order #4"):
+        build_and_place_batch(client, orders)
+    assert client.groups == []
+
+
+def test_async_batch_against_stub_exchange(temp_db):
+    orders = _ladder(7) + _ladder(1, symbol="BADUSDT")
+
+    async def run(url):
+        client = AsyncBinanceFuturesClient("key", "secret", base_url=url)
+        try:
+            return await build_and_place_batch_async(client, orders)
+        finally:
+            await client.aclose()
+
+    with StubExchange() as exchange:
+        results = asyncio.run(run(exchange.url))
+        assert sorted(exchange.batch_sizes) == [3, 5]
+
+    assert [r.get("price") for r in results[:7]] == [str(o["price"]) for o in orders[:7]]
+    assert results[7] == {"code": -1121, "msg": "Invalid symbol."}
+    assert len(get_recent_orders(limit=50)) == 7
+
+
+def test_sync_batch_against_stub_exchange(temp_db):
+    with StubExchange() as exchange:
+        client = BinanceFuturesClient("key", "secret", base_url=exchange.url, ping=False)
+        results = build_and_place_batch(client, _ladder(5))
+        client.close()
+        assert exchange.batch_sizes == [5]
+    assert all(r["status"] == "NEW" for r in results)
+
+
+def test_batch_endpoint(temp_db):
+    shared = AsyncDummyBatchClient()
+    app.dependency_overrides[get_binance_client] = lambda: shared
+    try:
+        api = TestClient(app)
+        resp = api.post("/orders/batch", json={"orders": _ladder(6)})
+        assert resp.status_code == 200
+        assert [r["orderId"] for r in resp.json()] == [1, 2, 3, 4, 5, 6]
+
+        bad = _ladder(2)
+        bad[1]["type"] = "STOP"
+        resp = api.post("/orders/batch", json={"orders": bad})
+        assert resp.status_code == 400
+        assert "Order #2" in resp.json()["detail"]
+    finally:
+        app.dependency_overrides.pop(get_binance_client, None)
+
+
+def test_cli_batch_command(temp_db, tmp_path, monkeypatch):
+    csv_path = tmp_path / "orders.csv"
+    csv_path.write_text(
+        "symbol,side,type,quantity,price,timeInForce\n"
+        "BTCUSDT,BUY,MARKET,0.002,,\n"
+        "BTCUSDT,SELL,LIMIT,0.002,76000,GTC\n"
+    )
+    shared = DummyBatchClient()
+    # The CLI imports the client lazily, so patch it at its source.
+    monkeypatch.setattr(client_module, "BinanceFuturesClient", lambda **kwargs: shared)
+    monkeypatch.setattr(cli, "setup_logging", lambda: None)
+
+    result = CliRunner().invoke(cli.app, ["batch", "--file", str(csv_path), "--no-daemon"])
+
+    assert result.exit_code == 0, result.output
+    assert [p["type"] for p in shared.groups[0]] == ["MARKET", "LIMIT"]
+    assert "All 2 orders placed" in result.output
+
+
+def test_cli_without_a_command_places_a_single_order(temp_db, monkeypatch):
+    shared = DummyBatchClient()
+    monkeypatch.setattr(client_module, "BinanceFuturesClient", lambda **kwargs: shared)
+    monkeypatch.setattr(cli, "setup_logging", lambda: None)
+    args = ["--symbol", "BTCUSDT", "--side", "BUY", "--order-type", "MARKET", "--quantity", "0.002", "--no-daemon"]
+
+    # The form from before `batch` existed, and the explicit `main` command.
+    for argv in (args, ["main", *args]):
+        result = CliRunner().invoke(cli.app, argv)
+        assert result.exit_code == 0, result.output
+    assert [g[0]["type"] for g in shared.groups] == ["MARKET", "MARKET"]
@@ -0,0 +1,35 @@
+import os
+import subprocess
+import sys
+
+from bot.db import dispose_engine, init_db
+from bot.loadtest import run_cli_scenarios
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+
+HEAVY_MODULES = ("binance", "aiohttp", "sqlalchemy", "websockets", "fastapi")
+
+
+def test_cli_import_skips_heavy_dependencies():
+    script = (
+        "import sys\n"
+        "import bot.cli\n"
+        f"print(','.join(m for m in {HEAVY_MODULES!r} if m in sys.modules))\n"
+    )
+    out = subprocess.run(
+        [sys.executable, "-c", script], cwd=ROOT, capture_output=True, text=True, check=True
+    ).stdout
+    assert out.strip() == ""
+
+
+def test_daemon_skips_cli_startup(tmp_path, monkeypatch):
+    monkeypatch.setenv("TRADING_BOT_DB_URL", f"sqlite:///{tmp_path / 'cli.db'}")
+    init_db()
+    try:
+        results = run_cli_scenarios(levels=(1,), runs=3)
+    finally:
+        dispose_engine()
+
+    direct, warm = results["cli_order@1"], results["cli_order_daemon@1"]
+    assert direct["errors"] == warm["errors"] == 0
+    assert warm["p50_ms"] < direct["p50_ms"] / 2
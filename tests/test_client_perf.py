@@ -0,0 +1,40 @@
+import time
+
+from stub_exchange import StubExchange
+
+from bot.client import BinanceFuturesClient
+
+
+def _place(client: BinanceFuturesClient) -> dict:
+    return client.place_order(
+        symbol="BTCUSDT", side="BUY", order_type="MARKET", quantity=0.002
+    )
+
+
+def test_shared_client_reuses_connections_and_cuts_latency():
+    n = 50
+    with StubExchange(latency=0.002) as exchange:
+        t0 = time.perf_counter()
+        for _ in range(n):
+            # Previous API behaviour: a new client (session + ping) per order.
+            client = BinanceFuturesClient("key", "secret", base_url=exchange.url, ping=True)
+            _place(client)
+            client.close()
+        per_request_ms = (time.perf_counter() - t0) / n * 1000
+        per_request_connections = exchange.connections
+        per_request_calls = exchange.requests
+
+        shared = BinanceFuturesClient("key", "secret", base_url=exchange.url, ping=True)
+        exchange.connections = 0
+        exchange.requests = 0
+        t0 = time.perf_counter()
+        for _ in range(n):
+            _place(shared)
+        shared_ms = (time.perf_counter() - t0) / n * 1000
+        shared.close()
+
+    assert per_request_calls == 2 * n
+    assert per_request_connections == n
+    assert exchange.requests == n
+    assert exchange.connections <= 1
+    assert shared_ms < per_request_ms
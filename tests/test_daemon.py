@@ -0,0 +1,103 @@
+import os
+import stat
+import threading
+
+import pytest
+
+from bot import daemon
+from bot.bench import BENCH_API_KEY, BENCH_API_SECRET
+from bot.client import BinanceFuturesClient
+from bot.db import dispose_engine, get_recent_orders
+from bot.exchange_info import ExchangeInfoCache, http_exchange_info_fetcher
+from bot.mock_exchange import MockExchange, MockExchangeServer
+
+
+@pytest.fixture
+def running_daemon(tmp_path, monkeypatch):
+    monkeypatch.setenv("TRADING_BOT_DB_URL", f"sqlite:///{tmp_path / 'daemon.db'}")
+    socket_path = str(tmp_path / "bot.sock")
+    with MockExchangeServer(MockExchange(api_key=BENCH_API_KEY, api_secret=BENCH_API_SECRET)) as server:
+        exchange_info = ExchangeInfoCache(http_exchange_info_fetcher(server.url))
+        exchange_info.refresh()
+        client = BinanceFuturesClient(BENCH_API_KEY, BENCH_API_SECRET, base_url=server.url, ping=False)
+        service = daemon.OrderDaemon(socket_path, client=client, exchange_info=exchange_info)
+        service.start()
+        thread = threading.Thread(target=service.serve_forever)
+        thread.start()
+        try:
+            yield socket_path
+        finally:
+            if thread.is_alive():
+                daemon.call("stop", socket_path=socket_path)
+            thread.join(timeout=10)
+            dispose_engine()
+
+
+def test_call_without_daemon_returns_none(tmp_path):
+    assert daemon.call("ping", socket_path=str(tmp_path / "missing.sock")) is None
+    # A stale socket file left by a crashed daemon.
+    stale = tmp_path / "stale.sock"
+    stale.touch()
+    assert daemon.call("ping", socket_path=str(stale)) is None
+
+
+def test_socket_is_owner_only_from_bind_and_foreign_files_are_kept(tmp_path, monkeypatch):
+    modes = []
+    bind = daemon._Server.server_bind
+
+    def record_mode(server):
+        bind(server)
+        modes.append(stat.S_IMODE(os.stat(server.server_address).st_mode))
+
+    monkeypatch.setattr(daemon._Server, "server_bind", record_mode)
+    monkeypatch.setenv("TRADING_BOT_DB_URL", f"sqlite:///{tmp_path / 'daemon.db'}")
+    service = daemon.OrderDaemon(str(tmp_path / "bot.sock"), client=object(), exchange_info=object(), risk=object())
+    umask = os.umask(0o022)
+    try:
+        service.start()
+        assert os.umask(0o022) == 0o022
+    finally:
+        os.umask(umask)
+        service.close()
+        dispose_engine()
+    assert modes == [0o600]
+
+    # Not a socket left by a crashed daemon: refuse rather than delete it.
+    other = tmp_path / "other.sock"
+    other.write_text("keep")
+    with pytest.raises(RuntimeError, match="not a socket"):
+        daemon.OrderDaemon(str(other)).start()
+    assert other.read_text() == "keep"
+
+
+def test_daemon_places_orders_and_reports_validation_errors(running_daemon):
+    assert daemon.call("ping", socket_path=running_daemon)["pid"] == os.getpid()
+    assert stat.S_IMODE(os.stat(running_daemon).st_mode) == 0o600
+
+    order = {"symbol": "BTCUSDT", "side": "BUY", "order_type": "MARKET", "quantity": 0.002}
+    reply = daemon.call("order", {"order": order}, socket_path=running_daemon)
+    assert reply["ok"] and reply["summary"]["status"] == "FILLED"
+
+    bad = dict(order, order_type="LIMIT")
+    reply = daemon.call("order", {"order": bad}, socket_path=running_daemon)
+    assert reply == {"ok": False, "kind": "validation", "error": reply["error"]}
+    assert "price" in reply["error"].lower()
+
+    orders = [
+        {"symbol": "BTCUSDT", "side": "SELL", "type": "LIMIT", "quantity": "0.002", "price": "76000", "timeInForce": "GTC"},
+        {"symbol": "BTCUSDT", "side": "SELL", "type": "LIMIT", "quantity": "0.002", "price": "76100", "timeInForce": "GTC"},
+    ]
+    reply = daemon.call("batch", {"orders": orders}, socket_path=running_daemon)
+    assert [r["status"] for r in reply["results"]] == ["NEW", "NEW"]
+
+    with pytest.raises(RuntimeError, match="already listening"):
+        daemon.OrderDaemon(running_daemon).start()
+
+    assert daemon.call("stop", socket_path=running_daemon) == {"ok": True}
+    for _ in range(100):
+        if not os.path.exists(running_daemon):
+            break
+        threading.Event().wait(0.05)
+    assert not os.path.exists(running_daemon)
+    # The writer was flushed on shutdown.
+    assert len(get_recent_orders(limit=10)) == 3
@@ -0,0 +1,79 @@
+import time
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+
+from bot.db import (
+    OrderRecord,
+    dispose_engine,
+    get_engine,
+    get_recent_orders,
+    init_db,
+    save_order,
+)
+
+
+def _response(i: int) -> dict:
+    return {
+        "symbol": "BTCUSDT",
+        "side": "BUY",
+        "type": "MARKET",
+        "status": "NEW",
+        "orderId": i,
+        "origQty": "0.002",
+        "executedQty": "0.000",
+    }
+
+
+def _save_order_engine_per_call(db_url: str, response: dict) -> None:
+    # Previous behaviour: a fresh engine (and pool) for every write.
+    engine = create_engine(db_url, echo=False, future=True)
+    with Session(engine) as session:
+        session.add(
+            OrderRecord(
+                symbol=response["symbol"],
+                side=response["side"],
+                type=response["type"],
+                status=response["status"],
+                order_id=str(response["orderId"]),
+                raw_response=response,
+            )
+        )
+        session.commit()
+    engine.dispose()
+
+
+def test_get_engine_is_shared_and_honours_env(tmp_path, monkeypatch):
+    db_path = tmp_path / "shared.db"
+    monkeypatch.setenv("TRADING_BOT_DB_URL", f"sqlite:///{db_path}")
+    try:
+        assert get_engine() is get_engine()
+        assert str(get_engine().url) == f"sqlite:///{db_path}"
+        with get_engine().connect() as conn:
+            mode = conn.exec_driver_sql("PRAGMA journal_mode").scalar()
+        assert mode.lower() == "wal"
+    finally:
+        dispose_engine()
+
+
+def test_save_order_throughput_pooled_vs_engine_per_call(tmp_path, monkeypatch):
+    db_url = f"sqlite:///{tmp_path / 'bench.db'}"
+    monkeypatch.setenv("TRADING_BOT_DB_URL", db_url)
+    init_db()
+    n = 200
+
+    try:
+        t0 = time.perf_counter()
+        for i in range(n):
+            _save_order_engine_per_call(db_url, _response(i))
+        before_ops = n / (time.perf_counter() - t0)
+
+        t0 = time.perf_counter()
+        for i in range(n):
+            save_order(_response(n + i))
+        after_ops = n / (time.perf_counter() - t0)
+
+        assert len(get_recent_orders(limit=2 * n)) == 2 * n
+        assert after_ops > before_ops
+    finally:
+        dispose_engine()
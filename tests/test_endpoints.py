@@ -0,0 +1,143 @@
+import asyncio
+import socket
+import time
+
+from stub_exchange import StubExchange
+
+from bot.client import AsyncBinanceFuturesClient
+from bot.endpoints import EndpointSet, LatencyHistogram
+from bot.retry import RetryPolicy
+
+
+def _client(urls, hedge_reads=True, hedge_delay=0.02):
+    return AsyncBinanceFuturesClient(
+        "key",
+        "secret",
+        base_url=urls[0],
+        alt_base_urls=urls[1:],
+        hedge_reads=hedge_reads,
+        endpoints=EndpointSet(urls, default_hedge_delay=hedge_delay),
+        retry_policy=RetryPolicy(attempts=3, timeout=1.0, base_delay=0.01, max_delay=0.02, deadline=3.0),
+    )
+
+
+def _dead_url():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]
+    return f"http://127.0.0.1:{port}"
+
+
+def test_histogram_quantiles_within_a_bucket():
+    hist = LatencyHistogram()
+    for ms in range(1, 101):
+        hist.observe(ms / 1000)
+    assert 0.095 <= hist.quantile(0.95) <= 0.095 * 1.12
+    assert 0.050 <= hist.quantile(0.5) <= 0.050 * 1.12
+
+
+def test_hedge_delay_follows_primary_p95():
+    endpoints = EndpointSet(["http://a", "http://b"], default_hedge_delay=0.5, min_samples=20)
+    assert endpoints.hedge_delay("http://a") == 0.5
+    for ms in range(1, 101):
+        endpoints.record("http://a", ms / 1000, ok=True)
+    assert 0.095 <= endpoints.hedge_delay("http://a") <= 0.095 * 1.12
+
+
+def test_slow_primary_read_is_hedged_to_alternate():
+    async def run(urls):
+        client = _client(urls)
+        try:
+            t0 = time.perf_counter()
+            info = await client.get_exchange_info()
+            return info, time.perf_counter() - t0, client.endpoints.metrics()
+        finally:
+            await client.aclose()
+
+    with StubExchange(latency=0.5) as slow, StubExchange() as fast:
+        info, elapsed, metrics = asyncio.run(run([slow.url, fast.url]))
+
+    assert info["symbols"]
+    assert elapsed < 0.3
+    assert metrics[fast.url.rstrip("/")]["hedge_wins"] == 1
+
+
+def test_fast_primary_is_not_hedged():
+    async def run(urls):
+        client = _client(urls, hedge_delay=0.5)
+        try:
+            for _ in range(10):
+                await client.get_exchange_info()
+        finally:
+            await client.aclose()
+
+    with StubExchange() as primary, StubExchange() as alternate:
+        asyncio.run(run([primary.url, alternate.url]))
+
+    assert primary.requests == 10
+    assert alternate.requests == 0
+
+
+def test_hedge_success_wins_over_a_failure_finishing_with_it():
+    async def run():
+        client = _client(["http://a", "http://b"])
+        gate = None
+
+        async def send(base_url, *args):
+            await gate
+            if base_url == "http://a":
+                raise ConnectionError("primary failed")
+            return {"from": base_url}
+
+        client._send = send
+        results = []
+        try:
+            # Both requests finish in the same loop iteration, in either order.
+            for _ in range(20):
+                gate = asyncio.get_running_loop().create_future()
+                asyncio.get_running_loop().call_later(0.03, gate.set_result, None)
+                results.append(await client._hedged("GET", "/fapi/v1/time", None, False, None, None))
+        finally:
+            await client.aclose()
+        return results, client.endpoints.metrics()
+
+    results, metrics = asyncio.run(run())
+    assert results == [{"from": "http://b"}] * 20
+    assert metrics["http://b"]["hedge_wins"] == 20
+
+
+def test_orders_move_to_healthy_endpoint():
+    async def run(urls):
+        client = _client(urls, hedge_reads=False)
+        try:
+            return [await client.place_order("BTCUSDT", "BUY", "MARKET", "0.002") for _ in range(3)]
+        finally:
+            await client.aclose()
+
+    with StubExchange() as healthy:
+        responses = asyncio.run(run([_dead_url(), healthy.url]))
+
+    assert len(healthy.orders) == 3
+    assert [r["orderId"] for r in responses] == sorted(healthy.orders)
+
+
+def test_hedging_cuts_read_tail_latency():
+    async def p99(urls, hedge_reads):
+        client = _client(urls, hedge_reads=hedge_reads, hedge_delay=0.02)
+        samples = []
+        try:
+            for _ in range(100):
+                t0 = time.perf_counter()
+                await client.get_exchange_info()
+                samples.append(time.perf_counter() - t0)
+        finally:
+            await client.aclose()
+        return sorted(samples)[98]
+
+    with StubExchange() as primary, StubExchange() as alternate:
+        primary.slow_every = 10
+        primary.slow_latency = 0.2
+        plain = asyncio.run(p99([primary.url, alternate.url], hedge_reads=False))
+        hedged = asyncio.run(p99([primary.url, alternate.url], hedge_reads=True))
+
+    assert hedged < plain / 2
@@ -0,0 +1,102 @@
+import time
+from decimal import Decimal
+
+import pytest
+from stub_exchange import EXCHANGE_INFO, StubExchange
+
+from bot.exchange_info import ExchangeInfoCache, http_exchange_info_fetcher
+from bot.orders import build_and_place_order
+from bot.validators import ValidationError
+
+
+class CountingFetch:
+    def __init__(self):
+        self.calls = 0
+
+    def __call__(self):
+        self.calls += 1
+        return EXCHANGE_INFO
+
+
+class DummyClient:
+    def __init__(self):
+        self.calls = []
+
+    def place_order(self, symbol, side, order_type, quantity, price=None, time_in_force=None):
+        self.calls.append((quantity, price))
+        return {"symbol": symbol, "side": side, "type": order_type, "status": "NEW", "orderId": 1}
+
+
+@pytest.fixture
+def cache(tmp_path):
+    c = ExchangeInfoCache(fetch=CountingFetch(), snapshot_path=str(tmp_path / "info.json"))
+    c.refresh()
+    return c
+
+
+@pytest.mark.parametrize(
+    "order_type, qty, price, message",
+    [
+        ("LIMIT", "0.0015", "70000", "stepSize"),
+        ("LIMIT", "0", "70000", "minQty"),
+        ("MARKET", "121", None, "maxQty"),
+        ("LIMIT", "0.002", "70000.05", "tickSize"),
+        ("LIMIT", "0.001", "70000", "notional"),
+        ("LIMIT", "0.01", "100", "minPrice"),
+    ],
+)
+def test_check_order_rejects_filter_violations(cache, order_type, qty, price, message):
+    with pytest.raises(ValidationError, match=message):
+        cache.check_order("BTCUSDT", order_type, qty, price)
+
+
+def test_check_order_rejects_unknown_symbol(cache):
+    with pytest.raises(ValidationError, match="Unknown symbol"):
+        cache.check_order("DOGEUSDT", "MARKET", "1")
+
+
+def test_round_mode_rounds_to_step_and_tick(cache):
+    cache.mode = "round"
+    qty, price = cache.check_order("BTCUSDT", "LIMIT", 0.0029, 70000.06)
+    assert qty == Decimal("0.002")
+    assert price == Decimal("70000.1")
+
+
+def test_empty_cache_skips_checks():
+    qty, price = ExchangeInfoCache().check_order("ANYTHING", "LIMIT", 0.1, 1)
+    assert (qty, price) == (Decimal("0.1"), Decimal("1"))
+
+
+def test_snapshot_allows_cold_start_without_fetch(cache):
+    cold = ExchangeInfoCache(fetch=None, snapshot_path=cache.snapshot_path)
+    assert cold.load_snapshot()
+    assert cold.get("BTCUSDT").step_size == Decimal("0.001")
+    assert abs(cold.loaded_at - cache.loaded_at) < 1
+
+
+def test_background_refresh_when_stale(tmp_path):
+    fetch = CountingFetch()
+    c = ExchangeInfoCache(fetch=fetch, ttl=0.05, snapshot_path=str(tmp_path / "info.json"))
+    c.start()
+    try:
+        time.sleep(0.3)
+    finally:
+        c.stop()
+    assert fetch.calls >= 2
+    assert c.loaded
+
+
+def test_build_and_place_order_rejects_locally(cache):
+    client = DummyClient()
+    with pytest.raises(ValidationError):
+        build_and_place_order(client, "BTCUSDT", "BUY", "LIMIT", 0.0015, 70000, exchange_info=cache)
+    assert client.calls == []
+
+
+def test_http_fetcher_against_stub_exchange(tmp_path):
+    with StubExchange() as exchange:
+        c = ExchangeInfoCache(
+            fetch=http_exchange_info_fetcher(exchange.url), snapshot_path=str(tmp_path / "i.json")
+        )
+        c.refresh()
+    assert c.get("BTCUSDT").min_notional == Decimal("100")
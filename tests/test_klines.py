@@ -0,0 +1,155 @@
+import asyncio
+import multiprocessing
+
+import numpy as np
+import pytest
+from fastapi.testclient import TestClient
+
+from bot.api import app, get_kline_store
+from bot.backtest import Bars, MovingAverageCross, run_backtest
+from bot.client import AsyncBinanceFuturesClient
+from bot.klines import KlineStore, KlineSync, missing_ranges, rows_to_bars
+from bot.mock_exchange import MatchingEngine, MockError, MockExchange, MockExchangeServer
+from bot.rate_limit import RateLimiter, request_cost
+from bot.retry import RetryPolicy
+
+DAY = 86_400_000
+START = 1_700_006_400_000  # a UTC midnight
+
+
+class Counting:
+    """
+    Wraps a client, recording each kline page requested; ``fail`` pages raise.
+    """
+
+    def __init__(self, client, fail=()):
+        self.client = client
+        self.fail = set(fail)
+        self.pages = []
+
+    async def get_klines(self, symbol, interval, start_time=None, end_time=None, limit=1500):
+        self.pages.append((start_time, end_time + 1))
+        if start_time in self.fail:
+            raise MockError(-1003, "Too many requests.")
+        return await self.client.get_klines(symbol, interval, start_time, end_time, limit)
+
+
+def _sync(url, store, ranges, fail=(), limiter=None):
+    async def run():
+        client = AsyncBinanceFuturesClient(
+            "key", "secret", base_url=url, rate_limiter=limiter or RateLimiter(), retry_policy=RetryPolicy(attempts=1)
+        )
+        counting = Counting(client, fail)
+        try:
+            syncer = KlineSync(counting, store, concurrency=3)
+            return [await syncer.sync("btcusdt", "1m", start, end) for start, end in ranges], counting.pages
+        finally:
+            await client.aclose()
+
+    return asyncio.run(run())
+
+
+def test_sync_fetches_only_missing_pages_concurrently_within_rate_limits(tmp_path):
+    store = KlineStore(tmp_path)
+    limiter = RateLimiter()
+    with MockExchangeServer(MockExchange(weight_limit=100)) as server:
+        # 3 days of 1m candles: pages of 1500 from the start of the range.
+        [first], pages = _sync(server.url, store, [(START + DAY, START + 4 * DAY)], limiter=limiter)
+        assert (first.requests, first.failed, first.fetched, first.rows) == (3, 0, 4320, 4320)
+        assert pages == [(START + DAY + i * 90_000_000, min(START + DAY + (i + 1) * 90_000_000, START + 4 * DAY)) for i in range(3)]
+
+        # Widening the range only asks for the day before and the day after.
+        [second, again], pages = _sync(
+            server.url, store, [(START, START + 5 * DAY), (START, START + 5 * DAY)], limiter=limiter
+        )
+        assert sorted(pages) == [(START, START + DAY), (START + 4 * DAY, START + 5 * DAY)]
+        assert (second.requests, second.rows, again.requests) == (2, 7200, 0)
+        assert server.exchange.stats()["rate_limited"] == 0
+    # Every page went through the shared limiter.
+    assert limiter.metrics()["requests"] == 5
+    assert store.coverage("BTCUSDT", "1m") == [(START, START + 5 * DAY)]
+
+    bars = store.load("BTCUSDT", "1m")
+    assert bars.size == 7200 and np.all(np.diff(bars.time) == 60_000)
+    assert bars.time[0] == START and bars.open[1:].tolist() == bars.close[:-1].tolist()
+    engine = MatchingEngine()
+    expected = rows_to_bars(engine.klines({"symbol": "BTCUSDT", "interval": "1m", "startTime": START + DAY, "limit": 3}))
+    window = store.load("BTCUSDT", "1m", START + DAY, START + DAY + 180_000)
+    assert all(np.array_equal(a, b) for a, b in zip(window, expected))
+    assert isinstance(window.close, np.memmap) and np.shares_memory(window.close, bars.close)
+
+    result = run_backtest(store.load("BTCUSDT", "1m"), MovingAverageCross(fast=5, slow=30, size=0.01))
+    assert result.bars == 7200
+
+
+def test_failed_pages_stay_missing_until_the_next_sync(tmp_path):
+    store = KlineStore(tmp_path)
+    with MockExchangeServer() as server:
+        [result], _ = _sync(server.url, store, [(START, START + 2 * DAY)], fail=[START + 90_000_000])
+        assert (result.requests, result.failed, result.rows) == (2, 1, 1500)
+        assert result.missing == [(START + 90_000_000, START + 2 * DAY)]
+
+        [retry], pages = _sync(server.url, store, [(START, START + 2 * DAY)])
+    assert pages == [(START + 90_000_000, START + 2 * DAY)]
+    assert (retry.failed, retry.rows, retry.missing) == (0, 2880, [])
+
+
+def test_store_publishes_new_versions_without_disturbing_readers(tmp_path):
+    store, reader = KlineStore(tmp_path), KlineStore(tmp_path)
+    t = np.arange(5, dtype=np.int64) * 60_000
+    store.write("BTCUSDT", "1m", Bars(t, *(np.full(5, 1.0) for _ in range(5))), [(0, 300_000)])
+    before = reader.load("BTCUSDT", "1m")
+
+    # Overlapping rows replace the stored ones; the old view stays intact.
+    t2 = np.arange(3, 8, dtype=np.int64) * 60_000
+    assert store.write("BTCUSDT", "1m", Bars(t2, *(np.full(5, 2.0) for _ in range(5))), [(180_000, 480_000)]) == 8
+    assert before.close.tolist() == [1.0] * 5
+    after = reader.load("BTCUSDT", "1m", 120_000)
+    assert after.close.tolist() == [1.0, 2.0, 2.0, 2.0, 2.0, 2.0]
+    assert sorted(p.name for p in (tmp_path / "BTCUSDT" / "1m").iterdir()) == sorted(
+        ["meta.json", "write.lock"] + [f"{name}.2.npy" for name in Bars._fields]
+    )
+    assert reader.coverage("BTCUSDT", "1m") == [(0, 480_000)]
+    assert missing_ranges([(0, 10), (20, 30)], 5, 40) == [(10, 20), (30, 40)]
+    assert [row["rows"] for row in reader.datasets()] == [8]
+    with pytest.raises(ValueError, match="interval"):
+        store.load("BTCUSDT", "1M")
+
+    app.dependency_overrides[get_kline_store] = lambda: reader
+    try:
+        response = TestClient(app).get("/klines/btcusdt", params={"interval": "1m", "start": 60_000, "limit": 3})
+        bad = TestClient(app).get("/klines/btcusdt", params={"interval": "7m"})
+    finally:
+        app.dependency_overrides.clear()
+    assert response.json()["time"] == [300_000, 360_000, 420_000]
+    assert bad.status_code == 400
+
+
+def _write_rows(root, first, count):
+    store = KlineStore(root)
+    for i in range(first, first + count):
+        t = np.array([i * 60_000], dtype=np.int64)
+        store.write("BTCUSDT", "1m", Bars(t, *(np.full(1, float(i)) for _ in range(5))), [(i * 60_000, (i + 1) * 60_000)])
+
+
+def test_concurrent_writer_processes_keep_every_row(tmp_path):
+    context = multiprocessing.get_context("fork")
+    writers = [context.Process(target=_write_rows, args=(tmp_path, n * 20, 20)) for n in range(4)]
+    for process in writers:
+        process.start()
+    for process in writers:
+        process.join(60)
+        assert process.exitcode == 0
+
+    store = KlineStore(tmp_path)
+    assert store.load("BTCUSDT", "1m").time.tolist() == [i * 60_000 for i in range(80)]
+    assert store.coverage("BTCUSDT", "1m") == [(0, 80 * 60_000)]
+    assert store.meta("BTCUSDT", "1m")["version"] == 80
+
+
+def test_kline_weight_follows_the_page_size():
+    weights = [request_cost("GET", "/fapi/v1/klines", {"limit": n})["weight"] for n in (50, 100, 500, 1000, 1500)]
+    assert weights == [1, 2, 5, 5, 10]
+    assert request_cost("GET", "/fapi/v1/klines", {})["weight"] == 5
+    with pytest.raises(MockError, match="interval"):
+        MatchingEngine().klines({"symbol": "BTCUSDT", "interval": "1M"})
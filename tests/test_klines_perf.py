@@ -0,0 +1,27 @@
+import time
+
+import numpy as np
+
+from bot.backtest import Bars
+from bot.klines import KlineStore
+
+YEAR_OF_MINUTES = 365 * 24 * 60
+LOADS = 2_000
+
+
+def test_time_range_loads_are_zero_copy_slices(tmp_path):
+    rng = np.random.default_rng(5)
+    t = 1704067200000 + np.arange(YEAR_OF_MINUTES, dtype=np.int64) * 60_000
+    close = 70000 * np.exp(np.cumsum(rng.normal(0, 0.0005, YEAR_OF_MINUTES)))
+    writer = KlineStore(tmp_path)
+    writer.write("BTCUSDT", "1m", Bars(t, close, close, close, close, np.ones(YEAR_OF_MINUTES)), [(int(t[0]), int(t[-1]) + 60_000)])
+
+    store = KlineStore(tmp_path)
+    starts = rng.integers(t[0], t[-1], LOADS)
+    t0 = time.perf_counter()
+    for start in starts.tolist():
+        window = store.load("BTCUSDT", "1m", start, start + 7 * 86_400_000)
+    elapsed = (time.perf_counter() - t0) / LOADS
+    assert isinstance(window.close, np.memmap) and window.time[0] >= starts[-1]
+    # Copying a week of bars per load would take tens of milliseconds.
+    assert elapsed < 5e-3
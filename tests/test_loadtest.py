@@ -0,0 +1,49 @@
+import os
+
+from bot.db import dispose_engine, get_recent_orders, init_db
+from bot.loadtest import compare, run_cli_scenarios, run_suite
+
+
+def _report(p95, throughput, errors=0):
+    return {"results": {"api_orders@8": {"p95_ms": p95, "throughput": throughput, "errors": errors}}}
+
+
+def test_compare_flags_p95_and_throughput_regressions():
+    baseline = _report(p95=10.0, throughput=500.0)
+    assert compare(_report(11.9, 410.0), baseline, max_regression=20) == []
+
+    failures = compare(_report(12.5, 390.0), baseline, max_regression=20)
+    assert len(failures) == 2
+    assert "p95 12.50 ms" in failures[0]
+    assert "390.0 req/s" in failures[1]
+
+    assert compare(_report(10.0, 500.0, errors=3), baseline, max_regression=20) == ["api_orders@8: 3 failed requests"]
+    assert compare({"results": {}}, baseline, max_regression=20) == []
+
+
+def test_api_scenarios_run_on_a_seeded_db():
+    previous = os.environ.get("TRADING_BOT_DB_URL")
+    report = run_suite(scale=0.05, include_cli=False)
+
+    assert os.environ.get("TRADING_BOT_DB_URL") == previous
+    results = report["results"]
+    assert set(results) == {
+        f"{scenario}@{level}" for scenario in ("api_orders", "api_orders_recent") for level in (1, 8, 32)
+    }
+    for result in results.values():
+        assert result["errors"] == 0
+        assert result["throughput"] > 0 and result["p95_ms"] > 0
+
+
+def test_cli_scenario_places_orders_through_the_mock(tmp_path, monkeypatch):
+    monkeypatch.setenv("TRADING_BOT_DB_URL", f"sqlite:///{tmp_path / 'cli.db'}")
+    init_db()
+    try:
+        results = run_cli_scenarios(levels=(2,), runs=2)
+        recent = get_recent_orders(limit=10)
+    finally:
+        dispose_engine()
+
+    assert results["cli_order@2"]["errors"] == 0
+    assert results["cli_order_daemon@2"]["errors"] == 0
+    assert len(recent) == 4
@@ -0,0 +1,54 @@
+import json
+import logging
+
+import pytest
+
+from bot.logging_config import log_response, setup_logging, stop_logging
+
+RESPONSE = {"orderId": 42, "symbol": "BTCUSDT", "status": "NEW", "origQty": "0.002"}
+
+
+@pytest.fixture
+def configure():
+    root = logging.getLogger()
+    saved, level = root.handlers[:], root.level
+
+    def run(*args, **kwargs):
+        # pytest adds its capture handlers per test phase; setup_logging only
+        # configures an unconfigured root logger.
+        root.handlers = []
+        setup_logging(*args, **kwargs)
+
+    yield run
+    stop_logging()
+    root.handlers = saved
+    root.setLevel(level)
+
+
+def test_json_lines_with_nested_payload(tmp_path, configure):
+    configure(str(tmp_path), log_format="json", use_queue=True)
+    logger = logging.getLogger("bot.client")
+    log_response(logger, "Order placed successfully", RESPONSE)
+    try:
+        raise ValueError("boom")
+    except ValueError:
+        logger.exception("Placing %s failed", "BTCUSDT")
+    stop_logging()
+
+    lines = [json.loads(line) for line in (tmp_path / "trading_bot.log").read_text().splitlines()]
+    assert lines[0]["msg"] == "Order placed successfully"
+    assert lines[0]["payload"] == RESPONSE
+    assert lines[0]["logger"] == "bot.client"
+    assert lines[1]["msg"] == "Placing BTCUSDT failed"
+    assert "ValueError: boom" in lines[1]["exc"]
+
+
+def test_sampled_out_responses_log_a_summary(tmp_path, configure):
+    configure(str(tmp_path), response_sample=0.0)
+    logger = logging.getLogger("bot.client")
+    log_response(logger, "Batch placed", [RESPONSE, dict(RESPONSE, orderId=43, status="FILLED")])
+    stop_logging()
+
+    text = (tmp_path / "trading_bot.log").read_text()
+    assert "Batch placed: 42=NEW 43=FILLED" in text
+    assert "origQty" not in text
@@ -0,0 +1,67 @@
+import logging
+import time
+
+import pytest
+
+from bot.logging_config import log_response, setup_logging, stop_logging
+
+RESPONSE = {
+    "orderId": 12094128049,
+    "symbol": "BTCUSDT",
+    "status": "NEW",
+    "clientOrderId": "tb0f1e2d3c4b5a69788796a5b4c3d2e1f0",
+    "price": "76000.0",
+    "avgPrice": "0.00",
+    "origQty": "0.002",
+    "executedQty": "0.000",
+    "cumQuote": "0.00000",
+    "timeInForce": "GTC",
+    "type": "LIMIT",
+    "side": "SELL",
+    "updateTime": 1718000000000,
+}
+
+
+@pytest.fixture
+def configure():
+    root = logging.getLogger()
+    saved, level = root.handlers[:], root.level
+
+    def run(*args, **kwargs):
+        # pytest adds its capture handlers per test phase; setup_logging only
+        # configures an unconfigured root logger.
+        root.handlers = []
+        setup_logging(*args, **kwargs)
+
+    yield run
+    stop_logging()
+    root.handlers = saved
+    root.setLevel(level)
+
+
+def _per_order(configure, log_dir, use_queue, n=5_000):
+    # The two log calls BinanceFuturesClient.place_order makes per order.
+    # Median, not mean: the listener thread competes for the GIL in a tight
+    # loop, which is a throughput cost, not added latency on one order.
+    configure(str(log_dir), use_queue=use_queue)
+    logger = logging.getLogger("bot.client")
+    samples = []
+    for _ in range(n):
+        t0 = time.perf_counter()
+        logger.info(
+            "Placing order: symbol=%s side=%s type=%s qty=%s price=%s tif=%s",
+            "BTCUSDT", "SELL", "LIMIT", "0.002", "76000", "GTC",
+        )
+        log_response(logger, "Order placed successfully", RESPONSE)
+        samples.append(time.perf_counter() - t0)
+    stop_logging()
+    return sorted(samples)[n // 2]
+
+
+def test_queued_logging_keeps_formatting_off_the_order_path(tmp_path, configure, capsys):
+    direct = _per_order(configure, tmp_path / "direct", use_queue=False)
+    queued = _per_order(configure, tmp_path / "queued", use_queue=True)
+    capsys.readouterr()
+    lines = (tmp_path / "queued" / "trading_bot.log").read_text().count("\n")
+    assert lines == 10_000
+    assert queued < direct / 2
@@ -0,0 +1,155 @@
+import asyncio
+import json
+import time
+from decimal import Decimal
+
+import pytest
+from fastapi.testclient import TestClient
+from websockets.asyncio.server import serve
+
+from bot.api import app, get_market_data
+from bot.market_data import MarketData, QuoteStore
+from bot.orders import build_and_place_order
+from bot.validators import ValidationError
+
+
+def book(symbol, bid, ask, ts_ms=None):
+    ts_ms = ts_ms or int(time.time() * 1000)
+    return {
+        "stream": f"{symbol.lower()}@bookTicker",
+        "data": {"e": "bookTicker", "s": symbol, "b": bid, "B": "3.5", "a": ask, "A": "1.25", "T": ts_ms},
+    }
+
+
+def mark(symbol, price):
+    return {
+        "stream": f"{symbol.lower()}@markPrice@1s",
+        "data": {"e": "markPriceUpdate", "s": symbol, "p": price, "E": int(time.time() * 1000)},
+    }
+
+
+@pytest.fixture
+def market_data():
+    md = MarketData(symbols=["BTCUSDT"], price_band=0.05)
+    md.apply(book("BTCUSDT", "60000.0", "60000.1"))
+    md.apply(mark("BTCUSDT", "60000.05"))
+    return md
+
+
+def test_store_keeps_book_and_mark_per_symbol():
+    store = QuoteStore(["BTCUSDT"])
+    assert store.get("BTCUSDT") is None
+    assert store.get("ETHUSDT") is None
+
+    store.update_book("BTCUSDT", 100.0, 1.0, 101.0, 2.0, 10.0)
+    store.update_book("ETHUSDT", 5.0, 1.0, 6.0, 2.0, 11.0)
+    store.update_mark("BTCUSDT", 100.5, 12.0)
+
+    btc = store.get("BTCUSDT")
+    assert (btc.bid, btc.ask, btc.mark_price, btc.mid, btc.updated_at) == (100.0, 101.0, 100.5, 100.5, 12.0)
+    eth = store.get("ETHUSDT")
+    assert (eth.bid, eth.ask, eth.mark_price) == (5.0, 6.0, 0.0)
+
+
+def test_stream_populates_store():
+    async def run():
+        async def handler(ws):
+            assert ws.request.path == "/stream?streams=btcusdt@bookTicker/btcusdt@markPrice@1s"
+            await ws.send(json.dumps(book("BTCUSDT", "60000.0", "60000.2")))
+            await ws.send(json.dumps(mark("BTCUSDT", "60000.1")))
+            await ws.wait_closed()
+
+        async with serve(handler, "127.0.0.1", 0) as server:
+            port = server.sockets[0].getsockname()[1]
+            md = MarketData(symbols=["BTCUSDT"], ws_url=f"ws://127.0.0.1:{port}")
+            md.start()
+            for _ in range(100):
+                await asyncio.sleep(0.02)
+                if md.messages >= 2:
+                    break
+            await md.stop()
+        return md
+
+    quote = asyncio.run(run()).get("BTCUSDT")
+    assert (quote.bid, quote.ask, quote.mark_price) == (60000.0, 60000.2, 60000.1)
+
+
+def test_connections_that_drop_at_once_back_off(monkeypatch):
+    clock = [0.0]
+    md = MarketData(symbols=["BTCUSDT"], max_backoff=60.0, min_healthy=30.0, clock=lambda: clock[0])
+    delays = []
+
+    class Connection:
+        # Accepted, then closed by the server without a message; the fourth
+        # connection stays up a minute first.
+        async def __aenter__(self):
+            return self
+
+        async def __aexit__(self, *exc):
+            return False
+
+        def __aiter__(self):
+            return self
+
+        async def __anext__(self):
+            clock[0] += 60.0 if len(delays) == 3 else 1.0
+            raise StopAsyncIteration
+
+    async def sleep(delay):
+        delays.append(delay)
+        if len(delays) == 6:
+            raise asyncio.CancelledError
+
+    monkeypatch.setattr("bot.market_data.connect", lambda url: Connection())
+    monkeypatch.setattr("bot.market_data.random.uniform", lambda low, high: high)
+    monkeypatch.setattr("bot.market_data.asyncio.sleep", sleep)
+    with pytest.raises(asyncio.CancelledError):
+        asyncio.run(md.run())
+
+    assert delays == [1.0, 2.0, 4.0, 0.5, 1.0, 2.0]
+    assert md.connects == 6
+
+
+def test_limit_price_outside_band_is_rejected_before_sending(market_data):
+    class NoNetworkClient:
+        def place_order(self, **kwargs):
+            raise AssertionError("order should not be sent")
+
+    with pytest.raises(ValidationError, match="away from reference price"):
+        build_and_place_order(
+            NoNetworkClient(), "BTCUSDT", "BUY", "LIMIT", "0.01", "70000", "GTC", market_data=market_data
+        )
+
+
+def test_market_notional_uses_touch_price(market_data):
+    with pytest.raises(ValidationError, match="notional"):
+        market_data.check_order("BTCUSDT", "BUY", "MARKET", Decimal("0.001"), min_notional=Decimal("100"))
+    market_data.check_order("BTCUSDT", "BUY", "MARKET", Decimal("0.002"), min_notional=Decimal("100"))
+
+
+def test_staleness_uses_local_receive_time():
+    now = [100.0]
+    md = MarketData(symbols=["BTCUSDT"], max_age=5, clock=lambda: now[0])
+    # An exchange clock a minute behind ours does not make a new quote stale.
+    md.apply(book("BTCUSDT", "60000.0", "60000.1", ts_ms=int((time.time() - 60) * 1000)))
+    with pytest.raises(ValidationError, match="away from reference price"):
+        md.check_order("BTCUSDT", "BUY", "LIMIT", Decimal("0.01"), Decimal("1000"))
+
+    now[0] += 6
+    assert md.fresh("BTCUSDT") is None
+    md.check_order("BTCUSDT", "BUY", "LIMIT", Decimal("0.01"), Decimal("1000"))
+
+
+def test_marketdata_endpoint(market_data):
+    app.dependency_overrides[get_market_data] = lambda: market_data
+    try:
+        api = TestClient(app)
+        resp = api.get("/marketdata/btcusdt")
+        missing = api.get("/marketdata/ETHUSDT")
+    finally:
+        app.dependency_overrides.pop(get_market_data, None)
+
+    assert resp.status_code == 200
+    body = resp.json()
+    assert (body["bid"], body["ask"], body["mark_price"]) == (60000.0, 60000.1, 60000.05)
+    assert missing.status_code == 404
@@ -0,0 +1,33 @@
+import asyncio
+import time
+
+from bot.api import market_data_quote
+from bot.market_data import MarketData, QuoteStore
+
+
+def test_quote_lookup_latency():
+    store = QuoteStore([f"SYM{i}USDT" for i in range(500)])
+    for i in range(500):
+        store.update_book(f"SYM{i}USDT", 1.0 + i, 1.0, 1.1 + i, 1.0, time.time())
+
+    n = 100_000
+    t0 = time.perf_counter()
+    for _ in range(n):
+        store.get("SYM250USDT")
+    per_call = (time.perf_counter() - t0) / n
+    # About a microsecond: a lock or per-call allocation would show here.
+    assert per_call < 500e-6
+
+
+def test_marketdata_handler_latency():
+    md = MarketData(symbols=["BTCUSDT"])
+    md.store.update_book("BTCUSDT", 60000.0, 1.0, 60000.1, 1.0, time.time())
+
+    async def run(n):
+        t0 = time.perf_counter()
+        for _ in range(n):
+            await market_data_quote("btcusdt", md)
+        return (time.perf_counter() - t0) / n
+
+    per_call = asyncio.run(run(20_000))
+    assert per_call < 1e-3
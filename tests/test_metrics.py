@@ -0,0 +1,83 @@
+import asyncio
+
+import pytest
+from binance.exceptions import BinanceAPIException
+from fastapi.testclient import TestClient
+from stub_exchange import StubExchange
+
+from bot.api import app, get_binance_client
+from bot.client import AsyncBinanceFuturesClient
+from bot.metrics import BINANCE_ERRORS, ORDER_SECONDS, VALIDATION_SECONDS, Histogram
+from bot.retry import RetryPolicy
+
+client = TestClient(app)
+
+
+class DummyClient:
+    async def place_order(self, symbol, side, order_type, quantity, price=None, time_in_force=None):
+        return {"symbol": symbol, "side": side, "type": order_type, "status": "NEW", "orderId": 7}
+
+
+def _count(histogram, *labels):
+    return sum(histogram.labels(*labels).counts)
+
+
+def test_histogram_buckets_are_cumulative_in_exposition():
+    hist = Histogram("test_latency_seconds", "Test.", ["op"], buckets=(0.1, 1.0))
+    for value in (0.05, 0.5, 0.5, 5.0):
+        hist.labels("x").observe(value)
+    family = hist.collect()
+    samples = {(s.name, s.labels.get("le")): s.value for s in family.samples}
+    assert samples[("test_latency_seconds_bucket", "0.1")] == 1
+    assert samples[("test_latency_seconds_bucket", "1.0")] == 3
+    assert samples[("test_latency_seconds_bucket", "+Inf")] == 4
+    assert samples[("test_latency_seconds_count", None)] == 4
+    assert samples[("test_latency_seconds_sum", None)] == pytest.approx(6.05)
+
+
+def test_order_through_api_is_recorded(tmp_path, monkeypatch):
+    monkeypatch.setenv("TRADING_BOT_DB_URL", f"sqlite:///{tmp_path / 'metrics.db'}")
+    from bot.db import dispose_engine, init_db
+
+    init_db()
+    app.dependency_overrides[get_binance_client] = lambda: DummyClient()
+    try:
+        orders = _count(ORDER_SECONDS, "ETHUSDT", "MARKET", "ok")
+        invalid = _count(VALIDATION_SECONDS, "", "", "invalid")
+        payload = {"symbol": "ETHUSDT", "side": "BUY", "type": "MARKET", "quantity": 0.01}
+        assert client.post("/orders", json=payload).status_code == 200
+        assert client.post("/orders", json=dict(payload, side="HOLD")).status_code == 400
+    finally:
+        app.dependency_overrides.pop(get_binance_client, None)
+        dispose_engine()
+
+    assert _count(ORDER_SECONDS, "ETHUSDT", "MARKET", "ok") == orders + 1
+    assert _count(VALIDATION_SECONDS, "", "", "invalid") == invalid + 1
+
+    resp = client.get("/metrics")
+    assert resp.status_code == 200
+    assert resp.headers["content-type"].startswith("text/plain")
+    text = resp.text
+    assert 'trading_bot_order_seconds_count{outcome="ok",symbol="ETHUSDT",type="MARKET"}' in text
+    assert 'trading_bot_order_validation_seconds_bucket{' in text
+    assert 'trading_bot_db_persist_seconds_count{outcome="ok"}' in text
+    assert 'trading_bot_http_request_seconds_count{method="POST",route="/orders",status="200"}' in text
+
+
+def test_binance_error_codes_are_counted():
+    async def run(stub):
+        exchange = AsyncBinanceFuturesClient(
+            "key", "secret", base_url=stub.url, retry_policy=RetryPolicy(attempts=1)
+        )
+        try:
+            await exchange.place_order("BADUSDT", "BUY", "MARKET", "0.002")
+        finally:
+            await exchange.aclose()
+
+    before = BINANCE_ERRORS.labels("-1121").value
+    with StubExchange() as stub:
+        with pytest.raises(BinanceAPIException):
+            asyncio.run(run(stub))
+
+    assert BINANCE_ERRORS.labels("-1121").value == before + 1
+    assert 'trading_bot_binance_errors_total{code="-1121"}' in client.get("/metrics").text
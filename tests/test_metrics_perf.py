@@ -0,0 +1,25 @@
+import time
+
+from bot.metrics import DB_PERSIST_SECONDS, EXCHANGE_SECONDS, ORDER_SECONDS, VALIDATION_SECONDS
+
+
+def _record_order():
+    # What one order costs in instrumentation: four timers, four observations.
+    t0 = time.perf_counter()
+    VALIDATION_SECONDS.labels("BTCUSDT", "LIMIT", "ok").observe(time.perf_counter() - t0)
+    t1 = time.perf_counter()
+    EXCHANGE_SECONDS.labels("BTCUSDT", "LIMIT", "ok").observe(time.perf_counter() - t1)
+    t2 = time.perf_counter()
+    DB_PERSIST_SECONDS.labels("ok").observe(time.perf_counter() - t2)
+    ORDER_SECONDS.labels("BTCUSDT", "LIMIT", "ok").observe(time.perf_counter() - t0)
+
+
+def test_instrumentation_cost_per_order():
+    n = 50_000
+    _record_order()
+    t0 = time.perf_counter()
+    for _ in range(n):
+        _record_order()
+    per_order = (time.perf_counter() - t0) / n
+    # A few microseconds per order; stay well clear of a slow host.
+    assert per_order < 100e-6
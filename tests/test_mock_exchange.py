@@ -0,0 +1,127 @@
+import asyncio
+from decimal import Decimal
+
+import pytest
+from binance.exceptions import BinanceAPIException
+
+from bot.bench import run_benchmark
+from bot.client import AsyncBinanceFuturesClient, BinanceFuturesClient
+from bot.db import dispose_engine, get_recent_orders
+from bot.mock_exchange import MatchingEngine, MockError, MockExchange, MockExchangeServer
+from bot.rate_limit import RateLimiter
+from bot.retry import RetryPolicy
+
+
+def _limit(side, price, qty="0.002", tif="GTC"):
+    return {"symbol": "BTCUSDT", "side": side, "type": "LIMIT", "quantity": qty, "price": price, "timeInForce": tif}
+
+
+def _market(side, qty="0.002"):
+    return {"symbol": "BTCUSDT", "side": side, "type": "MARKET", "quantity": qty}
+
+
+def test_market_order_sweeps_book_then_synthetic_touch():
+    engine = MatchingEngine()
+    first = engine.place(_limit("SELL", "70001.0"))
+    second = engine.place(_limit("SELL", "70002.0"))
+    assert first.status == second.status == "NEW"
+
+    taker = engine.place(_market("BUY", "0.005"))
+    _, ask = engine.touch("BTCUSDT")
+    assert taker.status == "FILLED"
+    assert first.status == second.status == "FILLED"
+    assert taker.cum_quote == Decimal("0.002") * 70001 + Decimal("0.002") * 70002 + Decimal("0.001") * ask
+    # One account on both sides: the resting sells offset all but 0.001.
+    assert engine.positions()[0]["positionAmt"] == "0.001"
+
+
+def test_limit_orders_rest_expire_and_fill_on_mark_moves():
+    engine = MatchingEngine()
+    resting = engine.place(_limit("BUY", "69000.0"))
+    ioc = engine.place(_limit("BUY", "69000.0", tif="IOC"))
+    fok = engine.place(_limit("BUY", "69000.0", qty="0.010", tif="FOK"))
+    assert (resting.status, ioc.status, fok.status) == ("NEW", "EXPIRED", "EXPIRED")
+    assert [o.order_id for o in engine.open_orders()] == [resting.order_id]
+
+    assert engine.set_mark("BTCUSDT", Decimal("69500")) == []
+    assert engine.set_mark("BTCUSDT", Decimal("68990")) == [resting]
+    assert resting.status == "FILLED"
+    assert resting.to_dict()["avgPrice"] == "69000"
+
+
+def test_order_validation_uses_binance_codes():
+    engine = MatchingEngine()
+    for params, code in [
+        (dict(_market("BUY"), symbol="BADUSDT"), -1121),
+        (_market("BUY", qty="0.0015"), -1111),
+        (_market("BUY", qty="0.001"), -4164),
+        (_limit("BUY", "70000.05"), -4014),
+    ]:
+        with pytest.raises(MockError) as excinfo:
+            engine.place(params)
+        assert excinfo.value.code == code
+
+
+def test_signed_requests_are_verified():
+    async def run(url, secret):
+        client = AsyncBinanceFuturesClient("key", secret, base_url=url, retry_policy=RetryPolicy(attempts=1))
+        try:
+            return await client.place_order("BTCUSDT", "BUY", "MARKET", "0.002")
+        finally:
+            await client.aclose()
+
+    with MockExchangeServer(MockExchange(api_key="key", api_secret="secret")) as server:
+        assert asyncio.run(run(server.url, "secret"))["status"] == "FILLED"
+        with pytest.raises(BinanceAPIException) as excinfo:
+            asyncio.run(run(server.url, "wrong"))
+        sync = BinanceFuturesClient("key", "secret", base_url=server.url, ping=False)
+        assert sync.place_order("BTCUSDT", "SELL", "MARKET", "0.002")["status"] == "FILLED"
+        sync.close()
+
+    assert excinfo.value.code == -1022
+    assert server.exchange.engine.positions()[0]["positionAmt"] == "0"
+
+
+def test_rate_limits_return_429_with_usage_headers():
+    async def run(url):
+        client = AsyncBinanceFuturesClient(
+            "key", "secret", base_url=url, rate_limiter=RateLimiter(enabled=False), retry_policy=RetryPolicy(attempts=1)
+        )
+        statuses = []
+        try:
+            for _ in range(5):
+                try:
+                    await client.place_order("BTCUSDT", "BUY", "MARKET", "0.002")
+                    statuses.append(200)
+                except BinanceAPIException as exc:
+                    statuses.append(exc.status_code)
+        finally:
+            await client.aclose()
+        return statuses
+
+    with MockExchangeServer(MockExchange(order_limit_10s=3)) as server:
+        statuses = asyncio.run(run(server.url))
+
+    assert statuses == [200, 200, 200, 429, 429]
+    assert server.exchange.stats()["rate_limited"] == 2
+
+
+def test_bench_drives_full_stack_through_injected_errors(tmp_path, monkeypatch):
+    monkeypatch.setenv("TRADING_BOT_DB_URL", f"sqlite:///{tmp_path / 'bench.db'}")
+    # Concurrency decides which request meets which injected error, so the
+    # seed alone is not enough: enough attempts that no order runs out
+    # (0.05 ** 8 per order).
+    monkeypatch.setenv("BINANCE_RETRY_ATTEMPTS", "8")
+    monkeypatch.setenv("BINANCE_RETRY_BASE_DELAY", "0.01")
+    exchange = MockExchange(api_key="bench-key", api_secret="bench-secret", error_rate=0.05, seed=3)
+    try:
+        with MockExchangeServer(exchange) as server:
+            report = run_benchmark(server.url, orders=200, concurrency=20)
+        recent = get_recent_orders(limit=500)
+    finally:
+        dispose_engine()
+
+    assert report["ok"] == 200 and not report["errors"]
+    assert report["persisted"] == 200 and len(recent) == 200
+    assert exchange.injected_errors > 0
+    assert len(exchange.engine.orders) == 200
@@ -0,0 +1,165 @@
+import os
+import time
+from datetime import datetime, timedelta
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import inspect
+
+from bot.api import app
+from bot.db import (
+    dispose_engine,
+    get_engine,
+    get_order,
+    get_orders_page,
+    init_db,
+    save_order,
+    save_orders,
+    upsert_order_updates,
+)
+
+api = TestClient(app)
+
+BENCH_ROWS = int(os.getenv("TRADING_BOT_BENCH_ROWS", "200000"))
+
+
+@pytest.fixture
+def temp_db(tmp_path, monkeypatch):
+    monkeypatch.setenv("TRADING_BOT_DB_URL", f"sqlite:///{tmp_path / 'history.db'}")
+    init_db()
+    yield
+    dispose_engine()
+
+
+def _seed(n, start=datetime(2026, 1, 1)):
+    symbols = ("BTCUSDT", "ETHUSDT", "SOLUSDT", "BNBUSDT")
+    rows = [
+        (
+            # Same text format SQLAlchemy uses for SQLite DateTime columns.
+            (start + timedelta(seconds=i)).strftime("%Y-%m-%d %H:%M:%S.%f"),
+            symbols[i % 4],
+            "BUY" if i % 2 else "SELL",
+            "LIMIT",
+            "FILLED" if i % 3 else "NEW",
+            str(i),
+            "{}",
+        )
+        for i in range(n)
+    ]
+    with get_engine().begin() as conn:
+        conn.exec_driver_sql(
+            "INSERT INTO orders (created_at, symbol, side, type, status, order_id, raw_response) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?)",
+            rows,
+        )
+
+
+def test_duplicate_order_ids_are_ignored(temp_db):
+    save_order({"symbol": "BTCUSDT", "side": "BUY", "type": "MARKET", "status": "NEW", "orderId": 5})
+    save_order({"symbol": "BTCUSDT", "side": "BUY", "type": "MARKET", "status": "NEW", "orderId": 5})
+    records, _ = get_orders_page()
+    assert len(records) == 1
+
+
+def test_order_ids_are_unique_per_symbol_only(temp_db):
+    for symbol in ("BTCUSDT", "ETHUSDT"):
+        save_order({"symbol": symbol, "side": "BUY", "type": "MARKET", "status": "NEW", "orderId": 9})
+    # Rejections carry no orderId and are not stored.
+    save_orders([{"symbol": "BTCUSDT", "code": -2019, "msg": "Margin is insufficient."}])
+    upsert_order_updates(
+        [{"symbol": "ETHUSDT", "side": "BUY", "type": "MARKET", "status": "FILLED", "order_id": "9",
+          "executed_qty": "1", "avg_price": "3000", "updated_at": datetime.utcnow(), "raw": {}}]
+    )
+
+    records, _ = get_orders_page()
+    assert sorted((r.symbol, r.status) for r in records) == [("BTCUSDT", "NEW"), ("ETHUSDT", "FILLED")]
+    assert get_order("9", "btcusdt").status == "NEW"
+    assert api.get("/orders/9", params={"symbol": "ETHUSDT"}).json()["status"] == "FILLED"
+    assert api.get("/orders/9", params={"symbol": "BNBUSDT"}).status_code == 404
+
+
+def test_old_order_id_index_is_replaced(tmp_path, monkeypatch):
+    monkeypatch.setenv("TRADING_BOT_DB_URL", f"sqlite:///{tmp_path / 'old.db'}")
+    with get_engine().begin() as conn:
+        conn.exec_driver_sql(
+            "CREATE TABLE orders (id INTEGER PRIMARY KEY, created_at DATETIME NOT NULL, symbol VARCHAR(32) NOT NULL, "
+            "side VARCHAR(8) NOT NULL, type VARCHAR(16) NOT NULL, status VARCHAR(32) NOT NULL, "
+            "order_id VARCHAR(64) NOT NULL, raw_response JSON NOT NULL)"
+        )
+        conn.exec_driver_sql("CREATE UNIQUE INDEX uq_orders_order_id ON orders (order_id)")
+    try:
+        init_db()
+        indexes = {i["name"] for i in inspect(get_engine()).get_indexes("orders")}
+    finally:
+        dispose_engine()
+    assert "uq_orders_order_id_symbol" in indexes and "uq_orders_order_id" not in indexes
+
+
+def test_keyset_pagination_walks_all_rows_once(temp_db):
+    _seed(120)
+    seen, cursor = [], None
+    while True:
+        resp = api.get("/orders", params={"limit": 50, **({"cursor": cursor} if cursor else {})})
+        assert resp.status_code == 200
+        body = resp.json()
+        seen.extend(item["order_id"] for item in body["items"])
+        cursor = body["next_cursor"]
+        if cursor is None:
+            break
+    assert seen == [str(i) for i in reversed(range(120))]
+
+
+def test_filters(temp_db):
+    _seed(100)
+    resp = api.get(
+        "/orders",
+        params={
+            "symbol": "btcusdt",
+            "side": "sell",
+            "status": "NEW",
+            "start": "2026-01-01T00:00:10Z",
+            "end": "2026-01-01T00:01:00+00:00",
+        },
+    )
+    items = resp.json()["items"]
+    assert items
+    assert {(i["symbol"], i["side"], i["status"]) for i in items} == {("BTCUSDT", "SELL", "NEW")}
+    assert all(10 <= int(i["order_id"]) < 60 for i in items)
+
+
+def test_bad_cursor_and_limit_bounds(temp_db):
+    assert api.get("/orders", params={"cursor": "not-a-cursor"}).status_code == 400
+    assert api.get("/orders/recent", params={"limit": 100000}).status_code == 422
+    assert api.get("/orders", params={"limit": 0}).status_code == 422
+
+
+def _timed(fn, repeat=20):
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - t0)
+    return best * 1000
+
+
+def test_query_latency_stays_flat_on_large_table(temp_db):
+    # Set TRADING_BOT_BENCH_ROWS=1000000 for the full-size run.
+    _seed(BENCH_ROWS)
+
+    first_page = _timed(lambda: get_orders_page(limit=50))
+    _, deep_cursor = get_orders_page(limit=BENCH_ROWS - 100)
+    deep_page = _timed(lambda: get_orders_page(limit=50, cursor=deep_cursor), repeat=5)
+    by_symbol = _timed(lambda: get_orders_page(limit=50, symbol="ETHUSDT"))
+
+    def offset_page():
+        with get_engine().connect() as conn:
+            conn.exec_driver_sql(
+                "SELECT * FROM orders ORDER BY created_at DESC, id DESC LIMIT 50 OFFSET ?",
+                (BENCH_ROWS - 100,),
+            ).fetchall()
+
+    deep_offset = _timed(offset_page, repeat=3)
+
+    assert deep_page < 10 * first_page + 5
+    assert by_symbol < 10 * first_page + 5
+    assert deep_page < deep_offset
@@ -0,0 +1,92 @@
+import json
+import time
+import tracemalloc
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import select
+
+from bot.api import app
+from bot.db import (
+    OrderRecord,
+    OrderSummary,
+    dispose_engine,
+    get_engine,
+    get_recent_orders,
+    get_session,
+    init_db,
+    save_order,
+)
+
+api = TestClient(app)
+
+ROWS = 10_000
+
+
+@pytest.fixture
+def temp_db(tmp_path, monkeypatch):
+    monkeypatch.setenv("TRADING_BOT_DB_URL", f"sqlite:///{tmp_path / 'projection.db'}")
+    init_db()
+    yield
+    dispose_engine()
+
+
+def _seed(n):
+    raw = json.dumps({"fills": [{"price": "70000.1", "qty": "0.001", "tradeId": i} for i in range(40)]})
+    rows = [
+        ("2026-01-01 00:00:00.%06d" % (i % 1_000_000), "BTCUSDT", "BUY", "LIMIT", "NEW", str(i), raw)
+        for i in range(n)
+    ]
+    with get_engine().begin() as conn:
+        conn.exec_driver_sql(
+            "INSERT INTO orders (created_at, symbol, side, type, status, order_id, raw_response) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?)",
+            rows,
+        )
+
+
+def _load_full_records(limit):
+    # Previous behaviour: whole ORM objects, raw_response JSON included.
+    with get_session() as session:
+        stmt = select(OrderRecord).order_by(OrderRecord.created_at.desc()).limit(limit)
+        return list(session.scalars(stmt))
+
+
+def _measure(fn):
+    t0 = time.perf_counter()
+    result = fn()
+    elapsed = time.perf_counter() - t0
+    # Memory is measured on a second run so tracing overhead does not skew timing.
+    tracemalloc.start()
+    fn()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, elapsed * 1000, peak / 1024 / 1024
+
+
+def test_recent_orders_returns_projected_tuples(temp_db):
+    save_order({"symbol": "BTCUSDT", "side": "BUY", "type": "MARKET", "status": "NEW", "orderId": 42})
+    recent = get_recent_orders(limit=5)
+    assert isinstance(recent[0], OrderSummary)
+    assert not hasattr(recent[0], "raw_response")
+
+
+def test_order_detail_endpoint(temp_db):
+    response = {"symbol": "BTCUSDT", "side": "BUY", "type": "MARKET", "status": "NEW", "orderId": 42}
+    save_order(response)
+    resp = api.get("/orders/42")
+    assert resp.status_code == 200
+    assert resp.json()["raw_response"] == response
+    assert api.get("/orders/43").status_code == 404
+    assert "raw_response" not in api.get("/orders/recent").json()[0]
+
+
+def test_projection_memory_and_latency(temp_db):
+    _seed(ROWS)
+
+    full, full_ms, full_mb = _measure(lambda: _load_full_records(ROWS))
+    projected, proj_ms, proj_mb = _measure(lambda: get_recent_orders(limit=ROWS))
+
+    assert len(full) == len(projected) == ROWS
+    assert proj_mb < full_mb / 2
+    assert proj_ms < full_ms
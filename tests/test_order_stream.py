@@ -0,0 +1,72 @@
+import asyncio
+import threading
+
+import pytest
+from fastapi.testclient import TestClient
+
+from bot.api import app, get_binance_client
+from bot.db import dispose_engine, init_db
+from bot.events import OrderHub, order_event
+
+
+class DummyClient:
+    async def place_order(self, symbol, side, order_type, quantity, price=None, time_in_force=None):
+        return {"symbol": symbol, "side": side, "type": order_type, "status": "NEW", "orderId": 99}
+
+
+@pytest.fixture
+def temp_db(tmp_path, monkeypatch):
+    monkeypatch.setenv("TRADING_BOT_DB_URL", f"sqlite:///{tmp_path / 'stream.db'}")
+    init_db()
+    yield
+    dispose_engine()
+
+
+def test_websocket_receives_new_orders(temp_db):
+    app.dependency_overrides[get_binance_client] = lambda: DummyClient()
+    try:
+        api = TestClient(app)
+        with api.websocket_connect("/ws/orders") as ws:
+            payload = {"symbol": "BTCUSDT", "side": "BUY", "type": "MARKET", "quantity": 0.002}
+            assert api.post("/orders", json=payload).status_code == 200
+            event = ws.receive_json()
+    finally:
+        app.dependency_overrides.pop(get_binance_client, None)
+
+    assert event["event"] == "order"
+    assert event["order_id"] == "99"
+    assert event["status"] == "NEW"
+
+
+def test_slow_subscriber_is_dropped_without_blocking_publisher():
+    async def run():
+        hub = OrderHub(buffer_size=3)
+        slow = hub.subscribe()
+        fast = hub.subscribe()
+        received = []
+
+        for i in range(10):
+            hub.publish(order_event({"orderId": i}))
+            received.append(fast.queue.get_nowait())
+
+        return hub, slow, received
+
+    hub, slow, received = asyncio.run(run())
+    assert [e["order_id"] for e in received] == [str(i) for i in range(10)]
+    assert slow.overflowed
+    assert slow.queue.get_nowait() is None
+    assert hub.subscriber_count == 1
+    assert hub.dropped_subscribers == 1
+
+
+def test_publish_from_worker_thread():
+    async def run():
+        hub = OrderHub()
+        sub = hub.subscribe()
+        thread = threading.Thread(target=hub.publish, args=(order_event({"orderId": 1}),))
+        thread.start()
+        event = await asyncio.wait_for(sub.get(), timeout=2)
+        thread.join()
+        return event
+
+    assert asyncio.run(run())["order_id"] == "1"
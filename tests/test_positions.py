@@ -0,0 +1,181 @@
+import time
+from datetime import datetime, timedelta
+from decimal import Decimal
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import update
+
+from bot.api import app, get_market_data, get_position_book
+from bot.db import (
+    OrderRecord,
+    dispose_engine,
+    get_latest_position_snapshot,
+    get_session,
+    init_db,
+    save_orders,
+    upsert_order_updates,
+)
+from bot.market_data import MarketData
+from bot.positions import Position, PositionBook
+from bot.user_stream import parse_order_update
+
+
+@pytest.fixture
+def temp_db(tmp_path, monkeypatch):
+    monkeypatch.setenv("TRADING_BOT_DB_URL", f"sqlite:///{tmp_path / 'positions.db'}")
+    init_db()
+    yield
+    dispose_engine()
+
+
+def _response(order_id, side, qty, avg, status="FILLED", symbol="BTCUSDT"):
+    return {
+        "orderId": order_id,
+        "symbol": symbol,
+        "side": side,
+        "type": "MARKET",
+        "status": status,
+        "executedQty": qty,
+        "avgPrice": avg,
+    }
+
+
+def test_position_nets_fills_and_realizes_pnl():
+    position = Position("BTCUSDT")
+    position.apply_fill("BUY", Decimal("1"), Decimal("100"))
+    position.apply_fill("BUY", Decimal("1"), Decimal("110"))
+    assert (position.qty, position.entry_price) == (2, 105)
+
+    position.apply_fill("SELL", Decimal("0.5"), Decimal("125"))
+    assert (position.qty, position.entry_price, position.realized_pnl) == (Decimal("1.5"), 105, 10)
+
+    # Flip short: closes 1.5 at 95, opens 0.5 short at 95.
+    position.apply_fill("SELL", Decimal("2"), Decimal("95"))
+    assert (position.qty, position.entry_price, position.realized_pnl) == (Decimal("-0.5"), 95, -5)
+
+    position.apply_fill("BUY", Decimal("0.5"), Decimal("90"))
+    assert (position.qty, position.entry_price, position.realized_pnl) == (0, 0, Decimal("-2.5"))
+
+
+def test_order_updates_are_idempotent_and_partial_fills_apply_deltas():
+    book = PositionBook()
+    # Partial fill, the same update again, a stale one, then the final fill.
+    assert book.apply_response(_response(1, "BUY", "0.010", "100", status="PARTIALLY_FILLED"))
+    assert not book.apply_response(_response(1, "BUY", "0.010", "100", status="PARTIALLY_FILLED"))
+    assert book.apply_response(_response(1, "BUY", "0.030", "110", status="FILLED"))
+    assert not book.apply_response(_response(1, "BUY", "0.010", "100", status="PARTIALLY_FILLED"))
+    # A NEW market order response carries no fill yet.
+    assert not book.apply_response(_response(2, "SELL", "0", "0", status="NEW"))
+
+    event = {
+        "e": "ORDER_TRADE_UPDATE",
+        "E": 1,
+        "o": {"s": "BTCUSDT", "S": "SELL", "o": "MARKET", "i": 2, "X": "FILLED", "z": "0.010", "ap": "120", "T": 1},
+    }
+    assert book.apply_updates([parse_order_update(event)] * 3) == 1
+
+    [row] = book.positions(lambda symbol: 130.0)
+    assert row["position_amt"] == "0.02"
+    assert row["entry_price"] == "110"
+    assert row["realized_pnl"] == "0.1"
+    assert row["unrealized_pnl"] == "0.4"
+    assert row["notional"] == "2.6"
+    assert book.positions()[0]["unrealized_pnl"] is None
+
+
+def test_order_ids_shared_across_symbols_are_tracked_separately():
+    book = PositionBook()
+    assert book.apply_response(_response(7, "BUY", "0.5", "100", status="PARTIALLY_FILLED"))
+    # Same id on another symbol: a new working order, not a repeat of BTCUSDT #7.
+    token = book.reserve("ETHUSDT", "SELL", Decimal("2"))
+    book.release(token, {"orderId": 7, "symbol": "ETHUSDT", "status": "NEW", "origQty": "2", "executedQty": "0"})
+    assert book.apply_response(_response(7, "SELL", "1", "3000", status="PARTIALLY_FILLED", symbol="ETHUSDT"))
+
+    restored = PositionBook()
+    restored.load_state(book.state())
+    for b in (book, restored):
+        assert b.apply_response(_response(7, "BUY", "1", "110"))
+        btc, eth = b.positions()
+        assert (btc["position_amt"], btc["entry_price"]) == ("1", "110")
+        assert (eth["position_amt"], eth["entry_price"]) == ("-1", "3000")
+        assert b.pending_qty("ETHUSDT", "SELL") == 1
+
+
+def test_restore_from_snapshot_replays_only_later_orders(temp_db):
+    old = datetime.utcnow() - timedelta(hours=1)
+    save_orders([_response(i, "BUY", "0.001", "100") for i in range(1, 2001)])
+    # Age the first 2000 orders so they fall before the snapshot.
+    upsert_order_updates(
+        [
+            {
+                "order_id": str(i), "symbol": "BTCUSDT", "side": "BUY", "type": "MARKET",
+                "status": "FILLED", "executed_qty": "0.001", "avg_price": "100", "updated_at": old, "raw": {},
+            }
+            for i in range(1, 2001)
+        ]
+    )
+    with get_session() as session:
+        session.execute(update(OrderRecord).values(created_at=old))
+        session.commit()
+
+    book = PositionBook(replay_margin=60)
+    assert book.restore() == 2000
+    book.save_snapshot()
+    assert get_latest_position_snapshot().state["positions"]["BTCUSDT"][0] == "2.000"
+
+    # Filled after the snapshot: one new order, one partial that completes.
+    save_orders([_response(3001, "SELL", "0.5", "120"), _response(3002, "BUY", "0.1", "90", status="PARTIALLY_FILLED")])
+    book.apply_response(_response(3002, "BUY", "0.1", "90", status="PARTIALLY_FILLED"))
+    book.save_snapshot()
+    upsert_order_updates(
+        [
+            {
+                "order_id": "3002", "symbol": "BTCUSDT", "side": "BUY", "type": "LIMIT",
+                "status": "FILLED", "executed_qty": "0.2", "avg_price": "95",
+                "updated_at": datetime.utcnow(), "raw": {},
+            }
+        ]
+    )
+
+    restored = PositionBook(replay_margin=60)
+    replayed = restored.restore()
+
+    [row] = restored.positions()
+    # Snapshot: 2.1 long at 99.52 (incl. 0.1 of #3002 at 90). Replay in
+    # change order: sell 0.5 at 120, then #3002's remaining 0.1 at 100.
+    assert row["position_amt"] == "1.7"
+    assert row["realized_pnl"] == "10.23809524"
+    # The completed order and the sale; the snapshot covered the first 0.1.
+    assert replayed == 2
+    assert restored.state()["open"] == []
+
+
+def test_snapshot_thread_saves_on_stop(temp_db):
+    book = PositionBook(snapshot_interval=3600)
+    book.start()
+    book.apply_response(_response(1, "SELL", "0.002", "70000"))
+    book.stop()
+    assert book.snapshots == 1
+    assert get_latest_position_snapshot().state["positions"]["BTCUSDT"][0] == "-0.002"
+
+
+def test_positions_endpoint_uses_cached_mark_prices():
+    book = PositionBook()
+    book.apply_response(_response(1, "BUY", "0.002", "70000"))
+    book.apply_response(_response(2, "SELL", "1", "3500", symbol="ETHUSDT"))
+    market_data = MarketData(["BTCUSDT"])
+    market_data.apply({"e": "markPriceUpdate", "s": "BTCUSDT", "p": "71000", "E": int(time.time() * 1000)})
+
+    app.dependency_overrides[get_position_book] = lambda: book
+    app.dependency_overrides[get_market_data] = lambda: market_data
+    try:
+        resp = TestClient(app).get("/positions")
+    finally:
+        app.dependency_overrides.pop(get_position_book, None)
+        app.dependency_overrides.pop(get_market_data, None)
+
+    assert resp.status_code == 200
+    btc, eth = resp.json()
+    assert (btc["symbol"], btc["position_amt"], btc["unrealized_pnl"]) == ("BTCUSDT", "0.002", "2")
+    assert (eth["symbol"], eth["position_amt"], eth["mark_price"], eth["unrealized_pnl"]) == ("ETHUSDT", "-1", None, None)
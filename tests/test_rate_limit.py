@@ -0,0 +1,117 @@
+import asyncio
+import threading
+
+import pytest
+from binance.exceptions import BinanceAPIException
+from stub_exchange import StubExchange
+
+from bot.client import AsyncBinanceFuturesClient, BinanceFuturesClient
+from bot.rate_limit import RateLimiter, RateLimitExceeded
+
+WINDOW = 1.0
+
+
+def limiter(weight=20, orders=10, max_wait=5.0, enabled=True, window=WINDOW):
+    # Same limits as the stub, over 1 s windows instead of 1 min / 10 s.
+    return RateLimiter(
+        budgets=[
+            ("weight", weight, window, "X-MBX-USED-WEIGHT-1M"),
+            ("orders_10s", orders, window, "X-MBX-ORDER-COUNT-10S"),
+        ],
+        max_wait=max_wait,
+        enabled=enabled,
+    )
+
+
+async def _burst(url, rate_limiter, n):
+    client = AsyncBinanceFuturesClient("key", "secret", base_url=url, rate_limiter=rate_limiter)
+    try:
+        return await asyncio.gather(
+            *(client.place_order("BTCUSDT", "BUY", "MARKET", "0.002") for _ in range(n)),
+            return_exceptions=True,
+        )
+    finally:
+        await client.aclose()
+
+
+def test_burst_without_governor_gets_429s():
+    with StubExchange(order_limit=10, window=WINDOW) as stub:
+        results = asyncio.run(_burst(stub.url, limiter(enabled=False), 30))
+
+    rejected = [r for r in results if isinstance(r, BinanceAPIException)]
+    assert rejected and all(r.status_code == 429 for r in rejected)
+    assert stub.rejected == len(rejected)
+
+
+def test_governor_queues_burst_within_exchange_limits():
+    governor = limiter()
+    with StubExchange(order_limit=10, window=WINDOW) as stub:
+        results = asyncio.run(_burst(stub.url, governor, 30))
+
+    assert all("orderId" in r for r in results)
+    assert stub.rejected == 0
+    assert governor.metrics()["throttled"] > 0
+
+
+def test_headers_correct_budget_for_usage_from_other_clients():
+    governor = limiter(window=3600)
+    with StubExchange(weight_limit=20, window=3600) as stub:
+        client = BinanceFuturesClient("key", "secret", base_url=stub.url, ping=False, rate_limiter=governor)
+        client.get_exchange_info()
+        # Another process on the same IP uses most of the window.
+        stub.used_weight += 15
+        client.get_exchange_info()
+        client.close()
+
+    weight = governor.metrics()["budgets"]["weight"]
+    assert weight["used"] == 17
+    assert weight["available"] == 3
+
+
+def test_low_priority_is_rejected_while_orders_queue():
+    governor = limiter(weight=10, max_wait=2.0)
+    for _ in range(8):
+        governor.acquire("GET", "/fapi/v1/openOrders", {"symbol": "BTCUSDT"}, priority="high")
+
+    # Low priority keeps 20% headroom and never waits.
+    with pytest.raises(RateLimitExceeded):
+        governor.acquire("GET", "/fapi/v1/exchangeInfo")
+    # High priority may spend the rest of the budget.
+    governor.acquire("GET", "/fapi/v1/openOrders", {"symbol": "BTCUSDT"}, priority="high")
+    assert governor.metrics()["rejected"] == 1
+
+
+def test_ban_response_pauses_all_requests():
+    governor = limiter(max_wait=0.5)
+    governor.update(418, {"Retry-After": "30"})
+
+    with pytest.raises(RateLimitExceeded) as excinfo:
+        governor.acquire("POST", "/fapi/v1/order")
+    assert excinfo.value.retry_after > 29
+    assert governor.metrics()["bans"] == 1
+
+
+class _Response:
+    status_code = 200
+    headers = {"X-MBX-USED-WEIGHT-1M": "7"}
+
+    def json(self):
+        return {}
+
+
+def test_each_thread_reads_its_own_response_headers():
+    client = BinanceFuturesClient("key", "secret", base_url="http://127.0.0.1:1", ping=False)
+    seen = []
+
+    def other_thread():
+        client._client._handle_response(_Response())
+        seen.append(client._client.pop_response())
+
+    thread = threading.Thread(target=other_thread)
+    thread.start()
+    thread.join()
+    client.close()
+
+    # Another thread's call must not leak its headers into this one.
+    assert isinstance(seen[0], _Response)
+    assert client._client.pop_response() is None
@@ -0,0 +1,134 @@
+import asyncio
+import re
+import time
+
+import pytest
+from binance.exceptions import BinanceAPIException, BinanceRequestException
+from stub_exchange import StubExchange
+
+from bot.client import AsyncBinanceFuturesClient, BinanceFuturesClient
+from bot.db import dispose_engine, init_db
+from bot.orders import build_and_place_order_async
+from bot.retry import RetryPolicy, make_client_order_id
+
+POLICY = RetryPolicy(attempts=4, timeout=0.3, base_delay=0.01, max_delay=0.05, deadline=2.0)
+
+
+def place_async(stub, **kwargs):
+    async def run():
+        client = AsyncBinanceFuturesClient("key", "secret", base_url=stub.url, retry_policy=POLICY)
+        try:
+            return await client.place_order("BTCUSDT", "BUY", "MARKET", "0.002", **kwargs)
+        finally:
+            await client.aclose()
+
+    return asyncio.run(run())
+
+
+def test_client_order_id_is_stable_per_key_and_valid():
+    assert make_client_order_id("order-42") == make_client_order_id("order-42")
+    assert make_client_order_id("order-42") != make_client_order_id("order-43")
+    assert make_client_order_id() != make_client_order_id()
+    assert re.fullmatch(r"[.A-Z:/a-z0-9_-]{1,36}", make_client_order_id())
+
+
+@pytest.mark.parametrize("fault", ["drop", "slow"])
+def test_lost_response_is_resolved_by_lookup_not_resent(fault):
+    with StubExchange() as stub:
+        stub.order_faults.append(fault)
+        response = place_async(stub, client_order_id=make_client_order_id("logical-1"))
+
+    assert len(stub.orders) == 1
+    assert response["clientOrderId"] == make_client_order_id("logical-1")
+    assert response["orderId"] == next(iter(stub.orders))
+
+
+@pytest.mark.parametrize("fault", ["error", "drop_before"])
+def test_order_that_never_landed_is_resent(fault):
+    with StubExchange() as stub:
+        stub.order_faults.extend([fault, fault])
+        response = place_async(stub)
+
+    assert len(stub.orders) == 1
+    assert response["status"] == "NEW"
+
+
+def test_business_errors_are_not_retried():
+    async def run(stub):
+        client = AsyncBinanceFuturesClient("key", "secret", base_url=stub.url, retry_policy=POLICY)
+        try:
+            await client.place_order("BADUSDT", "BUY", "MARKET", "0.002")
+        finally:
+            await client.aclose()
+
+    with StubExchange() as stub:
+        with pytest.raises(BinanceAPIException) as excinfo:
+            asyncio.run(run(stub))
+
+    assert excinfo.value.code == -1121
+    assert stub.requests == 1
+
+
+def test_tail_latency_is_bounded_by_deadline():
+    with StubExchange() as stub:
+        stub.order_faults.extend(["error"] * 100)
+        t0 = time.perf_counter()
+        with pytest.raises(BinanceAPIException):
+            place_async(stub)
+        elapsed = time.perf_counter() - t0
+
+        stub.order_faults.clear()
+        stub.order_faults.extend(["drop_before"] * 100)
+        t0 = time.perf_counter()
+        with pytest.raises(BinanceRequestException):
+            place_async(stub)
+        dropped_elapsed = time.perf_counter() - t0
+
+    assert not stub.orders
+    assert elapsed < POLICY.deadline
+    assert dropped_elapsed < POLICY.deadline
+
+
+def test_sync_client_retries_idempotently():
+    with StubExchange() as stub:
+        client = BinanceFuturesClient("key", "secret", base_url=stub.url, ping=False, retry_policy=POLICY)
+        stub.order_faults.extend(["slow", "drop"])
+        first = client.place_order("BTCUSDT", "BUY", "MARKET", "0.002")
+        second = client.place_order("BTCUSDT", "SELL", "MARKET", "0.002")
+        client.close()
+
+    assert len(stub.orders) == 2
+    assert first["clientOrderId"] != second["clientOrderId"]
+
+
+def test_same_idempotency_key_places_the_order_once(tmp_path, monkeypatch):
+    monkeypatch.setenv("TRADING_BOT_DB_URL", f"sqlite:///{tmp_path / 'retry.db'}")
+    init_db()
+
+    async def run(stub):
+        client = AsyncBinanceFuturesClient("key", "secret", base_url=stub.url, retry_policy=POLICY)
+        try:
+            # A caller that timed out sends the same request again.
+            return [
+                await build_and_place_order_async(client, "BTCUSDT", "BUY", "MARKET", 0.002, idempotency_key=key)
+                for key in ("req-7", "req-7", None)
+            ]
+        finally:
+            await client.aclose()
+
+    try:
+        with StubExchange() as stub:
+            first, again, other = asyncio.run(run(stub))
+    finally:
+        dispose_engine()
+
+    assert first["orderId"] == again["orderId"] != other["orderId"]
+    assert first["clientOrderId"] == make_client_order_id("req-7")
+    assert len(stub.orders) == 2
+
+
+def test_policy_rejects_non_positive_timeouts():
+    # A zero aiohttp timeout would mean no timeout at all.
+    for bad in ({"timeout": 0}, {"deadline": -1}, {"attempts": 0}):
+        with pytest.raises(ValueError):
+            RetryPolicy(**bad)
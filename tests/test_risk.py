@@ -0,0 +1,238 @@
+import json
+import os
+import time
+from decimal import Decimal
+
+import pytest
+from fastapi.testclient import TestClient
+
+from bot.api import app, get_binance_client, get_market_data, get_risk_engine
+from bot.market_data import MarketData
+from bot.orders import build_and_place_batch, build_and_place_order
+from bot.positions import PositionBook
+from bot.risk import RiskEngine, RiskRejected, default_checks, parse_risk_config
+from bot.validators import ValidatedOrder, ValidationError
+
+
+def _order(side="BUY", qty="0.01", price=None, symbol="BTCUSDT"):
+    return ValidatedOrder(
+        symbol, side, "LIMIT" if price else "MARKET", Decimal(qty), Decimal(price) if price else None, None
+    )
+
+
+def _market_data(mark=70000.0, bid=69990.0, ask=70010.0):
+    market_data = MarketData(["BTCUSDT"])
+    now = int(time.time() * 1000)
+    market_data.apply({"e": "bookTicker", "s": "BTCUSDT", "b": bid, "B": 1, "a": ask, "A": 1, "E": now})
+    market_data.apply({"e": "markPriceUpdate", "s": "BTCUSDT", "p": mark, "E": now})
+    return market_data
+
+
+def _write(path, content, mtime):
+    path.write_text(content if isinstance(content, str) else json.dumps(content))
+    # Set the mtime explicitly: two writes can land in the same clock tick.
+    os.utime(path, (mtime, mtime))
+
+
+def test_parse_risk_config_overrides_defaults_per_symbol():
+    config = parse_risk_config(
+        {"default": {"max_notional": 1000, "max_orders": 5}, "symbols": {"btcusdt": {"max_notional": 50000}}}
+    )
+    assert config.limits("BTCUSDT").max_notional == Decimal("50000")
+    assert config.limits("BTCUSDT").max_orders == 5
+    assert config.limits("ETHUSDT").max_notional == Decimal("1000")
+    with pytest.raises(ValueError, match="max_notionl"):
+        parse_risk_config({"default": {"max_notionl": 1}})
+
+
+def test_checks_reject_notional_position_and_price_band():
+    book = PositionBook()
+    config = parse_risk_config(
+        {"default": {"max_notional": 10000, "max_position": "0.2", "price_band": 0.02}}
+    )
+    risk = RiskEngine(checks=default_checks(book), config=config)
+    market_data = _market_data()
+
+    # Accepted orders stay pending until released; these are never sent.
+    risk.check(_order(qty="0.1"), market_data).release()
+    with pytest.raises(RiskRejected, match="notional") as exc:
+        # MARKET BUY priced at the ask: 0.15 x 70010.
+        risk.check(_order(qty="0.15"), market_data)
+    assert exc.value.check == "max_notional"
+    # Without a quote a MARKET order has no price to check notional against.
+    risk.check(_order(qty="0.15", side="SELL")).release()
+
+    with pytest.raises(RiskRejected, match="away from reference"):
+        risk.check(_order(qty="0.01", price="75000"), market_data)
+    risk.check(_order(qty="0.01", price="71000"), market_data).release()
+
+    book.apply_response(
+        {"orderId": 1, "symbol": "BTCUSDT", "side": "BUY", "status": "FILLED", "executedQty": "0.18", "avgPrice": "70000"}
+    )
+    with pytest.raises(RiskRejected, match="position to 0.23"):
+        risk.check(_order(qty="0.05"), market_data)
+    # Reducing the position is always allowed.
+    risk.check(_order(side="SELL", qty="0.05"), market_data)
+
+
+def test_position_limit_counts_in_flight_working_and_batched_orders():
+    book = PositionBook()
+    risk = RiskEngine(checks=default_checks(book), config=parse_risk_config({"default": {"max_position": "0.1"}}))
+
+    # Two concurrent orders: the second sees the first one in flight.
+    first = risk.check(_order(qty="0.06"))
+    with pytest.raises(RiskRejected, match="position to 0.12 with pending"):
+        risk.check(_order(qty="0.06"))
+    # Once answered, a resting LIMIT order stays pending until it is done.
+    first.settle([{"orderId": 5, "symbol": "BTCUSDT", "side": "BUY", "status": "NEW", "origQty": "0.06", "executedQty": "0"}])
+    assert book.pending_qty("BTCUSDT", "BUY") == Decimal("0.06")
+    book.apply_updates([{"order_id": "5", "symbol": "BTCUSDT", "side": "BUY", "status": "PARTIALLY_FILLED",
+                         "executed_qty": "0.02", "avg_price": "70000"}])
+    assert (book.net_qty("BTCUSDT"), book.pending_qty("BTCUSDT", "BUY")) == (Decimal("0.02"), Decimal("0.04"))
+    with pytest.raises(RiskRejected):
+        risk.check(_order(qty="0.05"))
+    # Sells are checked against the other side's pending quantity.
+    risk.check(_order(side="SELL", qty="0.1")).release()
+    book.apply_updates([{"order_id": "5", "symbol": "BTCUSDT", "side": "BUY", "status": "CANCELED",
+                         "executed_qty": "0.02", "avg_price": "70000"}])
+    assert book.pending_qty("BTCUSDT", "BUY") == 0
+
+    # Orders of one batch count the ones before them.
+    batch = [_order(qty="0.05"), _order(qty="0.05")]
+    with pytest.raises(RiskRejected, match="position to 0.12") as exc:
+        risk.check_batch(batch)
+    assert exc.value.index == 1
+    # An order that is never sent gives its reservation back.
+    risk.check(_order(qty="0.08")).release()
+    assert book.pending_qty("BTCUSDT", "BUY") == 0
+
+
+def test_rejected_batch_uses_no_rate_budget():
+    config = parse_risk_config({"default": {"max_orders": 3, "max_notional": 1000}})
+    risk = RiskEngine(checks=default_checks(PositionBook()), config=config)
+
+    with pytest.raises(RiskRejected, match="notional"):
+        risk.check_batch([_order(price="70000", qty="0.001"), _order(price="70000", qty="0.1")])
+    assert risk.status()["orders_in_window"] == {"BTCUSDT": 0}
+    with pytest.raises(RiskRejected, match="More than 3") as exc:
+        risk.check_batch([_order(price="70000", qty="0.001")] * 4)
+    assert exc.value.index == 3
+    risk.check_batch([_order(price="70000", qty="0.001")] * 3)
+    assert risk.status()["orders_in_window"] == {"BTCUSDT": 3}
+
+
+def test_order_rate_window_slides():
+    now = [100.0]
+    config = parse_risk_config({"default": {"max_orders": 3, "window_seconds": 10}})
+    risk = RiskEngine(checks=default_checks(PositionBook(), clock=lambda: now[0]), config=config)
+
+    for _ in range(3):
+        risk.check(_order())
+    with pytest.raises(RiskRejected, match="retry in 10.00s"):
+        risk.check(_order())
+    # Other symbols have their own window.
+    risk.check(_order(symbol="ETHUSDT"))
+
+    now[0] = 110.5
+    risk.check(_order())
+    assert risk.status()["orders_in_window"] == {"BTCUSDT": 1, "ETHUSDT": 1}
+
+
+def test_config_hot_reloads_and_keeps_limits_on_bad_file(tmp_path, caplog):
+    path = tmp_path / "risk.json"
+    risk = RiskEngine(config_path=str(path), checks=default_checks(PositionBook()), reload_interval=0)
+    assert not risk.enabled
+    risk.check(_order(qty="1000", price="1"))
+
+    _write(path, {"default": {"max_notional": 100}}, mtime=1_000)
+    with pytest.raises(RiskRejected):
+        risk.check(_order(qty="1000", price="1"))
+
+    _write(path, {"default": {"max_notional": 10000}}, mtime=2_000)
+    risk.check(_order(qty="1000", price="1"))
+
+    _write(path, "{not json", mtime=3_000)
+    risk.check(_order(qty="1000", price="1"))
+    assert risk.config.default.max_notional == Decimal("10000")
+    assert "keeping the previous limits" in caplog.text
+
+    path.unlink()
+    risk.check(_order(qty="1000", price="100"))
+    assert not risk.enabled
+    assert risk.reloads == 2
+
+
+class _NeverCalledClient:
+    def place_order(self, **kwargs):
+        raise AssertionError("risk rejection must happen before the order is sent")
+
+    def place_batch_orders(self, group):
+        raise AssertionError("risk rejection must happen before the order is sent")
+
+
+def test_rejections_stop_orders_before_the_client():
+    risk = RiskEngine(
+        checks=default_checks(PositionBook()), config=parse_risk_config({"default": {"max_notional": 100}})
+    )
+    with pytest.raises(ValidationError, match="exceeds limit 100"):
+        build_and_place_order(_NeverCalledClient(), "BTCUSDT", "BUY", "LIMIT", 0.01, 70000, risk=risk)
+
+    batch = [
+        {"symbol": "BTCUSDT", "side": "BUY", "type": "LIMIT", "quantity": "0.001", "price": "70000"},
+        {"symbol": "BTCUSDT", "side": "BUY", "type": "LIMIT", "quantity": "0.01", "price": "70000"},
+    ]
+    with pytest.raises(ValidationError, match="Order #2: Order notional 700.00"):
+        build_and_place_batch(_NeverCalledClient(), batch, risk=risk)
+
+
+class _FlakyClient:
+    def __init__(self):
+        self.calls = 0
+
+    def place_order(self, symbol, side, order_type, quantity, price=None, time_in_force=None):
+        self.calls += 1
+        if self.calls == 1:
+            raise ConnectionError("connection reset")
+        return {"orderId": self.calls, "symbol": symbol, "side": side, "type": order_type, "status": "NEW",
+                "origQty": str(quantity), "executedQty": "0", "avgPrice": "0"}
+
+
+def test_order_path_releases_or_keeps_the_reservation():
+    book = PositionBook()
+    risk = RiskEngine(checks=default_checks(book), config=parse_risk_config({"default": {"max_position": "0.01"}}))
+    client = _FlakyClient()
+
+    with pytest.raises(ConnectionError):
+        build_and_place_order(client, "BTCUSDT", "BUY", "LIMIT", 0.01, 70000, "GTC", risk=risk)
+    assert book.pending_qty("BTCUSDT", "BUY") == 0
+    # Placed and resting: the next BUY would breach the limit if it filled.
+    build_and_place_order(client, "BTCUSDT", "BUY", "LIMIT", 0.01, 70000, "GTC", risk=risk)
+    assert book.pending_qty("BTCUSDT", "BUY") == Decimal("0.01")
+    with pytest.raises(ValidationError, match="with pending orders"):
+        build_and_place_order(client, "BTCUSDT", "BUY", "LIMIT", 0.001, 70000, "GTC", risk=risk)
+
+
+def test_api_returns_400_on_risk_rejection():
+    risk = RiskEngine(
+        checks=default_checks(PositionBook()), config=parse_risk_config({"default": {"price_band": 0.01}})
+    )
+    market_data = _market_data()
+    app.dependency_overrides[get_binance_client] = lambda: _NeverCalledClient()
+    app.dependency_overrides[get_risk_engine] = lambda: risk
+    app.dependency_overrides[get_market_data] = lambda: market_data
+    try:
+        api = TestClient(app)
+        resp = api.post(
+            "/orders",
+            json={"symbol": "BTCUSDT", "side": "SELL", "type": "LIMIT", "quantity": 0.002, "price": 72000},
+        )
+        status = api.get("/metrics/risk").json()
+        metrics = api.get("/metrics").text
+    finally:
+        for dependency in (get_binance_client, get_risk_engine, get_market_data):
+            app.dependency_overrides.pop(dependency, None)
+
+    assert resp.status_code == 400
+    assert "away from reference price" in resp.json()["detail"]
+    assert status["enabled"] and status["checks"][0] == "price_band"
+    assert 'trading_bot_risk_rejections_total{check="price_band"}' in metrics
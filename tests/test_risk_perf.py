@@ -0,0 +1,49 @@
+import time
+from decimal import Decimal
+
+from bot.market_data import MarketData
+from bot.positions import PositionBook
+from bot.risk import RiskEngine, default_checks, parse_risk_config
+from bot.validators import ValidatedOrder
+
+CONFIG = {
+    "default": {
+        "max_notional": 1_000_000,
+        "max_position": 1_000,
+        "max_orders": 1_000_000,
+        "window_seconds": 1,
+        "price_band": 0.05,
+    }
+}
+
+
+def _per_check(risk, orders, market_data):
+    # Median: a single GC pause or reload stat should not move the figure.
+    samples = []
+    for order in orders:
+        t0 = time.perf_counter()
+        reservation = risk.check(order, market_data)
+        samples.append(time.perf_counter() - t0)
+        reservation.release()
+    return sorted(samples)[len(samples) // 2]
+
+
+def test_risk_checks_add_microseconds():
+    book = PositionBook()
+    for i in range(50):
+        book.apply_response(
+            {"orderId": i, "symbol": f"SYM{i}USDT", "side": "BUY", "status": "FILLED", "executedQty": "1", "avgPrice": "10"}
+        )
+    market_data = MarketData(["BTCUSDT"])
+    now = int(time.time() * 1000)
+    market_data.apply({"e": "bookTicker", "s": "BTCUSDT", "b": "69990", "B": "1", "a": "70010", "A": "1", "E": now})
+    market_data.apply({"e": "markPriceUpdate", "s": "BTCUSDT", "p": "70000", "E": now})
+    risk = RiskEngine(checks=default_checks(book), config=parse_risk_config(CONFIG))
+
+    orders = [
+        ValidatedOrder("BTCUSDT", "BUY" if i % 2 else "SELL", "LIMIT", Decimal("0.002"), Decimal(70000 + i % 50), "GTC")
+        for i in range(20_000)
+    ]
+    per_check = _per_check(risk, orders, market_data)
+    # Single-digit microseconds normally: only an order-of-magnitude bound.
+    assert per_check < 200e-6
@@ -0,0 +1,232 @@
+import asyncio
+import itertools
+import json
+import time
+from datetime import datetime
+
+import pytest
+
+from bot.db import dispose_engine, get_recent_orders
+from bot.exchange_info import ExchangeInfoCache
+from bot.market_data import MarketData
+from bot.metrics import render_latest
+from bot.positions import PositionBook
+from bot.risk import RiskEngine
+from bot.strategy import Strategy, StrategyRunner, load_strategies
+
+
+@pytest.fixture
+def temp_db(tmp_path, monkeypatch):
+    monkeypatch.setenv("TRADING_BOT_DB_URL", f"sqlite:///{tmp_path / 'strategy.db'}")
+    yield
+    dispose_engine()
+
+
+class StubClient:
+    """
+    MARKET orders fill at once; LIMIT orders rest as NEW.
+    """
+
+    def __init__(self):
+        self.ids = itertools.count(1)
+        self.orders = []
+
+    async def place_order(self, symbol, side, order_type, quantity, price=None, time_in_force=None):
+        await asyncio.sleep(0)
+        filled = order_type == "MARKET"
+        response = {
+            "orderId": next(self.ids),
+            "symbol": symbol,
+            "side": side,
+            "type": order_type,
+            "status": "FILLED" if filled else "NEW",
+            "origQty": str(quantity),
+            "executedQty": str(quantity) if filled else "0",
+            "avgPrice": "70000" if filled else "0",
+        }
+        self.orders.append(response)
+        return response
+
+
+def _runner(strategies, client=None, **kwargs):
+    return StrategyRunner(
+        strategies,
+        client=client or StubClient(),
+        market_data=MarketData(),
+        exchange_info=ExchangeInfoCache(),
+        risk=RiskEngine(),
+        positions=PositionBook(),
+        **kwargs,
+    )
+
+
+def _update(order_id, status, qty, avg="69000", symbol="BTCUSDT"):
+    return {
+        "order_id": str(order_id), "symbol": symbol, "side": "BUY", "type": "LIMIT",
+        "status": status, "executed_qty": qty, "avg_price": avg, "updated_at": datetime.utcnow(), "raw": {},
+    }
+
+
+class Ladder(Strategy):
+    # One MARKET and one LIMIT order on the first tick, then records fills.
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.fills = []
+        self.placed = []
+
+    async def on_tick(self):
+        if not self.placed and self.params.get("trade", True):
+            self.placed.append(await self.place_order("BUY", "0.002"))
+            self.placed.append(await self.place_order("BUY", "0.004", "LIMIT", "69000", "GTC"))
+
+    def on_fill(self, fill):
+        self.fills.append((fill.order_id, fill.status, str(fill.executed_qty), str(fill.last_qty)))
+
+
+class Counter(Strategy):
+    def on_start(self):
+        self.ticks = 0
+
+    def on_tick(self):
+        self.ticks += 1
+
+
+class Hog(Strategy):
+    async def on_tick(self):
+        await asyncio.sleep(0)
+        end = time.thread_time() + self.params["burn"]
+        while time.thread_time() < end:
+            pass
+
+
+def test_fills_are_routed_once_to_the_placing_strategy(temp_db):
+    ladder, other = Ladder(symbols=["BTCUSDT"], interval=0.01), Ladder(name="idle", symbols=["BTCUSDT"], trade=False)
+
+    async def run():
+        runner = _runner([ladder, other])
+        await runner.start()
+        while len(ladder.placed) < 2:
+            await asyncio.sleep(0.01)
+        limit_id = ladder.placed[1]["orderId"]
+        # Partial fill, a duplicate, an update for an order placed elsewhere,
+        # then the final fill.
+        runner.apply_updates([_update(limit_id, "PARTIALLY_FILLED", "0.001")] * 2 + [_update(999, "FILLED", "1")])
+        runner.apply_updates([_update(limit_id, "FILLED", "0.004")])
+        await asyncio.sleep(0.05)
+        await runner.stop()
+        return runner
+
+    runner = asyncio.run(run())
+    market_id, limit_id = (str(o["orderId"]) for o in ladder.placed)
+    assert ladder.fills == [
+        (market_id, "FILLED", "0.002", "0.002"),
+        (limit_id, "PARTIALLY_FILLED", "0.001", "0.001"),
+        (limit_id, "FILLED", "0.004", "0.003"),
+    ]
+    assert other.fills == []
+    stats = {row["name"]: row for row in runner.stats()}
+    assert (stats["Ladder"]["orders"], stats["Ladder"]["fills"], stats["Ladder"]["state"]) == (2, 3, "stopped")
+    # The MARKET fill; stream updates reach the book through UserDataStream.
+    assert str(runner.positions.net_qty("BTCUSDT")) == "0.002"
+    assert len(get_recent_orders(10)) == 2
+
+
+def test_stream_update_before_placement_returns_is_not_lost(temp_db):
+    ladder = Ladder(symbols=["BTCUSDT"], interval=60)
+    client = StubClient()
+
+    async def run():
+        runner = _runner([ladder], client=client)
+        place = client.place_order
+
+        async def place_and_race(**kwargs):
+            response = await place(**kwargs)
+            if kwargs["order_type"] == "LIMIT":
+                # The user stream reports the fill before the REST reply arrives.
+                runner.apply_updates([_update(response["orderId"], "FILLED", "0.004")])
+            return response
+
+        client.place_order = place_and_race
+        await runner.start()
+        await asyncio.sleep(0.05)
+        await runner.stop()
+
+    asyncio.run(run())
+    assert [fill[1:] for fill in ladder.fills] == [("FILLED", "0.002", "0.002"), ("FILLED", "0.004", "0.004")]
+
+
+def test_stream_fill_of_a_filled_market_order_before_placement_returns(temp_db):
+    ladder = Ladder(symbols=["BTCUSDT"], interval=60)
+    client = StubClient()
+
+    async def run():
+        runner = _runner([ladder], client=client)
+        place = client.place_order
+
+        async def place_and_race(**kwargs):
+            response = await place(**kwargs)
+            if kwargs["order_type"] == "MARKET":
+                # The stream reports the fill, plus an order on another
+                # symbol that happens to share its id.
+                runner.apply_updates(
+                    [
+                        _update(response["orderId"], "FILLED", "0.002", "70000"),
+                        _update(response["orderId"], "NEW", "0", symbol="ETHUSDT"),
+                    ]
+                )
+            return response
+
+        client.place_order = place_and_race
+        await runner.start()
+        await asyncio.sleep(0.05)
+        await runner.stop()
+        return runner
+
+    runner = asyncio.run(run())
+    assert len(ladder.placed) == 2
+    assert [fill[1:] for fill in ladder.fills] == [("FILLED", "0.002", "0.002")]
+    assert list(runner._unclaimed) == [("ETHUSDT", str(ladder.placed[0]["orderId"]))]
+
+
+def test_cpu_budget_suspends_a_hog_and_stats_name_it(temp_db, caplog):
+    hog = Hog(symbols=["BTCUSDT"], interval=0.01, burn=0.02)
+    polite = Counter(symbols=["ETHUSDT"], interval=0.01)
+
+    async def run():
+        runner = _runner([hog, polite], cpu_budget=0.005, max_overruns=3, slow_step=0.015)
+        await runner.start()
+        await asyncio.sleep(0.5)
+        top = runner.stats()
+        await runner.stop()
+        return top
+
+    top = asyncio.run(run())
+    assert [row["name"] for row in top] == ["Hog", "Counter"]
+    assert (top[0]["state"], top[0]["ticks"], top[0]["overruns"]) == ("suspended", 3, 3)
+    assert top[0]["cpu_seconds"] >= 0.06 and top[0]["max_step"] >= 0.02
+    assert top[1]["state"] == "running" and top[1]["overruns"] == 0 and polite.ticks > 20
+    assert "Strategy Hog held the event loop" in caplog.text
+    assert "Suspended strategy Hog after 3 budget overruns" in caplog.text
+    assert 'trading_bot_strategy_budget_overruns_total{strategy="Hog"} 3.0' in render_latest()[0].decode()
+
+
+def test_load_strategies_from_json(tmp_path):
+    path = tmp_path / "strategies.json"
+    path.write_text(
+        json.dumps(
+            [
+                {"class": f"{__name__}:Hog", "name": "hog-btc", "symbols": ["btcusdt"], "interval": 0.5, "params": {"burn": 0.1}},
+                {"class": f"{__name__}:Counter", "symbols": ["ETHUSDT"], "cpu_budget": 0.002},
+            ]
+        )
+    )
+    hog, counter = load_strategies(str(path))
+    assert (hog.name, hog.symbols, hog.interval, hog.params) == ("hog-btc", ["BTCUSDT"], 0.5, {"burn": 0.1})
+    assert (counter.name, counter.cpu_budget) == ("Counter", 0.002)
+    assert _runner([hog, counter]).symbols == ["BTCUSDT", "ETHUSDT"]
+
+    with pytest.raises(ValueError, match="module:Class"):
+        load_strategies([{"class": "bot.strategy.Strategy"}])
+    with pytest.raises(ValueError, match="Duplicate"):
+        _runner([Counter(), Counter()])
@@ -0,0 +1,52 @@
+import asyncio
+import time
+
+from bot.db import dispose_engine
+from bot.exchange_info import ExchangeInfoCache
+from bot.market_data import MarketData
+from bot.positions import PositionBook
+from bot.risk import RiskEngine
+from bot.strategy import Strategy, StrategyRunner
+
+STRATEGIES = 50
+INTERVAL = 0.02
+SECONDS = 1.0
+
+
+class Watcher(Strategy):
+    # Reads its quote on every tick, like a strategy waiting for a signal.
+
+    def on_tick(self):
+        self.quote()
+
+
+def test_one_loop_schedules_dozens_of_strategies(tmp_path, monkeypatch):
+    monkeypatch.setenv("TRADING_BOT_DB_URL", f"sqlite:///{tmp_path / 'perf.db'}")
+    runner = StrategyRunner(
+        [Watcher(name=f"w{i}", symbols=["BTCUSDT"], interval=INTERVAL) for i in range(STRATEGIES)],
+        client=object(),
+        market_data=MarketData(["BTCUSDT"]),
+        exchange_info=ExchangeInfoCache(),
+        risk=RiskEngine(),
+        positions=PositionBook(),
+    )
+
+    async def run():
+        await runner.start()
+        cpu0 = time.process_time()
+        await asyncio.sleep(SECONDS)
+        cpu = time.process_time() - cpu0
+        stats = runner.stats()
+        await runner.stop()
+        return cpu, stats
+
+    try:
+        cpu, stats = asyncio.run(run())
+    finally:
+        dispose_engine()
+    ticks = [row["ticks"] for row in stats]
+    per_tick = cpu / sum(ticks)
+    expected = SECONDS / INTERVAL
+    assert min(ticks) >= expected * 0.8
+    # Tens of microseconds per tick; the bound only catches a blowup.
+    assert per_tick < 2e-3
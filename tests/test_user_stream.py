@@ -0,0 +1,208 @@
+import asyncio
+import json
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+
+import pytest
+from websockets.asyncio.server import serve
+
+from bot.client import AsyncBinanceFuturesClient
+from bot.db import dispose_engine, get_order, init_db, save_orders, upsert_order_updates
+from bot.events import OrderHub
+from bot.positions import PositionBook
+from bot.user_stream import UserDataStream, parse_order_update
+
+from stub_exchange import StubExchange
+
+
+@pytest.fixture
+def temp_db(tmp_path, monkeypatch):
+    monkeypatch.setenv("TRADING_BOT_DB_URL", f"sqlite:///{tmp_path / 'user_stream.db'}")
+    init_db()
+    yield
+    dispose_engine()
+
+
+def trade_update(order: dict, status: str, qty: str, price: str) -> str:
+    return json.dumps(
+        {
+            "e": "ORDER_TRADE_UPDATE",
+            "E": order["updateTime"] + 1,
+            "o": {
+                "s": order["symbol"],
+                "S": order["side"],
+                "o": order["type"],
+                "i": order["orderId"],
+                "X": status,
+                "z": qty,
+                "ap": price,
+                "T": order["updateTime"] + 1,
+            },
+        }
+    )
+
+
+def test_stream_updates_orders_and_resyncs_after_gap(temp_db):
+    async def run(stub):
+        client = AsyncBinanceFuturesClient("key", "secret", base_url=stub.url)
+        placed = [
+            await client.place_order("BTCUSDT", "BUY", "LIMIT", "0.010", "60000.0", "GTC")
+            for _ in range(3)
+        ]
+        save_orders(placed)
+        first, second, third = placed
+        connections = []
+
+        async def handler(ws):
+            connections.append(ws.request.path)
+            if len(connections) == 1:
+                await ws.send(trade_update(first, "FILLED", "0.010", "60000.0"))
+                await asyncio.sleep(0.2)
+                # Order two fills while the stream is down: no event for it.
+                stub.fill(second["orderId"], "0.010", "59990.0")
+                return
+            await ws.send(trade_update(third, "PARTIALLY_FILLED", "0.004", "60000.0"))
+            await ws.wait_closed()
+
+        async with serve(handler, "127.0.0.1", 0) as server:
+            port = server.sockets[0].getsockname()[1]
+            stream = UserDataStream(
+                client, ws_url=f"ws://127.0.0.1:{port}", max_backoff=0.05, hub=OrderHub()
+            )
+            stream.start()
+            for _ in range(100):
+                await asyncio.sleep(0.05)
+                if stream.connects >= 2 and stream.events >= 2 and not stream._pending:
+                    break
+            await stream.stop()
+        await client.aclose()
+        return placed, connections, stream
+
+    with StubExchange() as stub:
+        placed, connections, stream = asyncio.run(run(stub))
+
+    assert connections[:2] == ["/ws/key1", "/ws/key2"]
+    assert stream.resyncs >= 2
+
+    rows = [get_order(str(o["orderId"])) for o in placed]
+    assert (rows[0].status, rows[0].executed_qty, rows[0].avg_price) == ("FILLED", "0.010", "60000.0")
+    assert (rows[1].status, rows[1].avg_price) == ("FILLED", "59990.0")
+    assert (rows[2].status, rows[2].executed_qty) == ("PARTIALLY_FILLED", "0.004")
+
+
+def test_resync_covers_every_open_order_per_symbol(temp_db):
+    def order(order_id, symbol="BTCUSDT", status="NEW"):
+        return {
+            "orderId": order_id, "symbol": symbol, "side": "BUY", "type": "LIMIT", "status": status,
+            "origQty": "1", "executedQty": "1" if status == "FILLED" else "0", "avgPrice": "10",
+            "updateTime": 1_700_000_000_000,
+        }
+
+    save_orders([order(i) for i in range(1, 301)])
+
+    class Client:
+        queried = []
+
+        async def get_open_orders(self):
+            # Same id as the DB's BTCUSDT #5, on another symbol.
+            return [order(5, symbol="ETHUSDT")]
+
+        async def get_order(self, symbol, order_id):
+            self.queried.append((symbol, order_id))
+            return dict(order(int(order_id), symbol), status="FILLED", executedQty="1")
+
+    stream = UserDataStream(Client(), positions=PositionBook(), hub=OrderHub())
+    asyncio.run(stream.resync())
+
+    assert len(Client.queried) == 300 and ("BTCUSDT", "5") in Client.queried
+    assert get_order("1", "BTCUSDT").status == "FILLED"
+    assert get_order("5", "ETHUSDT").status == "NEW"
+
+
+def test_cancelled_flush_still_writes_its_batch(temp_db):
+    update = parse_order_update(
+        {
+            "e": "ORDER_TRADE_UPDATE",
+            "E": 1,
+            "o": {"s": "BTCUSDT", "S": "BUY", "o": "LIMIT", "i": 7, "X": "FILLED", "z": "1", "ap": "10", "T": 1},
+        }
+    )
+
+    async def run():
+        loop = asyncio.get_running_loop()
+        loop.set_default_executor(ThreadPoolExecutor(1))
+        gate = threading.Event()
+        busy = loop.run_in_executor(None, gate.wait)
+        stream = UserDataStream(client=None, positions=PositionBook(), hub=OrderHub())
+        stream._pending.append(update)
+        # The write queues behind the busy worker, then stop() cancels the flush.
+        flush = asyncio.ensure_future(stream.flush())
+        await asyncio.sleep(0)
+        flush.cancel()
+        await asyncio.gather(flush, return_exceptions=True)
+        gate.set()
+        await busy
+
+    asyncio.run(run())
+    assert get_order("7", "BTCUSDT").status == "FILLED"
+
+
+def test_upsert_skips_stale_updates_and_inserts_unknown_orders(temp_db):
+    now = datetime.utcnow()
+    base = {"symbol": "BTCUSDT", "side": "SELL", "type": "LIMIT", "raw": {}}
+    upsert_order_updates(
+        [
+            dict(base, order_id="7", status="FILLED", executed_qty="1", avg_price="10", updated_at=now),
+            dict(
+                base,
+                order_id="7",
+                status="NEW",
+                executed_qty="0",
+                avg_price="0",
+                updated_at=now - timedelta(seconds=1),
+            ),
+        ]
+    )
+    upsert_order_updates(
+        [
+            dict(
+                base,
+                order_id="7",
+                status="PARTIALLY_FILLED",
+                executed_qty="0.5",
+                avg_price="10",
+                updated_at=now - timedelta(seconds=2),
+            )
+        ]
+    )
+
+    row = get_order("7")
+    assert (row.status, row.executed_qty, row.updated_at) == ("FILLED", "1", now)
+
+
+def test_connections_that_drop_at_once_back_off(monkeypatch):
+    clock = [0.0]
+    stream = UserDataStream(client=None, max_backoff=60.0, min_healthy=30.0, clock=lambda: clock[0])
+    delays = []
+
+    async def run_once():
+        # Each connection lasts 1s, except the fourth, which stays up a minute.
+        clock[0] += 60.0 if len(delays) == 3 else 1.0
+
+    async def sleep(delay):
+        delays.append(delay)
+        if len(delays) == 6:
+            raise asyncio.CancelledError
+
+    monkeypatch.setattr(stream, "_run_once", run_once)
+    monkeypatch.setattr("bot.user_stream.random.uniform", lambda low, high: high)
+    monkeypatch.setattr("bot.user_stream.asyncio.sleep", sleep)
+    with pytest.raises(asyncio.CancelledError):
+        asyncio.run(stream.run())
+
+    assert delays == [1.0, 2.0, 4.0, 0.5, 1.0, 2.0]
+
+
+def test_parse_order_update_ignores_other_events():
+    assert parse_order_update({"e": "ACCOUNT_UPDATE"}) is None
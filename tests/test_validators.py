@@ -1,8 +1,13 @@
+from decimal import Decimal
+
 import pytest
 
+from bot.client import build_order_params
 from bot.validators import (
+    ValidatedOrder,
     ValidationError,
     validate_order_type,
+    validate_orders,
     validate_price,
     validate_quantity,
     validate_side,
@@ -79,3 +84,43 @@ def test_validate_time_in_force_invalid():
 def test_validate_time_in_force_ignored_for_market():
     assert validate_time_in_force("GTC", "MARKET") is None
 
+
+def test_validate_quantity_is_decimal_exact():
+    assert validate_quantity(0.1) == Decimal("0.1")
+    assert validate_quantity("0.30000") == Decimal("0.3")
+
+
+@pytest.mark.parametrize("qty", [float("nan"), float("inf"), "NaN", True])
+def test_validate_quantity_rejects_non_finite(qty):
+    with pytest.raises(ValidationError):
+        validate_quantity(qty)
+
+
+@pytest.mark.parametrize("value", ["1e999999", "1e-999999", "1" * 100, 1e300])
+def test_out_of_range_numbers_are_validation_errors(value):
+    with pytest.raises(ValidationError, match="out of range"):
+        validate_quantity(value)
+    with pytest.raises(ValidationError, match="out of range"):
+        validate_price(value, "LIMIT")
+
+
+def test_build_order_params_uses_plain_notation():
+    params = build_order_params("BTCUSDT", "BUY", "LIMIT", Decimal("1E-7"), Decimal("7E+4"))
+    assert params["quantity"] == "0.0000001"
+    assert params["price"] == "70000"
+
+
+def test_validate_orders_single_pass():
+    orders = validate_orders(
+        [
+            {"symbol": "btcusdt", "side": "buy", "type": "market", "quantity": 0.002},
+            {"symbol": "ETHUSDT", "side": "SELL", "order_type": "LIMIT", "quantity": "1", "price": 3000},
+        ]
+    )
+    assert orders[0] == ValidatedOrder("BTCUSDT", "BUY", "MARKET", Decimal("0.002"), None, None)
+    assert orders[1].time_in_force == "GTC"
+
+
+def test_validate_orders_reports_index():
+    with pytest.raises(ValidationError, match="Order #2"):
+        validate_orders([{"symbol": "BTCUSDT", "side": "BUY", "type": "MARKET", "quantity": 1}, {}])
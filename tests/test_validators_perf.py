@@ -0,0 +1,24 @@
+import time
+
+from bot.validators import validate_order, validate_orders
+
+
+def _rate(fn, n):
+    t0 = time.perf_counter()
+    for _ in range(n):
+        fn()
+    return n / (time.perf_counter() - t0)
+
+
+ORDER = {"symbol": "BTCUSDT", "side": "BUY", "type": "LIMIT", "quantity": 0.002, "price": 70000.1}
+
+
+def test_single_order_validation_rate():
+    rate = _rate(lambda: validate_order("BTCUSDT", "BUY", "LIMIT", 0.002, 70000.1, "GTC"), 20_000)
+    assert rate > 20_000
+
+
+def test_batch_validation_rate():
+    batch = [dict(ORDER, price=70000 + i) for i in range(50)]
+    batches = _rate(lambda: validate_orders(batch), 1_000)
+    assert batches * len(batch) > 20_000
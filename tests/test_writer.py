@@ -0,0 +1,125 @@
+import asyncio
+import threading
+import time
+
+import pytest
+
+from bot import writer as writer_module
+from bot.db import dispose_engine, get_recent_orders, init_db
+from bot.orders import _persist_async, build_and_place_order
+from bot.writer import OrderWriter, start_order_writer, stop_order_writer
+
+
+def _response(i):
+    return {"symbol": "BTCUSDT", "side": "BUY", "type": "MARKET", "status": "NEW", "orderId": i}
+
+
+class DummyClient:
+    def place_order(self, symbol, side, order_type, quantity, price=None, time_in_force=None):
+        return {"symbol": symbol, "side": side, "type": order_type, "status": "NEW", "orderId": 7}
+
+
+@pytest.fixture
+def temp_db(tmp_path, monkeypatch):
+    monkeypatch.setenv("TRADING_BOT_DB_URL", f"sqlite:///{tmp_path / 'writer.db'}")
+    init_db()
+    yield
+    dispose_engine()
+
+
+def test_writer_batches_inserts_and_flushes_on_close(temp_db):
+    writer = OrderWriter(batch_size=50, flush_interval_ms=1000)
+    for i in range(120):
+        writer.submit(_response(i))
+    writer.close()
+
+    metrics = writer.metrics()
+    assert metrics["written"] == 120
+    assert metrics["queue_depth"] == 0
+    assert metrics["flushes"] <= 3
+    assert len(get_recent_orders(limit=500)) == 120
+
+
+def test_writer_flushes_after_interval(temp_db):
+    writer = OrderWriter(batch_size=1000, flush_interval_ms=20)
+    writer.submit(_response(1))
+    assert writer.flush(timeout=2)
+    assert len(get_recent_orders(limit=5)) == 1
+    assert writer.metrics()["last_flush_ms"] > 0
+    writer.close()
+
+
+def test_drop_policy_counts_dropped_records(temp_db, monkeypatch):
+    gate = threading.Event()
+    monkeypatch.setattr(writer_module, "save_orders", lambda batch: gate.wait(5))
+    writer = OrderWriter(max_queue=2, batch_size=1, flush_interval_ms=1, policy="drop")
+    accepted = [writer.submit(_response(i)) for i in range(10)]
+    gate.set()
+    writer.close()
+    assert not all(accepted)
+    assert writer.metrics()["dropped"] == accepted.count(False)
+
+
+def test_sync_policy_writes_inline_when_full(temp_db, monkeypatch):
+    gate = threading.Event()
+    monkeypatch.setattr(writer_module, "save_orders", lambda batch: gate.wait(5))
+    writer = OrderWriter(max_queue=1, batch_size=1, flush_interval_ms=1, policy="sync")
+    for i in range(5):
+        writer.submit(_response(i))
+    assert writer.metrics()["sync_writes"] >= 1
+    gate.set()
+    writer.close()
+
+
+def test_order_path_enqueues_instead_of_committing(temp_db):
+    writer = start_order_writer(flush_interval_ms=10)
+    try:
+        build_and_place_order(DummyClient(), "BTCUSDT", "BUY", "MARKET", 0.002)
+        assert writer.flush(timeout=2)
+        assert get_recent_orders(limit=1)[0].order_id == "7"
+        assert writer.metrics()["enqueued"] == 1
+    finally:
+        stop_order_writer()
+
+
+def test_full_queue_never_blocks_the_event_loop(temp_db, monkeypatch):
+    gate = threading.Event()
+    monkeypatch.setattr(writer_module, "save_orders", lambda batch: gate.wait(5))
+    monkeypatch.setattr(writer_module, "save_order", lambda response: time.sleep(0.05))
+    writer = start_order_writer(max_queue=1, batch_size=1, flush_interval_ms=1, policy="block", block_timeout=0.2)
+
+    async def run():
+        ticks = 0
+
+        async def ticker():
+            nonlocal ticks
+            while True:
+                ticks += 1
+                await asyncio.sleep(0.01)
+
+        task = asyncio.create_task(ticker())
+        await _persist_async([_response(i) for i in range(4)])
+        task.cancel()
+        return ticks
+
+    try:
+        # The waits and inline writes ran in a thread while the loop kept ticking.
+        assert asyncio.run(run()) >= 10
+        assert writer.metrics()["sync_writes"] >= 1
+    finally:
+        gate.set()
+        stop_order_writer()
+
+
+def test_close_with_a_full_queue_drains_instead_of_hanging(temp_db, monkeypatch):
+    gate = threading.Event()
+    save_orders = writer_module.save_orders
+    monkeypatch.setattr(writer_module, "save_orders", lambda batch: gate.wait(5) and save_orders(batch))
+    writer = OrderWriter(max_queue=3, batch_size=1, flush_interval_ms=1, policy="drop")
+    accepted = sum(writer.submit(_response(i)) for i in range(5))
+    assert writer.metrics()["queue_depth"] == 3
+    threading.Timer(0.1, gate.set).start()
+    t0 = time.monotonic()
+    writer.close(timeout=5)
+    assert time.monotonic() - t0 < 2
+    assert len(get_recent_orders(limit=10)) == writer.metrics()["written"] == accepted